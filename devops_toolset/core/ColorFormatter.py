@@ -6,8 +6,9 @@ from colorama import Fore, Back, Style
 class ColorFormatter(logging.Formatter):
     """Logging Formatter to add colors to log records """
 
-    def __init__(self, format_str):
+    def __init__(self, format_str, datefmt=None):
         """ Initializes the color formatter with color data and takes the format string as parameter"""
+        super().__init__(format_str, datefmt)
         grey = Fore.WHITE
         yellow = Fore.YELLOW
         red = Fore.RED
@@ -20,8 +21,9 @@ class ColorFormatter(logging.Formatter):
             logging.ERROR: red + format_str + reset,
             logging.CRITICAL: Fore.BLACK + Back.RED + format_str + reset
         }
+        # One formatter per level, created once instead of for every record
+        self.formatters = {level: logging.Formatter(log_fmt, datefmt) for level, log_fmt in self.FORMATS.items()}
 
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt)
-        return formatter.format(record)
+        formatter = self.formatters.get(record.levelno)
+        return formatter.format(record) if formatter else super().format(record)
@@ -1,11 +1,99 @@
 """Commands for the package."""
 
+import functools
+import re
+import shlex
+import sys
 from core.ValueDictsBase import ValueDictsBase
 from core.app import App
+from typing import FrozenSet, Tuple, Union
 
 app: App = App()
 
 
+class Argument(str):
+    """Value of a whole field that is a single argument (e.g. an optional
+    --dbpass=value). Its string is quoted for the shell, since the command
+    string may still be run by one, and its argument is the value that
+    reaches the program, as it is, when the command is run from its argv.
+    """
+
+    def __new__(cls, value: str, argument: str):
+        instance = super().__new__(cls, value)
+        instance.argument = argument
+        return instance
+
+
+class Command(str):
+    """Command got from a CommandsCore. Besides being the command string, it
+    keeps the key of its template and the values of its secret fields
+    (passwords, tokens...), so it can be traced without them. See
+    tools.tracing.
+
+    It also keeps the command as an argument list (argv), so tools.cli can run
+    it without a shell. The template is split into arguments before the
+    values are put in them, so a value is never parsed by a shell. A field
+    that is a whole unquoted argument (e.g. {debug_info}) is split as the
+    shell would do, since it holds optional arguments (--debug, an id
+    list...), unless its value is an Argument. Templates that need a shell
+    (pipes, redirections, variables...) have no argv, and neither does any
+    command on Windows, where the shell splits arguments in its own way.
+    """
+
+    SECRET_FIELDS = re.compile("pass|token|secret", re.IGNORECASE)
+    SHELL_OPERATORS = re.compile(r"[();<>|&]+")
+    SHELL_BUILTINS = {"cd", "export", "source", "."}
+    WHOLE_FIELD = re.compile(r"{(\w+)}")
+
+    def __new__(cls, value: str, key: str = None, secrets: tuple = (), argv: Tuple[str, ...] = None,
+                split_fields: FrozenSet[int] = frozenset()):
+        command = super().__new__(cls, value)
+        command.key = key
+        command.secrets = secrets
+        command.argv = argv
+        command.split_fields = split_fields
+        return command
+
+    def format(self, *args, **kwargs) -> "Command":
+        secrets = tuple(str(value) for name, value in kwargs.items() if value and self.SECRET_FIELDS.search(name))
+        argv = None
+        if self.argv is not None:
+            argv = []
+            for index, argument in enumerate(self.argv):
+                value = kwargs.get(self.WHOLE_FIELD.fullmatch(argument).group(1)) \
+                    if index in self.split_fields else None
+                if isinstance(value, Argument):
+                    argv.append(value.argument)
+                elif index in self.split_fields:
+                    argv.extend(shlex.split(argument.format(*args, **kwargs)))
+                else:
+                    argv.append(argument.format(*args, **kwargs))
+        return Command(super().format(*args, **kwargs), self.key, self.secrets + secrets,
+                       tuple(argv) if argv is not None else None)
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def split_template(cls, template: str) -> Tuple[Union[Tuple[str, ...], None], FrozenSet[int]]:
+        """Splits a template into unquoted arguments.
+
+        Args:
+            template: Command template.
+
+        Returns:
+            The arguments (None if the template needs a shell) and the indexes
+            of the ones that are unquoted whole fields.
+        """
+
+        lexer = shlex.shlex(template, posix=False, punctuation_chars=True)
+        lexer.whitespace_split = True
+        tokens = list(lexer)
+        if not tokens or tokens[0] in cls.SHELL_BUILTINS \
+                or any(cls.SHELL_OPERATORS.fullmatch(token) for token in tokens):
+            return None, frozenset()
+        return (tuple(shlex.split(token)[0] for token in tokens),
+                frozenset(index for index, token in enumerate(tokens) if cls.WHOLE_FIELD.fullmatch(token)))
+
+
 class CommandsCore(ValueDictsBase):
     """Core literals for the package.
 
@@ -25,3 +113,13 @@ class CommandsCore(ValueDictsBase):
 
     # Add your core command dictionaries here
     _commands = {}
+
+    def get(self, key: str) -> Command:
+        """Gets a command from a given key.
+
+        Args:
+            key: used for getting the command
+        """
+
+        argv, split_fields = Command.split_template(self.all[key]) if sys.platform != "win32" else (None, frozenset())
+        return Command(self.all[key], key, argv=argv, split_fields=split_fields)
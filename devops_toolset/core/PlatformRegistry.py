@@ -0,0 +1,103 @@
+"""Registry of the platform-specific modules"""
+
+import importlib.util
+import pathlib
+import threading
+from types import ModuleType
+from typing import Dict, List, Tuple
+
+
+class PlatformRegistry(object):
+    """Loads every platform-specific module (devops_platforms/<platform>/<name>.py)
+    once per process and returns the same module afterwards.
+
+    Modules can also be registered by hand, so a platform can be swapped at
+    runtime (e.g. with a stand-in platform in tests):
+
+        registry.register("environment", fake_environment)
+        registry.use("aws")
+    """
+
+    def __init__(self, devops_path: pathlib.Path, platform: str):
+        """
+        Args:
+            devops_path: Path to the directory with a subdirectory per
+                platform.
+            platform: Platform whose modules are returned by default.
+        """
+
+        self.devops_path = pathlib.Path(devops_path)
+        self.platform = platform
+        self._modules: Dict[Tuple[str, str], ModuleType] = {}
+        self._lock = threading.RLock()
+
+    def clear(self):
+        """Forgets all the loaded and registered modules."""
+
+        with self._lock:
+            self._modules.clear()
+
+    def get(self, name: str, platform: str = None) -> ModuleType:
+        """Gets a platform-specific module, loading it the first time.
+
+        Args:
+            name: Name of the module (environment, restapi...).
+            platform: Platform of the module. Defaults to the current one.
+
+        Returns:
+            The module.
+        """
+
+        key = (platform or self.platform, name)
+        with self._lock:
+            if key not in self._modules:
+                self._modules[key] = self._load(*key)
+            return self._modules[key]
+
+    def preload(self, names: List[str], platform: str = None):
+        """Loads platform-specific modules before they are needed.
+
+        Args:
+            names: Names of the modules.
+            platform: Platform of the modules. Defaults to the current one.
+        """
+
+        for name in names:
+            self.get(name, platform)
+
+    def register(self, name: str, module: ModuleType, platform: str = None):
+        """Registers a module as a platform-specific module, replacing the
+        loaded one if any.
+
+        Args:
+            name: Name of the module.
+            module: Module to be returned from now on.
+            platform: Platform of the module. Defaults to the current one.
+        """
+
+        with self._lock:
+            self._modules[(platform or self.platform, name)] = module
+
+    def use(self, platform: str):
+        """Changes the platform whose modules are returned by default. Modules
+        that were already got keep being the ones of the previous platform.
+
+        Args:
+            platform: Name of the platform.
+        """
+
+        with self._lock:
+            self.platform = platform
+
+    def _load(self, platform: str, name: str) -> ModuleType:
+        """Executes a platform-specific module from its file."""
+
+        module_path = pathlib.Path.joinpath(self.devops_path, platform, f"{name}.py")
+        spec = importlib.util.spec_from_file_location(name, module_path)
+        platform_specific = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(platform_specific)
+        return platform_specific
+
+
+if __name__ == "__main__":
+    help(__name__)
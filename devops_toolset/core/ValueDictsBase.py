@@ -1,7 +1,12 @@
 """Base class for ValueDicts"""
 
-import inspect
-from typing import List
+import functools
+import threading
+from typing import Dict, List, Tuple
+
+# Values of every combination of classes, shared by all their instances
+_registry: Dict[tuple, dict] = {}
+_registry_lock = threading.Lock()
 
 
 class ValueDictsBase(object):
@@ -11,20 +16,22 @@ class ValueDictsBase(object):
         """Plains all values from all the dictionaries passed as a parameter
         plus the ones defined in the instanced class.
 
+        The values are merged once per process for every class and list of
+        classes. Next instances share them.
+
         Args:
             value_list: List of class types where values should be found.
         """
 
-        self._all_dictionaries = self.get_dicts()
-
-        if value_list:
-            for values in value_list:
-                _external = values()
-                self._all_dictionaries += _external.get_dicts()
-
-        self.all = {}
-        for dictionary in self._all_dictionaries:
-            self.all.update(dictionary[1])
+        key = (type(self), *(value_list or []))
+        with _registry_lock:
+            if key not in _registry:
+                values = {}
+                for value_class in key:
+                    for name, dictionary in self.get_class_dicts(value_class):
+                        values.update(dictionary)
+                _registry[key] = values
+            self.all = _registry[key]
 
     def get(self, key: str) -> str:
         """Gets a literal from a given key.
@@ -38,4 +45,17 @@ class ValueDictsBase(object):
     def get_dicts(self):
         """Gets all dict objects of the class."""
 
-        return inspect.getmembers(self, lambda m: type(m) is dict and len(m) > 0)
+        return self.get_class_dicts(type(self))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def get_class_dicts(value_class: type) -> List[Tuple[str, dict]]:
+        """Gets all the non-empty dict attributes of a class (including the
+        inherited ones), sorted by name.
+
+        Args:
+            value_class: ValueDictsBase subclass.
+        """
+
+        return [(name, getattr(value_class, name)) for name in sorted(dir(value_class))
+                if type(getattr(value_class, name)) is dict and getattr(value_class, name)]
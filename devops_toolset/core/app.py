@@ -4,18 +4,45 @@ Args:
     --skip-i18n: If present it will skip loading gettext
 """
 
-import importlib.util
-import pathlib
+import threading
+from core.PlatformRegistry import PlatformRegistry
 from core.settings import Settings
 import i18n.loader
 import core.log_setup
 
 
+class _LazySettings(object):
+    """Loads the settings the first time they are used"""
+
+    def __get__(self, instance, owner):
+        if owner._settings is None:
+            owner._settings = Settings()
+        return owner._settings
+
+
 class App(object):
-    """App object that contains core settings and functionalities."""
+    """App object that contains core settings and functionalities.
+
+    There is only one App per process. Every module creates it with App(),
+    but gettext and logging are only set up the first time (and gettext the
+    first time it is not skipped). Call configure() to set them up again,
+    e.g. after changing the settings.
+    """
+
+    settings: Settings = _LazySettings()
 
-    # Initialize settings
-    settings: Settings = Settings()
+    _settings: Settings = None
+    _platforms: PlatformRegistry = None
+    _instance: "App" = None
+    _i18n_loaded: bool = False
+    _lock = threading.RLock()
+
+    def __new__(cls, skip_i18n: bool = False):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance._configured = False
+            return cls._instance
 
     def __init__(self, skip_i18n: bool = False):
         """
@@ -23,19 +50,57 @@ class App(object):
             skip_i18n: If True it does not load the gettext engine
         """
 
-        # Load gettext
-        if not skip_i18n:
-            i18n.loader.setup(self.settings)
+        with self._lock:
+            if not self._configured:
+                self.configure(skip_i18n)
+            elif not skip_i18n and not App._i18n_loaded:
+                self._load_i18n()
+
+    def configure(self, skip_i18n: bool = False, settings: Settings = None):
+        """Sets up gettext and logging again.
 
-        # Configure logging
-        core.log_setup.configure(self.settings.log_config_file_path)
+        Args:
+            skip_i18n: If True it does not load the gettext engine
+            settings: Settings to be used from now on. If None the current
+                ones are kept.
+        """
+
+        with self._lock:
+            if settings is not None:
+                App._settings = settings
+                App._platforms = None
+
+            # Load gettext
+            if not skip_i18n:
+                self._load_i18n()
+
+            # Configure logging
+            core.log_setup.configure(self.settings.log_config_file_path)
+            self._configured = True
+
+    @property
+    def platforms(self) -> PlatformRegistry:
+        """Registry of the platform-specific modules of the configured
+        platform."""
+
+        with self._lock:
+            if App._platforms is None:
+                App._platforms = PlatformRegistry(self.settings.devops_path, self.settings.platform)
+            return App._platforms
 
     def load_platform_specific(self, name: str):
-        module_path = pathlib.Path.joinpath(self.settings.platform_specific_path, f"{name}.py")
-        spec = importlib.util.spec_from_file_location(name, module_path)
-        platform_specific = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(platform_specific)
-        return platform_specific
+        """Gets a platform-specific module of the configured platform. It is
+        loaded only once per process.
+
+        Args:
+            name: Name of the module (environment, restapi...).
+        """
+        return self.platforms.get(name)
+
+    def _load_i18n(self):
+        """Installs the gettext translations of the configured language"""
+        i18n.loader.setup(self.settings)
+        App._i18n_loaded = True
 
 
 if __name__ == "__main__":
@@ -0,0 +1,54 @@
+"""Lazy imports of the modules that are slow to import
+
+Modules imported with lazy_import are only executed the first time one of
+their attributes is used, so entry points do not pay for them before parsing
+their arguments (or at all, if they are not needed):
+
+    from core.lazy_import import lazy_import
+
+    requests = lazy_import("requests")
+    ...
+    requests.get(url)  # requests is imported here
+
+Do not use the module's attributes at import time (e.g. in annotations of
+module-level names or function signatures), quote them instead:
+
+    def call_api(...) -> "requests.Response":
+"""
+
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Imports a module that is executed on first use. If it was already
+    imported, it is returned as it is.
+
+    Args:
+        name: Full name of the module.
+
+    Returns:
+        The module.
+
+    Raises:
+        ModuleNotFoundError: If the module cannot be found.
+    """
+
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+if __name__ == "__main__":
+    help(__name__)
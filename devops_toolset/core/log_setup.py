@@ -1,13 +1,105 @@
 """Logging configuration"""
 
+import atexit
+import gzip
 import logging as logger
 import logging.handlers
+import os
+import queue
+import shutil
+import threading
 from logging.config import dictConfig
 from core.ColorFormatter import ColorFormatter
 import core.settings as settings
 
 import json
 
+# Maximum number of records written to the console before flushing it, in queue mode
+QUEUE_BATCH_SIZE = 1000
+
+_queue_listener: "BatchQueueListener" = None
+
+
+class BatchedStream(object):
+    """Stream that keeps what the handlers write until the batch is flushed,
+    so a console is written once per batch instead of once per record."""
+
+    def __init__(self, stream):
+        """
+        Args:
+            stream: Stream where the batches are written.
+        """
+        self.stream = stream
+        self._buffer = []
+
+    def write(self, text: str):
+        self._buffer.append(text)
+
+    def flush(self):
+        """Does nothing, as the handlers flush after every record. See
+        flush_batch."""
+
+    def flush_batch(self):
+        """Writes and flushes the records kept since the last batch."""
+        if self._buffer:
+            self.stream.write("".join(self._buffer))
+            self._buffer.clear()
+        self.stream.flush()
+
+    def isatty(self) -> bool:
+        return self.stream.isatty()
+
+
+class LightQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that puts the records in the queue without formatting
+    and copying them, so the calling thread spends less time logging. The
+    listener handlers format them."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info or record.stack_info:
+            return super().prepare(record)
+
+        # Handlers of the root logger run last, so the record can be changed in place
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class BatchQueueListener(logging.handlers.QueueListener):
+    """QueueListener that flushes the console streams of its handlers after
+    a batch of records, when the queue is empty or when batch_size records
+    have been handled."""
+
+    def __init__(self, log_queue: queue.Queue, *handlers: logging.Handler, batch_size: int = QUEUE_BATCH_SIZE):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+        self.streams = []
+        for handler in handlers:
+            if type(handler) is logging.StreamHandler:
+                self.streams.append(BatchedStream(handler.stream))
+                handler.setStream(self.streams[-1])
+        self._pending = 0
+
+    def handle(self, record: logging.LogRecord):
+        super().handle(record)
+        self._pending += 1
+        if self._pending >= self.batch_size or self.queue.empty():
+            self.flush()
+
+    def flush(self):
+        """Writes the records kept in the console streams."""
+        for stream in self.streams:
+            stream.flush_batch()
+        self._pending = 0
+
+    def stop(self):
+        """Handles the records left in the queue and stops the listener."""
+        super().stop()
+        self.flush()
+        for handler in self.handlers:
+            if type(handler) is logging.StreamHandler and isinstance(handler.stream, BatchedStream):
+                handler.setStream(handler.stream.stream)
+
 
 def configure(filepath):
     """Configures the Python logging using a dictionary from a json file and adding a default
@@ -68,7 +160,7 @@ def add_filter_to_console_handler(loglevel):
     handler.addFilter(lambda record: record.levelno <= loglevel)
 
 
-def add_time_rotated_file_handler(backupcount=10, filepath=".", when='midnight'):
+def add_time_rotated_file_handler(backupcount=10, filepath=".", when='midnight', compress=False):
     """Adds a filter to the console in order to drop messages above desired loglevel
 
      Args:
@@ -76,20 +168,119 @@ def add_time_rotated_file_handler(backupcount=10, filepath=".", when='midnight')
         filepath: Path of the file used to log in.
         when: Defines when to rotate
         (see https://docs.python.org/3/library/logging.handlers.html#timedrotatingfilehandler)
+        compress: If True rotated files are compressed with gzip in a background thread
 
     Raises: FileNotFoundError: When passed filepath doesn't exist
     """
     log = logger.getLogger()
     file_handler = logging.handlers.TimedRotatingFileHandler(filename=filepath, when=when, backupCount=backupcount)
+    if compress:
+        file_handler.namer = lambda name: f"{name}.gz"
+        file_handler.rotator = rotate_and_compress
     log.addHandler(file_handler)
 
 
+def rotate_and_compress(source: str, destination: str):
+    """Rotates a log file and compresses it with gzip in a background thread,
+    so the thread that logged the record does not wait for it.
+
+    Args:
+        source: Path of the log file.
+        destination: Path of the compressed file (.gz).
+    """
+
+    rotated = destination[:-len(".gz")]
+    os.replace(source, rotated)
+    threading.Thread(target=compress_file, args=(rotated, destination), name="log-compress").start()
+
+
+def compress_file(source: str, destination: str):
+    """Compresses a file with gzip and deletes it.
+
+    Args:
+        source: Path of the file.
+        destination: Path of the compressed file.
+    """
+
+    with open(source, "rb") as source_file, gzip.open(destination, "wb") as destination_file:
+        shutil.copyfileobj(source_file, destination_file)
+    os.remove(source)
+
+
 def add_colored_formatter_to_console_handlers():
-    """ Adds a custom colored formatter to the current console handler """
+    """ Adds a custom colored formatter to the current console handlers that
+    write to a terminal, so redirected output has no color codes """
     log = logger.getLogger()
     for handler in log.handlers:
-        color_formatter = ColorFormatter(handler.formatter._fmt)
-        handler.setFormatter(color_formatter)
+        if is_tty_handler(handler):
+            color_formatter = ColorFormatter(handler.formatter._fmt, handler.formatter.datefmt)
+            handler.setFormatter(color_formatter)
+
+
+def is_tty_handler(handler: logging.Handler) -> bool:
+    """Checks if a handler writes to a terminal.
+
+    Args:
+        handler: Logging handler.
+    """
+    stream = getattr(handler, "stream", None)
+    try:
+        return type(handler) is logging.StreamHandler and stream is not None and stream.isatty()
+    except (AttributeError, ValueError):
+        # Streams without isatty or closed
+        return False
+
+
+def start_queue_logging(batch_size: int = QUEUE_BATCH_SIZE) -> BatchQueueListener:
+    """Moves the handlers of the root logger to a background thread, so
+    logging only puts the records in a queue. Console output is written in
+    batches. The records left are written when stop_queue_logging is called
+    or at exit.
+
+    Args:
+        batch_size: Maximum number of records written to the console before
+            flushing it.
+
+    Returns:
+        The listener that handles the records.
+    """
+
+    global _queue_listener
+
+    if _queue_listener is not None:
+        return _queue_listener
+
+    log = logger.getLogger()
+    log_queue = queue.SimpleQueue()
+    handlers = list(log.handlers)
+    for handler in handlers:
+        log.removeHandler(handler)
+    log.addHandler(LightQueueHandler(log_queue))
+
+    _queue_listener = BatchQueueListener(log_queue, *handlers, batch_size=batch_size)
+    _queue_listener.start()
+    atexit.register(stop_queue_logging)
+    return _queue_listener
+
+
+def stop_queue_logging():
+    """Writes the records left in the queue and moves the handlers back to
+    the root logger."""
+
+    global _queue_listener
+
+    if _queue_listener is None:
+        return
+
+    listener, _queue_listener = _queue_listener, None
+    listener.stop()
+    log = logger.getLogger()
+    for handler in list(log.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler) and handler.queue is listener.queue:
+            log.removeHandler(handler)
+    for handler in listener.handlers:
+        log.addHandler(handler)
+    atexit.unregister(stop_queue_logging)
 
 
 if __name__ == "__main__":
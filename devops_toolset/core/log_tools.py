@@ -37,6 +37,10 @@ def log_stdouterr(output: bytes, level: LogLevel):
         level: Logging level.
     """
 
+    # Skip decoding the output if the level is not logged (e.g. debug output)
+    if not logging.getLogger().isEnabledFor(level.value[0]):
+        return
+
     for line in output.splitlines():
         logging.log(level.value[0], line.decode(encoding="utf-8", errors="ignore"))
 
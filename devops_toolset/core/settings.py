@@ -3,7 +3,7 @@
 import pathlib
 import os
 import json
-import pkg_resources
+from importlib import resources
 
 
 class Settings(object):
@@ -21,12 +21,14 @@ class Settings(object):
     project_xml_path = root_path.parent.absolute()
     devops_path: pathlib.Path = pathlib.Path.joinpath(root_path, _DEVOPS).absolute()
     locales_path: pathlib.Path = pathlib.Path.joinpath(root_path, _LOCALES).absolute()
-    log_config_file_path: pathlib.Path = pathlib.Path(pkg_resources.resource_filename
-                                                      (__name__, _CONFIG_SETTINGS_FILE_NAME))
-    settings_path: pathlib.Path = pathlib.Path(pkg_resources.resource_filename(__name__, _SETTINGS_FILE_NAME))
+    log_config_file_path: pathlib.Path = pathlib.Path(str(resources.files(__package__)
+                                                          .joinpath(_CONFIG_SETTINGS_FILE_NAME)))
+    settings_path: pathlib.Path = pathlib.Path(str(resources.files(__package__).joinpath(_SETTINGS_FILE_NAME)))
     language: str = "en"
     platform: str = "azuredevops"
     platform_specific_path: pathlib.Path = pathlib.Path.joinpath(devops_path, platform).absolute()
+    artifact_cache_path: pathlib.Path = pathlib.Path.joinpath(pathlib.Path.home(), ".cache", "devops-toolset")
+    artifact_cache_max_size: int = 2 * 1024 ** 3
 
     def __init__(self):
         """Loads settings"""
@@ -55,3 +57,6 @@ class Settings(object):
         # Add your setting mappings here
         self.language = settings["language"]
         self.platform = settings["platform"]
+        if settings.get("artifact_cache_path"):
+            self.artifact_cache_path = pathlib.Path(os.path.expanduser(settings["artifact_cache_path"]))
+        self.artifact_cache_max_size = settings.get("artifact_cache_max_size", self.artifact_cache_max_size)
@@ -1,18 +1,20 @@
 """Azure DevOps REST API functionality"""
 
 from core.app import App
+from core.lazy_import import lazy_import
 from core.CommandsCore import CommandsCore
 from core.LiteralsCore import LiteralsCore
 from devops_platforms.azuredevops.Literals import Literals as PlatformSpecificLiterals
 from devops_platforms.azuredevops.commands import Commands as PlatformSpecificCommands
-import filesystem.paths
+import filesystem.artifact_cache
+import tools.http_client as http_client
 from tools.xcoding64 import encode
 from typing import Union
 import logging
-import requests
 
 
 app: App = App()
+requests = lazy_import("requests")
 literals = LiteralsCore([PlatformSpecificLiterals])
 commands = CommandsCore([PlatformSpecificCommands])
 
@@ -32,7 +34,7 @@ def generate_authentication_header(user_name: str, access_token: str) -> dict:
     return {"Authorization": basic_auth_token}
 
 
-def call_api(command: str, user_name: str, access_token: str) -> requests.Response:
+def call_api(command: str, user_name: str, access_token: str) -> "requests.Response":
     """Calls the REST API.
 
     Args:
@@ -47,7 +49,7 @@ def call_api(command: str, user_name: str, access_token: str) -> requests.Respon
 
     logging.info(literals.get("azdevops_command").format(command=command))
 
-    response = requests.get(command, headers=headers)
+    response = http_client.get(command, headers=headers)
     if response.status_code != 200:
         raise ValueError(literals.get("azdevops_status_code").format(status_code=response.status_code))
     return response
@@ -138,8 +140,8 @@ def get_artifact(organization: str, project: str, build_id: int, artifact_name:
     download_url = build["resource"]["downloadUrl"]
     if download_url:
         headers = generate_authentication_header(user_name, access_token)
-        filesystem.paths.download_file(build["resource"]["downloadUrl"], destination_path, f"{artifact_name}.zip",
-                                           headers)
+        filesystem.artifact_cache.download_file(build["resource"]["downloadUrl"], destination_path,
+                                                f"{artifact_name}.zip", headers, version=str(build_id))
 
 
 def get_last_artifact(organization: str, project: str, artifact_name: str, destination_path: str,
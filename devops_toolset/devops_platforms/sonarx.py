@@ -9,7 +9,7 @@ from tools.git import simplify_branch_name
 import configparser
 import core.log_tools
 import logging
-import requests
+import tools.http_client as http_client
 
 app: App = App()
 literals = LiteralsCore([DevopsLiterals])
@@ -46,7 +46,7 @@ def get_quality_gate_status(properties_file_path: str, token: str, branch: str =
     url = f"{sonar_url}{Urls.SONAR_QUALITY_GATE_PARTIAL_URL}{sonar_project_key}{branch_segment}"
     logging.info(literals.get("sonar_qg_url").format(url=url))
 
-    response = requests.get(url, headers=headers)
+    response = http_client.get(url, headers=headers)
     if response.status_code != 200:
         raise ValueError(literals.get("sonar_unexpected_status_code").format(statusCode=response.status_code))
 
@@ -14,8 +14,20 @@ class Literals(ValueDictsBase):
         "fs_project_path_is": _("Project path is {path}."),
         "fs_composer_path_is": _("Composer file path is {path}."),
         "fs_zip_added_file": _("[{zip_file_name}] Added file: {added_file}"),
+        "fs_cache_evicted": _("Evicted {path} from the artifact cache."),
+        "fs_cache_hit": _("{url} found in the artifact cache."),
+        "fs_cache_statistics": _("Artifact cache ({path}): {hits} hits, {misses} misses."),
+        "fs_download_resuming": _("Resuming download of {url} from byte {offset}..."),
         "fs_file_moving": _("Moving file {origin_file_path} to {destination_file_path}"),
     }
+    _warnings = {
+        "fs_cache_checksum_mismatch": _("Checksum of the cached {url} does not match. Downloading it again..."),
+        "fs_download_retrying": _("Download of {url} was interrupted ({error}). Retrying..."),
+    }
     _errors = {
+        "fs_cache_only_miss": _("{url} is not in the artifact cache and downloads are disabled (cache only mode)."),
+        "fs_download_checksum_error": _("Checksum of {url} does not match. Expected {algorithm} {expected} but was "
+                                        "{actual}."),
         "fs_not_dir": _("Path must be a dir, not a file."),
+        "fs_zstd_error": _("Command {command} exited with code {code}. Is zstd installed and in the PATH?"),
     }
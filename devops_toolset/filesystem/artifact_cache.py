@@ -0,0 +1,330 @@
+"""Local cache of downloaded artifacts (plugins, themes, WP-CLI...) shared by
+all the runs on a machine.
+
+Artifacts are stored once by content hash (blobs/<sha256>) and found through
+index entries keyed by URL and version (index/<key>.json). Blobs are written
+to a temporary file and renamed, so parallel jobs can share the cache without
+locks: a reader either finds a complete file or none. When the cache grows
+over its maximum size, the least recently used blobs are deleted.
+
+    file_name, file_path = artifact_cache.download_file(url, destination, version="1.2.0")
+"""
+
+import contextlib
+import datetime
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import shutil
+import tempfile
+import threading
+import filesystem.paths as paths
+from core.app import App
+from core.LiteralsCore import LiteralsCore
+from filesystem.Literals import Literals as FileSystemLiterals
+from filesystem.constants import ARTIFACT_CACHE_UNVERSIONED_MAX_AGE, DOWNLOAD_CHUNK_SIZE
+from typing import Union
+
+app: App = App()
+literals = LiteralsCore([FileSystemLiterals])
+
+_cache: Union["ArtifactCache", None] = None
+
+
+class ArtifactCache(object):
+    """On-disk cache of downloaded files keyed by URL and version."""
+
+    def __init__(self, path: str, max_size: int, cache_only: bool = False):
+        """
+        Args:
+            path: Path to the cache directory. It is created if needed.
+            max_size: Maximum size of the cached files in bytes. If it is 0
+                the cache is disabled and files are always downloaded.
+            cache_only: If True files are never downloaded, so builds without
+                network access fail fast when an artifact is not cached.
+        """
+
+        self.path = pathlib.Path(path)
+        self.max_size = max_size
+        self.cache_only = cache_only
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def download_file(self, url: str, destination: str, save_as: str = None, headers: dict = None,
+                      version: str = None, checksum: str = None, checksum_algorithm: str = "sha256") -> tuple:
+        """Copies a file from the cache or downloads it and adds it to the
+        cache. Same as filesystem.paths.download_file.
+
+        Args:
+            url: Where to download the file from.
+            destination: Path to the directory where the file will be copied.
+            save_as: File name to save the file as.
+            headers: Authentication headers.
+            version: Version of the artifact. If None the URL is expected to
+                always return the same content for
+                ARTIFACT_CACHE_UNVERSIONED_MAX_AGE.
+            checksum: If present, expected hex digest of the file. A cached
+                file that does not match it is removed from the cache and
+                downloaded again.
+            checksum_algorithm: hashlib algorithm of the checksum.
+
+        Returns:
+            Tuple with (file name, file path)
+
+        Raises:
+            FileNotFoundError: If the file is not cached in cache only mode.
+        """
+
+        if not self.max_size:
+            return paths.download_file(url, destination, save_as, headers, checksum=checksum,
+                                       checksum_algorithm=checksum_algorithm)
+
+        if not os.path.isdir(destination):
+            raise ValueError(literals.get("fs_not_dir"))
+
+        file_name = save_as if save_as else paths.get_file_name_from_url(url)
+        file_path = pathlib.Path.joinpath(pathlib.Path(destination), file_name)
+
+        if self._copy_from_cache(url, version, file_path, checksum, checksum_algorithm):
+            self._count(hit=True)
+            logging.info(literals.get("fs_cache_hit").format(url=url))
+            return file_name, file_path
+
+        self._count(hit=False)
+        if self.cache_only:
+            raise FileNotFoundError(literals.get("fs_cache_only_miss").format(url=url))
+
+        paths.download_file(url, destination, file_name, headers, checksum=checksum,
+                            checksum_algorithm=checksum_algorithm)
+        self.put(url, version, file_path)
+        return file_name, file_path
+
+    def get(self, url: str, version: str = None) -> Union[pathlib.Path, None]:
+        """Gets the cached file of a URL and version.
+
+        Args:
+            url: URL the file was downloaded from.
+            version: Version of the artifact.
+
+        Returns:
+            Path to the cached file or None if it is not cached.
+        """
+
+        try:
+            with open(self._get_entry_path(url, version), "r") as entry_file:
+                entry = json.load(entry_file)
+        except (OSError, ValueError):
+            return None
+
+        if version is None and not self.cache_only:
+            age = datetime.datetime.now().timestamp() - entry["created"]
+            if age > ARTIFACT_CACHE_UNVERSIONED_MAX_AGE:
+                return None
+
+        blob_path = self._get_blob_path(entry["sha256"])
+        try:
+            # The modification time is the last use of the blob for eviction
+            os.utime(blob_path)
+        except OSError:
+            return None
+        return blob_path
+
+    def put(self, url: str, version: str, file_path: pathlib.Path) -> pathlib.Path:
+        """Adds a file to the cache and evicts the least recently used files
+        if the cache is full.
+
+        Args:
+            url: URL the file was downloaded from.
+            version: Version of the artifact.
+            file_path: Path to the file.
+
+        Returns:
+            Path to the cached file.
+        """
+
+        file_hash = hashlib.sha256()
+        with open(file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(DOWNLOAD_CHUNK_SIZE), b""):
+                file_hash.update(chunk)
+        sha256 = file_hash.hexdigest()
+
+        blob_path = self._get_blob_path(sha256)
+        if not blob_path.is_file():
+            self._write_atomically(blob_path, lambda temporary_path: shutil.copyfile(file_path, temporary_path))
+        else:
+            os.utime(blob_path)
+
+        entry = {"url": url, "version": version, "sha256": sha256, "size": blob_path.stat().st_size,
+                 "created": datetime.datetime.now().timestamp()}
+        self._write_atomically(self._get_entry_path(url, version),
+                               lambda temporary_path: pathlib.Path(temporary_path).write_text(json.dumps(entry)))
+
+        self.evict()
+        return blob_path
+
+    def evict(self):
+        """Deletes the least recently used files until the cache fits in its
+        maximum size. Index entries of deleted files are ignored when read."""
+
+        blobs = []
+        for blob_path in pathlib.Path.joinpath(self.path, "blobs").glob("*/*"):
+            try:
+                blob_stat = blob_path.stat()
+            except OSError:
+                continue
+            blobs.append((blob_stat.st_mtime, blob_stat.st_size, blob_path))
+
+        total_size = sum(size for _, size, _ in blobs)
+        for _, size, blob_path in sorted(blobs):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(blob_path)
+            except OSError:
+                # Another job removed it or, on Windows, is copying it
+                continue
+            total_size -= size
+            logging.debug(literals.get("fs_cache_evicted").format(path=blob_path))
+
+    def log_statistics(self):
+        """Logs how many files were found in the cache and how many were
+        not."""
+
+        if self.hits or self.misses:
+            logging.info(literals.get("fs_cache_statistics").format(hits=self.hits, misses=self.misses,
+                                                                    path=self.path))
+
+    def _copy_from_cache(self, url: str, version: Union[str, None], file_path: pathlib.Path,
+                         checksum: str = None, checksum_algorithm: str = "sha256") -> bool:
+        """Copies the cached file of a URL and version to a path.
+
+        If a checksum is passed and the cached file does not match it (it is
+        corrupt or the URL now returns other content), its index entry is
+        removed, and so is the file if it is corrupt.
+
+        Returns:
+            True if the file was cached, matched the checksum and was copied.
+        """
+
+        blob_path = self.get(url, version)
+        if blob_path is None:
+            return False
+
+        if checksum:
+            file_hash = hashlib.new(checksum_algorithm)
+            blob_hash = hashlib.sha256()
+            try:
+                with open(blob_path, "rb") as blob_file:
+                    for chunk in iter(lambda: blob_file.read(DOWNLOAD_CHUNK_SIZE), b""):
+                        file_hash.update(chunk)
+                        blob_hash.update(chunk)
+            except FileNotFoundError:
+                # Evicted by another job after it was found
+                return False
+
+            if file_hash.hexdigest().lower() != checksum.lower():
+                logging.warning(literals.get("fs_cache_checksum_mismatch").format(url=url))
+                with contextlib.suppress(OSError):
+                    os.remove(self._get_entry_path(url, version))
+                    if blob_hash.hexdigest() != blob_path.name:
+                        os.remove(blob_path)
+                return False
+
+        partial_path = file_path.with_name(f"{file_path.name}.part")
+        try:
+            shutil.copyfile(blob_path, partial_path)
+        except FileNotFoundError:
+            # Evicted by another job after it was found
+            return False
+        os.replace(partial_path, file_path)
+        return True
+
+    def _count(self, hit: bool):
+        """Updates the hit / miss statistics. Downloads can run in threads."""
+
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _get_blob_path(self, sha256: str) -> pathlib.Path:
+        """Gets the path to the blob with a content hash."""
+        return pathlib.Path.joinpath(self.path, "blobs", sha256[:2], sha256)
+
+    def _get_entry_path(self, url: str, version: Union[str, None]) -> pathlib.Path:
+        """Gets the path to the index entry of a URL and version."""
+        key = hashlib.sha256(f"{url}\n{version or ''}".encode("utf-8")).hexdigest()
+        return pathlib.Path.joinpath(self.path, "index", f"{key}.json")
+
+    @staticmethod
+    def _write_atomically(file_path: pathlib.Path, write):
+        """Writes a file in the cache through a temporary file that is renamed
+        when it is complete.
+
+        Args:
+            file_path: Path to the file.
+            write: Function that writes the content to the path it receives.
+        """
+
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=file_path.parent, suffix=".tmp")
+        os.close(file_descriptor)
+        try:
+            write(temporary_path)
+            os.replace(temporary_path, file_path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+
+def configure(path: str = None, max_size: int = None, cache_only: bool = None) -> ArtifactCache:
+    """Configures the artifact cache used by download_file. Settings not
+    passed are taken from the app settings.
+
+    Args:
+        path: Path to the cache directory.
+        max_size: Maximum size of the cached files in bytes. 0 disables the
+            cache.
+        cache_only: If True files are never downloaded.
+
+    Returns:
+        The configured cache.
+    """
+
+    global _cache
+
+    _cache = ArtifactCache(path if path else app.settings.artifact_cache_path,
+                           max_size if max_size is not None else app.settings.artifact_cache_max_size,
+                           bool(cache_only))
+    return _cache
+
+
+def get_cache() -> ArtifactCache:
+    """Gets the artifact cache, configuring it from the app settings the first
+    time."""
+    return _cache if _cache is not None else configure()
+
+
+def download_file(url: str, destination: str, save_as: str = None, headers: dict = None, **kwargs) -> tuple:
+    """Downloads a file through the artifact cache.
+
+    Args:
+        url: Where to download the file from.
+        destination: Path to the directory where the file will be saved.
+        save_as: File name to save the file as.
+        headers: Authentication headers.
+        kwargs: version, checksum and checksum_algorithm, as in
+            ArtifactCache.download_file.
+
+    Returns:
+        Tuple with (file name, file path)
+    """
+    return get_cache().download_file(url, destination, save_as, headers, **kwargs)
+
+
+if __name__ == "__main__":
+    help(__name__)
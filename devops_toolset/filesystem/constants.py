@@ -3,6 +3,29 @@
 from enum import Enum
 
 
+# Seconds an artifact downloaded from a URL without a version is served from the cache
+ARTIFACT_CACHE_UNVERSIONED_MAX_AGE = 24 * 60 * 60
+
+# Size of the chunks downloaded files are written in
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Times a download is attempted (resuming it) before giving up when the connection fails
+DOWNLOAD_RETRIES = 3
+
+# Seconds to wait for the server to send data before a download attempt fails
+DOWNLOAD_TIMEOUT = 60
+
+# Compression level for gzip files: lower than the default (9) since large files are written while they are produced
+GZIP_COMPRESS_LEVEL = 6
+
+
+class Compression(Enum):
+    """Defines the supported compression formats by file extension"""
+
+    GZIP = ".gz"
+    ZSTD = ".zst"
+
+
 class Directions(Enum):
     """Defines sorting and finding directions"""
 
@@ -1,36 +1,53 @@
 """Contains paths-related operations."""
 
+import hashlib
 import logging
 import os
 import pathlib
-import requests
 import shutil
+import tools.http_client as http_client
 from core.app import App
+from core.lazy_import import lazy_import
 from core.LiteralsCore import LiteralsCore
 from filesystem.Literals import Literals as FileSystemLiterals
-from filesystem.constants import Directions, FileNames, FileType
+from filesystem.constants import Directions, FileNames, DOWNLOAD_CHUNK_SIZE, DOWNLOAD_RETRIES, \
+    DOWNLOAD_TIMEOUT
 from typing import List, Tuple, Union
 from urllib.parse import urlparse
 
 app: App = App()
+requests = lazy_import("requests")
 platform_specific = app.load_platform_specific("environment")
 literals = LiteralsCore([FileSystemLiterals])
 
 
 # noinspection PyTypeChecker
-def download_file(url: str, destination: str, save_as: str = None, headers: dict = None,
-                  file_type: FileType = FileType.BINARY) -> tuple:
+def download_file(url: str, destination: str, save_as: str = None, headers: dict = None, checksum: str = None,
+                  checksum_algorithm: str = "sha256") -> tuple:
     """Downloads a file from a URL.
 
+    The content is streamed in chunks to a .part file that is renamed when the
+    download is complete, so a failed download never leaves a truncated file
+    with the final name. If the transfer is interrupted it is resumed with an
+    HTTP Range request, also from a .part file left by a previous call. The
+    ETag or Last-Modified validator of the file is kept next to the .part
+    file and sent in an If-Range header, so a file that changed is
+    downloaded again from the start instead of being appended to.
+
     Args:
         url: Where to download the file from.
         destination: Path to the directory where the file will be downloaded.
         save_as: File name to save the downloaded file as.
         headers: Authentication headers.
-        file_type: The type of the file. Defaults to BINARY.
+        checksum: If present, expected hex digest of the file. It is computed
+            while streaming.
+        checksum_algorithm: hashlib algorithm of the checksum (sha256, md5...).
 
     Returns:
         Tuple with (file name, file path)
+
+    Raises:
+        ValueError: If the checksum of the downloaded file does not match.
     """
 
     if not os.path.isdir(destination):
@@ -39,14 +56,110 @@ def download_file(url: str, destination: str, save_as: str = None, headers: dict
     destination_path = pathlib.Path(destination)
     file_name = save_as if save_as else get_file_name_from_url(url)
     full_destination_path = pathlib.Path.joinpath(destination_path, file_name)
+    partial_path = full_destination_path.with_name(f"{file_name}.part")
+    validator_path = full_destination_path.with_name(f"{file_name}.part.validator")
+
+    for attempt in range(1, DOWNLOAD_RETRIES + 1):
+        try:
+            file_hash = _download_to_partial_file(url, partial_path, validator_path, headers,
+                                                  checksum_algorithm if checksum else None)
+            break
+        # A connection dropped in the middle of the body raises ChunkedEncodingError, which is not a ConnectionError
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as error:
+            if attempt == DOWNLOAD_RETRIES:
+                raise
+            logging.warning(literals.get("fs_download_retrying").format(url=url, error=error))
+
+    _remove_if_exists(validator_path)
+    if checksum and file_hash.hexdigest().lower() != checksum.lower():
+        os.remove(partial_path)
+        raise ValueError(literals.get("fs_download_checksum_error").format(
+            url=url, algorithm=checksum_algorithm, expected=checksum, actual=file_hash.hexdigest()))
+
+    os.replace(partial_path, full_destination_path)
 
-    response = requests.get(url, headers=headers) if headers else requests.get(url)
+    return file_name, full_destination_path
 
-    file_mode: str = f"w{file_type.value}"
-    with open(full_destination_path, file_mode) as file:
-        file.write(response.content)
 
-    return file_name, full_destination_path
+def _download_to_partial_file(url: str, partial_path: pathlib.Path, validator_path: pathlib.Path,
+                              headers: dict = None, checksum_algorithm: str = None):
+    """Streams the content of a URL to a .part file, resuming from its
+    current size if it exists, its validator was saved and the file did not
+    change since (the server answers 206 to If-Range).
+
+    Args:
+        url: Where to download the file from.
+        partial_path: Path to the .part file.
+        validator_path: Path to the file where the ETag or Last-Modified
+            validator of the .part file is saved.
+        headers: Authentication headers.
+        checksum_algorithm: If present, hashlib algorithm used to hash the
+            whole file while it is written.
+
+    Returns:
+        The hashlib object with the file content, or None if no algorithm was
+        passed.
+    """
+
+    request_headers = dict(headers) if headers else {}
+    offset = partial_path.stat().st_size if partial_path.is_file() else 0
+    validator = validator_path.read_text() if offset and validator_path.is_file() else None
+    # Without a validator there is no way to know if the .part file belongs to the current file
+    if offset and validator:
+        request_headers["Range"] = f"bytes={offset}-"
+        request_headers["If-Range"] = validator
+
+    with http_client.get(url, headers=request_headers, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+        # 416 means the .part file is not a prefix of the resource anymore, so it is downloaded again
+        if "Range" in request_headers and response.status_code == 416:
+            os.remove(partial_path)
+            _remove_if_exists(validator_path)
+            return _download_to_partial_file(url, partial_path, validator_path, headers, checksum_algorithm)
+        response.raise_for_status()
+
+        resumed = "Range" in request_headers and response.status_code == 206
+        if resumed:
+            logging.info(literals.get("fs_download_resuming").format(url=url, offset=offset))
+        else:
+            _save_validator(response, validator_path)
+
+        file_hash = hashlib.new(checksum_algorithm) if checksum_algorithm else None
+        if file_hash and resumed:
+            with open(partial_path, "rb") as file:
+                for chunk in iter(lambda: file.read(DOWNLOAD_CHUNK_SIZE), b""):
+                    file_hash.update(chunk)
+
+        with open(partial_path, "ab" if resumed else "wb") as file:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                file.write(chunk)
+                if file_hash:
+                    file_hash.update(chunk)
+
+    return file_hash
+
+
+def _remove_if_exists(file_path: pathlib.Path):
+    """Removes a file if it exists."""
+    if file_path.is_file():
+        os.remove(file_path)
+
+
+def _save_validator(response, validator_path: pathlib.Path):
+    """Saves the strong ETag of a download response or, if it has none, its
+    Last-Modified date, so the download can be resumed with If-Range. Weak
+    ETags can not be used to resume a download.
+
+    Args:
+        response: Response of the download request.
+        validator_path: Path to the file where the validator is saved.
+    """
+
+    etag = response.headers.get("ETag")
+    validator = etag if etag and not etag.startswith("W/") else response.headers.get("Last-Modified")
+    if validator:
+        validator_path.write_text(validator)
+    else:
+        _remove_if_exists(validator_path)
 
 
 def files_exist(path: str, file_names: List[str]) -> List[Tuple[str, bool]]:
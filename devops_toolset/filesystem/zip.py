@@ -1,18 +1,25 @@
 """Supports al compression / decompression operations in the file system."""
 
 from core.app import App
+from core.CommandsCore import CommandsCore
 from core.LiteralsCore import LiteralsCore
 from filesystem.Literals import Literals as FileSystemLiterals
+from tools.commands import Commands as ToolsCommands
+from typing import BinaryIO, Iterator, Union
+import contextlib
 import filesystem.constants as constants
 import filesystem.paths
+import gzip
 import logging
 import os
 import pathlib
 import shutil
+import subprocess
 import zipfile
 
 app: App = App()
 literals = LiteralsCore([FileSystemLiterals])
+commands = CommandsCore([ToolsCommands])
 
 
 def download_an_unzip_file(url: str, destination: str, delete_after_unzip: bool = True, unzip_root: str = None):
@@ -26,7 +33,7 @@ def download_an_unzip_file(url: str, destination: str, delete_after_unzip: bool
             directory.
     """
 
-    file_name, file_path = filesystem.paths.download_file(url, destination, constants.FileType.BINARY)
+    file_name, file_path = filesystem.paths.download_file(url, destination)
     destination_path = pathlib.Path(destination)
     temp_extraction_path = pathlib.Path.joinpath(destination_path, constants.FileNames.TEMP_DIRECTORY)
 
@@ -48,6 +55,68 @@ def download_an_unzip_file(url: str, destination: str, delete_after_unzip: bool
         os.remove(file_path)
 
 
+def get_compression(file_path: str) -> Union[constants.Compression, None]:
+    """Gets the compression format of a file from its extension.
+
+    Args:
+        file_path: Path to the file.
+
+    Returns:
+        The compression format or None if the file is not compressed.
+    """
+
+    suffix = pathlib.Path(file_path).suffix.lower()
+    for compression in constants.Compression:
+        if compression.value == suffix:
+            return compression
+    return None
+
+
+@contextlib.contextmanager
+def open_compressed(file_path: str, mode: str, compression: constants.Compression = None) -> Iterator[BinaryIO]:
+    """Opens a file to read or write it as a binary stream, compressing or
+    decompressing it on the fly. Uncompressed files are opened as they are.
+
+    gzip files are handled by the gzip module and zstd files are piped through
+    the zstd command, which must be in the PATH.
+
+    Args:
+        file_path: Path to the file.
+        mode: rb to read or wb to write.
+        compression: Compression format. If not present, it is obtained from
+            the file extension (see get_compression).
+
+    Yields:
+        Binary stream with the uncompressed content.
+
+    Raises:
+        OSError: If the zstd command fails.
+    """
+
+    if compression is None:
+        compression = get_compression(file_path)
+
+    if compression is None:
+        with open(file_path, mode) as file:
+            yield file
+    elif compression == constants.Compression.GZIP:
+        with gzip.open(file_path, mode, compresslevel=constants.GZIP_COMPRESS_LEVEL) as file:
+            yield file
+    else:
+        reading = mode.startswith("r")
+        command = commands.get("zstd_decompress" if reading else "zstd_compress").format(path=file_path)
+        process = subprocess.Popen(command, shell=True, stdin=None if reading else subprocess.PIPE,
+                                   stdout=subprocess.PIPE if reading else None)
+        pipe = process.stdout if reading else process.stdin
+        try:
+            with pipe:
+                yield pipe
+        finally:
+            return_code = process.wait()
+        if return_code != 0:
+            raise OSError(literals.get("fs_zstd_error").format(command=command, code=return_code))
+
+
 def zip_directory(directory_path: str, file_path, internal_path_prefix: str = ""):
     """Creates a ZIP file of the contents of the specified directory path.
 
@@ -69,7 +69,8 @@ def install(folder: str = ""):
         folder=folder,
     ), log_before_out=[literals.get("npm_install_before")],
      log_after_out=[literals.get("npm_install_after")],
-     log_after_err=[literals.get("npm_install_error")])
+     log_after_err=[literals.get("npm_install_error")],
+     stream=True)
 
 
 if __name__ == "__main__":
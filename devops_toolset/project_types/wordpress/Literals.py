@@ -17,6 +17,7 @@ class Literals(ValueDictsBase):
         "wp_title_wordpress_rollback_db": _("WordPress\ndatabase rollback"),
     }
     _info = {
+        "wp_config_rendered": _("File {path} rendered with {count} settings."),
         "wp_created_project_structure": _("Finished creation of the project structure."),
         "wp_creating_project_structure": _("Starting to create the project structure."),
         "wp_created_theme_structure": _("Finished creation of the development theme {theme_name} structure."),
@@ -27,6 +28,13 @@ class Literals(ValueDictsBase):
                                                    "{file_name}"),
         "wp_theme_structure_creating_from_default_file": _("Creating default development theme structure from "
                                                    "{resource}"),
+        "wp_db_provisioned": _("{count} databases and users provisioned on {server}."),
+        "wp_db_provisioning": _("Creating databases {schemas} and users {users} on {server} (if they do not exist) "
+                                "and granting their privileges..."),
+        "wp_db_tables_exported": _("{count} tables exported to {path} in {seconds:.1f}s."),
+        "wp_db_tables_exporting": _("Exporting {count} tables to {path} ({workers} at a time)..."),
+        "wp_db_tables_imported": _("{count} tables imported from {path} in {seconds:.1f}s."),
+        "wp_db_tables_importing": _("Importing {count} tables from {path} ({workers} at a time)..."),
         "wp_default_files": _("These are the default files from the GitHub repository:"),
         "wp_directory_created": _("Directory created: {directory}"),
         "wp_environment_file_used": _("The following environment file will be used: {file}"),
@@ -46,6 +54,9 @@ class Literals(ValueDictsBase):
         "wp_root_path": _("The root path is: {path}"),
         "wp_themes_install_manually": _("Please, install the theme/s manually."),
         "wp_plugin_path": _("The plugin path is: {path}"),
+        "wp_prefetch_done": _("{count} plugins / themes downloaded."),
+        "wp_prefetch_downloading": _("Downloading {count} plugins / themes ({workers} at the same time)..."),
+        "wp_plugin_dump_not_changed": _("Plugin {plugin_name} did not change the database. Skipping its dump..."),
         "wp_theme_path": _("The theme path is: {path}"),
         "wp_themes_path": _("The themes path is: {path}"),
         "wp_use_default_files": _("Do you want me to use the default ones instead for those missing files?"),
@@ -55,13 +66,9 @@ class Literals(ValueDictsBase):
         "wp_wpcli_config_created_ok": _("File wp-config.php created successfully."),
         "wp_wpcli_core_install_before": _("Preparing wordpress core files to install..."),
         "wp_wpcli_creating_config": _("Creating wp-config.php..."),
-        "wp_wpcli_db_create_before":
-            _("Creating Wordpress database (by default, user_name and host will be taken from wp_config)"),
         "wp_wpcli_db_import_before": _("Importing database dump from file:"),
         "wp_wpcli_db_export_before": _("Exporting database dump to: {path}"),
-        "wp_wpcli_db_query_user_creating": _("Creating database user {user} for host {host}"),
-        "wp_wpcli_db_query_user_granting": _("Granting database user {user} for host {host} the following privileges "
-                                             "on schema {schema}: {privileges}"),
+        "wp_wpcli_db_export_compressed": _("Database dump exported to {path} ({size} bytes)."),
         "wp_wpcli_db_reset_before": _("Resetting the database (drop and create)..."),
         "wp_wpcli_delete_transients": _("Transients are going to be deleted"),
         "wp_wpcli_downloading": _("Downloading WP-CLI from {url}"),
@@ -72,16 +79,28 @@ class Literals(ValueDictsBase):
         "wp_wpcli_export": _("Exporting WordPress content to {path}"),
         "wp_wpcli_import_after": _("{type} content imported successfully. "),
         "wp_wpcli_import_before": _("Importing {type} content..."),
+        "wp_wpcli_import_incremental": _("Content of type {type}: {new} new, {changed} changed, {unchanged} "
+                                         "unchanged and {deleted} posts to be deleted."),
+        "wp_wpcli_import_incremental_nothing": _("Content of type {type} is up to date. Nothing to import."),
         "wp_wpcli_import_error": _("There was an error when importing {type} content..."),
         "wp_wpcli_info": _("Here is the WP-CLI information:"),
         "wp_wpcli_install_ok": _("WP-CLI installation was successful."),
         "wp_wpcli_option_add_before": _("Adding database option {option_name}..."),
+        "wp_wpcli_option_bulk_before": _("Applying {count} database option changes ({added} added, {updated} "
+                                         "updated)..."),
+        "wp_wpcli_option_bulk_no_changes": _("Database options are up to date. Nothing to apply."),
         "wp_wpcli_option_update_before": _("Updating database option {option_name}..."),
         "wp_wpcli_option_skipping": _("Skipping option update for {option_name} since the new value is the same as the "
                                       "existing one."),
         "wp_wpcli_plugin_install_before": _("Installing plugin {plugin_name}..."),
         "wp_wpcli_plugin_install_error": _("An error occurred installing plugin {plugin_name}..."),
         "wp_wpcli_post_delete_post_type_before": _("Deleting posts of type {post_type}..."),
+        "wp_wpcli_post_delete_post_type_chunk": _("Deleted {deleted} posts of type {post_type} so far ({rate:.1f} "
+                                                  "posts/s)."),
+        "wp_wpcli_post_delete_post_type_done": _("Deleted {deleted} posts of type {post_type} in {seconds:.1f}s."),
+        "wp_wpcli_query_cache_statistics": _("WP-CLI query cache: {hits} calls saved, {misses} queries run."),
+        "wp_wpcli_session_closed": _("WP-CLI session closed after running {count} commands."),
+        "wp_wpcli_session_starting": _("Starting WP-CLI session for {path}..."),
         "wp_wpcli_setting_value_ok": _("Config value {name} set as {value}"),
         "wp_wpcli_theme_install_before": _("Installing wordpress theme {theme_name}"),
         "wp_wpcli_user_creating": _("Creating WordPress user {user}..."),
@@ -91,14 +110,18 @@ class Literals(ValueDictsBase):
         "wp_gulp_build_after": _("Gulp build task has completed successfully for theme {theme_slug}."),
     }
     _warnings = {
-        "mysql_user_exists_grant_privileges_manually": _("User {user} exists in the {host} host and will not be "
-                                                         "altered. Please grant the following privileges manually to "
-                                                         "{host} for this user in the {schema} schema: "
-                                                         "(db privileges) {db_privileges}; "
-                                                         "(global privileges) {global_privileges};"),
-        "mysql_db_exists_skipping_creation": _("Database {schema} exists. I will not create any database..."),
+        "wp_constants_offline": _("WordPress constants could not be downloaded ({error}). Using a local "
+                                  "copy..."),
+        "wp_timezone_unknown": _("Timezone {timezone} is unknown. Dates will be formatted in UTC."),
+        "wp_wpcli_db_fingerprint_error": _("Database changes could not be detected. A dump will be exported after "
+                                           "every plugin."),
         "wp_wpcli_export_db_skipping_as_set": _("I am skipping the {dump} database dump as configured in settings..."),
+        "wp_wpcli_import_incremental_fallback": _("Posts of type {type} could not be listed. All the content will be "
+                                                  "deleted and imported again."),
+        "wp_wpcli_session_fallback": _("WP-CLI session is not available ({error}). Every command will run in its own "
+                                       "process."),
         "wp_wpcli_user_exists": _("User {user} already exists. Skipping user creation..."),
+        "wp_wpcli_user_list_error": _("WordPress users could not be listed. Users will be created one by one."),
     }
     _errors = {
         "wp_checking_devops_toolset": _("Checking for devops-toolset in: {path}"),
@@ -106,6 +129,15 @@ class Literals(ValueDictsBase):
         "wp_config_file_only_one_activated_theme": _("You can only activate one theme and there are {number} themes "
                                                      "marked to be activated. Please, check the configuration file."),
         "wp_current_version": _("Current version: {version}"),
+        "wp_db_privileges_err": _("Invalid database privileges: {privileges}"),
+        "wp_db_provisioning_err": _("Databases and users could not be provisioned on {server}."),
+        "wp_db_setup_err": _("Databases could not be created. WordPress cannot be installed without them."),
+        "wp_db_table_export_err": _("Table {table} could not be exported."),
+        "wp_db_table_import_err": _("Table {table} could not be imported."),
+        "wp_db_tables_err": _("Database tables could not be listed."),
+        "wp_db_tables_need_table_dump": _("Tables can only be restored from a dump with a file per table, not from "
+                                          "{path}."),
+        "wp_db_tables_not_in_dump": _("Tables not found in the dump: {tables}"),
         "wp_devops_toolset_needs_update": _("devops-toolset needs to be updated."),
         "wp_devops_toolset_not_found": _("devops-toolset not found in required path: {path} "),
         "wp_devops_toolset_obtained": _("devops-toolset has been successfully downloaded on: {path}"),
@@ -127,6 +159,7 @@ class Literals(ValueDictsBase):
         "wp_required_files_mandatory": _("Required files are mandatory. I cannot continue."),
         "wp_required_files_not_found": _("The required files where not found at {path}."),
         "wp_required_files_not_found_detail": _("The following required files where not found at {path}:"),
+        "wp_prefetch_error": _("{name} could not be downloaded: {error}"),
         "wp_theme_path_not_exist": _("The following theme path does not exist: {path}"),
         "wp_theme_feed_no_info": _("The {theme} theme has a source type of feed, but it has no feed configuration. "
                                    "Please, check the configuration file."),
@@ -138,19 +171,27 @@ class Literals(ValueDictsBase):
                                                       "Skipping download..."),
         "wp_wpcli_db_export_error": _("Database dump could not be exported due to an error."),
         "wp_wpcli_db_import_error": _("Dump file could not be imported due to an error."),
-        "wp_wpcli_db_query_user_creating_err": _("Database user {user} for host {host} could not be created"),
-        "wp_wpcli_db_query_user_granting_err": _("Privileges could not be granted to database user {user} for host "
-                                                 "{host} on schema {schema}"),
         "wp_wpcli_db_reset_error": _("Database could not be reset due to an error."),
         "wp_wpcli_delete_transients_err": _("Transients could not be deleted"),
         "wp_wpcli_downloading_wordpress_err": _("WordPress core files could not be downloaded."),
         "wp_wpcli_export_err": _("WordPress content could not be exported to {path}"),
         "wp_wpcli_option_add_error":
             _("Database option {option_name} cannot be added due to an error."),
+        "wp_wpcli_option_bulk_error": _("Database option changes could not be applied due to an error."),
+        "wp_wpcli_option_list_error": _("Database options could not be listed. Options will be added or updated one "
+                                        "by one."),
         "wp_wpcli_option_update_error":
             _("Database option {option_name} cannot be set to {option_value} due to an error."),
         "wp_wpcli_plugin_install_err": _("Plugin {plugin_name} could not be installed due to an error."),
+        "wp_wpcli_post_delete_err": _("Unable to delete posts due to an error."),
+        "wp_wpcli_post_modified_err": _("Unable to set the modification date of the imported posts."),
         "wp_wpcli_post_delete_post_type_err": _("Unable to delete content from type {post_type} due to an error."),
+        "wp_wpcli_post_delete_post_type_stalled_err": _("Posts of type {post_type} are not being deleted. Stopping "
+                                                        "after {deleted} deleted posts."),
+        "wp_wpcli_session_closed_err": _("WP-CLI session process is not running."),
+        "wp_wpcli_session_start_err": _("WP-CLI session could not be started for {path}."),
+        "wp_wpcli_session_write_lost_err": _("WP-CLI session ended while running a command that may change the "
+                                             "site. It is not run again, so it is not applied twice."),
         "wp_wpcli_user_creating_err": _("An error occurred creating the user {user}."),
         "wp_src_theme_not_found": _("Create development theme was called but no src themes found. Please check your "
                                     "themes configuration and try again."),
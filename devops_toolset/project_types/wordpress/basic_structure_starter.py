@@ -4,7 +4,7 @@ import filesystem.paths as path_tools
 import logging
 import os
 import pathlib
-import requests
+import tools.http_client as http_client
 from core.app import App
 from core.LiteralsCore import LiteralsCore
 from project_types.wordpress.Literals import Literals as WordpressLiterals
@@ -101,5 +101,5 @@ class BasicStructureStarter(object):
                 file="",
                 source=f"URL => {item['source']}"
             ))
-            response = requests.get(item["value"])
+            response = http_client.get(item["value"])
             return response.content if is_binary else response.text
@@ -11,6 +11,7 @@ class Commands(ValueDictsBase):
 
     # Add your wordpress literal dictionaries here
     _commands = {
+        "mysql_script": "mysql --host={host} {connection} --user={admin_user} --password={admin_password} --batch",
         "wpcli_config_create": "wp config create --path={path} --dbhost={db_host} --dbname={db_name} "
                                "--dbuser={db_user} --dbpass={db_pass} --dbprefix={db_prefix} --dbcharset={db_charset} "
                                "--dbcollate={db_collate} --force {skip_check} {debug_info}",
@@ -21,31 +22,42 @@ class Commands(ValueDictsBase):
         "wpcli_core_install": "wp core install --path={path} --url={url} --title=\"{title}\" --admin_user={admin_user} "
                               "--admin_email={admin_email} {admin_password} {skip_email} {debug_info}",
         "wpcli_core_version": "wp core version --path={path}",
-        "wpcli_db_create": "wp db create {db_user} {db_pass} --path={path} {debug_info}",
-        "wpcli_db_export": "wp db export \"{core_dump_path}\" --path={path} --extended-insert=false {debug_info}",
+        "wpcli_db_export": "wp db export \"{core_dump_path}\" --path={path} --extended-insert={extended_insert} "
+                           "{debug_info}",
+        "wpcli_db_export_stdout": "wp db export - --path={path} --extended-insert={extended_insert} {debug_info}",
+        "wpcli_db_export_table_data": "wp db export - --tables={table} --no-create-info --extended-insert=true "
+                                      "--path={path} {debug_info}",
+        "wpcli_db_export_table_schema": "wp db export - --tables={table} --no-data --path={path} {debug_info}",
+        "wpcli_db_query_checksum": "wp db query \"checksum table {tables}\" --skip-column-names --path={path} "
+                                   "{debug_info}",
+        "wpcli_db_query_schema": "wp db query \"select table_name, column_name, column_type, column_key from "
+                                 "information_schema.columns where table_schema = database() order by table_name, "
+                                 "ordinal_position\" --skip-column-names --path={path} {debug_info}",
+        "wpcli_db_tables": "wp db tables --all-tables-with-prefix --format=csv --path={path} {debug_info}",
         "wpcli_db_reset": "wp db reset --path={path} {yes} {debug_info}",
         "wpcli_db_import": "wp db import {file} --path={path} {debug_info}",
+        "wpcli_db_import_stdin": "wp db import - --path={path} {debug_info}",
         "wpcli_db_delete_transient": "wp transient delete --all --path={path}",
-        "wpcli_db_query_create_user":
-            "wp db query \"create user '{user}'@'{host}' identified by '{password}'\" "
-            "--dbuser={admin_user} --dbpass={admin_password} --path={path}",
-        "wpcli_db_query_db_exists": "wp db query \"select exists (select 1 from information_schema.schemata where "
-                                    "schema_name = '{schema}')\" --dbuser={admin_user} --dbpass={admin_password} "
-                                      "--path={path}",
-        "wpcli_db_query_grant": "wp db query \"grant {privileges} on {schema}.* to '{user}'@'{host}'\" "
-            "--dbuser={admin_user} --dbpass={admin_password} --path={path}",
-        "wpcli_db_query_user_exists": "wp db query \"select exists (select 1 from mysql.user where user='{user}')\" "
-                                      "--dbuser={admin_user} --dbpass={admin_password} "
-                                      "--path={path}",
         "wpcli_post_list_ids": "wp post list --post_type={post_type} --path={path} --format=ids",
+        "wpcli_post_list_ids_chunk": "wp post list --post_type={post_type} --posts_per_page={chunk_size} --path={path} "
+                                     "--format=ids",
         "wpcli_post_delete_post_type": "wp post delete {id_list} --force --path={path} {debug_info}",
+        "wpcli_post_list_wxr": "wp post list --post_type={post_types} --post_status=any --posts_per_page=-1 "
+                               "--fields=ID,guid,post_type,post_title,post_date_gmt,post_modified_gmt --format=json "
+                               "--path={path} {debug_info}",
+        "wpcli_post_delete_post_type_sql": "wp eval-file \"{script}\" {post_type} --path={path} {debug_info}",
         "wpcli_eval": "wp eval \"{php_code}\" --path={path}",
+        "wpcli_eval_file_post_modified": "wp eval-file \"{script}\" \"{posts_file}\" --path={path} {debug_info}",
+        "wpcli_eval_file_options": "wp eval-file \"{script}\" \"{changes_file}\" --path={path} {debug_info}",
+        "wpcli_eval_file_session": "wp eval-file \"{script}\" --path=\"{path}\"",
         "wpcli_export": "wp export --path=\"{path}\" --dir=\"{destination_path}\" "
                         "--filename_format={date}_UTC-content{suffix}.xml",
         "wpcli_import": "wp import \"{file}\" --authors={authors} --path=\"{path}\" {debug_info}",
         "wpcli_info": "wp --info",
         "wpcli_option_add": "wp option add {option_name} \"{option_value}\" {autoload} --path={path} {debug_info}",
         "wpcli_option_get": "wp option get {option_name} --path={path} {debug_info}",
+        "wpcli_option_list": "wp option list --no-transients --fields=option_name,option_value "
+                             "--format=json --path={path} {debug_info}",
         "wpcli_option_update": "wp option update {option_name} \"{option_value}\" {autoload} "
                                "--path={path} {debug_info}",
         "wpcli_plugin_install": "wp plugin install {source} --path={path} {force} {activate} {debug_info}",
@@ -56,5 +68,7 @@ class Commands(ValueDictsBase):
             "gulp watch --theme-slug=\"{theme_slug}\" --dev-proxy=\"{local_web_server}\" --wordpress-path=\"{path}\"",
         "wp_user_create": "wp user create {user_login} {user_email} "
                           "{role} {display_name} {first_name} {last_name} {send_email} --path={path} {debug_info}",
+        "wp_user_create_bulk": "wp eval-file \"{script}\" \"{users_file}\" --path={path} {debug_info}",
+        "wp_user_list": "wp user list --fields=user_login --format=json --path={path} {debug_info}",
         "wp_user_get": "wp user get {user_login} --format=json --path={path} {debug_info}"
     }
@@ -1,12 +1,51 @@
 """Defines constants for the module."""
 
+from enum import Enum
+
+
+class PluginDumps(Enum):
+    """Defines when database dumps are exported while installing plugins.
+
+    Attributes:
+        EACH: After every plugin.
+        INTERVAL: After every N plugins and after the last one.
+        END: Only after the last plugin.
+        SCHEMA: After every plugin that changed the database schema.
+        CHANGES: After every plugin that changed the database schema or data.
+        NONE: Never.
+    """
+
+    EACH = "each"
+    INTERVAL = "interval"
+    END = "end"
+    SCHEMA = "schema"
+    CHANGES = "changes"
+    NONE = "none"
+
+
 required_files_suffixes = {
     "site_configuration_file_path": "site.json"
 }
 
+# Number of plugins / themes downloaded at the same time when prefetching them
+prefetch_max_workers = 4
+
+# Number of posts deleted by every wp post delete call when deleting a post type content
+post_delete_chunk_size = 500
+
+# Seconds the result of a read-only WP-CLI query is reused (see wp_cli_cache)
+wpcli_query_cache_ttl = 300
+
+# Database dumps with a file per table (see database.export_tables)
+table_dump_suffix = ".tables"
+table_dump_manifest_file_name = "manifest.json"
+table_dump_max_workers = 4
+
 theme_metadata_parse_regex = ": (.+)"
 functions_php_mytheme_regex = "(mytheme)(?=_[\w\d\sáéíóú'-.])"
 
 wordpress_constants_json_resource = \
     "https://raw.githubusercontent.com/aheadlabs/devops-toolset/master/" \
     "devops_toolset/project_types/wordpress/wordpress-constants.json"
+# Name of the copies of the WordPress constants shipped with the toolset and kept in the artifact cache
+wordpress_constants_json_file_name = "wordpress-constants.json"
@@ -0,0 +1,424 @@
+"""Database tools for large and many databases.
+
+WP-CLI runs every `wp db query` in its own process and needs a database to
+connect to, so the databases and users of a site are provisioned with a
+single idempotent script run by the mysql client instead:
+
+    database.provision([DatabaseUser("wp_db", "wp_db_user", password)], "localhost", "root", admin_password)
+
+Large databases can be dumped to a directory with a file per table and a
+manifest (a table dump, see constants.table_dump_suffix). Its tables are
+exported and imported by a pool of workers at the same time, and they can be
+imported one by one:
+
+    database.export_tables(wordpress_path, "dumps/db.tables")
+    database.import_tables(wordpress_path, "dumps/db.tables", tables=["wp_options"])
+"""
+
+import concurrent.futures
+import contextlib
+import datetime
+import io
+import json
+import logging
+import os
+import pathlib
+import re
+import time
+import filesystem.zip
+import project_types.wordpress.constants as wp_constants
+import project_types.wordpress.wp_cli as wp_cli
+import project_types.wordpress.wp_cli_cache as wp_cli_cache
+import tools.cli as cli
+from core.app import App
+from core.CommandsCore import CommandsCore
+from core.LiteralsCore import LiteralsCore
+from filesystem.constants import Compression
+from project_types.wordpress.Literals import Literals as WordpressLiterals
+from project_types.wordpress.commands import Commands as WordpressCommands
+from typing import BinaryIO, List, NamedTuple, Tuple, Union
+
+app: App = App()
+literals = LiteralsCore([WordpressLiterals])
+commands = CommandsCore([WordpressCommands])
+
+# Privileges of the WordPress database users, on their database and globally
+DB_PRIVILEGES = "create, alter, select, insert, update, delete"
+GLOBAL_PRIVILEGES = "lock tables, process"
+
+_privileges_regex = re.compile(r"[a-z ]+(,[a-z ]+)*", re.IGNORECASE)
+_create_table_regex = re.compile(r"CREATE TABLE (`[^`]+`) \($")
+_secondary_index_regex = re.compile(r"\s+((UNIQUE |FULLTEXT |SPATIAL )?KEY `.*?),?$")
+
+
+class DatabaseUser(NamedTuple):
+    """Database and user that can access it"""
+    schema: str
+    user: str
+    password: str
+    host: str = "localhost"
+    db_privileges: str = DB_PRIVILEGES
+    global_privileges: str = GLOBAL_PRIVILEGES
+
+
+class ChainedReader(object):
+    """Binary stream that reads several binary streams one after another"""
+
+    def __init__(self, streams: List[BinaryIO]):
+        """
+        Args:
+            streams: Streams to be read, in order.
+        """
+
+        self._streams = list(streams)
+
+    def read(self, size: int = -1) -> bytes:
+        """Reads up to size bytes (all if size is negative) from the current
+        stream, moving to the next one when it ends."""
+
+        while self._streams:
+            chunk = self._streams[0].read(size)
+            if chunk:
+                return chunk
+            self._streams.pop(0)
+        return b""
+
+
+def export_tables(wordpress_path: str, dump_path: str, compression: Compression = None,
+                  max_workers: int = wp_constants.table_dump_max_workers, debug: bool = False) -> bool:
+    """Exports a WordPress database to a table dump: a directory with the
+    schema, the data and the secondary indexes of every table in separate
+    files, and a manifest that is written last, once every table is
+    exported.
+
+    Tables are exported by max_workers WP-CLI processes at the same time, so
+    they are not a consistent snapshot if the database is being written.
+
+    Args:
+        wordpress_path: Path to WordPress files.
+        dump_path: Path to the dump directory.
+        compression: Compression of the data files.
+        max_workers: Number of tables exported at the same time.
+        debug: If True, --debug will be added to the WP-CLI commands.
+
+    Returns:
+        True if every table was exported.
+    """
+
+    tables = wp_cli.get_database_tables(wordpress_path, debug)
+    if not tables:
+        logging.error(literals.get("wp_db_tables_err"))
+        return False
+
+    start = time.perf_counter()
+    pathlib.Path(dump_path).mkdir(parents=True, exist_ok=True)
+    logging.info(literals.get("wp_db_tables_exporting").format(count=len(tables), path=dump_path,
+                                                               workers=max_workers))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        entries = list(executor.map(lambda table: _export_table(wordpress_path, dump_path, table, compression, debug),
+                                    tables))
+    if None in entries:
+        return False
+
+    manifest = {"version": 1, "created": datetime.datetime.utcnow().isoformat(timespec="seconds"),
+                "compression": compression.value if compression else None, "tables": entries}
+    manifest_path = pathlib.Path.joinpath(pathlib.Path(dump_path), wp_constants.table_dump_manifest_file_name)
+    with open(f"{manifest_path}.part", "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    os.replace(f"{manifest_path}.part", manifest_path)
+
+    logging.info(literals.get("wp_db_tables_exported").format(count=len(entries), path=dump_path,
+                                                              seconds=time.perf_counter() - start))
+    return True
+
+
+def get_manifest(dump_path: str) -> dict:
+    """Gets the manifest of a table dump.
+
+    Args:
+        dump_path: Path to the dump directory.
+
+    Raises:
+        FileNotFoundError: If the dump has no manifest (e.g. its export
+            failed).
+    """
+
+    manifest_path = pathlib.Path.joinpath(pathlib.Path(dump_path), wp_constants.table_dump_manifest_file_name)
+    with open(manifest_path, "r") as manifest_file:
+        return json.load(manifest_file)
+
+
+def get_provisioning_script(database_users: List[DatabaseUser]) -> str:
+    """Gets a SQL script that creates databases and users if they do not
+    exist and grants the users their privileges. It can be run many times.
+
+    Args:
+        database_users: Databases and their users.
+
+    Raises:
+        ValueError: If the privileges are not a comma-separated list of
+            privilege names.
+    """
+
+    statements = []
+    for database_user in database_users:
+        for privileges in (database_user.db_privileges, database_user.global_privileges):
+            if not _privileges_regex.fullmatch(privileges):
+                raise ValueError(literals.get("wp_db_privileges_err").format(privileges=privileges))
+
+        account = f"{quote_string(database_user.user)}@{quote_string(database_user.host)}"
+        statements += [
+            f"CREATE DATABASE IF NOT EXISTS {quote_identifier(database_user.schema)};",
+            f"CREATE USER IF NOT EXISTS {account} IDENTIFIED BY {quote_string(database_user.password)};",
+            f"GRANT {database_user.db_privileges} ON {quote_identifier(database_user.schema)}.* TO {account};",
+            f"GRANT {database_user.global_privileges} ON *.* TO {account};",
+        ]
+    return "\n".join(statements) + "\n"
+
+
+def import_tables(wordpress_path: str, dump_path: str, tables: List[str] = None,
+                  max_workers: int = wp_constants.table_dump_max_workers, debug: bool = False) -> bool:
+    """Imports the tables of a table dump, replacing them if they exist.
+
+    Every table is imported by a WP-CLI process: its schema without the
+    secondary indexes, its data and then its secondary indexes, which are
+    built once instead of being updated on every insert. max_workers tables
+    are imported at the same time, largest first.
+
+    Args:
+        wordpress_path: Path to WordPress files.
+        dump_path: Path to the dump directory.
+        tables: Names of the tables to be imported. All by default.
+        max_workers: Number of tables imported at the same time.
+        debug: If True, --debug will be added to the WP-CLI commands.
+
+    Returns:
+        True if every table was imported.
+
+    Raises:
+        ValueError: If some of the tables are not in the dump.
+    """
+
+    manifest = get_manifest(dump_path)
+    entries = manifest["tables"]
+    if tables is not None:
+        missing_tables = set(tables).difference(entry["name"] for entry in entries)
+        if missing_tables:
+            raise ValueError(literals.get("wp_db_tables_not_in_dump").format(tables=", ".join(sorted(missing_tables))))
+        entries = [entry for entry in entries if entry["name"] in tables]
+
+    compression = Compression(manifest["compression"]) if manifest["compression"] else None
+    # Largest first, so the pool does not end up importing a large table alone
+    entries = sorted(entries, key=lambda entry: entry["size"], reverse=True)
+
+    start = time.perf_counter()
+    logging.info(literals.get("wp_db_tables_importing").format(count=len(entries), path=dump_path,
+                                                               workers=max_workers))
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(
+                lambda entry: _import_table(wordpress_path, dump_path, entry, compression, debug), entries))
+    finally:
+        # The tables were replaced, so no cached query result is valid anymore
+        wp_cli_cache.invalidate(commands.get("wpcli_db_import_stdin"))
+
+    if not all(results):
+        return False
+    logging.info(literals.get("wp_db_tables_imported").format(count=len(entries), path=dump_path,
+                                                              seconds=time.perf_counter() - start))
+    return True
+
+
+def is_table_dump(dump_path: str) -> bool:
+    """Determines if a dump path is a table dump (a directory with a file per
+    table), from its suffix (see constants.table_dump_suffix)."""
+    return pathlib.Path(dump_path).suffix == wp_constants.table_dump_suffix
+
+
+def provision(database_users: List[DatabaseUser], server: str, admin_user: str, admin_password: str) -> bool:
+    """Creates databases and users that do not exist and grants the users
+    their privileges, running a single script in a single mysql process.
+
+    Args:
+        database_users: Databases and their users.
+        server: Database server host, as in DB_HOST (host, host:port or
+            host:/path/to/socket).
+        admin_user: Database user with privileges to create databases and
+            other users.
+        admin_password: Admin user password.
+
+    Returns:
+        True if the script succeeded.
+    """
+
+    host, connection = split_server(server)
+    script = get_provisioning_script(database_users)
+    return_code = cli.pipe_subprocess(
+        commands.get("mysql_script").format(host=host, connection=connection, admin_user=admin_user,
+                                            admin_password=admin_password),
+        stdin=io.BytesIO(script.encode("utf-8")),
+        log_before_process=[literals.get("wp_db_provisioning").format(
+            schemas=", ".join(database_user.schema for database_user in database_users),
+            users=", ".join(database_user.user for database_user in database_users), server=server)],
+        log_after_err=[literals.get("wp_db_provisioning_err").format(server=server)])
+
+    if return_code != 0:
+        return False
+    logging.info(literals.get("wp_db_provisioned").format(count=len(database_users), server=server))
+    return True
+
+
+def quote_identifier(name: str) -> str:
+    """Quotes a MySQL identifier (database, table...)."""
+    return "`" + name.replace("`", "``") + "`"
+
+
+def quote_string(value: str) -> str:
+    """Quotes a MySQL string literal."""
+    return "'" + value.replace("\\", "\\\\").replace("'", "''") + "'"
+
+
+def split_secondary_indexes(schema: str) -> Tuple[str, str]:
+    """Removes the secondary indexes from the CREATE TABLE statement of a
+    table schema dump, so they can be built after its data is imported.
+
+    Tables with foreign keys are kept as they are, since their constraints
+    may need the indexes.
+
+    Args:
+        schema: Table schema, as exported by mysqldump --no-data.
+
+    Returns:
+        The schema without secondary indexes and the ALTER TABLE statements
+        that add them (empty if there are none).
+    """
+
+    if re.search(r"^\s+CONSTRAINT ", schema, re.MULTILINE):
+        return schema, ""
+
+    lines = []
+    table = None
+    in_create_table = False
+    indexes = []
+    for line in schema.splitlines():
+        create_table = _create_table_regex.match(line)
+        secondary_index = _secondary_index_regex.fullmatch(line) if in_create_table else None
+        if create_table:
+            table = create_table.group(1)
+            in_create_table = True
+        elif secondary_index:
+            indexes.append(secondary_index.group(1))
+            continue
+        elif in_create_table and line.startswith(")"):
+            lines[-1] = lines[-1].rstrip(",")
+            in_create_table = False
+        lines.append(line)
+
+    if not indexes:
+        return schema, ""
+
+    # InnoDB builds a single FULLTEXT / SPATIAL index per statement
+    grouped_indexes = [index for index in indexes if index.startswith(("KEY", "UNIQUE"))]
+    statements = [f"ALTER TABLE {table} {', '.join(f'ADD {index}' for index in grouped_indexes)};"] \
+        if grouped_indexes else []
+    statements += [f"ALTER TABLE {table} ADD {index};" for index in indexes if index not in grouped_indexes]
+    return "\n".join(lines) + "\n", "\n".join(statements) + "\n"
+
+
+def split_server(server: str) -> Tuple[str, str]:
+    """Splits a DB_HOST value into the host and the mysql client argument
+    for its port or socket, if any.
+
+    Args:
+        server: Database server host (host, host:port or
+            host:/path/to/socket).
+
+    Returns:
+        The host and the --port or --socket argument (empty if none).
+    """
+
+    host, separator, port_or_socket = server.partition(":")
+    if not port_or_socket:
+        return host, ""
+    if port_or_socket.isdigit():
+        return host, f"--port={port_or_socket}"
+    return host, f"--socket={port_or_socket}"
+
+
+def _export_table(wordpress_path: str, dump_path: str, table: str, compression: Union[Compression, None],
+                  debug: bool) -> Union[dict, None]:
+    """Exports the schema, the data and the secondary indexes of a table to
+    their files.
+
+    Returns:
+        The manifest entry of the table, or None if it was not exported.
+    """
+
+    debug_info = wp_cli.convert_wp_parameter_debug(debug)
+    schema = io.BytesIO()
+    return_code = cli.pipe_subprocess(
+        commands.get("wpcli_db_export_table_schema").format(table=table, path=wordpress_path, debug_info=debug_info),
+        stdout=schema, log_after_err=[literals.get("wp_db_table_export_err").format(table=table)])
+    if return_code != 0:
+        return None
+
+    entry = {"name": table, "schema": f"{table}.schema.sql",
+             "data": f"{table}.data.sql{compression.value if compression else ''}", "indexes": f"{table}.indexes.sql"}
+    dump_path_obj = pathlib.Path(dump_path)
+    for file_key, content in zip(("schema", "indexes"), split_secondary_indexes(schema.getvalue().decode("utf-8"))):
+        pathlib.Path.joinpath(dump_path_obj, entry[file_key]).write_text(content, encoding="utf-8")
+
+    data_path = pathlib.Path.joinpath(dump_path_obj, entry["data"])
+    part_file_path = f"{data_path}.part"
+    try:
+        with filesystem.zip.open_compressed(part_file_path, "wb", compression) as data_file:
+            return_code = cli.pipe_subprocess(
+                commands.get("wpcli_db_export_table_data").format(table=table, path=wordpress_path,
+                                                                  debug_info=debug_info),
+                stdout=data_file, log_after_err=[literals.get("wp_db_table_export_err").format(table=table)])
+    except OSError as error:
+        logging.error(literals.get("wp_db_table_export_err").format(table=table))
+        logging.error(error)
+        return_code = 1
+
+    if return_code != 0:
+        if os.path.exists(part_file_path):
+            os.remove(part_file_path)
+        return None
+
+    os.replace(part_file_path, data_path)
+    entry["size"] = os.path.getsize(data_path)
+    return entry
+
+
+def _import_table(wordpress_path: str, dump_path: str, entry: dict, compression: Union[Compression, None],
+                  debug: bool) -> bool:
+    """Imports the schema, the data and the secondary indexes of a table in
+    a single WP-CLI process.
+
+    Returns:
+        True if the table was imported.
+    """
+
+    dump_path_obj = pathlib.Path(dump_path)
+    try:
+        with contextlib.ExitStack() as stack:
+            streams = [stack.enter_context(open(pathlib.Path.joinpath(dump_path_obj, entry["schema"]), "rb")),
+                       stack.enter_context(filesystem.zip.open_compressed(
+                           str(pathlib.Path.joinpath(dump_path_obj, entry["data"])), "rb", compression)),
+                       stack.enter_context(open(pathlib.Path.joinpath(dump_path_obj, entry["indexes"]), "rb"))]
+            return_code = cli.pipe_subprocess(
+                commands.get("wpcli_db_import_stdin").format(path=wordpress_path,
+                                                             debug_info=wp_cli.convert_wp_parameter_debug(debug)),
+                stdin=ChainedReader(streams),
+                log_after_err=[literals.get("wp_db_table_import_err").format(table=entry["name"])])
+    except OSError as error:
+        logging.error(literals.get("wp_db_table_import_err").format(table=entry["name"]))
+        logging.error(error)
+        return False
+
+    return return_code == 0
+
+
+if __name__ == "__main__":
+    help(__name__)
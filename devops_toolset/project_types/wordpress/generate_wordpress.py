@@ -2,14 +2,19 @@
 required configuration files"""
 
 import argparse
+import contextlib
 import json
 import logging
 import pathlib
-import requests
+import core.log_setup
 import core.log_tools
+import filesystem.artifact_cache as artifact_cache
 import filesystem.paths as paths
 import os
 import project_types.wordpress.constants as constants
+import project_types.wordpress.prefetch as prefetch
+import project_types.wordpress.wp_cli_cache as wp_cli_cache
+import project_types.wordpress.wp_cli_session as wp_cli_session
 import project_types.wordpress.wp_theme_tools as theme_tools
 import project_types.wordpress.wptools
 import shutil
@@ -17,19 +22,28 @@ import tools.cli
 import tools.argument_validators
 import tools.devops_toolset
 import tools.git as git_tools
-from clint.textui import prompt
+import tools.http_client as http_client
+import tools.tracing as tracing
 from core.LiteralsCore import LiteralsCore
 from core.app import App
+from core.lazy_import import lazy_import
 from devops_platforms.constants import Urls
 from project_types.wordpress.Literals import Literals as WordpressLiterals
 
 app: App = App()
 literals = LiteralsCore([WordpressLiterals])
+prompt = lazy_import("clint.textui.prompt")
+requests = lazy_import("requests")
 
 
 def main(root_path: str, db_user_password: str, db_admin_password: str, wp_admin_password: str,
          environment: str, additional_environments: list, environments_db_user_passwords: dict,
-         create_db: bool, skip_partial_dumps: bool, create_development_theme: bool, **kwargs_):
+         create_db: bool, skip_partial_dumps: bool, create_development_theme: bool, use_wp_cli_session: bool = False,
+         plugin_dumps: constants.PluginDumps = constants.PluginDumps.EACH, plugin_dumps_interval: int = 1,
+         cache_only: bool = False, download_concurrency: int = constants.prefetch_max_workers,
+         create_additional_dbs: bool = False, bulk_options: bool = True,
+         native_wp_config: bool = True, bulk_users: bool = True, delete_content_with_sql: bool = False,
+         incremental_import: bool = True, **kwargs_):
     """Generates a new Wordpress site based on the site configuration file
 
     Args:
@@ -47,9 +61,36 @@ def main(root_path: str, db_user_password: str, db_admin_password: str, wp_admin
             (after installing WordPress, themes and plugins).
         create_development_theme: If True generates the file structure for a
             development theme
+        use_wp_cli_session: If True WordPress is bootstrapped only once to
+            run the WP-CLI commands issued after installing it.
+        plugin_dumps: When to export database dumps while installing the
+            plugins, if partial dumps are not skipped.
+        plugin_dumps_interval: Number of plugins between dumps when
+            plugin_dumps is PluginDumps.INTERVAL.
+        cache_only: If True artifacts are only taken from the artifact cache
+            and never downloaded.
+        download_concurrency: Maximum number of plugins / themes downloaded
+            at the same time.
+        create_additional_dbs: If True and create_db is True, it also creates
+            the databases and users of the additional environments.
+        bulk_options: If True the WordPress options are read at once and only
+            the changed ones are set, in a single WP-CLI call.
+        native_wp_config: If True the wp-config.php files are rendered in a
+            single pass instead of using WP-CLI.
+        bulk_users: If True the existing users are listed at once and the
+            missing ones are created in a single WP-CLI call.
+        delete_content_with_sql: If True the content is deleted before
+            importing it with a single SQL statement, without firing any
+            WordPress hooks.
+        incremental_import: If True only the new and changed content is
+            imported, instead of deleting all the content and importing it
+            again.
         kwargs_: Platform-specific arguments
     """
 
+    if cache_only:
+        artifact_cache.configure(cache_only=True)
+
     # Get basic settings
     global_constants: dict = project_types.wordpress.wptools.get_constants()
     database_files_path: str = global_constants["paths"]["database"]
@@ -84,7 +125,7 @@ def main(root_path: str, db_user_password: str, db_admin_password: str, wp_admin
             file_name = paths.get_file_name_from_url(url)
             file_path = pathlib.Path.joinpath(root_path_obj, file_name)
 
-            response: requests.Response = requests.get(url)
+            response: requests.Response = http_client.get(url)
             with open(file_path, "wb") as fw:
                 fw.write(response.content)
 
@@ -108,63 +149,99 @@ def main(root_path: str, db_user_password: str, db_admin_password: str, wp_admin
     setup_devops_toolset(root_path)
 
     # Download WordPress core files
-    project_types.wordpress.wptools.download_wordpress(site_config, wordpress_path, environment_config["wp_cli_debug"])
+    with tracing.span("download wordpress"):
+        project_types.wordpress.wptools.download_wordpress(site_config, wordpress_path,
+                                                           environment_config["wp_cli_debug"])
+
+    # Download remote plugins and themes at the same time
+    with tracing.span("prefetch artifacts"):
+        prefetch.prefetch_artifacts(site_config, global_constants, root_path, download_concurrency, **kwargs_)
 
     # Create development theme (if needed)
-    if create_development_theme:
-        theme_tools.create_development_theme(site_config["settings"]["themes"], root_path, global_constants)
+    with tracing.span("build themes"):
+        if create_development_theme:
+            theme_tools.create_development_theme(site_config["settings"]["themes"], root_path, global_constants)
 
-    # Set development themes / plugins ready
-    theme_tools.build_theme(site_config["settings"]["themes"], themes_path, root_path)
+        # Set development themes / plugins ready
+        theme_tools.build_theme(site_config["settings"]["themes"], themes_path, root_path)
 
     # Configure WordPress site
-    project_types.wordpress.wptools.set_wordpress_config_from_configuration_file(site_config, environment_config,
-                                                                                 wordpress_path, db_user_password)
+    with tracing.span("set wp-config"):
+        project_types.wordpress.wptools.set_wordpress_config_from_configuration_file(site_config, environment_config,
+                                                                                     wordpress_path, db_user_password,
+                                                                                     native=native_wp_config)
 
     # Create database and users
     if create_db:
-        project_types.wordpress.wptools.setup_database(environment_config, wordpress_path, db_user_password,
-                                                       db_admin_password)
+        with tracing.span("create database"):
+            if create_additional_dbs:
+                databases_created = project_types.wordpress.wptools.setup_databases(
+                    [(environment_config, db_user_password)] +
+                    [(additional_environment, environments_db_user_passwords[additional_environment["name"]])
+                     for additional_environment in site_config["environments"]
+                     if additional_environment["name"] in additional_environments], db_admin_password)
+            else:
+                databases_created = project_types.wordpress.wptools.setup_database(
+                    environment_config, db_user_password, db_admin_password)
+
+        # WordPress cannot be installed without its database
+        if not databases_created:
+            logging.critical(literals.get("wp_db_setup_err"))
+            raise ValueError(literals.get("wp_db_setup_err"))
 
     # Install WordPress site
-    project_types.wordpress.wptools.install_wordpress_site(
-        site_config, environment_config, global_constants, root_path, wp_admin_password, skip_partial_dumps)
-
-    # Add / update WordPress options
-    project_types.wordpress.wptools.add_wp_options(
-        site_config["settings"]["options"], wordpress_path, environment_config["wp_cli_debug"])
-
-    # Install site theme
-    theme_tools.install_themes_from_configuration_file(
-        site_config, environment_config, global_constants, root_path, skip_partial_dumps, **kwargs_)
-
-    # Install site plugins
-    project_types.wordpress.wptools.install_plugins_from_configuration_file(
-        site_config, environment_config, global_constants, root_path, skip_partial_dumps)
-
-    # Create additional users
-    project_types.wordpress.wptools.create_users(site_config["settings"]["users"], wordpress_path,
-                                                 environment_config["wp_cli_debug"])
-
-    # Import wxr content
-    if not create_development_theme:
-        project_types.wordpress.wptools.import_content_from_configuration_file(
-            site_config, environment_config, root_path, wordpress_path, global_constants)
+    with tracing.span("install wordpress"):
+        project_types.wordpress.wptools.install_wordpress_site(
+            site_config, environment_config, global_constants, root_path, wp_admin_password, skip_partial_dumps)
+
+    # Run the WP-CLI commands against the installed site in a single session (if set)
+    wp_cli_context = wp_cli_session.session(wordpress_path) if use_wp_cli_session else contextlib.nullcontext()
+    with wp_cli_context:
+
+        # Add / update WordPress options
+        with tracing.span("add options"):
+            project_types.wordpress.wptools.add_wp_options(
+                site_config["settings"]["options"], wordpress_path, environment_config["wp_cli_debug"],
+                bulk=bulk_options)
+
+        # Install site theme
+        with tracing.span("install themes"):
+            theme_tools.install_themes_from_configuration_file(
+                site_config, environment_config, global_constants, root_path, skip_partial_dumps, **kwargs_)
+
+        # Install site plugins
+        with tracing.span("install plugins"):
+            project_types.wordpress.wptools.install_plugins_from_configuration_file(
+                site_config, environment_config, global_constants, root_path, skip_partial_dumps,
+                plugin_dumps, plugin_dumps_interval)
+
+        # Create additional users
+        with tracing.span("create users"):
+            project_types.wordpress.wptools.create_users(site_config["settings"]["users"], wordpress_path,
+                                                         environment_config["wp_cli_debug"], bulk=bulk_users)
+
+        # Import wxr content
+        if not create_development_theme:
+            with tracing.span("import content"):
+                project_types.wordpress.wptools.import_content_from_configuration_file(
+                    site_config, environment_config, root_path, global_constants, incremental=incremental_import,
+                    delete_with_sql=delete_content_with_sql)
 
     # Generate additional wp-config.php files
     generate_additional_wpconfig_files(site_config, site_config["environments"], additional_environments,
-                                       environments_db_user_passwords, wordpress_path)
+                                       environments_db_user_passwords, wordpress_path, native_wp_config)
 
     # Delete sample configuration file
     delete_sample_wp_config_file(wordpress_path)
 
     # Backup database
     core_dump_path_converted = project_types.wordpress.wptools.convert_wp_config_token(
-        site_config["settings"]["dumps"]["core"], wordpress_path)
+        site_config["settings"]["dumps"]["core"], wordpress_path, site_config)
     database_core_dump_directory_path = pathlib.Path.joinpath(root_path_obj, database_files_path)
     database_core_dump_path = pathlib.Path.joinpath(database_core_dump_directory_path, core_dump_path_converted)
-    project_types.wordpress.wptools.export_database(
-        environment_config, wordpress_path_as_posix, database_core_dump_path.as_posix())
+    with tracing.span("export database"):
+        project_types.wordpress.wptools.export_database(
+            environment_config, wordpress_path_as_posix, database_core_dump_path.as_posix())
     git_tools.purge_gitkeep(database_core_dump_directory_path.as_posix())
 
     # Move config files to devops directory
@@ -175,6 +252,9 @@ def main(root_path: str, db_user_password: str, db_admin_password: str, wp_admin
         False
     )
 
+    artifact_cache.get_cache().log_statistics()
+    http_client.log_statistics()
+
 
 def setup_devops_toolset(root_path: str):
     """ Checks if devops toolset is present and up to date. In case not, it will be downloaded
@@ -189,7 +269,7 @@ def setup_devops_toolset(root_path: str):
 
 def generate_additional_wpconfig_files(site_config: dict, environments: dict, additional_environments: list,
                                        environments_db_user_passwords: dict,
-                                       wordpress_path: str):
+                                       wordpress_path: str, native: bool = False):
     """Generates additional wp-config.php files for different environments.
 
     Args:
@@ -200,6 +280,8 @@ def generate_additional_wpconfig_files(site_config: dict, environments: dict, ad
         environments_db_user_passwords: Additional environment db user
             passwords.
         wordpress_path: Path to the WordPress installation.
+        native: If True the wp-config.php files are rendered in a single pass
+            instead of using WP-CLI.
     """
 
     wordpress_path_obj = pathlib.Path(wordpress_path)
@@ -219,7 +301,8 @@ def generate_additional_wpconfig_files(site_config: dict, environments: dict, ad
         project_types.wordpress.wptools.set_wordpress_config_from_configuration_file(site_config, environment,
                                                                                      wordpress_path,
                                                                                      environments_db_user_passwords[
-                                                                                         environment["name"]])
+                                                                                         environment["name"]],
+                                                                                     native=native)
         shutil.move(wp_config_path, pathlib.Path.joinpath(wordpress_path_obj, f"wp-config-{environment['name']}.php"))
 
     # Rename original file
@@ -248,8 +331,23 @@ if __name__ == "__main__":
     parser.add_argument("--additional-environments", default="")
     parser.add_argument("--additional-environment-db-user-passwords", default={})
     parser.add_argument("--create-db", action="store_true", default=False)
+    parser.add_argument("--create-additional-dbs", action="store_true", default=False)
     parser.add_argument("--skip-partial-dumps", action="store_true", default=False)
     parser.add_argument("--create-development-theme", action="store_true", default=False)
+    parser.add_argument("--wp-cli-session", action="store_true", default=False)
+    parser.add_argument("--plugin-dumps", choices=[policy.value for policy in constants.PluginDumps],
+                        default=constants.PluginDumps.EACH.value)
+    parser.add_argument("--plugin-dumps-interval", type=int, default=1)
+    parser.add_argument("--cache-only", action="store_true", default=False)
+    parser.add_argument("--download-concurrency", type=int, default=constants.prefetch_max_workers)
+    parser.add_argument("--queue-logging", action="store_true", default=False)
+    parser.add_argument("--trace-path", default=None)
+    parser.add_argument("--no-wp-cli-query-cache", dest="wp_cli_query_cache", action="store_false", default=True)
+    parser.add_argument("--no-bulk-options", dest="bulk_options", action="store_false", default=True)
+    parser.add_argument("--no-native-wp-config", dest="native_wp_config", action="store_false", default=True)
+    parser.add_argument("--no-bulk-users", dest="bulk_users", action="store_false", default=True)
+    parser.add_argument("--delete-content-with-sql", action="store_true", default=False)
+    parser.add_argument("--no-incremental-import", dest="incremental_import", action="store_false", default=True)
     args, args_unknown = parser.parse_known_args()
     kwargs = {}
     for kwarg in args_unknown:
@@ -260,12 +358,34 @@ if __name__ == "__main__":
     additional_environment_db_user_passwords = args.additional_environment_db_user_passwords.split(",") \
         if args.additional_environment_db_user_passwords != "" else []
 
+    if args.queue_logging:
+        core.log_setup.start_queue_logging()
+
     tools.cli.print_title(literals.get("wp_title_generate_wordpress"))
-    main(args.project_path, args.db_user_password, args.db_admin_password, args.wp_admin_password,
-         args.environment,
-         args.additional_environments.split(",") if args.additional_environments != "" else [],
-         json.loads(args.additional_environment_db_user_passwords),
-         args.create_db,
-         args.skip_partial_dumps,
-         args.create_development_theme,
-         **kwargs)
+
+    # Traced only if --trace-path is set, without the passwords
+    environments_db_user_passwords = json.loads(args.additional_environment_db_user_passwords)
+    secrets = [args.db_user_password, args.db_admin_password, args.wp_admin_password,
+               *environments_db_user_passwords.values()]
+    # Read-only WP-CLI queries are asked once, unless --no-wp-cli-query-cache is set
+    query_cache = wp_cli_cache.cached_queries() if args.wp_cli_query_cache else contextlib.nullcontext()
+    with tracing.trace(args.trace_path, secrets), query_cache:
+        main(args.project_path, args.db_user_password, args.db_admin_password, args.wp_admin_password,
+             args.environment,
+             args.additional_environments.split(",") if args.additional_environments != "" else [],
+             environments_db_user_passwords,
+             args.create_db,
+             args.skip_partial_dumps,
+             args.create_development_theme,
+             args.wp_cli_session,
+             constants.PluginDumps(args.plugin_dumps),
+             args.plugin_dumps_interval,
+             args.cache_only,
+             args.download_concurrency,
+             args.create_additional_dbs,
+             args.bulk_options,
+             args.native_wp_config,
+             args.bulk_users,
+             args.delete_content_with_sql,
+             args.incremental_import,
+             **kwargs)
@@ -0,0 +1,146 @@
+"""Formats dates like PHP's date() function does, without running PHP.
+
+Format strings are compiled once into a list of field formatters and cached,
+so formatting a date with a format already used is a list comprehension.
+
+For more information about the format characters see:
+    https://www.php.net/manual/en/datetime.format.php
+"""
+
+import calendar
+import datetime
+import functools
+from typing import Callable, List, Union
+
+
+def _format_offset(date: datetime.datetime, separator: str) -> str:
+    """Formats the UTC offset of a date as +hhmm or +hh:mm."""
+    seconds = int(date.utcoffset().total_seconds())
+    sign = "-" if seconds < 0 else "+"
+    hours, minutes = divmod(abs(seconds) // 60, 60)
+    return f"{sign}{hours:02d}{separator}{minutes:02d}"
+
+
+def _format_ordinal_suffix(day: int) -> str:
+    """Gets the English ordinal suffix of a day of the month."""
+    if day in (11, 12, 13):
+        return "th"
+    return {1: "st", 2: "nd", 3: "rd"}.get(day % 10, "th")
+
+
+def _format_swatch(date: datetime.datetime) -> str:
+    """Formats a date as Swatch Internet time (UTC+1 based beats)."""
+    utc = date.astimezone(datetime.timezone.utc)
+    seconds = (utc.hour * 3600 + utc.minute * 60 + utc.second + 3600) % 86400
+    return f"{int(seconds / 86.4):03d}"
+
+
+def _format_timezone_identifier(date: datetime.datetime) -> str:
+    """Gets the timezone identifier (e.g. Europe/Madrid) of a date."""
+    key = getattr(date.tzinfo, "key", None)
+    if key:
+        return key
+    if date.utcoffset() == datetime.timedelta(0):
+        return "UTC"
+    return _format_offset(date, ":")
+
+
+# Field formatters by PHP format character
+FORMATTERS = {
+    # Day
+    "d": lambda date: f"{date.day:02d}",
+    "D": lambda date: calendar.day_abbr[date.weekday()],
+    "j": lambda date: str(date.day),
+    "l": lambda date: calendar.day_name[date.weekday()],
+    "N": lambda date: str(date.isoweekday()),
+    "S": lambda date: _format_ordinal_suffix(date.day),
+    "w": lambda date: str(date.isoweekday() % 7),
+    "z": lambda date: str(date.timetuple().tm_yday - 1),
+    # Week
+    "W": lambda date: f"{date.isocalendar()[1]:02d}",
+    # Month
+    "F": lambda date: calendar.month_name[date.month],
+    "m": lambda date: f"{date.month:02d}",
+    "M": lambda date: calendar.month_abbr[date.month],
+    "n": lambda date: str(date.month),
+    "t": lambda date: str(calendar.monthrange(date.year, date.month)[1]),
+    # Year
+    "L": lambda date: "1" if calendar.isleap(date.year) else "0",
+    "o": lambda date: str(date.isocalendar()[0]),
+    "Y": lambda date: str(date.year),
+    "y": lambda date: f"{date.year % 100:02d}",
+    # Time
+    "a": lambda date: "am" if date.hour < 12 else "pm",
+    "A": lambda date: "AM" if date.hour < 12 else "PM",
+    "B": _format_swatch,
+    "g": lambda date: str(date.hour % 12 or 12),
+    "G": lambda date: str(date.hour),
+    "h": lambda date: f"{date.hour % 12 or 12:02d}",
+    "H": lambda date: f"{date.hour:02d}",
+    "i": lambda date: f"{date.minute:02d}",
+    "s": lambda date: f"{date.second:02d}",
+    # date() gets an integer timestamp, so it has no microseconds / milliseconds
+    "u": lambda date: "000000",
+    "v": lambda date: "000",
+    # Timezone
+    "e": _format_timezone_identifier,
+    "I": lambda date: "1" if date.dst() else "0",
+    "O": lambda date: _format_offset(date, ""),
+    "P": lambda date: _format_offset(date, ":"),
+    "p": lambda date: "Z" if date.utcoffset() == datetime.timedelta(0) else _format_offset(date, ":"),
+    "T": lambda date: date.tzname() or _format_offset(date, ":"),
+    "Z": lambda date: str(int(date.utcoffset().total_seconds())),
+    # Full date / time
+    "c": lambda date: date.replace(microsecond=0).isoformat(),
+    "r": lambda date: f"{calendar.day_abbr[date.weekday()]}, {date.day:02d} {calendar.month_abbr[date.month]} "
+                      f"{date.year} {date:%H:%M:%S} {_format_offset(date, '')}",
+    "U": lambda date: str(int(date.timestamp())),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def compile_format(date_format: str) -> List[Union[str, Callable[[datetime.datetime], str]]]:
+    """Compiles a PHP date format into a list of literals and field
+    formatters. Characters that are not format characters, or are escaped
+    with a backslash, are copied as they are.
+
+    Args:
+        date_format: PHP date format (e.g. Y.m.d-Hisve).
+
+    Returns:
+        The literal strings and field formatters, in order.
+    """
+
+    template = []
+    escaped = False
+    for character in date_format:
+        if escaped:
+            template.append(character)
+            escaped = False
+        elif character == "\\":
+            escaped = True
+        else:
+            template.append(FORMATTERS.get(character, character))
+
+    return template
+
+
+def format_date(date_format: str, date: datetime.datetime = None,
+                timezone: datetime.tzinfo = datetime.timezone.utc) -> str:
+    """Formats a date like PHP's date() function does.
+
+    Args:
+        date_format: PHP date format (e.g. Y.m.d-Hisve).
+        date: Date to be formatted. Defaults to now.
+        timezone: Timezone the date is converted to before formatting it.
+
+    Returns:
+        The formatted date.
+    """
+
+    date = datetime.datetime.now(timezone) if date is None else date.astimezone(timezone)
+    return "".join(field if isinstance(field, str) else field(date) for field in compile_format(date_format))
+
+
+if __name__ == "__main__":
+    help(__name__)
@@ -0,0 +1,141 @@
+"""Downloads the remote plugins and themes of a site configuration
+concurrently, before they are installed.
+
+Installing plugins and themes downloads every url / feed source right before
+installing it, so the network latency of every download adds up. Prefetching
+overlaps the downloads and records the downloaded files as prefetched_source,
+so the install loops only use local files:
+
+    prefetch.prefetch_artifacts(site_config, global_constants, root_path)
+    theme_tools.install_themes_from_configuration_file(site_config, ...)
+    wptools.install_plugins_from_configuration_file(site_config, ...)
+"""
+
+import concurrent.futures
+import logging
+import os
+import pathlib
+import project_types.wordpress.constants as wp_constants
+import project_types.wordpress.wp_theme_tools as theme_tools
+import project_types.wordpress.wptools as wptools
+from core.app import App
+from core.LiteralsCore import LiteralsCore
+from project_types.wordpress.Literals import Literals as WordpressLiterals
+from typing import Callable, List, NamedTuple, Union
+
+app: App = App()
+literals = LiteralsCore([WordpressLiterals])
+
+
+class Download(NamedTuple):
+    """Remote artifact of a site configuration"""
+    name: str
+    config: dict
+    file_path: pathlib.Path
+    download: Callable[[], None]
+
+
+def get_downloads(site_configuration: dict, global_constants: dict, root_path: str, **kwargs) -> List[Download]:
+    """Gets the plugins and themes of a site configuration that have to be
+    downloaded.
+
+    Args:
+        site_configuration: Parsed site configuration.
+        global_constants: Parsed global constants.
+        root_path: Path to project root.
+        kwargs: Platform-specific arguments, as in
+            wp_theme_tools.download_wordpress_theme.
+
+    Returns:
+        The artifacts to be downloaded.
+    """
+
+    root_path_obj = pathlib.Path(root_path)
+    plugins_path = pathlib.Path.joinpath(root_path_obj, global_constants["paths"]["content"]["plugins"])
+    themes_path = pathlib.Path.joinpath(root_path_obj, global_constants["paths"]["content"]["themes"])
+
+    downloads = []
+    for plugin in site_configuration["settings"]["plugins"]:
+        if plugin["source_type"] == "url":
+            file_path = pathlib.Path.joinpath(plugins_path, f"{plugin['name']}.zip")
+            downloads.append(Download(plugin["name"], plugin, file_path,
+                                      lambda plugin=plugin, file_path=file_path:
+                                      wptools.download_wordpress_plugin(plugin, str(file_path))))
+
+    for theme in site_configuration["settings"]["themes"]:
+        # Feed themes without feed information are reported by the install loop
+        if theme["source_type"] == "url" or (theme["source_type"] == "feed" and "feed" in theme):
+            file_path = pathlib.Path.joinpath(themes_path, f"{theme['name']}.zip")
+            downloads.append(Download(theme["name"], theme, file_path,
+                                      lambda theme=theme:
+                                      theme_tools.download_wordpress_theme(theme, str(themes_path), **kwargs)))
+
+    return downloads
+
+
+def prefetch_artifacts(site_configuration: dict, global_constants: dict, root_path: str,
+                       max_workers: int = wp_constants.prefetch_max_workers, **kwargs) -> int:
+    """Downloads the remote plugins and themes of a site configuration
+    concurrently.
+
+    The path of every downloaded artifact is set as its prefetched_source in
+    site_configuration, so the install loops do not download it again. Its
+    source type is kept, so generated zip files are still purged after they
+    are installed. Artifacts that were not downloaded without an error (e.g.
+    a feed without credentials) are not prefetched, even if a file from a
+    previous run is in their path.
+
+    Args:
+        site_configuration: Parsed site configuration.
+        global_constants: Parsed global constants.
+        root_path: Path to project root.
+        max_workers: Maximum number of concurrent downloads.
+        kwargs: Platform-specific arguments, as in
+            wp_theme_tools.download_wordpress_theme.
+
+    Returns:
+        Number of artifacts downloaded.
+    """
+
+    downloads = get_downloads(site_configuration, global_constants, root_path, **kwargs)
+    if not downloads:
+        return 0
+
+    logging.info(literals.get("wp_prefetch_downloading").format(count=len(downloads), workers=max_workers))
+
+    stamps = {download.file_path: _get_file_stamp(download.file_path) for download in downloads}
+    count = 0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(download.download): download for download in downloads}
+        for future in concurrent.futures.as_completed(futures):
+            download = futures[future]
+            try:
+                future.result()
+            except Exception as error:
+                logging.error(literals.get("wp_prefetch_error").format(name=download.name, error=error))
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+
+            stamp = _get_file_stamp(download.file_path)
+            if stamp is not None and stamp != stamps[download.file_path]:
+                download.config["prefetched_source"] = str(download.file_path)
+                count += 1
+
+    logging.info(literals.get("wp_prefetch_done").format(count=count))
+    return count
+
+
+def _get_file_stamp(file_path: pathlib.Path) -> Union[tuple, None]:
+    """Gets what tells apart the versions of a file (inode, modification time
+    and size), or None if it does not exist. Downloads replace the file, so
+    a file written by them has another stamp."""
+
+    try:
+        file_stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size
+
+
+if __name__ == "__main__":
+    help(__name__)
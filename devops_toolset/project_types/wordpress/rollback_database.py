@@ -1,6 +1,10 @@
 """Rollbacks a database using a dump, removing first all existing tables."""
 
 import argparse
+import project_types.wordpress.constants as wp_constants
+import project_types.wordpress.database as database
+import tools.argument_validators
+import tools.cli
 from core.app import App
 from core.CommandsCore import CommandsCore
 from core.LiteralsCore import LiteralsCore
@@ -14,20 +18,40 @@ literals = LiteralsCore([WordpressLiterals, ToolsLiterals])
 commands = CommandsCore([ToolsCommands])
 
 
-def main(wordpress_path: str, database_dump_path: str, quiet: bool):
+def main(wordpress_path: str, database_dump_path: str, quiet: bool, debug: bool = False, tables: list = None,
+         max_workers: int = wp_constants.table_dump_max_workers):
     """Rollbacks a database using a dump, dropping and re-creating the database
 
     Args:
         wordpress_path: Path to WordPress directory.
         database_dump_path: Path to the database dump file to be restored.
+            .sql.gz and .sql.zst dumps are decompressed while they are
+            imported. .tables dumps (a file per table) are imported by
+            max_workers processes at the same time.
         quiet: If True, no questions are asked and defaults are assumed.
+        debug: If True, --debug will be added to the WP-CLI commands.
+        tables: If present, only these tables are restored from a .tables
+            dump and the rest of the database is kept.
+        max_workers: Number of tables imported at the same time.
+
+    Raises:
+        ValueError: If tables are passed with a dump that is not a .tables
+            dump.
     """
 
-    # Drop the database and create an empty one
-    wp_cli.reset_database(wordpress_path, quiet)
+    if tables and not database.is_table_dump(database_dump_path):
+        raise ValueError(literals.get("wp_db_tables_need_table_dump").format(path=database_dump_path))
+
+    # Drop the database and create an empty one (unless only some tables are restored)
+    if not tables:
+        wp_cli.reset_database(wordpress_path, quiet, debug)
+
+    if database.is_table_dump(database_dump_path):
+        database.import_tables(wordpress_path, database_dump_path, tables, max_workers, debug)
+        return
 
     # Imports a dump in the newly created database
-    wp_cli.import_database(wordpress_path, database_dump_path)
+    wp_cli.import_database(wordpress_path, database_dump_path, debug)
 
 
 if __name__ == "__main__":
@@ -35,7 +59,11 @@ if __name__ == "__main__":
     parser.add_argument("wordpress-path", action=tools.argument_validators.PathValidator)
     parser.add_argument("database-dump-path", action=tools.argument_validators.PathValidator)
     parser.add_argument("--quiet", action="store_true", default=False)
+    parser.add_argument("--debug", action="store_true", default=False)
+    parser.add_argument("--tables", default="")
+    parser.add_argument("--workers", type=int, default=wp_constants.table_dump_max_workers)
     args, args_unknown = parser.parse_known_args()
 
     tools.cli.print_title(literals.get("wp_title_wordpress_rollback_db"))
-    main(args.wordpress_path, args.database_dump_path, args.quiet)
+    main(getattr(args, "wordpress-path"), getattr(args, "database-dump-path"), args.quiet, args.debug,
+         args.tables.split(",") if args.tables != "" else None, args.workers)
@@ -0,0 +1,56 @@
+<?php
+/**
+ * Creates many WordPress users with a single WordPress bootstrap.
+ *
+ * Used by wp_cli.create_users() as
+ * `wp eval-file wp-cli-create-users.php <users.json> --path=<wordpress path>`
+ * where users.json is a list of users as defined in #/definitions/user at
+ * https://dev.aheadlabs.com/schemas/json/wordpress-site-schema.json
+ *
+ * Prints a JSON list with a {"user_login": "...", "created": true|false,
+ * "error": "..."} object per user.
+ */
+
+$users = json_decode( file_get_contents( $args[0] ), true );
+
+if ( ! is_array( $users ) ) {
+	WP_CLI::error( "Cannot read users from {$args[0]}" );
+}
+
+$results = array();
+foreach ( $users as $user ) {
+	if ( username_exists( $user['user_login'] ) ) {
+		$results[] = array( 'user_login' => $user['user_login'], 'created' => false, 'error' => 'exists' );
+		continue;
+	}
+
+	$user_data = array(
+		'user_login' => $user['user_login'],
+		'user_email' => $user['user_email'],
+		'user_pass'  => wp_generate_password( 24 ),
+	);
+	foreach ( array( 'role', 'display_name', 'first_name', 'last_name' ) as $field ) {
+		if ( ! empty( $user[ $field ] ) ) {
+			$user_data[ $field ] = $user[ $field ];
+		}
+	}
+
+	$user_id = wp_insert_user( $user_data );
+
+	if ( is_wp_error( $user_id ) ) {
+		$results[] = array(
+			'user_login' => $user['user_login'],
+			'created'    => false,
+			'error'      => $user_id->get_error_message(),
+		);
+		continue;
+	}
+
+	if ( ! empty( $user['send_email'] ) ) {
+		wp_new_user_notification( $user_id, null, 'user' );
+	}
+
+	$results[] = array( 'user_login' => $user['user_login'], 'created' => true, 'error' => null );
+}
+
+echo json_encode( $results );
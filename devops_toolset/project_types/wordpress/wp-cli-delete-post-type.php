@@ -0,0 +1,41 @@
+<?php
+/**
+ * Deletes all the posts of a post type, with their metadata, term
+ * relationships and comments, using a single SQL DELETE statement.
+ *
+ * Used by wp_cli.delete_post_type_content() as
+ * `wp eval-file wp-cli-delete-post-type.php <post type> --path=<wordpress path>`
+ *
+ * No hooks are fired, so this is only suitable for content that is going to
+ * be imported again. Prints the number of deleted posts.
+ */
+
+global $wpdb;
+
+if ( empty( $args[0] ) ) {
+	WP_CLI::error( 'Missing post type' );
+}
+
+$post_type = $args[0];
+$count     = (int) $wpdb->get_var( $wpdb->prepare( "SELECT COUNT(*) FROM {$wpdb->posts} WHERE post_type = %s", $post_type ) );
+
+$result = $wpdb->query(
+	$wpdb->prepare(
+		"DELETE p, pm, tr, c, cm
+		FROM {$wpdb->posts} p
+		LEFT JOIN {$wpdb->postmeta} pm ON pm.post_id = p.ID
+		LEFT JOIN {$wpdb->term_relationships} tr ON tr.object_id = p.ID
+		LEFT JOIN {$wpdb->comments} c ON c.comment_post_ID = p.ID
+		LEFT JOIN {$wpdb->commentmeta} cm ON cm.comment_id = c.comment_ID
+		WHERE p.post_type = %s",
+		$post_type
+	)
+);
+
+if ( false === $result ) {
+	WP_CLI::error( $wpdb->last_error );
+}
+
+wp_cache_flush();
+
+echo $count;
@@ -0,0 +1,37 @@
+<?php
+/**
+ * Long-lived WP-CLI session used by project_types/wordpress/wp_cli_session.py
+ *
+ * Run it with `wp eval-file wp-cli-session.php --path=<wordpress path>` so
+ * WordPress is bootstrapped only once. Then write one JSON object per line to
+ * stdin ({"command": "option get blogname"}) and read one JSON object per line
+ * from stdout ({"stdout": "...", "stderr": "...", "return_code": 0}).
+ */
+
+fwrite( STDOUT, json_encode( array( 'ready' => true ) ) . "\n" );
+fflush( STDOUT );
+
+while ( false !== ( $line = fgets( STDIN ) ) ) {
+	$request = json_decode( $line, true );
+	if ( ! is_array( $request ) || ! isset( $request['command'] ) ) {
+		continue;
+	}
+
+	$result = WP_CLI::runcommand(
+		$request['command'],
+		array(
+			'return'     => 'all',
+			'launch'     => false,
+			'exit_error' => false,
+			'parse'      => false,
+		)
+	);
+
+	$response = array(
+		'stdout'      => $result->stdout,
+		'stderr'      => $result->stderr,
+		'return_code' => $result->return_code,
+	);
+	fwrite( STDOUT, json_encode( $response, JSON_INVALID_UTF8_SUBSTITUTE ) . "\n" );
+	fflush( STDOUT );
+}
@@ -0,0 +1,53 @@
+<?php
+/**
+ * Sets the modification date of many posts, matched by GUID or, if the
+ * importer changed it (as it does with attachments), by post type, title and
+ * publication date.
+ *
+ * The WordPress importer sets the modification date of the posts it creates
+ * to their publication date. Used by wp_cli.set_posts_modified() after an
+ * incremental import as
+ * `wp eval-file wp-cli-set-post-modified.php <posts.json> --path=<wordpress path>`
+ * where posts.json is a list of {"guid": "...", "post_type": "...",
+ * "post_title": "...", "post_date_gmt": "...", "post_modified": "...",
+ * "post_modified_gmt": "..."} objects, so the next import can compare them
+ * with the WXR file.
+ */
+
+global $wpdb;
+
+$posts = json_decode( file_get_contents( $args[0] ), true );
+
+if ( ! is_array( $posts ) ) {
+	WP_CLI::error( "Cannot read posts from {$args[0]}" );
+}
+
+$updated = 0;
+foreach ( $posts as $post ) {
+	$modified = array(
+		'post_modified'     => $post['post_modified'],
+		'post_modified_gmt' => $post['post_modified_gmt'],
+	);
+
+	$result = $wpdb->update( $wpdb->posts, $modified, array( 'guid' => $post['guid'] ) );
+
+	if ( 0 === $result ) {
+		$result = $wpdb->update(
+			$wpdb->posts,
+			$modified,
+			array(
+				'post_type'     => $post['post_type'],
+				'post_title'    => $post['post_title'],
+				'post_date_gmt' => $post['post_date_gmt'],
+			)
+		);
+	}
+
+	if ( false !== $result ) {
+		$updated += $result;
+	}
+}
+
+wp_cache_flush();
+
+WP_CLI::log( "{$updated} posts updated" );
@@ -0,0 +1,37 @@
+<?php
+/**
+ * Adds or updates many WordPress options with a single WordPress bootstrap.
+ *
+ * Used by wp_cli.update_options() as
+ * `wp eval-file wp-cli-update-options.php <changes.json> --path=<wordpress path>`
+ * where changes.json is a list of {"action": "add|update", "name": "...",
+ * "value": "...", "autoload": true|false} objects.
+ */
+
+$changes = json_decode( file_get_contents( $args[0] ), true );
+
+if ( ! is_array( $changes ) ) {
+	WP_CLI::error( "Cannot read option changes from {$args[0]}" );
+}
+
+$errors = 0;
+foreach ( $changes as $change ) {
+	$autoload = $change['autoload'] ? 'yes' : 'no';
+
+	if ( 'add' === $change['action'] ) {
+		$result = add_option( $change['name'], $change['value'], '', $autoload );
+	} else {
+		$result = update_option( $change['name'], $change['value'], $autoload );
+	}
+
+	if ( $result ) {
+		WP_CLI::log( "Option {$change['name']} {$change['action']}: ok" );
+	} else {
+		WP_CLI::warning( "Option {$change['name']} {$change['action']}: failed" );
+		$errors++;
+	}
+}
+
+if ( $errors > 0 ) {
+	WP_CLI::error( "{$errors} option changes could not be applied" );
+}
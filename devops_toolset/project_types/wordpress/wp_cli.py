@@ -1,19 +1,36 @@
 """Contains wrappers for WP CLI commands"""
 
+import contextlib
 import datetime
+import hashlib
+import json
 import logging
+import os
+import pathlib
+import tempfile
+import time
+import filesystem.zip
+import project_types.wordpress.constants as wp_constants
+import project_types.wordpress.wp_cli_cache as wp_cli_cache
+import project_types.wordpress.wp_cli_session as wp_cli_session
 import tools.cli as cli
 from core.app import App
 from core.LiteralsCore import LiteralsCore
 from project_types.wordpress.Literals import Literals as WordpressLiterals
-from core.CommandsCore import CommandsCore
+from core.CommandsCore import Argument, CommandsCore
 from project_types.wordpress.commands import Commands as WordpressCommands
 from enum import Enum
+from typing import Union
 
 app: App = App()
 literals = LiteralsCore([WordpressLiterals])
 commands = CommandsCore([WordpressCommands])
 
+CREATE_USERS_SCRIPT_PATH = pathlib.Path(os.path.dirname(os.path.realpath(__file__)), "wp-cli-create-users.php")
+DELETE_POST_TYPE_SCRIPT_PATH = pathlib.Path(os.path.dirname(os.path.realpath(__file__)), "wp-cli-delete-post-type.php")
+SET_POST_MODIFIED_SCRIPT_PATH = pathlib.Path(os.path.dirname(os.path.realpath(__file__)), "wp-cli-set-post-modified.php")
+UPDATE_OPTIONS_SCRIPT_PATH = pathlib.Path(os.path.dirname(os.path.realpath(__file__)), "wp-cli-update-options.php")
+
 
 class ValueType(Enum):
     """Defines value types for values at the wp-config.php file"""
@@ -41,11 +58,7 @@ def add_update_option(option: dict, wordpress_path: str, debug: bool = False, up
         add_database_option(option["name"], option["value"], wordpress_path, debug, option["autoload"])
 
     if option["name"] == "permalink_structure" and update_permalinks:
-        cli.call_subprocess(commands.get("wpcli_rewrite_structure").format(
-            structure=option["value"],
-            path=wordpress_path,
-            debug_info=convert_wp_parameter_debug(debug)
-        ))
+        update_permalink_structure(option["value"], wordpress_path, debug)
 
 
 def add_database_option(option_name: str, option_value: str, wordpress_path: str,
@@ -71,7 +84,7 @@ def add_database_option(option_name: str, option_value: str, wordpress_path: str
 
     # Adds the option if it does not exist
     if not option_exists and check_if_option_is_valid(option_name, option_value, autoload):
-        cli.call_subprocess(commands.get("wpcli_option_add").format(
+        wp_cli_session.call_subprocess(commands.get("wpcli_option_add").format(
             option_name=option_name,
             option_value=option_value,
             autoload=convert_wp_parameter_autoload(autoload),
@@ -103,7 +116,7 @@ def check_if_option_exists(option_name: str, wordpress_path: str, debug_info: bo
         The option value if it exists
     """
 
-    value = cli.call_subprocess_with_result(commands.get("wpcli_option_get").format(
+    value = wp_cli_session.call_subprocess_with_result(commands.get("wpcli_option_get").format(
         option_name=option_name,
         path=wordpress_path,
         debug_info=convert_wp_parameter_debug(debug_info)
@@ -115,6 +128,86 @@ def check_if_option_exists(option_name: str, wordpress_path: str, debug_info: bo
     return option_exists, option_value
 
 
+def get_database_fingerprint(wordpress_path: str, schema_only: bool, debug_info: bool = False) -> Union[str, None]:
+    """Gets a fingerprint of the database that changes when its schema (or
+    its data) changes. Much cheaper than exporting a dump to compare it.
+
+    Args:
+        wordpress_path: Path to WordPress files.
+        schema_only: If True only the tables and columns are considered.
+            Otherwise the table checksums are considered too.
+        debug_info: If true, --debug will be added to the command showing all debug trace information.
+
+    Returns:
+        SHA-256 hex digest of the database state, or None if it could not be
+        obtained.
+    """
+
+    debug = convert_wp_parameter_debug(debug_info)
+    schema = wp_cli_session.call_subprocess_with_result(commands.get("wpcli_db_query_schema").format(
+        path=wordpress_path, debug_info=debug))
+    if not schema:
+        return None
+
+    fingerprint = hashlib.sha256(schema.encode("utf-8"))
+
+    if not schema_only:
+        tables = wp_cli_session.call_subprocess_with_result(commands.get("wpcli_db_tables").format(
+            path=wordpress_path, debug_info=debug))
+        checksums = wp_cli_session.call_subprocess_with_result(commands.get("wpcli_db_query_checksum").format(
+            tables=(tables or "").strip(), path=wordpress_path, debug_info=debug)) if tables else None
+        if not checksums:
+            return None
+        fingerprint.update(checksums.encode("utf-8"))
+
+    return fingerprint.hexdigest()
+
+
+def get_database_tables(wordpress_path: str, debug_info: bool = False) -> list:
+    """Gets the names of the WordPress database tables.
+
+    Args:
+        wordpress_path: Path to WordPress files.
+        debug_info: If true, --debug will be added to the command showing all debug trace information.
+
+    Returns:
+        List of table names (empty if they could not be listed).
+    """
+
+    tables = wp_cli_session.call_subprocess_with_result(commands.get("wpcli_db_tables").format(
+        path=wordpress_path, debug_info=convert_wp_parameter_debug(debug_info)))
+    return [table for table in (tables or "").strip().split(",") if table]
+
+
+def get_options(wordpress_path: str, debug_info: bool = False) -> Union[dict, None]:
+    """Gets all the options (but transients) from the wp_options (*) table
+    in the WordPress database using a single WP-CLI call.
+
+    (*) wp_ prefix could change, but this function will work anyway because
+        its value is obtained from the wp-config.php configuration file.
+    For more information see:
+        https://developer.wordpress.org/cli/commands/option/list/
+
+    Args:
+        wordpress_path: Path to WordPress files.
+        debug_info: Toggles debug info on the command.
+
+    Returns:
+        Dict with the option values by option name, or None if the options
+        could not be listed.
+    """
+
+    options = parse_json_list(wp_cli_session.call_subprocess_with_result(commands.get("wpcli_option_list").format(
+        path=wordpress_path,
+        debug_info=convert_wp_parameter_debug(debug_info)
+    )))
+
+    if options is None:
+        return None
+
+    return {option["option_name"]: option["option_value"] for option in options}
+
+
 def check_if_option_is_valid(name: str, value: str, autoload: bool) -> bool:
     """Checks if the name, value and autoload flag are valid (not empty
     or None)
@@ -145,7 +238,7 @@ def convert_wp_parameter_autoload(autoload: bool):
 def convert_wp_parameter_db_user(db_user: str):
     """Converts a str value to a --db_user parameter."""
     if db_user:
-        return "--dbuser=" + "\"" + db_user + "\""
+        return Argument("--dbuser=" + "\"" + db_user + "\"", "--dbuser=" + db_user)
     else:
         return ""
 
@@ -153,7 +246,7 @@ def convert_wp_parameter_db_user(db_user: str):
 def convert_wp_parameter_db_pass(db_pass: str):
     """Converts a str value to a --db_pass parameter."""
     if db_pass:
-        return "--dbpass=" + "\"" + db_pass + "\""
+        return Argument("--dbpass=" + "\"" + db_pass + "\"", "--dbpass=" + db_pass)
     else:
         return ""
 
@@ -169,11 +262,16 @@ def convert_wp_parameter_activate(activate: bool):
 def convert_wp_parameter_admin_password(admin_password: str):
     """Converts a str value to a --admin_password parameter."""
     if admin_password:
-        return "--admin_password=" + "\"" + admin_password + "\""
+        return Argument("--admin_password=" + "\"" + admin_password + "\"", "--admin_password=" + admin_password)
     else:
         return ""
 
 
+def convert_wp_parameter_bool(value: bool):
+    """Converts a boolean value to the true / false value of a WP-CLI option."""
+    return "true" if value else "false"
+
+
 def convert_wp_parameter_content(value: bool):
     """Converts a boolean value to a yes/no string."""
     if not value:
@@ -244,7 +342,7 @@ def convert_wp_parameter_str_key_value(key: str, value: str, quoted: bool = Fals
     quote = "\"" if quoted else ""
 
     if value:
-        return "--" + key + "=" + quote + value + quote
+        return Argument("--" + key + "=" + quote + value + quote, "--" + key + "=" + value)
     return ""
 
 
@@ -275,7 +373,7 @@ def create_configuration_file(wordpress_path: str, db_host: str, db_name: str, d
         skip_check: Skip check parameter --skip-check
         debug: If present, --debug will be added to the command showing all debug trace information.
     """
-    tools.cli.call_subprocess(commands.get("wpcli_config_create").format(
+    wp_cli_session.call_subprocess(commands.get("wpcli_config_create").format(
         path=wordpress_path,
         db_host=db_host,
         db_name=db_name,
@@ -292,38 +390,6 @@ def create_configuration_file(wordpress_path: str, db_host: str, db_name: str, d
     )
 
 
-def create_database(wordpress_path: str, debug: bool, db_user: str, db_password: str, schema: str):
-    """ Calls wp db create with the parameters
-    Args
-        wordpress_path: Path to WordPress files
-        debug: If True, --debug will be added to the command showing all debug trace information.
-        db_user: Database user
-        db_pass: Database password
-        schema: Schema name to be checked for existence
-    """
-    # Check if the database exists
-    output = cli.call_subprocess_with_result(commands.get("wpcli_db_query_db_exists").format(
-        schema=schema,
-        admin_user=db_user,
-        admin_password=db_password,
-        path=wordpress_path
-    ))
-    database_exists = True if output is not None and output.split("\r\n")[1] == '1' else False
-
-    # Create the database
-    if not database_exists:
-        tools.cli.call_subprocess(commands.get("wpcli_db_create").format(
-            path=wordpress_path,
-            db_user=convert_wp_parameter_db_user(db_user),
-            db_pass=convert_wp_parameter_db_pass(db_password),
-            debug_info=convert_wp_parameter_debug(debug)
-        ), log_before_process=[literals.get("wp_wpcli_db_create_before")])
-
-    # Warn the user we will not create the database
-    else:
-        logging.warning(literals.get("mysql_db_exists_skipping_creation").format(schema=schema))
-
-
 def create_user(user: dict, wordpress_path: str, debug: bool):
     """Creates a WordPress user.
 
@@ -334,7 +400,7 @@ def create_user(user: dict, wordpress_path: str, debug: bool):
         debug: If present, --debug will be added to the command showing all debug trace information.
     """
 
-    cli.call_subprocess(commands.get("wp_user_create").format(
+    wp_cli_session.call_subprocess(commands.get("wp_user_create").format(
         user_login=user["user_login"],
         user_email=user["user_email"],
         role=convert_wp_parameter_str_key_value("role", user["role"]),
@@ -351,6 +417,53 @@ def create_user(user: dict, wordpress_path: str, debug: bool):
     )
 
 
+def create_users(users: list, wordpress_path: str, debug: bool) -> Union[list, None]:
+    """Creates many WordPress users in a single WP-CLI call.
+
+    Args:
+        users: Users to be created based on #/definitions/user at
+            https://dev.aheadlabs.com/schemas/json/wordpress-site-schema.json
+        wordpress_path: Path to WordPress files.
+        debug: If present, --debug will be added to the command showing all debug trace information.
+
+    Returns:
+        List with a dict per user with the user_login, created and error
+        keys, or None if the users could not be created.
+    """
+
+    with temporary_json_file(users) as users_file_path:
+        output = wp_cli_session.call_subprocess_with_result(commands.get("wp_user_create_bulk").format(
+            script=CREATE_USERS_SCRIPT_PATH.as_posix(),
+            users_file=users_file_path,
+            path=wordpress_path,
+            debug_info=convert_wp_parameter_debug(debug)
+        ))
+
+    return parse_json_list(output)
+
+
+def get_user_logins(wordpress_path: str, debug: bool) -> Union[set, None]:
+    """Gets the logins of all the WordPress users in a single WP-CLI call.
+
+    Args:
+        wordpress_path: Path to WordPress files.
+        debug: If present, --debug will be added to the command showing all debug trace information.
+
+    Returns:
+        Set with the user logins, or None if the users could not be listed.
+    """
+
+    users = parse_json_list(wp_cli_session.call_subprocess_with_result(commands.get("wp_user_list").format(
+        path=wordpress_path,
+        debug_info=convert_wp_parameter_debug(debug)
+    )))
+
+    if users is None:
+        return None
+
+    return {user["user_login"] for user in users}
+
+
 def user_exists(user_login: str, wordpress_path: str, debug: bool) -> bool:
     """Creates a WordPress user.
 
@@ -363,7 +476,7 @@ def user_exists(user_login: str, wordpress_path: str, debug: bool) -> bool:
         True if the user exists.
     """
 
-    result = cli.call_subprocess_with_result(commands.get("wp_user_get").format(
+    result = wp_cli_session.call_subprocess_with_result(commands.get("wp_user_get").format(
         user_login=user_login,
         path=wordpress_path,
         debug_info=convert_wp_parameter_debug(debug)
@@ -374,130 +487,174 @@ def user_exists(user_login: str, wordpress_path: str, debug: bool) -> bool:
     return True
 
 
-def create_wordpress_database_user(wordpress_path: str, admin_user: str, admin_password: str, user: str, password: str,
-                                   schema: str, host: str = 'localhost',
-                                   db_privileges: str = 'create, alter, select, insert, update, delete',
-                                   global_privileges: str = 'lock tables, process'):
-    """Creates a database user to be used by WordPress
-        e.g.:
-            wp db query
-                "create user '<username>'@'localhost'
-                identified by '<password>'"
-            wp db query
-                "grant create, alter, select, insert, update, delete
-                on <schema>.* to '<username>'@'localhost'"
+def delete_post_type_content(wordpress_path: str, content_type: str, debug_info: bool = False,
+                             chunk_size: int = wp_constants.post_delete_chunk_size, use_sql: bool = False) -> int:
+    """ Calls db in order to delete content from a concrete post type
 
-        Args:
-            wordpress_path: Path to WordPress files.
-            admin_user: Database user with privileges to create databases and
-                other users.
-            admin_password: Admin user password.
-            user: Database user name.
-            password: Database user password.
-            schema: Existing database schema name.
-            host: localhost or FQDN. (% and _ wildcards are permitted).
-            db_privileges: comma-separated privileges to be granted on the database. More info at:
-                https://dev.mysql.com/doc/refman/en/grant.html#grant-privileges
-                e.g.: 'create, alter, select, insert, update, delete'
-            global_privileges: comma-separated privileges to be granted globally. More info at:
-                https://dev.mysql.com/doc/refman/en/grant.html#grant-privileges
-                e.g.: 'process'
-    """
-    # Check if the user exists
-    output = cli.call_subprocess_with_result(commands.get("wpcli_db_query_user_exists").format(
-        user=user,
-        host=host,
-        admin_user=admin_user,
-        admin_password=admin_password,
-        path=wordpress_path
-    ))
-    user_exists = True if output is not None and len(output.split("\r\n")) > 1 and output.split("\r\n")[1] == '1' \
-        else False
-
-    # Create user
-    if not user_exists:
-        cli.call_subprocess(commands.get("wpcli_db_query_create_user").format(
-            user=user,
-            host=host,
-            password=password,
-            admin_user=admin_user,
-            admin_password=admin_password,
-            path=wordpress_path),
-            log_before_out=[literals.get("wp_wpcli_db_query_user_creating").format(user=user, host=host)],
-            log_after_err=[literals.get("wp_wpcli_db_query_user_creating_err").format(user=user, host=host)]
-        )
+    Posts are listed and deleted chunk_size at a time, so the command line
+    never grows with the number of posts.
 
-        # Grant user privileges on the database
-        cli.call_subprocess(commands.get("wpcli_db_query_grant").format(
-            privileges=db_privileges,
-            schema=schema,
-            user=user,
-            host=host,
-            admin_user=admin_user,
-            admin_password=admin_password,
-            path=wordpress_path),
-            log_before_out=[literals.get("wp_wpcli_db_query_user_granting").format(
-                user=user, host=host, schema=schema, privileges=db_privileges)],
-            log_after_err=[literals.get("wp_wpcli_db_query_user_granting_err").format(
-                user=user, host=host, schema=schema)]
-        )
+    Args:
+        wordpress_path: Path to WordPress files.
+        content_type: Type of the content to be deleted
+        debug_info: If true, --debug will be added to the command showing all debug trace information.
+        chunk_size: Number of posts deleted by every wp post delete call.
+        use_sql: If True deletes all the posts of the type with a single SQL
+            statement, without firing any WordPress hooks.
 
-        # Grant user global privileges
-        cli.call_subprocess(commands.get("wpcli_db_query_grant").format(
-            privileges=global_privileges,
-            schema="*",
-            user=user,
-            host=host,
-            admin_user=admin_user,
-            admin_password=admin_password,
-            path=wordpress_path),
-            log_before_out=[literals.get("wp_wpcli_db_query_user_granting").format(
-                user=user, host=host, schema=schema, privileges=db_privileges)],
-            log_after_err=[literals.get("wp_wpcli_db_query_user_granting_err").format(
-                user=user, host=host, schema=schema)]
-        )
+    Returns:
+        Number of deleted posts.
+    """
+
+    logging.info(literals.get("wp_wpcli_post_delete_post_type_before").format(post_type=content_type))
+    start = time.perf_counter()
 
-    # Warn the user we are not altering users and permissions
+    if use_sql:
+        deleted = delete_post_type_content_sql(wordpress_path, content_type, debug_info)
     else:
-        logging.warning(literals.get("mysql_user_exists_grant_privileges_manually").format(
-            user=user,
-            host=host,
-            schema=schema,
-            db_privileges=db_privileges,
-            global_privileges=global_privileges
-        ))
+        deleted = delete_post_type_content_chunked(wordpress_path, content_type, debug_info, chunk_size, start)
 
+    logging.info(literals.get("wp_wpcli_post_delete_post_type_done").format(
+        deleted=deleted, post_type=content_type, seconds=time.perf_counter() - start))
+    return deleted
+
+
+def delete_post_type_content_chunked(wordpress_path: str, content_type: str, debug_info: bool, chunk_size: int,
+                                     start: float) -> int:
+    """Deletes the posts of a post type using wp post delete, one chunk at a
+    time. Every chunk is listed again from the first page, so posts created or
+    deleted meanwhile do not make it skip any post.
 
-def delete_post_type_content(wordpress_path: str, content_type: str, debug_info: bool = False):
-    """ Calls db in order to delete content from a concrete post type
     Args:
         wordpress_path: Path to WordPress files.
         content_type: Type of the content to be deleted
         debug_info: If true, --debug will be added to the command showing all debug trace information.
+        chunk_size: Number of posts deleted by every wp post delete call.
+        start: Performance counter value when the deletion started.
+
+    Returns:
+        Number of deleted posts.
     """
 
-    id_list = get_post_type_ids(wordpress_path, content_type)
+    deleted = 0
+    previous_ids = None
 
-    cli.call_subprocess(commands.get("wpcli_post_delete_post_type").format(
-        id_list=id_list,
+    while True:
+        ids = get_post_type_ids(wordpress_path, content_type, chunk_size)
+        if not ids:
+            break
+
+        # If the same posts are listed again, the last chunk was not deleted
+        if ids == previous_ids:
+            logging.error(literals.get("wp_wpcli_post_delete_post_type_stalled_err").format(
+                post_type=content_type, deleted=deleted))
+            break
+        previous_ids = ids
+
+        wp_cli_session.call_subprocess(commands.get("wpcli_post_delete_post_type").format(
+            id_list=" ".join(ids),
+            path=wordpress_path,
+            debug_info=convert_wp_parameter_debug(debug_info)),
+            log_before_err=[literals.get("wp_wpcli_post_delete_post_type_err").format(post_type=content_type)])
+
+        deleted += len(ids)
+        logging.info(literals.get("wp_wpcli_post_delete_post_type_chunk").format(
+            deleted=deleted, post_type=content_type, rate=deleted / max(time.perf_counter() - start, 1e-6)))
+
+        if len(ids) < chunk_size:
+            break
+
+    return deleted
+
+
+def delete_post_type_content_sql(wordpress_path: str, content_type: str, debug_info: bool) -> int:
+    """Deletes the posts of a post type with their metadata, term
+    relationships and comments using a single SQL statement.
+
+    Args:
+        wordpress_path: Path to WordPress files.
+        content_type: Type of the content to be deleted
+        debug_info: If true, --debug will be added to the command showing all debug trace information.
+
+    Returns:
+        Number of deleted posts.
+    """
+
+    output = wp_cli_session.call_subprocess_with_result(commands.get("wpcli_post_delete_post_type_sql").format(
+        script=DELETE_POST_TYPE_SCRIPT_PATH.as_posix(),
+        post_type=content_type,
         path=wordpress_path,
-        debug_info=convert_wp_parameter_debug(debug_info)),
-        log_before_out=[literals.get("wp_wpcli_post_delete_post_type_before").format(post_type=content_type)],
-        log_before_err=[literals.get("wp_wpcli_post_delete_post_type_err").format(post_type=content_type)])
+        debug_info=convert_wp_parameter_debug(debug_info)))
+
+    try:
+        return int(output.strip())
+    except (AttributeError, ValueError):
+        logging.error(literals.get("wp_wpcli_post_delete_post_type_err").format(post_type=content_type))
+        return 0
+
+
+def delete_posts(post_ids: list, wordpress_path: str, debug_info: bool = False,
+                 chunk_size: int = wp_constants.post_delete_chunk_size):
+    """Deletes posts by id, chunk_size posts at a time.
+
+    Args:
+        post_ids: Ids of the posts to be deleted.
+        wordpress_path: Path to WordPress files.
+        debug_info: If true, --debug will be added to the command showing all debug trace information.
+        chunk_size: Number of posts deleted by every wp post delete call.
+    """
 
+    for index in range(0, len(post_ids), chunk_size):
+        wp_cli_session.call_subprocess(commands.get("wpcli_post_delete_post_type").format(
+            id_list=" ".join(str(post_id) for post_id in post_ids[index:index + chunk_size]),
+            path=wordpress_path,
+            debug_info=convert_wp_parameter_debug(debug_info)),
+            log_before_err=[literals.get("wp_wpcli_post_delete_err")])
+
+
+def get_posts_for_wxr_import(post_types: list, wordpress_path: str, debug_info: bool = False) -> Union[list, None]:
+    """Lists the posts of some post types with the fields needed to compare
+    them with the items of a WXR file, in a single WP-CLI call.
+
+    Args:
+        post_types: Post type names to filter by.
+        wordpress_path: Path to WordPress files.
+        debug_info: If true, --debug will be added to the command showing all debug trace information.
+
+    Returns:
+        List with a dict per post with the ID, guid, post_type, post_title,
+        post_date_gmt and post_modified_gmt keys, or None if the posts could
+        not be listed.
+    """
+
+    return parse_json_list(wp_cli_session.call_subprocess_with_result(commands.get("wpcli_post_list_wxr").format(
+        post_types=",".join(post_types),
+        path=wordpress_path,
+        debug_info=convert_wp_parameter_debug(debug_info)
+    )))
 
-def get_post_type_ids(wordpress_path: str, post_type: str):
+
+def get_post_type_ids(wordpress_path: str, post_type: str, chunk_size: int = None) -> list:
     """Gets the ids for all the posts that match an specific post type.
 
     Args:
         wordpress_path: Path to WordPress files.
         post_type: Post type name to filter by.
+        chunk_size: If present, gets only the ids of the first chunk_size
+            posts.
+
+    Returns:
+        List of post ids, as strings.
     """
 
-    return cli.call_subprocess_with_result(commands.get("wpcli_post_list_ids").format(
-        post_type=post_type,
-        path=wordpress_path
-    ))
+    if chunk_size is None:
+        command = commands.get("wpcli_post_list_ids").format(post_type=post_type, path=wordpress_path)
+    else:
+        command = commands.get("wpcli_post_list_ids_chunk").format(
+            post_type=post_type, chunk_size=chunk_size, path=wordpress_path)
+
+    output = wp_cli_session.call_subprocess_with_result(command)
+    return output.split() if output else []
 
 
 def wordpress_is_downloaded(path: str) -> bool:
@@ -510,7 +667,7 @@ def wordpress_is_downloaded(path: str) -> bool:
         True if WordPress files are present at the specified path.
     """
 
-    version = cli.call_subprocess_with_result(commands.get("wpcli_core_version").format(path=path))
+    version = wp_cli_session.call_subprocess_with_result(commands.get("wpcli_core_version").format(path=path))
 
     if version:
         logging.warning(literals.get("wp_wpcli_core_version_already_downloaded")
@@ -534,7 +691,7 @@ def download_wordpress(destination_path: str, version: str, locale: str, skip_co
         debug: If present, --debug will be added to the command showing all debug trace information.
     """
     if not wordpress_is_downloaded(destination_path):
-        cli.call_subprocess(commands.get("wpcli_core_download").format(
+        wp_cli_session.call_subprocess(commands.get("wpcli_core_download").format(
             version=version,
             locale=locale,
             path=destination_path,
@@ -547,7 +704,8 @@ def download_wordpress(destination_path: str, version: str, locale: str, skip_co
             log_after_out=[
                 literals.get("wp_wpcli_downloading_wordpress_ok")],
             log_after_err=[
-                literals.get("wp_wpcli_downloading_wordpress_err")]
+                literals.get("wp_wpcli_downloading_wordpress_err")],
+            stream=True
         )
 
 
@@ -557,16 +715,20 @@ def eval_code(php_code: str, wordpress_path: str) -> str:
         php_code: Piece of php code to be evaluated
         wordpress_path: Path to WordPress files.
     """
-    return cli.call_subprocess_with_result(commands.get("wpcli_eval").format(
+    return wp_cli_session.call_subprocess_with_result(commands.get("wpcli_eval").format(
         php_code=php_code,
         path=wordpress_path))
 
 
-def export_database(wordpress_path: str, dump_file_path: str, debug: bool):
+def export_database(wordpress_path: str, dump_file_path: str, debug: bool, extended_insert: bool = None):
     """Exports a WordPress database to a dump file using WP-CLI.
 
     All parameters are obtained from a site configuration file.
 
+    If the dump file name ends with .gz or .zst, the dump is compressed while
+    it is produced. It is written to a .part file that is renamed when the
+    export finishes, so a failed export never leaves a truncated dump.
+
     For more information see:
         https://developer.wordpress.org/cli/commands/db/export/
 
@@ -574,13 +736,48 @@ def export_database(wordpress_path: str, dump_file_path: str, debug: bool):
         wordpress_path: Path to WordPress files.
         dump_file_path: Path to the destination dump file.
         debug: If present, --debug will be added to the command showing all debug trace information.
+        extended_insert: If True, rows are grouped in multi-row INSERT
+            statements, which is faster but makes the dump hard to diff. By
+            default only compressed dumps, which are not meant to be
+            versioned, use them.
     """
-    cli.call_subprocess(commands.get("wpcli_db_export").format(
-        core_dump_path=dump_file_path,
-        path=wordpress_path,
-        debug_info=convert_wp_parameter_debug(debug)),
-        log_before_out=[literals.get("wp_wpcli_db_export_before").format(path=dump_file_path)],
-        log_after_err=[literals.get("wp_wpcli_db_export_error")])
+
+    compression = filesystem.zip.get_compression(dump_file_path)
+    if extended_insert is None:
+        extended_insert = compression is not None
+
+    if compression is None:
+        wp_cli_session.call_subprocess(commands.get("wpcli_db_export").format(
+            core_dump_path=dump_file_path,
+            path=wordpress_path,
+            extended_insert=convert_wp_parameter_bool(extended_insert),
+            debug_info=convert_wp_parameter_debug(debug)),
+            log_before_out=[literals.get("wp_wpcli_db_export_before").format(path=dump_file_path)],
+            log_after_err=[literals.get("wp_wpcli_db_export_error")],
+            stream=True)
+        return
+
+    part_file_path = f"{dump_file_path}.part"
+    try:
+        with filesystem.zip.open_compressed(part_file_path, "wb", compression) as dump_file:
+            return_code = cli.pipe_subprocess(commands.get("wpcli_db_export_stdout").format(
+                path=wordpress_path,
+                extended_insert=convert_wp_parameter_bool(extended_insert),
+                debug_info=convert_wp_parameter_debug(debug)),
+                stdout=dump_file,
+                log_before_process=[literals.get("wp_wpcli_db_export_before").format(path=dump_file_path)],
+                log_after_err=[literals.get("wp_wpcli_db_export_error")])
+    except OSError as error:
+        logging.error(literals.get("wp_wpcli_db_export_error"))
+        logging.error(error)
+        return_code = 1
+
+    if return_code == 0:
+        os.replace(part_file_path, dump_file_path)
+        logging.info(literals.get("wp_wpcli_db_export_compressed").format(
+            path=dump_file_path, size=os.path.getsize(dump_file_path)))
+    elif os.path.exists(part_file_path):
+        os.remove(part_file_path)
 
 
 def export_content_to_wxr(wordpress_path: str, destination_path: str, wrx_file_suffix: str = None):
@@ -597,7 +794,7 @@ def export_content_to_wxr(wordpress_path: str, destination_path: str, wrx_file_s
     date = datetime.datetime.utcnow().strftime("%Y.%m.%d")
     suffix = "" if wrx_file_suffix is None else f"-{wrx_file_suffix}"
 
-    cli.call_subprocess(commands.get("wpcli_export").format(
+    wp_cli_session.call_subprocess(commands.get("wpcli_export").format(
         path=wordpress_path,
         destination_path=destination_path,
         date=date,
@@ -611,15 +808,34 @@ def import_database(wordpress_path: str, dump_file_path: str, debug: bool):
 
     All parameters are obtained from a site configuration file.
 
+    Dump files ending with .gz or .zst are decompressed while they are
+    imported.
+
     Args:
         wordpress_path: Path to WordPress files.
         dump_file_path: Path to dump file to be imported.
         debug: If present, --debug will be added to the command showing all debug trace information.
     """
-    cli.call_subprocess(commands.get("wpcli_db_import").format(
+    if filesystem.zip.get_compression(dump_file_path) is not None:
+        try:
+            with filesystem.zip.open_compressed(dump_file_path, "rb") as dump_file:
+                cli.pipe_subprocess(commands.get("wpcli_db_import_stdin").format(
+                    path=wordpress_path, debug_info=convert_wp_parameter_debug(debug)),
+                    stdin=dump_file,
+                    log_before_process=[literals.get("wp_wpcli_db_import_before"), dump_file_path],
+                    log_after_err=[literals.get("wp_wpcli_db_import_error")])
+        except OSError as error:
+            logging.error(literals.get("wp_wpcli_db_import_error"))
+            logging.error(error)
+        # The database was replaced, so no cached query result is valid anymore
+        wp_cli_cache.invalidate(commands.get("wpcli_db_import_stdin"))
+        return
+
+    wp_cli_session.call_subprocess(commands.get("wpcli_db_import").format(
         file=dump_file_path, path=wordpress_path, debug_info=convert_wp_parameter_debug(debug)),
-                        log_before_process=[literals.get("wp_wpcli_db_import_before"), dump_file_path],
-                        log_after_err=[literals.get("wp_wpcli_db_import_error")])
+        log_before_process=[literals.get("wp_wpcli_db_import_before"), dump_file_path],
+        log_after_err=[literals.get("wp_wpcli_db_import_error")],
+        stream=True)
 
 
 def import_wxr_content(wordpress_path: str, wxr_path: str, authors: str, debug: bool):
@@ -635,10 +851,11 @@ def import_wxr_content(wordpress_path: str, wxr_path: str, authors: str, debug:
         debug: If present, --debug will be added to the command showing all debug trace information.
 
     """
-    cli.call_subprocess(commands.get("wpcli_import").format(
+    wp_cli_session.call_subprocess(commands.get("wpcli_import").format(
         file=wxr_path, path=wordpress_path, authors=authors, debug_info=convert_wp_parameter_debug(debug)),
         log_before_process=[literals.get("wp_wpcli_import_before"), wxr_path],
-        log_after_err=[literals.get("wp_wpcli_import_error")])
+        log_after_err=[literals.get("wp_wpcli_import_error")],
+        stream=True)
 
 
 def install_theme(wordpress_path: str, source: str, activate: bool, debug: bool, theme_name: str):
@@ -658,13 +875,14 @@ def install_theme(wordpress_path: str, source: str, activate: bool, debug: bool,
        theme_name: Name of the theme to be installed (just used for log purposes)
 
     """
-    cli.call_subprocess(commands.get("wpcli_theme_install").format(
+    wp_cli_session.call_subprocess(commands.get("wpcli_theme_install").format(
         path=wordpress_path,
         source=source,
         activate=convert_wp_parameter_activate(activate),
         debug_info=convert_wp_parameter_debug(debug)),
         log_before_process=[literals.get("wp_wpcli_theme_install_before").format(theme_name=theme_name)],
-        log_after_err=[literals.get("wp_wpcli_theme_install_error").format(theme_name=theme_name)])
+        log_after_err=[literals.get("wp_wpcli_theme_install_error").format(theme_name=theme_name)],
+        stream=True)
 
 
 def install_plugin(plugin_name: str, wordpress_path: str, activate: bool, force: bool, source: str, debug: bool):
@@ -683,7 +901,7 @@ def install_plugin(plugin_name: str, wordpress_path: str, activate: bool, force:
                source: Source of the installation.
                debug: Adds optional --debug parameter in order to better track the command result.
            """
-    cli.call_subprocess(commands.get("wpcli_plugin_install").format(
+    wp_cli_session.call_subprocess(commands.get("wpcli_plugin_install").format(
         path=wordpress_path,
         activate=convert_wp_parameter_activate(activate),
         force=convert_wp_parameter_force(force),
@@ -691,7 +909,8 @@ def install_plugin(plugin_name: str, wordpress_path: str, activate: bool, force:
         debug_info=convert_wp_parameter_debug(debug)
     ),
         log_before_process=[literals.get("wp_wpcli_plugin_install_before").format(plugin_name=plugin_name)],
-        log_after_err=[literals.get("wp_wpcli_plugin_install_error").format(plugin_name=plugin_name)])
+        log_after_err=[literals.get("wp_wpcli_plugin_install_error").format(plugin_name=plugin_name)],
+        stream=True)
 
 
 def install_wordpress_core(wordpress_path: str, url: str, title: str, admin_user: str, admin_email: str,
@@ -713,7 +932,7 @@ def install_wordpress_core(wordpress_path: str, url: str, title: str, admin_user
             skip_email: --skip-mail parameter will send an email to the address specified if present.
             debug: Adds optional --debug parameter in order to better track the command result.
         """
-    cli.call_subprocess(commands.get("wpcli_core_install").format(
+    wp_cli_session.call_subprocess(commands.get("wpcli_core_install").format(
         path=wordpress_path,
         url=url,
         title=title,
@@ -727,6 +946,24 @@ def install_wordpress_core(wordpress_path: str, url: str, title: str, admin_user
     )
 
 
+def parse_json_list(output: str) -> Union[list, None]:
+    """Parses the output of a WP-CLI command that prints a JSON list.
+
+    Args:
+        output: Command output.
+
+    Returns:
+        The parsed list, or None if the output is empty or not a JSON list.
+    """
+
+    try:
+        result = json.loads(output) if output is not None else None
+    except ValueError:
+        return None
+
+    return result if isinstance(result, list) else None
+
+
 def reset_database(wordpress_path: str, quiet: bool, debug_info: bool):
     """Removes all WordPress core tables from the database using WP-CLI.
 
@@ -738,7 +975,7 @@ def reset_database(wordpress_path: str, quiet: bool, debug_info: bool):
         wordpress_path: Path to WordPress files.
         quiet: If True, no questions are asked.
     """
-    cli.call_subprocess(commands.get("wpcli_db_reset").format(
+    wp_cli_session.call_subprocess(commands.get("wpcli_db_reset").format(
         path=wordpress_path,
         yes=convert_wp_parameter_yes(quiet),
         debug_info=convert_wp_parameter_debug(debug_info)),
@@ -753,9 +990,9 @@ def reset_transients(wordpress_path: str):
         wordpress_path: Path to WordPress files.
     """
 
-    cli.call_subprocess(commands.get("wpcli_db_delete_transient").format(path=wordpress_path),
-                        log_before_out=[literals.get("wp_wpcli_delete_transients")],
-                        log_after_err=[literals.get("wp_wpcli_delete_transients_err")])
+    wp_cli_session.call_subprocess(commands.get("wpcli_db_delete_transient").format(path=wordpress_path),
+                                   log_before_out=[literals.get("wp_wpcli_delete_transients")],
+                                   log_after_err=[literals.get("wp_wpcli_delete_transients_err")])
 
 
 def set_configuration_value(name: str, value: str, value_type: ValueType, wordpress_path: str, raw: bool, debug: bool):
@@ -773,7 +1010,7 @@ def set_configuration_value(name: str, value: str, value_type: ValueType, wordpr
             raw: Toggles --raw as parameter that decides if value will placed as it gets, without quotes
             debug: Toggles --debug_info as a parameter inside the command.
     """
-    cli.call_subprocess(commands.get("wpcli_config_set").format(
+    wp_cli_session.call_subprocess(commands.get("wpcli_config_set").format(
         name=name,
         value=value,
         raw=convert_wp_parameter_raw(raw),
@@ -784,6 +1021,92 @@ def set_configuration_value(name: str, value: str, value_type: ValueType, wordpr
     )
 
 
+def set_posts_modified(posts: list, wordpress_path: str, debug_info: bool):
+    """Sets the modification date of many posts in a single WP-CLI call.
+
+    Args:
+        posts: List of dicts with the guid, post_type, post_title,
+            post_date_gmt, post_modified and post_modified_gmt keys.
+        wordpress_path: Path to WordPress files.
+        debug_info: If true, --debug will be added to the command showing all debug trace information.
+    """
+
+    with temporary_json_file(posts) as posts_file_path:
+        wp_cli_session.call_subprocess(commands.get("wpcli_eval_file_post_modified").format(
+            script=SET_POST_MODIFIED_SCRIPT_PATH.as_posix(),
+            posts_file=posts_file_path,
+            path=wordpress_path,
+            debug_info=convert_wp_parameter_debug(debug_info)),
+            log_after_err=[literals.get("wp_wpcli_post_modified_err")])
+
+
+@contextlib.contextmanager
+def temporary_json_file(data):
+    """Writes data to a temporary JSON file that exists while the context is
+    active. Used to pass bulk data to WP-CLI scripts.
+
+    Args:
+        data: Data to be serialized.
+
+    Yields:
+        Path to the temporary file, in POSIX format.
+    """
+
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as json_file:
+        json.dump(data, json_file)
+
+    try:
+        yield pathlib.Path(json_file.name).as_posix()
+    finally:
+        os.remove(json_file.name)
+
+
+def update_options(changes: list, wordpress_path: str, debug_info: bool):
+    """Adds and updates many options at the wp_options (*) table in the
+    WordPress database in a single WP-CLI call.
+
+    (*) wp_ prefix could change, but this function will work anyway because
+        its value is obtained from the wp-config.php configuration file.
+
+    Args:
+        changes: Options to be changed, as dicts with action (add or update),
+            name, value and autoload keys.
+        wordpress_path: Path to WordPress files.
+        debug_info: Toggles debug info on the command.
+    """
+
+    with temporary_json_file(changes) as changes_file_path:
+        wp_cli_session.call_subprocess(commands.get("wpcli_eval_file_options").format(
+            script=UPDATE_OPTIONS_SCRIPT_PATH.as_posix(),
+            changes_file=changes_file_path,
+            path=wordpress_path,
+            debug_info=convert_wp_parameter_debug(debug_info)),
+            log_before_process=[literals.get("wp_wpcli_option_bulk_before").format(
+                count=len(changes),
+                added=len([change for change in changes if change["action"] == "add"]),
+                updated=len([change for change in changes if change["action"] == "update"]))],
+            log_after_err=[literals.get("wp_wpcli_option_bulk_error")])
+
+
+def update_permalink_structure(structure: str, wordpress_path: str, debug_info: bool):
+    """Updates the permalink structure using WP-CLI.
+
+    For more information see:
+        https://developer.wordpress.org/cli/commands/rewrite/structure/
+
+    Args:
+        structure: Permalink structure.
+        wordpress_path: Path to WordPress files.
+        debug_info: Toggles debug info on the command.
+    """
+
+    wp_cli_session.call_subprocess(commands.get("wpcli_rewrite_structure").format(
+        structure=structure,
+        path=wordpress_path,
+        debug_info=convert_wp_parameter_debug(debug_info)
+    ))
+
+
 def update_database_option(option_name: str, option_value: str, wordpress_path: str,
                            debug_info: bool, autoload: bool = False):
     """Updates an option at the wp_options (*) table in the WordPress
@@ -807,7 +1130,7 @@ def update_database_option(option_name: str, option_value: str, wordpress_path:
 
     # Update the option if the new value is different than the existing one
     if option_exists and existing_option_value != option_value:
-        cli.call_subprocess(commands.get("wpcli_option_update").format(
+        wp_cli_session.call_subprocess(commands.get("wpcli_option_update").format(
             option_name=option_name,
             option_value=option_value,
             autoload=convert_wp_parameter_autoload(autoload),
@@ -825,9 +1148,9 @@ def update_database_option(option_name: str, option_value: str, wordpress_path:
 
 def wp_cli_info():
     """Executes wp info command and logs output based on the result. """
-    cli.call_subprocess(commands.get("wpcli_info"),
-                        log_before_out=[literals.get("wp_wpcli_install_ok"), literals.get("wp_wpcli_info")],
-                        log_after_out=[literals.get("wp_wpcli_add_ev")])
+    wp_cli_session.call_subprocess(commands.get("wpcli_info"),
+                                   log_before_out=[literals.get("wp_wpcli_install_ok"), literals.get("wp_wpcli_info")],
+                                   log_after_out=[literals.get("wp_wpcli_add_ev")])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,200 @@
+"""Memoization of the read-only WP-CLI queries of a run.
+
+The same question is often asked to WP-CLI several times in a run (e.g.
+add_update_option checks if an option exists and add_database_option checks
+it again). While the cache is active, the result of a read-only query is
+reused until a command that may change what it reads is run or until it
+expires:
+
+    with wp_cli_cache.cached_queries():
+        wptools.add_wp_options(options, wordpress_path)
+
+Queries are told apart by their template key (see core.CommandsCore.Command)
+and commands without a key are never cached. Commands that are not known
+queries are writes: the known ones forget the queries of the entities they
+change and the rest forget every query.
+"""
+
+import contextlib
+import logging
+import threading
+import time
+import project_types.wordpress.constants as constants
+from core.app import App
+from core.LiteralsCore import LiteralsCore
+from project_types.wordpress.Literals import Literals as WordpressLiterals
+from typing import Callable, Dict, NamedTuple, Tuple, Union
+
+app: App = App()
+literals = LiteralsCore([WordpressLiterals])
+
+# Read-only queries, with the entity they read
+QUERIES = {
+    "wpcli_core_version": "core",
+    "wpcli_option_get": "option",
+    "wpcli_option_list": "option",
+    "wpcli_post_list_ids": "post",
+    "wpcli_post_list_ids_chunk": "post",
+    "wp_user_get": "user",
+    "wp_user_list": "user",
+}
+
+# Writes with the entities they change. Other commands change every entity
+WRITES = {
+    "wpcli_core_download": ("core",),
+    "wpcli_db_export": (),
+    "wpcli_db_export_stdout": (),
+    "wpcli_db_export_table_data": (),
+    "wpcli_db_export_table_schema": (),
+    "wpcli_db_tables": (),
+    "wpcli_eval_file_options": ("option",),
+    "wpcli_eval_file_post_modified": ("post",),
+    "wpcli_option_add": ("option",),
+    "wpcli_option_update": ("option",),
+    "wpcli_post_delete_post_type": ("post",),
+    "wpcli_post_delete_post_type_sql": ("post",),
+    "wpcli_rewrite_structure": ("option",),
+    "wp_user_create": ("user",),
+    "wp_user_create_bulk": ("user",),
+}
+
+_active_cache: Union["QueryCache", None] = None
+
+
+class CachedResult(NamedTuple):
+    """Result of a query, with the entity it read"""
+    entity: str
+    expires: float
+    result: Union[str, None]
+
+
+class QueryCache(object):
+    """Results of the read-only WP-CLI queries, by command."""
+
+    def __init__(self, ttl: float = constants.wpcli_query_cache_ttl):
+        """
+        Args:
+            ttl: Seconds a result is reused.
+        """
+
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._results: Dict[str, CachedResult] = {}
+        self._lock = threading.Lock()
+
+    def call(self, command: str, run: Callable[[str], Union[str, None]]) -> Union[str, None]:
+        """Gets the result of a query from the cache, running it if it is not
+        there. Other commands are always run and forget the queries they may
+        change.
+
+        Args:
+            command: Command to be executed.
+            run: Function that runs the command and returns its stdout.
+        """
+
+        entity = QUERIES.get(getattr(command, "key", None))
+        if entity is None:
+            try:
+                return run(command)
+            finally:
+                self.invalidate(command)
+
+        with self._lock:
+            cached = self._results.get(command)
+            if cached is not None and cached.expires > time.monotonic():
+                self.hits += 1
+                return cached.result
+
+        result = run(command)
+        with self._lock:
+            self.misses += 1
+            self._results[command] = CachedResult(entity, time.monotonic() + self.ttl, result)
+        return result
+
+    def clear(self):
+        """Forgets every query."""
+
+        with self._lock:
+            self._results.clear()
+
+    def invalidate(self, command: str):
+        """Forgets the queries that a command may change.
+
+        Args:
+            command: Command that was executed.
+        """
+
+        key = getattr(command, "key", None)
+        if key in QUERIES:
+            return
+        if key not in WRITES:
+            self.clear()
+            return
+
+        entities = WRITES[key]
+        with self._lock:
+            for cached_command in [cached_command for cached_command, cached in self._results.items()
+                                   if cached.entity in entities]:
+                del self._results[cached_command]
+
+    def get_statistics(self) -> Tuple[int, int]:
+        """Gets the number of queries answered from the cache (calls saved)
+        and the number of queries run."""
+
+        return self.hits, self.misses
+
+
+@contextlib.contextmanager
+def cached_queries(ttl: float = constants.wpcli_query_cache_ttl):
+    """Caches the read-only WP-CLI queries while the context is active and
+    logs how many calls were saved when it ends.
+
+    Args:
+        ttl: Seconds a result is reused.
+    """
+
+    global _active_cache
+
+    previous_cache = _active_cache
+    _active_cache = QueryCache(ttl)
+    try:
+        yield _active_cache
+    finally:
+        hits, misses = _active_cache.get_statistics()
+        logging.info(literals.get("wp_wpcli_query_cache_statistics").format(hits=hits, misses=misses))
+        _active_cache = previous_cache
+
+
+def get_active_cache() -> Union[QueryCache, None]:
+    """Gets the cache activated by cached_queries(), if any."""
+    return _active_cache
+
+
+def call(command: str, run: Callable[[str], Union[str, None]]) -> Union[str, None]:
+    """Runs a command through the active cache, if any (see QueryCache.call).
+
+    Args:
+        command: Command to be executed.
+        run: Function that runs the command and returns its stdout.
+    """
+
+    if _active_cache is None:
+        return run(command)
+    return _active_cache.call(command, run)
+
+
+def invalidate(command: str):
+    """Forgets the cached queries that a command may change, if the cache is
+    active.
+
+    Args:
+        command: Command that was executed.
+    """
+
+    if _active_cache is not None:
+        _active_cache.invalidate(command)
+
+
+if __name__ == "__main__":
+    help(__name__)
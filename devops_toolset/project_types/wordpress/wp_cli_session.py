@@ -0,0 +1,326 @@
+"""Long-lived WP-CLI session that runs many commands with a single WordPress
+bootstrap.
+
+Every wp command launched by wp_cli.py is a new PHP process that boots
+WordPress from scratch. While a session is open, the commands that run
+against the session's WordPress installation are sent to one `wp eval-file`
+process instead (see wp-cli-session.php), and the rest keep using
+tools.cli. The wp_cli functions do not need to know about it:
+
+    with wp_cli_session.session(wordpress_path):
+        wptools.add_wp_options(options, wordpress_path)
+"""
+
+import contextlib
+import json
+import logging
+import os
+import pathlib
+import re
+import subprocess
+import threading
+import core.log_tools
+import project_types.wordpress.wp_cli_cache as wp_cli_cache
+import tools.cli as cli
+import tools.tracing as tracing
+from core.app import App
+from core.CommandsCore import CommandsCore
+from core.LiteralsCore import LiteralsCore
+from project_types.wordpress.Literals import Literals as WordpressLiterals
+from project_types.wordpress.commands import Commands as WordpressCommands
+from typing import NamedTuple, Union
+
+app: App = App()
+literals = LiteralsCore([WordpressLiterals])
+commands = CommandsCore([WordpressCommands])
+
+SESSION_SCRIPT_PATH = pathlib.Path(os.path.dirname(os.path.realpath(__file__)), "wp-cli-session.php")
+
+# WP-CLI commands that need a bootstrapped WordPress and can run in-process
+SESSION_COMMANDS = {"config", "eval", "eval-file", "option", "plugin", "post", "rewrite", "theme", "transient", "user"}
+
+_path_argument_regex = re.compile(r"\s--path=(\"[^\"]*\"|\S+)")
+_debug_argument_regex = re.compile(r"\s--debug(?=\s|$)")
+
+_active_session: Union["WpCliSession", None] = None
+
+
+class WpCliResult(NamedTuple):
+    """Result of a WP-CLI command run in a session"""
+    stdout: str
+    stderr: str
+    return_code: int
+
+
+class WpCliSession(object):
+    """WP-CLI process that keeps WordPress loaded between commands."""
+
+    def __init__(self, wordpress_path: str):
+        """Starts the WP-CLI session process and waits for WordPress to boot.
+
+        Args:
+            wordpress_path: Path to the WordPress installation.
+
+        Raises:
+            ConnectionError: If the session process could not be started.
+        """
+
+        self.wordpress_path = _normalize_path(wordpress_path)
+        self.commands_count = 0
+        self._lock = threading.Lock()
+
+        command = commands.get("wpcli_eval_file_session").format(
+            script=SESSION_SCRIPT_PATH.as_posix(), path=wordpress_path)
+        logging.info(literals.get("wp_wpcli_session_starting").format(path=wordpress_path))
+        self._process = subprocess.Popen(command, shell=True, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                         stderr=subprocess.PIPE, universal_newlines=True, encoding="utf-8")
+
+        # stderr must be drained, or a chatty bootstrap could block the process
+        self._stderr_reader = threading.Thread(target=self._log_stderr, daemon=True)
+        self._stderr_reader.start()
+
+        ready = self._read_response()
+        if not ready or not ready.get("ready"):
+            self.close()
+            raise ConnectionError(literals.get("wp_wpcli_session_start_err").format(path=wordpress_path))
+
+    def accepts(self, command: str) -> bool:
+        """Determines if a command can be run in this session.
+
+        Args:
+            command: Full WP-CLI command line, as built from the Commands
+                templates (e.g. wp option get siteurl --path=/path).
+
+        Returns:
+            True if the command targets this session's WordPress installation
+            and it does not need a process on its own.
+        """
+
+        arguments = command.strip().split(maxsplit=2)
+        if len(arguments) < 2 or arguments[0] != "wp" or arguments[1] not in SESSION_COMMANDS:
+            return False
+
+        path_match = _path_argument_regex.search(command)
+        return path_match is not None and _normalize_path(path_match.group(1)) == self.wordpress_path
+
+    def run(self, command: str) -> WpCliResult:
+        """Runs a WP-CLI command in the session.
+
+        Args:
+            command: Full WP-CLI command line. The wp prefix and the global
+                --path and --debug arguments are removed before sending it.
+
+        Returns:
+            The command stdout, stderr and return code.
+
+        Raises:
+            ConnectionError: If the session process is not running anymore.
+        """
+
+        session_command = _debug_argument_regex.sub("", _path_argument_regex.sub("", command.strip()))
+        session_command = session_command[len("wp "):]
+
+        with self._lock:
+            try:
+                self._process.stdin.write(json.dumps({"command": session_command}) + "\n")
+                self._process.stdin.flush()
+            except OSError as error:
+                raise ConnectionError(literals.get("wp_wpcli_session_closed_err")) from error
+
+            response = self._read_response()
+            if response is None:
+                raise ConnectionError(literals.get("wp_wpcli_session_closed_err"))
+            self.commands_count += 1
+
+        return WpCliResult(response.get("stdout") or "", response.get("stderr") or "",
+                           int(response.get("return_code") or 0))
+
+    def close(self):
+        """Ends the session process."""
+
+        if self._process.stdin and not self._process.stdin.closed:
+            with contextlib.suppress(OSError):
+                self._process.stdin.close()
+        try:
+            self._process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+        self._stderr_reader.join(timeout=5)
+        logging.info(literals.get("wp_wpcli_session_closed").format(count=self.commands_count))
+
+    def _read_response(self) -> Union[dict, None]:
+        """Reads the next JSON response line, skipping anything else the
+        bootstrap may have printed.
+
+        Returns:
+            The parsed response or None if the process output was closed.
+        """
+
+        for line in iter(self._process.stdout.readline, ""):
+            try:
+                response = json.loads(line)
+            except ValueError:
+                logging.debug(line.rstrip("\n"))
+                continue
+            if isinstance(response, dict):
+                return response
+        return None
+
+    def _log_stderr(self):
+        """Logs the session process stderr as debug information."""
+
+        for line in iter(self._process.stderr.readline, ""):
+            logging.debug(line.rstrip("\n"))
+
+
+@contextlib.contextmanager
+def session(wordpress_path: str):
+    """Opens a WP-CLI session for a WordPress installation while the context
+    is active.
+
+    If the session cannot be started, commands keep running in their own
+    process as usual.
+
+    Args:
+        wordpress_path: Path to the WordPress installation.
+    """
+
+    global _active_session
+
+    previous_session = _active_session
+    try:
+        opened_session = WpCliSession(wordpress_path)
+    except (ConnectionError, OSError) as error:
+        logging.warning(literals.get("wp_wpcli_session_fallback").format(error=error))
+        opened_session = None
+
+    _active_session = opened_session
+    try:
+        yield opened_session
+    finally:
+        if opened_session is not None:
+            opened_session.close()
+        _active_session = previous_session
+
+
+def get_active_session() -> Union[WpCliSession, None]:
+    """Gets the WP-CLI session opened by session(), if any."""
+    return _active_session
+
+
+def call_subprocess_with_result(command: str) -> str:
+    """Same as tools.cli.call_subprocess_with_result, running the command in
+    the active session if it accepts it. Read-only queries are answered from
+    the active query cache, if any (see wp_cli_cache).
+
+    Args:
+        command: Command to be executed.
+    """
+
+    return wp_cli_cache.call(command, _call_subprocess_with_result)
+
+
+def call_subprocess(command: str, **kwargs):
+    """Same as tools.cli.call_subprocess, running the command in the active
+    session if it accepts it.
+
+    Args:
+        command: Command to be executed.
+        kwargs: Logging hooks and stream flag, as in tools.cli.call_subprocess.
+    """
+
+    try:
+        _call_subprocess(command, **kwargs)
+    finally:
+        wp_cli_cache.invalidate(command)
+
+
+def _call_subprocess_with_result(command: str) -> str:
+    """Runs a command in the active session if it accepts it, in its own
+    process otherwise, and returns its stdout."""
+
+    result = _run_in_session(command)
+    if result is None:
+        return cli.call_subprocess_with_result(command)
+
+    if result.stdout:
+        return result.stdout
+
+
+def _call_subprocess(command: str, **kwargs):
+    """Runs a command in the active session if it accepts it, in its own
+    process otherwise, logging its output."""
+
+    session_accepts = _active_session is not None and _active_session.accepts(command)
+    if not session_accepts:
+        cli.call_subprocess(command, **kwargs)
+        return
+
+    core.log_tools.log_list([command], core.log_tools.LogLevel.debug)
+    core.log_tools.log_list(kwargs.get("log_before_process"), core.log_tools.LogLevel.info)
+
+    result = _run_in_session(command)
+    if result is None:
+        kwargs.pop("log_before_process", None)
+        cli.call_subprocess(command, **kwargs)
+        return
+
+    if result.stdout:
+        core.log_tools.log_list(kwargs.get("log_before_out"), core.log_tools.LogLevel.info)
+        core.log_tools.log_stdouterr(result.stdout.encode("utf-8"), core.log_tools.LogLevel.info)
+        core.log_tools.log_list(kwargs.get("log_after_out"), core.log_tools.LogLevel.info)
+
+    if result.stderr and result.return_code != 0:
+        core.log_tools.log_list(kwargs.get("log_before_err"), core.log_tools.LogLevel.error)
+        core.log_tools.log_stdouterr(result.stderr.encode("utf-8"), core.log_tools.LogLevel.error)
+        core.log_tools.log_list(kwargs.get("log_after_err"), core.log_tools.LogLevel.error)
+
+
+def _run_in_session(command: str) -> Union[WpCliResult, None]:
+    """Runs a command in the active session.
+
+    If the session process died (e.g. a plugin called exit()), the session is
+    discarded. Read-only queries (see wp_cli_cache.QUERIES) must then be run
+    in their own process. Other commands may have been applied before the
+    process died, so they are not run again and fail.
+
+    Args:
+        command: Command to be executed.
+
+    Returns:
+        The command result or None if it was not run in the session.
+    """
+
+    global _active_session
+
+    if _active_session is None or not _active_session.accepts(command):
+        return None
+
+    try:
+        with tracing.command_span(command) as span:
+            span.attributes["session"] = True
+            result = _active_session.run(command)
+            span.attributes.update(exit_code=result.return_code, stdout_bytes=len(result.stdout.encode("utf-8")),
+                                   stderr_bytes=len(result.stderr.encode("utf-8")))
+        return result
+    except ConnectionError as error:
+        logging.warning(literals.get("wp_wpcli_session_fallback").format(error=error))
+        _active_session = None
+        if getattr(command, "key", None) in wp_cli_cache.QUERIES:
+            return None
+        logging.error(literals.get("wp_wpcli_session_write_lost_err"))
+        return WpCliResult("", str(error), 1)
+
+
+def _normalize_path(path: str) -> str:
+    """Normalizes a path so paths written in different ways can be compared.
+
+    Args:
+        path: Path, optionally surrounded by double quotes.
+    """
+    return os.path.normcase(os.path.abspath(path.strip("\"")))
+
+
+if __name__ == "__main__":
+    help(__name__)
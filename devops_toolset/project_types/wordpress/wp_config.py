@@ -0,0 +1,203 @@
+"""Renders the wp-config.php WordPress configuration file natively.
+
+Creating the file with WP-CLI takes a `wp config create` process plus one
+`wp config set` process per setting. This module renders the same file in one
+pass from the environment configuration, so no PHP process is needed.
+"""
+
+import functools
+import logging
+import os
+import pathlib
+import secrets
+import string
+from core.app import App
+from core.LiteralsCore import LiteralsCore
+from project_types.wordpress.Literals import Literals as WordpressLiterals
+
+app: App = App()
+literals = LiteralsCore([WordpressLiterals])
+
+CLOUDFRONT_SNIPPET_PATH = pathlib.Path(os.path.dirname(os.path.realpath(__file__)), "default-files",
+                                       "default-cloudfront-forwarded-proto.php")
+
+# Keys and salts WordPress expects; the alphabet has no quotes nor backslashes, so values need no escaping
+SALT_NAMES = ["AUTH_KEY", "SECURE_AUTH_KEY", "LOGGED_IN_KEY", "NONCE_KEY",
+              "AUTH_SALT", "SECURE_AUTH_SALT", "LOGGED_IN_SALT", "NONCE_SALT"]
+SALT_CHARACTERS = string.ascii_letters + string.digits + "!@#$%^&*()-_ []{}<>~`+=,.;:/?|"
+SALT_LENGTH = 64
+
+WP_CONFIG_TEMPLATE = """<?php
+/**
+ * The base configuration for WordPress
+ *
+ * This file has been generated by devops-toolset.
+ */
+
+// ** Database settings ** //
+{database}
+
+/**#@+
+ * Authentication unique keys and salts.
+ */
+{salts}
+/**#@-*/
+
+/**
+ * WordPress database table prefix.
+ */
+$table_prefix = {table_prefix};
+
+{settings}
+{snippets}
+/* That's all, stop editing! Happy publishing. */
+
+/** Absolute path to the WordPress directory. */
+if ( ! defined( 'ABSPATH' ) ) {{
+\tdefine( 'ABSPATH', __DIR__ . '/' );
+}}
+
+/** Sets up WordPress vars and included files. */
+require_once ABSPATH . 'wp-settings.php';
+"""
+
+
+def convert_php_value(value, raw: bool) -> str:
+    """Converts a value to its PHP source representation.
+
+    Args:
+        value: Value to be converted.
+        raw: If True the value is placed as it is, without quotes (as
+            wp config set --raw does). Booleans and None are converted to
+            their PHP literals.
+
+    Returns:
+        PHP representation of the value.
+    """
+
+    if not raw:
+        return "'" + str(value).replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return "null"
+    return str(value)
+
+
+def convert_php_setting(name: str, value, value_type: str, raw: bool) -> str:
+    """Converts a setting to a PHP constant definition or variable assignment.
+
+    Args:
+        name: Name of the constant or variable.
+        value: Value of the setting.
+        value_type: constant or variable.
+        raw: If True the value is placed without quotes.
+
+    Returns:
+        PHP statement that sets the value.
+    """
+
+    php_value = convert_php_value(value, raw)
+
+    if value_type == "variable":
+        return f"${name} = {php_value};"
+    return f"define( {convert_php_value(name, False)}, {php_value} );"
+
+
+def generate_salts() -> dict:
+    """Generates random authentication keys and salts.
+
+    Returns:
+        Dict with the salt values by constant name.
+    """
+    return {name: "".join(secrets.choice(SALT_CHARACTERS) for _ in range(SALT_LENGTH)) for name in SALT_NAMES}
+
+
+@functools.lru_cache(maxsize=None)
+def get_snippet_cloudfront() -> str:
+    """Gets the HTTP_CLOUDFRONT_FORWARDED_PROTO snippet from its default file.
+
+    Returns:
+        HTTP_CLOUDFRONT_FORWARDED_PROTO snippet as a string.
+    """
+
+    with open(CLOUDFRONT_SNIPPET_PATH, "r") as snippet_file:
+        return snippet_file.read()
+
+
+def render_configuration_file(environment_config: dict, db_user_password: str, aws_cloudfront: bool = False,
+                              salts: dict = None) -> str:
+    """Renders the content of the wp-config.php file.
+
+    Values that are not strings are placed without quotes, as
+    set_wordpress_config_from_configuration_file does with wp config set.
+
+    Args:
+        environment_config: Parsed environment configuration.
+        db_user_password: Database user password.
+        aws_cloudfront: If True adds the HTTP_CLOUDFRONT_FORWARDED_PROTO
+            snippet.
+        salts: Authentication keys and salts by name. Random ones are
+            generated if not passed.
+
+    Returns:
+        wp-config.php file content.
+    """
+
+    database = environment_config["database"]
+    database_settings = [
+        ("DB_NAME", database["db_name"]),
+        ("DB_USER", database["db_user"]),
+        ("DB_PASSWORD", db_user_password),
+        ("DB_HOST", database["host"]),
+        ("DB_CHARSET", database["charset"]),
+        ("DB_COLLATE", database["collate"]),
+    ]
+
+    if salts is None:
+        salts = generate_salts()
+
+    settings = []
+    for prop in environment_config["wp_config"].values():
+        value = prop.get("value")
+        settings.append(convert_php_setting(prop.get("name"), value, prop.get("type"), type(value) != str))
+
+    snippets = [get_snippet_cloudfront().rstrip("\n") + "\n"] if aws_cloudfront else []
+
+    return WP_CONFIG_TEMPLATE.format(
+        database="\n".join(convert_php_setting(name, value, "constant", False) for name, value in database_settings),
+        salts="\n".join(convert_php_setting(name, value, "constant", False) for name, value in salts.items()),
+        table_prefix=convert_php_value(database["table_prefix"], False),
+        settings="\n".join(settings) + "\n",
+        snippets="\n".join(snippets))
+
+
+def write_configuration_file(environment_config: dict, wordpress_path: str, db_user_password: str,
+                             aws_cloudfront: bool = False) -> pathlib.Path:
+    """Writes the wp-config.php file rendered by render_configuration_file.
+
+    Args:
+        environment_config: Parsed environment configuration.
+        wordpress_path: Path to WordPress files.
+        db_user_password: Database user password.
+        aws_cloudfront: If True adds the HTTP_CLOUDFRONT_FORWARDED_PROTO
+            snippet.
+
+    Returns:
+        Path to the wp-config.php file.
+    """
+
+    file_path = pathlib.Path.joinpath(pathlib.Path(wordpress_path), "wp-config.php")
+    content = render_configuration_file(environment_config, db_user_password, aws_cloudfront)
+
+    with open(file_path, "w", encoding="utf-8", newline="\n") as config_file:
+        config_file.write(content)
+
+    logging.info(literals.get("wp_config_rendered").format(path=file_path,
+                                                           count=len(environment_config["wp_config"])))
+    return file_path
+
+
+if __name__ == "__main__":
+    help(__name__)
@@ -2,6 +2,7 @@
 import filesystem.parsers as parsers
 import filesystem
 import project_types.node.npm as npm
+import filesystem.artifact_cache as artifact_cache
 import filesystem.paths as paths
 import filesystem.tools
 import filesystem.zip
@@ -73,7 +74,8 @@ def build_theme(themes_config: dict, theme_path: str, root_path: str):
             path=theme_path_dist
         ), log_before_out=[literals.get("wp_gulp_build_before").format(theme_slug=theme_slug)],
             log_after_out=[literals.get("wp_gulp_build_after").format(theme_slug=theme_slug)],
-            log_after_err=[literals.get("wp_gulp_build_error").format(theme_slug=theme_slug)])
+            log_after_err=[literals.get("wp_gulp_build_error").format(theme_slug=theme_slug)],
+            stream=True)
 
         # Zip dist
         filesystem.zip.zip_directory(theme_path_dist.as_posix(), theme_path_zip.as_posix(), f"{theme_slug}/")
@@ -193,7 +195,8 @@ def download_wordpress_theme(theme_config: dict, destination_path: str, **kwargs
             logging.warning(platform_literals.get("azdevops_token_not_found"))
             logging.warning(platform_literals.get("azdevops_download_package_manually"))
     elif source_type == "url":
-        paths.download_file(theme_config["source"], destination_path, f"{theme_config['name']}.zip")
+        artifact_cache.download_file(theme_config["source"], destination_path, f"{theme_config['name']}.zip",
+                                     version=theme_config.get("version"), checksum=theme_config.get("checksum"))
 
 
 def get_themes_path_from_root_path(root_path: str, constants: dict) -> str:
@@ -251,8 +254,8 @@ def install_themes_from_configuration_file(site_configuration: dict, environment
         logging.info(literals.get("wp_theme_path").format(path=theme_path))
         theme["source"] = theme_path
 
-        # Download theme if needed
-        if theme["source_type"] in ["url", "feed"]:
+        # Download theme if needed (and not prefetched, see prefetch.py)
+        if theme["source_type"] in ["url", "feed"] and "prefetched_source" not in theme:
             download_wordpress_theme(theme, str(themes_path), **kwargs)
 
         # Get template for the theme if it has one
@@ -279,7 +282,7 @@ def install_themes_from_configuration_file(site_configuration: dict, environment
     if not skip_partial_dumps:
         database_path = pathlib.Path.joinpath(root_path_obj, global_constants["paths"]["database"])
         core_dump_path_converted = wptools.convert_wp_config_token(
-            site_configuration["database"]["dumps"]["theme"], wordpress_path)
+            site_configuration["database"]["dumps"]["theme"], wordpress_path, site_configuration)
         database_core_dump_path = pathlib.Path.joinpath(database_path, core_dump_path_converted)
         wptools.export_database(site_configuration, wordpress_path, database_core_dump_path.as_posix())
 
@@ -1,21 +1,29 @@
 """Contains several tools for WordPress"""
+import datetime
+import functools
 import json
 import logging
 import os
 import pathlib
 import stat
 import sys
+import tempfile
 import tools.dicts
+import zoneinfo
 from typing import List, Tuple
 
-import requests
-
 import core.log_tools
+import filesystem.artifact_cache as artifact_cache
 import filesystem.paths as paths
 import filesystem.tools
 import project_types.wordpress.constants as wp_constants
+import project_types.wordpress.database as database
+import project_types.wordpress.php_date as php_date
 import project_types.wordpress.wp_cli as wp_cli
+import project_types.wordpress.wp_config as wp_config
+import project_types.wordpress.wxr as wxr
 import tools.git as git_tools
+import tools.http_client as http_client
 from core.CommandsCore import CommandsCore
 from core.LiteralsCore import LiteralsCore
 from core.app import App
@@ -34,32 +42,88 @@ platform_literals = LiteralsCore([PlatformLiterals])
 commands = CommandsCore([WordpressCommands])
 
 
-def add_wp_options(wp_options: dict, wordpress_path: str, debug: bool = False):
+def add_wp_options(wp_options: dict, wordpress_path: str, debug: bool = False, bulk: bool = False):
     """Adds or updates WordPress options in the wp_options table
 
     Args:
         wp_options: WordPress options.
         wordpress_path: Path to the WordPress installation.
         debug: If True logs debug information.
+        bulk: If True reads all existing options at once and applies only the
+            changed ones in a single WP-CLI call, instead of checking and
+            setting every option on its own.
     """
+
+    existing_options = wp_cli.get_options(wordpress_path, debug) if bulk else None
+
+    if bulk and existing_options is None:
+        logging.warning(literals.get("wp_wpcli_option_list_error"))
+
+    if existing_options is None:
+        for option in wp_options:
+            wp_cli.add_update_option(option, wordpress_path, debug)
+        return
+
+    changes = get_wp_options_changes(wp_options, existing_options)
+    if len(changes) == 0:
+        logging.info(literals.get("wp_wpcli_option_bulk_no_changes"))
+        return
+
+    wp_cli.update_options(changes, wordpress_path, debug)
+
+    for change in changes:
+        if change["name"] == "permalink_structure":
+            wp_cli.update_permalink_structure(change["value"], wordpress_path, debug)
+
+
+def get_wp_options_changes(wp_options: dict, existing_options: dict) -> List[dict]:
+    """Gets the minimal list of changes needed to set the WordPress options.
+
+    Args:
+        wp_options: WordPress options from the site configuration.
+        existing_options: Option values by option name, as they are in the
+            database.
+
+    Returns:
+        List of changes (dicts with action, name, value and autoload keys)
+        for the options that do not exist or have a different value.
+    """
+
+    changes = []
     for option in wp_options:
-        wp_cli.add_update_option(option, wordpress_path, debug)
+        value = str(option["value"]) if option["value"] is not None else None
+
+        if option["name"] not in existing_options:
+            if wp_cli.check_if_option_is_valid(option["name"], value, option["autoload"]):
+                changes.append({"action": "add", "name": option["name"], "value": value,
+                                "autoload": bool(option["autoload"])})
+        elif existing_options[option["name"]] != value:
+            changes.append({"action": "update", "name": option["name"], "value": value,
+                            "autoload": bool(option["autoload"])})
+        else:
+            logging.warning(literals.get("wp_wpcli_option_skipping").format(option_name=option["name"]))
+
+    return changes
 
 
-def convert_wp_config_token(token: str, wordpress_path: str) -> str:
+def convert_wp_config_token(token: str, wordpress_path: str, site_configuration: dict = None) -> str:
     """ Replaces [] tokens inside configuration parameters using php syntax
 
+    Dates are formatted natively, in the site timezone if site_configuration
+    is passed (see get_site_timezone), so no PHP process is needed.
+
     Args:
         token: The token to replace (for example: [date|Y.m.d-Hisve])
         wordpress_path: Wordpress installation path
+        site_configuration: Parsed site configuration.
     """
     result = token
     # parse token [date|Y.m.d-Hisve]
     if token.find("[date|") != -1:
         date_format = token[token.find("[date|") + 1:token.find("]")]
         date_token = date_format.split("|")[1]
-        result = result.replace(
-            "[" + date_format + "]", wp_cli.eval_code("echo date('" + date_token + "');", wordpress_path))
+        timezone = get_site_timezone(site_configuration) if site_configuration else datetime.timezone.utc
+        result = result.replace("[" + date_format + "]", php_date.format_date(date_token, timezone=timezone))
     # NOTE: Add more tokens if needed
     return result
 
@@ -106,7 +170,7 @@ def create_configuration_file(environment_configuration: dict, wordpress_path: s
                                      )
 
 
-def create_users(users: dict, wordpress_path: str, debug: bool):
+def create_users(users: dict, wordpress_path: str, debug: bool, bulk: bool = False):
     """Creates WordPress users.
 
     Args:
@@ -114,8 +178,20 @@ def create_users(users: dict, wordpress_path: str, debug: bool):
             https://dev.aheadlabs.com/schemas/json/wordpress-site-schema.json
         wordpress_path: Path to WordPress files.
         debug: If present, --debug will be added to the command showing all debug trace information.
+        bulk: If True lists the existing users once and creates the missing
+            ones in a single WP-CLI call, instead of checking and creating
+            every user on its own.
     """
 
+    existing_logins = wp_cli.get_user_logins(wordpress_path, debug) if bulk else None
+
+    if bulk and existing_logins is None:
+        logging.warning(literals.get("wp_wpcli_user_list_error"))
+
+    if existing_logins is not None:
+        create_users_bulk(users, existing_logins, wordpress_path, debug)
+        return
+
     for user in users:
         # Create the user if does not exist
         if not wp_cli.user_exists(user["user_login"], wordpress_path, debug):
@@ -126,6 +202,41 @@ def create_users(users: dict, wordpress_path: str, debug: bool):
             logging.warning(literals.get("wp_wpcli_user_exists").format(user=user["user_login"]))
 
 
+def create_users_bulk(users: dict, existing_logins: set, wordpress_path: str, debug: bool):
+    """Creates the WordPress users that do not exist in a single WP-CLI call.
+
+    Args:
+        users: Users based on #/definitions/user at
+            https://dev.aheadlabs.com/schemas/json/wordpress-site-schema.json
+        existing_logins: Logins of the users that already exist.
+        wordpress_path: Path to WordPress files.
+        debug: If present, --debug will be added to the command showing all debug trace information.
+    """
+
+    missing_users = []
+    for user in users:
+        if user["user_login"] in existing_logins:
+            logging.warning(literals.get("wp_wpcli_user_exists").format(user=user["user_login"]))
+        else:
+            logging.info(literals.get("wp_wpcli_user_creating").format(user=user["user_login"]))
+            missing_users.append(user)
+
+    if len(missing_users) == 0:
+        return
+
+    results = wp_cli.create_users(missing_users, wordpress_path, debug) or []
+    results_by_login = {result["user_login"]: result for result in results}
+
+    for user in missing_users:
+        result = results_by_login.get(user["user_login"], {})
+        if result.get("created"):
+            logging.info(literals.get("wp_wpcli_user_created").format(user=user["user_login"]))
+        elif result.get("error") == "exists":
+            logging.warning(literals.get("wp_wpcli_user_exists").format(user=user["user_login"]))
+        else:
+            logging.error(literals.get("wp_wpcli_user_creating_err").format(user=user["user_login"]))
+
+
 def download_wordpress(site_configuration: dict, destination_path: str, wp_cli_debug: bool = False):
     """ Downloads the latest version of the WordPress core files using a site configuration file.
 
@@ -144,6 +255,9 @@ def download_wordpress(site_configuration: dict, destination_path: str, wp_cli_d
     version = site_configuration["settings"]["version"]
     locale = site_configuration["settings"]["locale"]
     skip_content = site_configuration["settings"]["skip_content_download"]
+
+    # WP-CLI caches the core packages itself; sharing its cache directory shares them between runs and jobs
+    os.environ.setdefault("WP_CLI_CACHE_DIR", str(pathlib.Path.joinpath(artifact_cache.get_cache().path, "wp-cli")))
     wp_cli.download_wordpress(destination_path, version, locale, skip_content, wp_cli_debug)
     git_tools.purge_gitkeep(destination_path)
 
@@ -159,9 +273,9 @@ def download_wordpress_plugin(plugin_config: dict, destination_path: str):
         plugin_config: Plugin configuration.
         destination_path: Path where the plugin will be downloaded.
     """
-    with open(destination_path, "wb") as file:
-        response = requests.get(plugin_config["source"])
-        file.write(response.content)
+    destination_path = pathlib.Path(destination_path)
+    artifact_cache.download_file(plugin_config["source"], str(destination_path.parent), destination_path.name,
+                                 version=plugin_config.get("version"), checksum=plugin_config.get("checksum"))
 
 
 def export_database(environment_config: dict, wordpress_path: str, dump_file_path: str):
@@ -169,6 +283,9 @@ def export_database(environment_config: dict, wordpress_path: str, dump_file_pat
 
     All parameters are obtained from a site configuration file.
 
+    If the dump path ends with .tables, the database is exported to a
+    directory with a file per table instead (see database.export_tables).
+
     For more information see:
         https://developer.wordpress.org/cli/commands/db/export/
 
@@ -177,24 +294,63 @@ def export_database(environment_config: dict, wordpress_path: str, dump_file_pat
         wordpress_path: Path to WordPress files.
         dump_file_path: Path to the destination dump file.
     """
+    if database.is_table_dump(dump_file_path):
+        database.export_tables(wordpress_path, dump_file_path, debug=environment_config["wp_cli_debug"])
+        return
+
     wp_cli.export_database(wordpress_path, dump_file_path, environment_config["wp_cli_debug"])
 
 
+@functools.lru_cache(maxsize=None)
 def get_constants() -> dict:
     """Gets all the constants from a WordPress constants resource.
 
+    The constants are loaded once per process. A copy is kept in the artifact
+    cache and revalidated with its ETag, so it is only downloaded again when
+    it changes. If the resource cannot be reached (or the cache is in cache
+    only mode) the cached copy is used, or the one shipped with the toolset if
+    there is none.
+
     For more information see:
         https://dev.aheadlabs.com/schemas/json/wordpress-constants-schema.json
 
 
     Returns:
-        All the constants in a dict object.
+        All the constants in a dict object. It is shared, so do not modify it.
     """
 
-    response = requests.get(wp_constants.wordpress_constants_json_resource)
-    data = json.loads(response.content)
+    cache = artifact_cache.get_cache()
+    cached_file_path = pathlib.Path.joinpath(cache.path, wp_constants.wordpress_constants_json_file_name)
+    cached = None
+    try:
+        with open(cached_file_path, "r") as cached_file:
+            cached = json.load(cached_file)
+    except (OSError, ValueError):
+        # No cached copy (or a broken one), it is downloaded again
+        pass
+
+    if not cache.cache_only:
+        try:
+            headers = {"If-None-Match": cached["etag"]} if cached else {}
+            response = http_client.get(wp_constants.wordpress_constants_json_resource, headers=headers)
+            if cached and response.status_code == 304:
+                return cached["constants"]
+            response.raise_for_status()
+            data = json.loads(response.content)
+        except (OSError, ValueError) as error:
+            # requests exceptions are OSError, invalid JSON content is ValueError
+            logging.warning(literals.get("wp_constants_offline").format(error=error))
+        else:
+            if cache.max_size and response.headers.get("ETag"):
+                _write_cached_constants(cached_file_path, response.headers["ETag"], data)
+            return data
 
-    return data
+    if cached:
+        return cached["constants"]
+    bundled_file_path = pathlib.Path.joinpath(pathlib.Path(__file__).parent,
+                                              wp_constants.wordpress_constants_json_file_name)
+    with open(bundled_file_path, "r") as bundled_file:
+        return json.load(bundled_file)
 
 
 def get_project_structure(url_resource: str) -> dict:
@@ -209,7 +365,7 @@ def get_project_structure(url_resource: str) -> dict:
     Returns:
         Project structure in a dict object.
     """
-    request = requests.get(url_resource)
+    request = http_client.get(url_resource)
     return request.json()
 
 
@@ -263,6 +419,35 @@ def get_site_configuration(path: str) -> dict:
         return json.loads(data)
 
 
+def get_site_timezone(site_configuration: dict) -> datetime.tzinfo:
+    """Gets the site timezone from the timezone_string or gmt_offset options
+    in the site configuration, as WordPress does.
+
+    Args:
+        site_configuration: Parsed site configuration.
+
+    Returns:
+        The site timezone. UTC if none is configured or it is unknown.
+    """
+
+    options = {option["name"]: option.get("value")
+               for option in site_configuration.get("settings", {}).get("options", [])}
+
+    timezone_string = options.get("timezone_string")
+    if timezone_string:
+        try:
+            return zoneinfo.ZoneInfo(timezone_string)
+        except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+            logging.warning(literals.get("wp_timezone_unknown").format(timezone=timezone_string))
+            return datetime.timezone.utc
+
+    gmt_offset = options.get("gmt_offset")
+    if gmt_offset not in (None, ""):
+        return datetime.timezone(datetime.timedelta(hours=float(gmt_offset)))
+
+    return datetime.timezone.utc
+
+
 def get_environment(site_config: dict, environment_name: str) -> dict:
     """Gets the environment that matches the name passed as a parameter.
 
@@ -312,7 +497,8 @@ def get_wordpress_path_from_root_path(root_path: str, constants: dict = None) ->
 
 
 def import_content_from_configuration_file(site_configuration: dict, environment_config: dict,
-                                           root_path: str, global_constants: dict):
+                                           root_path: str, global_constants: dict, incremental: bool = False,
+                                           delete_with_sql: bool = False):
     """ Imports WordPress posts content specified on a site_configuration file.
     NOTE: content entries in the configuration file must be named after post
     types in singular form. Otherwise they will be ignored. ie: post, page.
@@ -322,6 +508,11 @@ def import_content_from_configuration_file(site_configuration: dict, environment
         environment_config: Parsed environment configuration.
         root_path: Path to the root repository.
         global_constants: Parsed global constants.
+        incremental: If True imports only the new and changed items of every
+            WXR file and deletes only the removed ones, instead of deleting
+            all the content and importing it again.
+        delete_with_sql: If True the content is deleted before importing it
+            with a single SQL statement, without firing any WordPress hooks.
     """
     # If no content to import, then do nothing
     if "content" not in site_configuration:
@@ -345,15 +536,73 @@ def import_content_from_configuration_file(site_configuration: dict, environment
         # File name will be the {wxr_path}/{content_type}.xml
         content_path = str(pathlib.Path.joinpath(wxr_path, f"{content_type}.xml"))
 
+        if incremental and import_wxr_content_incremental(wordpress_path, content_type, content_path, authors,
+                                                          debug_info):
+            continue
+
         # Delete content before importing (to avoid duplicating content)
-        wp_cli.delete_post_type_content(wordpress_path, content_type, debug_info)
+        wp_cli.delete_post_type_content(wordpress_path, content_type, debug_info, use_sql=delete_with_sql)
 
         # Import new content
         wp_cli.import_wxr_content(wordpress_path, content_path, authors, debug_info)
 
 
+def import_wxr_content_incremental(wordpress_path: str, content_type: str, content_path: str, authors: str,
+                                   debug_info: bool) -> bool:
+    """Imports the items of a WXR file that are new or changed since the last
+    import and deletes the posts whose items were removed from the file.
+
+    Args:
+        wordpress_path: Path to WordPress files.
+        content_type: Post type the WXR file was exported from.
+        content_path: Path to the WXR file.
+        authors: Value for the authors argument.
+        debug_info: If true, --debug will be added to the command showing all debug trace information.
+
+    Returns:
+        False if the posts could not be listed, so the content must be
+        imported as a whole.
+    """
+
+    items = list(wxr.iter_items(content_path))
+    post_types = sorted({content_type} | {item.post_type for item in items if item.post_type})
+
+    existing_posts = wp_cli.get_posts_for_wxr_import(post_types, wordpress_path, debug_info)
+    if existing_posts is None:
+        logging.warning(literals.get("wp_wpcli_import_incremental_fallback").format(type=content_type))
+        return False
+
+    changes = wxr.get_changes(items, existing_posts, content_type)
+    logging.info(literals.get("wp_wpcli_import_incremental").format(
+        type=content_type, new=len(changes.new), changed=len(changes.changed), unchanged=len(changes.unchanged),
+        deleted=len(changes.deleted_ids)))
+
+    if not changes.imported and not changes.deleted_ids:
+        logging.info(literals.get("wp_wpcli_import_incremental_nothing").format(type=content_type))
+        return True
+
+    if changes.deleted_ids:
+        wp_cli.delete_posts(changes.deleted_ids, wordpress_path, debug_info)
+
+    if changes.imported:
+        with tempfile.TemporaryDirectory() as temp_path:
+            filtered_content_path = str(pathlib.Path.joinpath(pathlib.Path(temp_path), f"{content_type}.xml"))
+            wxr.write_items(content_path, {item.guid for item in changes.imported}, filtered_content_path)
+            wp_cli.import_wxr_content(wordpress_path, filtered_content_path, authors, debug_info)
+
+        # The importer sets the modification date to the publication date
+        wp_cli.set_posts_modified([{"guid": item.guid, "post_type": item.post_type, "post_title": item.title,
+                                    "post_date_gmt": item.date_gmt, "post_modified": item.modified,
+                                    "post_modified_gmt": item.modified_gmt} for item in changes.imported],
+                                  wordpress_path, debug_info)
+
+    return True
+
+
 def install_plugins_from_configuration_file(site_configuration: dict, environment_config: dict, global_constants: dict,
-                                            root_path: str, skip_partial_dumps: bool):
+                                            root_path: str, skip_partial_dumps: bool,
+                                            dumps: wp_constants.PluginDumps = wp_constants.PluginDumps.EACH,
+                                            dumps_interval: int = 1):
     """Installs WordPress's plugin files using WP-CLI.
 
        For more information see:
@@ -365,6 +614,10 @@ def install_plugins_from_configuration_file(site_configuration: dict, environmen
            global_constants: Parsed global constants.
            root_path: Path to project root.
            skip_partial_dumps: If True skips database dumps.
+           dumps: When to export database dumps while installing the
+               plugins.
+           dumps_interval: Number of plugins between dumps when dumps is
+               PluginDumps.INTERVAL.
        """
     # Get data needed in the process
     plugins: dict = site_configuration["settings"]["plugins"]
@@ -373,14 +626,22 @@ def install_plugins_from_configuration_file(site_configuration: dict, environmen
     plugins_path = str(pathlib.Path.joinpath(root_path_obj, global_constants["paths"]["content"]["plugins"]))
     debug_info = environment_config["wp_cli_debug"]
 
-    for plugin in plugins:
+    if skip_partial_dumps:
+        dumps = wp_constants.PluginDumps.NONE
+    fingerprint = get_plugin_dumps_fingerprint(dumps, wordpress_path, debug_info)
+    if fingerprint is None and dumps in (wp_constants.PluginDumps.SCHEMA, wp_constants.PluginDumps.CHANGES):
+        logging.warning(literals.get("wp_wpcli_db_fingerprint_error"))
+        dumps = wp_constants.PluginDumps.EACH
+
+    for index, plugin in enumerate(plugins, start=1):
         # Get plugin path
         plugin_path = paths.get_file_path_from_pattern(plugins_path, f"{plugin['name']}*.zip")
         logging.info(literals.get("wp_plugin_path").format(path=plugin_path))
 
-        # Download plugin if needed
+        # Download plugin if needed (and not prefetched, see prefetch.py)
         if plugin["source_type"] == "url":
-            download_wordpress_plugin(plugin, plugin_path)
+            if "prefetched_source" not in plugin:
+                download_wordpress_plugin(plugin, plugin_path)
 
             # Once downloaded, should have a .zip under plugins path, so can freely add this source as a .zip one for
             # further installing this plugin as a zip
@@ -392,19 +653,71 @@ def install_plugins_from_configuration_file(site_configuration: dict, environmen
         wp_cli.install_plugin(plugin["name"], wordpress_path, plugin["activate"], plugin["force"], plugin["source"],
                               debug_info)
 
+        # Skip the dump if the plugin did not change the database
+        if dumps in (wp_constants.PluginDumps.SCHEMA, wp_constants.PluginDumps.CHANGES):
+            previous_fingerprint = fingerprint
+            fingerprint = get_plugin_dumps_fingerprint(dumps, wordpress_path, debug_info)
+            if fingerprint is not None and fingerprint == previous_fingerprint:
+                logging.info(literals.get("wp_plugin_dump_not_changed").format(plugin_name=plugin["name"]))
+                continue
+
         # Backup database after plugin install
-        if not skip_partial_dumps:
-            database_path = pathlib.Path.joinpath(root_path_obj, global_constants["paths"]["database"])
-            core_dump_path_converted = convert_wp_config_token(
-                site_configuration["settings"]["dumps"]["plugins"], wordpress_path)
-            database_core_dump_path = pathlib.Path.joinpath(database_path, core_dump_path_converted)
-            export_database(site_configuration, wordpress_path, database_core_dump_path.as_posix())
+        if dumps != wp_constants.PluginDumps.NONE:
+            if is_plugin_dump_due(dumps, dumps_interval, index, len(plugins)):
+                database_path = pathlib.Path.joinpath(root_path_obj, global_constants["paths"]["database"])
+                core_dump_path_converted = convert_wp_config_token(
+                    site_configuration["settings"]["dumps"]["plugins"], wordpress_path, site_configuration)
+                database_core_dump_path = pathlib.Path.joinpath(database_path, core_dump_path_converted)
+                export_database(environment_config, wordpress_path, database_core_dump_path.as_posix())
 
         # Warn the user we are skipping the backup dump
         else:
             logging.warning(literals.get("wp_wpcli_export_db_skipping_as_set").format(dump="plugins"))
 
 
+def get_plugin_dumps_fingerprint(dumps: wp_constants.PluginDumps, wordpress_path: str, debug_info: bool):
+    """Gets the database fingerprint needed to detect plugins that did not
+    change the database.
+
+    Args:
+        dumps: When to export database dumps while installing the plugins.
+        wordpress_path: Path to WordPress files.
+        debug_info: If true, --debug will be added to the command showing all debug trace information.
+
+    Returns:
+        The database fingerprint, or None if the dumps policy does not need it
+        or it could not be obtained.
+    """
+
+    if dumps not in (wp_constants.PluginDumps.SCHEMA, wp_constants.PluginDumps.CHANGES):
+        return None
+    return wp_cli.get_database_fingerprint(wordpress_path, dumps == wp_constants.PluginDumps.SCHEMA, debug_info)
+
+
+def is_plugin_dump_due(dumps: wp_constants.PluginDumps, dumps_interval: int, index: int, count: int) -> bool:
+    """Determines if a database dump must be exported after installing a
+    plugin.
+
+    Args:
+        dumps: When to export database dumps while installing the plugins.
+        dumps_interval: Number of plugins between dumps when dumps is
+            PluginDumps.INTERVAL.
+        index: Position of the installed plugin, starting at 1.
+        count: Number of plugins to be installed.
+
+    Returns:
+        True if the dump must be exported.
+    """
+
+    if dumps == wp_constants.PluginDumps.NONE:
+        return False
+    if dumps == wp_constants.PluginDumps.END:
+        return index == count
+    if dumps == wp_constants.PluginDumps.INTERVAL:
+        return index % max(dumps_interval, 1) == 0 or index == count
+    return True
+
+
 def install_recommended_plugins():
     """ Uses TGMPA core to decide and install automatically the recommended plugins.
 
@@ -461,10 +774,7 @@ def install_wp_cli(install_path: str = "/usr/local/bin/wp"):
         raise ValueError(literals.get("wp_not_dir"))
 
     logging.info(literals.get("wp_wpcli_downloading").format(url=wp_cli_download_url))
-    response = requests.get(wp_cli_download_url)
-
-    with open(file_path, "wb") as cli:
-        cli.write(response.content)
+    artifact_cache.download_file(wp_cli_download_url, str(install_path), wp_cli_phar)
 
     file_stat = os.stat(file_path)
     os.chmod(file_path, file_stat.st_mode | stat.S_IEXEC)
@@ -509,7 +819,8 @@ def install_wordpress_site(site_configuration: dict, environment_config: dict, g
     # Backup database
     if not skip_partial_dumps:
         core_dump_path_converted = \
-            convert_wp_config_token(site_configuration["settings"]["dumps"]["core"], wordpress_path)
+            convert_wp_config_token(site_configuration["settings"]["dumps"]["core"], wordpress_path,
+                                    site_configuration)
         database_core_dump_directory_path = pathlib.Path.joinpath(root_path_obj, database_path)
         database_core_dump_path = pathlib.Path.joinpath(database_core_dump_directory_path, core_dump_path_converted)
         export_database(environment_config, wordpress_path_as_posix, database_core_dump_path.as_posix())
@@ -521,16 +832,23 @@ def install_wordpress_site(site_configuration: dict, environment_config: dict, g
 
 
 def set_wordpress_config_from_configuration_file(site_config: dict, environment_config: dict, wordpress_path: str,
-                                                 db_user_password: str) -> None:
+                                                 db_user_password: str, native: bool = False) -> None:
     """ Sets all configuration parameters in pristine WordPress core files
     Args:
         site_config: Parsed site configuration.
         environment_config: Environment configuration.
         wordpress_path: Path to wordpress installation.
         db_user_password: Database user password.
+        native: If True the wp-config.php file is rendered in a single pass
+            by wp_config instead of using WP-CLI.
 
     """
 
+    if native:
+        wp_config.write_configuration_file(environment_config, wordpress_path, db_user_password,
+                                           is_aws_cloudfront_enabled(site_config))
+        return
+
     # Create wp-config.php file
     create_configuration_file(environment_config, wordpress_path, db_user_password)
 
@@ -548,14 +866,23 @@ def set_wordpress_config_from_configuration_file(site_config: dict, environment_
             wordpress_path, raw, debug)
 
     # Add cloudfront snippet to wp_config.php
-    if "additional_settings" not in site_config["settings"]:
-        return
-    if "aws_cloudfront" not in site_config["settings"]["additional_settings"]:
-        return
-    if site_config["settings"]["additional_settings"]["aws_cloudfront"]:
+    if is_aws_cloudfront_enabled(site_config):
         add_cloudfront_forwarded_proto_to_config(wordpress_path)
 
 
+def is_aws_cloudfront_enabled(site_config: dict) -> bool:
+    """ Checks if the site is served through AWS CloudFront
+
+    Args:
+        site_config: Parsed site configuration.
+
+    Returns:
+        True if the aws_cloudfront additional setting is present and true.
+    """
+    additional_settings = site_config["settings"].get("additional_settings", {})
+    return bool(additional_settings.get("aws_cloudfront", False))
+
+
 def add_cloudfront_forwarded_proto_to_config(wordpress_path: str):
     """ Add HTTP_CLOUDFRONT_FORWARDED_PROTO snippet to wp-config.php
 
@@ -590,26 +917,46 @@ def get_snippet_cloudfront():
         logging.error(literals.get("wp_file_not_found").format(file=file_path))
 
 
-def setup_database(environment_config: dict, wordpress_path: str, db_user_password: str, db_admin_password: str = ""):
-    """ Uses wp cli create to create a new database from configuration file
+def setup_database(environment_config: dict, db_user_password: str, db_admin_password: str = "") -> bool:
+    """ Creates the database and the database user of an environment, if they
+    do not exist, and grants the user its privileges
 
     Args:
         environment_config: Parsed environment configuration.
-        wordpress_path: Path to WordPress files.
         db_user_password: Password of the database user to be created.
         db_admin_password:  Database administrator user password.
+
+    Returns:
+        True if the database and the user were provisioned.
     """
 
-    db_host = environment_config["database"]["host"]
-    schema = environment_config["database"]["db_name"]
-    db_admin_user = environment_config["database"]["db_admin_user"]
-    db_user = environment_config["database"]["db_user"]
-    wp_cli_debug = environment_config["wp_cli_debug"]
+    return setup_databases([(environment_config, db_user_password)], db_admin_password)
+
+
+def setup_databases(environments: List[Tuple[dict, str]], db_admin_password: str = "") -> bool:
+    """ Creates the databases and the database users of many environments, if
+    they do not exist, and grants the users their privileges. A single SQL
+    script is run for every database server and admin user.
+
+    Args:
+        environments: Parsed environment configurations, with the password
+            of their database user.
+        db_admin_password:  Database administrator user password.
+
+    Returns:
+        True if every script succeeded.
+    """
 
-    wp_cli.create_database(wordpress_path, wp_cli_debug, db_admin_user, db_admin_password, schema)
+    servers = {}
+    for environment_config, db_user_password in environments:
+        database_config = environment_config["database"]
+        servers.setdefault((database_config["host"], database_config["db_admin_user"]), []).append(
+            database.DatabaseUser(database_config["db_name"], database_config["db_user"], db_user_password,
+                                  database_config["host"].partition(":")[0]))
 
-    wp_cli.create_wordpress_database_user(
-        wordpress_path, db_admin_user, db_admin_password, db_user, db_user_password, schema, db_host)
+    results = [database.provision(database_users, server, db_admin_user, db_admin_password)
+               for (server, db_admin_user), database_users in servers.items()]
+    return all(results)
 
 
 def start_basic_project_structure(root_path: str) -> None:
@@ -640,5 +987,26 @@ def start_basic_project_structure(root_path: str) -> None:
     logging.info(literals.get("wp_created_project_structure"))
 
 
+def _write_cached_constants(file_path: pathlib.Path, etag: str, constants: dict):
+    """Saves a copy of the WordPress constants with its ETag. A copy that
+    cannot be saved is not an error, it only means the constants are
+    downloaded again next time.
+
+    Args:
+        file_path: Path to the cached copy.
+        etag: ETag of the WordPress constants resource.
+        constants: WordPress constants.
+    """
+
+    temporary_file_path = file_path.with_suffix(".tmp")
+    try:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temporary_file_path, "w") as cached_file:
+            json.dump({"etag": etag, "constants": constants}, cached_file)
+        os.replace(temporary_file_path, file_path)
+    except OSError:
+        pass
+
+
 if __name__ == "__main__":
     help(__name__)
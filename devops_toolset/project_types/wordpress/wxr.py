@@ -0,0 +1,233 @@
+"""Streaming reader and writer for WordPress eXtended RSS (WXR) files.
+
+WXR files can be large, so they are never loaded as a whole: items are read
+one by one with iterparse and discarded as soon as they are processed. This
+makes it possible to compare the content of a WXR file with the content of
+the database and import only what changed.
+"""
+
+import xml.etree.ElementTree as ElementTree
+from typing import Iterator, List, NamedTuple
+
+
+class WxrItem(NamedTuple):
+    """Fields of a WXR item needed to match it with a post in the database"""
+    guid: str
+    post_type: str
+    title: str
+    date_gmt: str
+    modified: str
+    modified_gmt: str
+
+
+class WxrChanges(NamedTuple):
+    """Differences between a WXR file and the posts in the database"""
+    new: List[WxrItem]
+    changed: List[WxrItem]
+    unchanged: List[WxrItem]
+    deleted_ids: List[str]
+
+    @property
+    def imported(self) -> List[WxrItem]:
+        """Items that have to be imported."""
+        return self.new + self.changed
+
+
+def get_changes(items: List[WxrItem], existing_posts: List[dict], post_type: str) -> WxrChanges:
+    """Compares the items of a WXR file with the posts in the database.
+
+    Items are matched with posts by GUID or, as the WordPress importer does
+    to skip existing posts, by post type, title and date (the importer
+    changes the GUID of attachments). Matched posts whose modification date
+    differs from the item's are changed: they have to be deleted and imported
+    again. Posts of post_type that match no item were removed from the file.
+
+    Args:
+        items: Items of the WXR file.
+        existing_posts: Posts in the database, as listed by
+            wp_cli.get_posts_for_wxr_import.
+        post_type: Post type the WXR file was exported from. Only posts of
+            this type are deleted if they are not in the file.
+
+    Returns:
+        The new, changed and unchanged items and the ids of the posts to be
+        deleted.
+    """
+
+    posts_by_guid = {}
+    posts_by_title = {}
+    for post in existing_posts:
+        posts_by_guid.setdefault(post["guid"], post)
+        posts_by_title.setdefault((post["post_type"], post["post_title"], post["post_date_gmt"]), post)
+
+    new, changed, unchanged = [], [], []
+    matched_ids = set()
+    changed_ids = []
+    for item in items:
+        post = posts_by_guid.get(item.guid) or posts_by_title.get((item.post_type, item.title, item.date_gmt))
+        if post is None or str(post["ID"]) in matched_ids:
+            new.append(item)
+            continue
+
+        matched_ids.add(str(post["ID"]))
+        if post["post_modified_gmt"] == item.modified_gmt:
+            unchanged.append(item)
+        else:
+            # The importer does not update existing posts, so changed posts are deleted and imported again
+            changed.append(item)
+            changed_ids.append(str(post["ID"]))
+
+    removed_ids = [str(post["ID"]) for post in existing_posts
+                   if str(post["ID"]) not in matched_ids and post["post_type"] == post_type]
+
+    return WxrChanges(new, changed, unchanged, changed_ids + removed_ids)
+
+
+def iter_items(wxr_path: str) -> Iterator[WxrItem]:
+    """Reads the items of a WXR file one by one.
+
+    Args:
+        wxr_path: Path to the WXR file.
+
+    Yields:
+        The fields of every item needed to match it with a post.
+    """
+
+    for element in _iter_channel_children(wxr_path):
+        if element.tag == "item":
+            yield _parse_item(element)
+
+
+def write_items(wxr_path: str, guids: set, destination_path: str) -> int:
+    """Writes a copy of a WXR file that contains only some of its items.
+
+    Everything else in the channel (site information, authors, categories,
+    tags and terms) is kept, so the WordPress importer can resolve the
+    items' references.
+
+    Args:
+        wxr_path: Path to the WXR file.
+        guids: GUIDs of the items to be kept.
+        destination_path: Path to the WXR file to be written.
+
+    Returns:
+        Number of items written.
+    """
+
+    count = 0
+    namespaces = {}
+    document_started = False
+
+    with open(destination_path, "w", encoding="utf-8") as destination_file:
+        for element in _iter_channel_children(wxr_path, namespaces):
+            # Namespaces are declared in the rss element, so they are known by now
+            if not document_started:
+                destination_file.write(_get_document_start(namespaces))
+                document_started = True
+
+            if element.tag == "item":
+                if _get_child_text(element, "guid") not in guids:
+                    continue
+                count += 1
+
+            element.tail = "\n"
+            destination_file.write(ElementTree.tostring(element, encoding="unicode"))
+
+        if not document_started:
+            destination_file.write(_get_document_start(namespaces))
+        destination_file.write("</channel>\n</rss>\n")
+
+    return count
+
+
+def _get_child_text(element: ElementTree.Element, name: str) -> str:
+    """Gets the text of the first direct child with a local name, ignoring its
+    namespace, since the WXR namespace changes between versions.
+
+    Args:
+        element: Parent element.
+        name: Local name of the child.
+
+    Returns:
+        The text of the child, or an empty string if it does not exist.
+    """
+
+    for child in element:
+        if _get_local_name(child.tag) == name:
+            return (child.text or "").strip()
+    return ""
+
+
+def _get_document_start(namespaces: dict) -> str:
+    """Gets the XML declaration and the opening rss and channel tags.
+
+    Args:
+        namespaces: Namespace URIs by prefix declared in the source document.
+    """
+
+    declarations = "".join(f" xmlns:{prefix}=\"{uri}\"" for prefix, uri in namespaces.items())
+    return f"<?xml version=\"1.0\" encoding=\"UTF-8\" ?>\n<rss version=\"2.0\"{declarations}>\n<channel>\n"
+
+
+def _get_local_name(tag: str) -> str:
+    """Removes the {namespace} part of an element tag."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _iter_channel_children(wxr_path: str, namespaces: dict = None) -> Iterator[ElementTree.Element]:
+    """Reads the direct children of the channel element one by one. Every
+    child is discarded after being yielded, so memory does not grow with the
+    file size.
+
+    Args:
+        wxr_path: Path to the WXR file.
+        namespaces: If present, it is filled with the namespace URIs by prefix
+            declared in the document.
+
+    Yields:
+        The complete channel children.
+    """
+
+    depth = 0
+    channel = None
+
+    for event, element in ElementTree.iterparse(wxr_path, events=("start", "end", "start-ns")):
+        if event == "start-ns":
+            prefix, uri = element
+            if namespaces is not None and prefix:
+                namespaces[prefix] = uri
+                # Keeps the original prefixes when the children are written again
+                ElementTree.register_namespace(prefix, uri)
+        elif event == "start":
+            depth += 1
+            if depth == 2:
+                channel = element
+        else:
+            depth -= 1
+            if depth == 2:
+                yield element
+                channel.remove(element)
+
+
+def _parse_item(element: ElementTree.Element) -> WxrItem:
+    """Gets the fields needed to match an item with a post.
+
+    Args:
+        element: item element.
+    """
+
+    fields = {}
+    for child in element:
+        fields.setdefault(_get_local_name(child.tag), (child.text or "").strip())
+
+    date_gmt = fields.get("post_date_gmt", "")
+    return WxrItem(guid=fields.get("guid", ""),
+                   post_type=fields.get("post_type", ""),
+                   title=fields.get("title", ""),
+                   date_gmt=date_gmt,
+                   modified=fields.get("post_modified") or fields.get("post_date", ""),
+                   modified_gmt=fields.get("post_modified_gmt") or date_gmt)
+
+
+if __name__ == "__main__":
+    help(__name__)
@@ -12,6 +12,8 @@ class Literals(ValueDictsBase):
     # Add your core literal dictionaries here
     _info = {
         "cli_return_code": _("Process terminated with return code {code}"),
+        "cli_stderr_truncated": _("{count} stderr lines were discarded, showing the last {kept} lines only"),
+        "http_host_statistics": _("HTTP {host}: {requests} requests ({errors} failed) in {seconds:.2f}s"),
         "git_purging_gitkeep": _("Purging .gitkeep file at {path}"),
         "git_repo_to_be_created": _("The repository is going to be created"),
         "git_repo_created": _("The repository has been created"),
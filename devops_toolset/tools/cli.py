@@ -1,14 +1,29 @@
 """Contains tools for working with the command line"""
 
+import contextlib
 import core.log_tools
+import queue
+import shutil
 import subprocess
-from pyfiglet import Figlet
-from typing import List
+import threading
+import tools.constants
+import tools.tracing as tracing
+from collections import deque
+from core.LiteralsCore import LiteralsCore
+from core.lazy_import import lazy_import
+from tools.Literals import Literals as ToolsLiterals
+from typing import IO, BinaryIO, Dict, List, Union
+
+literals = LiteralsCore([ToolsLiterals])
+pyfiglet = lazy_import("pyfiglet")
+
+# Paths to the programs run without a shell, by name
+_programs: Dict[str, str] = {}
 
 
 def print_title(text: str):
     """Prints a title in the console"""
-    f = Figlet()
+    f = pyfiglet.Figlet()
     print(f.renderText(text))
 
 
@@ -18,9 +33,11 @@ def call_subprocess_with_result(command: str) -> str:
         Args:
             command: Command to be executed.
         """
-    process = subprocess.Popen(command.strip(), shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    out, err = process.communicate()
-    process.wait()
+    with tracing.command_span(command) as span:
+        process = _popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        out, err = process.communicate()
+        process.wait()
+        _set_span_result(span, process.returncode, out, err)
 
     if out:
         return out.decode("utf-8")
@@ -28,7 +45,8 @@ def call_subprocess_with_result(command: str) -> str:
 
 def call_subprocess(command: str, log_before_process: List[str] = None,
                     log_before_out: List[str] = None, log_after_out: List[str] = None,
-                    log_before_err: List[str] = None, log_after_err: List[str] = None):
+                    log_before_err: List[str] = None, log_after_err: List[str] = None,
+                    stream: bool = False):
     """Calls a subprocess.
 
     Args:
@@ -43,14 +61,23 @@ def call_subprocess(command: str, log_before_process: List[str] = None,
             errors.
         log_after_err: List of strings to log as error after the stderr, if
             errors.
+        stream: If True stdout is logged line by line while the process runs
+            instead of being buffered until it exits. Use it for long-running
+            commands with large outputs.
     """
 
     core.log_tools.log_list([command], core.log_tools.LogLevel.debug)
     core.log_tools.log_list(log_before_process, core.log_tools.LogLevel.info)
 
-    process = subprocess.Popen(command.strip(), shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    out, err = process.communicate()
-    process.wait()
+    if stream:
+        stream_subprocess(command, log_before_out, log_after_out, log_before_err, log_after_err)
+        return
+
+    with tracing.command_span(command) as span:
+        process = _popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        out, err = process.communicate()
+        process.wait()
+        _set_span_result(span, process.returncode, out, err)
 
     if out:
         core.log_tools.log_list(log_before_out, core.log_tools.LogLevel.info)
@@ -63,5 +90,230 @@ def call_subprocess(command: str, log_before_process: List[str] = None,
         core.log_tools.log_list(log_after_err, core.log_tools.LogLevel.error)
 
 
+def stream_subprocess(command: str, log_before_out: List[str] = None, log_after_out: List[str] = None,
+                      log_before_err: List[str] = None, log_after_err: List[str] = None) -> int:
+    """Calls a subprocess logging its stdout as it is produced.
+
+    stdout and stderr are drained at the same time by two reader threads, so
+    the process never blocks on a full pipe. Lines travel through a bounded
+    queue and are logged from the calling thread, so memory usage does not
+    grow with the output size. stderr is only logged if the process fails, as
+    call_subprocess does, so just its last lines are kept (see
+    tools.constants.stream_stderr_tail_lines).
+
+    Args:
+        command: Command to be executed.
+        log_before_out: List of strings to log as info before the first stdout
+            line.
+        log_after_out: List of strings to log as info after the stdout, if
+            there was any.
+        log_before_err: List of strings to log as error before the stderr, if
+            errors.
+        log_after_err: List of strings to log as error after the stderr, if
+            errors.
+
+    Returns:
+        The process return code.
+    """
+
+    with tracing.command_span(command) as span:
+        process = _popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+        lines = queue.Queue(maxsize=tools.constants.stream_queue_max_lines)
+        readers = [threading.Thread(target=_enqueue_lines, args=(pipe, pipe_name, lines), daemon=True)
+                   for pipe, pipe_name in ((process.stdout, "out"), (process.stderr, "err"))]
+        for reader in readers:
+            reader.start()
+
+        has_out = False
+        out_bytes = 0
+        err_bytes = 0
+        err_tail = deque(maxlen=tools.constants.stream_stderr_tail_lines)
+        err_lines_count = 0
+        open_pipes = len(readers)
+
+        while open_pipes > 0:
+            pipe_name, line = lines.get()
+            if line is None:
+                open_pipes -= 1
+            elif pipe_name == "out":
+                if not has_out:
+                    core.log_tools.log_list(log_before_out, core.log_tools.LogLevel.info)
+                    has_out = True
+                out_bytes += len(line)
+                core.log_tools.log_stdouterr(line, core.log_tools.LogLevel.info)
+            else:
+                err_tail.append(line)
+                err_bytes += len(line)
+                err_lines_count += 1
+
+        for reader in readers:
+            reader.join()
+        return_code = process.wait()
+        span.attributes.update(exit_code=return_code, stdout_bytes=out_bytes, stderr_bytes=err_bytes)
+
+    if has_out:
+        core.log_tools.log_list(log_after_out, core.log_tools.LogLevel.info)
+
+    if err_tail and return_code != 0:
+        core.log_tools.log_list(log_before_err, core.log_tools.LogLevel.error)
+        if err_lines_count > len(err_tail):
+            core.log_tools.log_list([literals.get("cli_stderr_truncated").format(
+                count=err_lines_count - len(err_tail), kept=len(err_tail))], core.log_tools.LogLevel.error)
+        core.log_tools.log_stdouterr(b"".join(err_tail), core.log_tools.LogLevel.error)
+        core.log_tools.log_list(log_after_err, core.log_tools.LogLevel.error)
+
+    return return_code
+
+
+def pipe_subprocess(command: str, stdin: BinaryIO = None, stdout: BinaryIO = None,
+                    log_before_process: List[str] = None, log_before_err: List[str] = None,
+                    log_after_err: List[str] = None) -> int:
+    """Calls a subprocess streaming a file into its stdin and/or its stdout
+    into a file, tools.constants.pipe_chunk_size bytes at a time, so memory
+    usage does not grow with the data size.
+
+    Args:
+        command: Command to be executed.
+        stdin: Binary file to be written to the process stdin.
+        stdout: Binary file where the process stdout is written.
+        log_before_process: List of strings to log as info before the process
+            call.
+        log_before_err: List of strings to log as error before the stderr, if
+            errors.
+        log_after_err: List of strings to log as error after the stderr, if
+            errors.
+
+    Returns:
+        The process return code.
+    """
+
+    core.log_tools.log_list([command], core.log_tools.LogLevel.debug)
+    core.log_tools.log_list(log_before_process, core.log_tools.LogLevel.info)
+
+    with tracing.command_span(command) as span:
+        process = _popen(command, stdin=subprocess.PIPE if stdin else None,
+                         stdout=subprocess.PIPE if stdout else None, stderr=subprocess.PIPE)
+
+        err_tail = deque(maxlen=tools.constants.stream_stderr_tail_lines)
+        threads = [threading.Thread(target=_tail_lines, args=(process.stderr, err_tail), daemon=True)]
+        if stdin:
+            threads.append(threading.Thread(target=_copy_to_pipe, args=(stdin, process.stdin), daemon=True))
+        for thread in threads:
+            thread.start()
+
+        out_bytes = 0
+        if stdout:
+            with process.stdout:
+                for chunk in iter(lambda: process.stdout.read(tools.constants.pipe_chunk_size), b""):
+                    stdout.write(chunk)
+                    out_bytes += len(chunk)
+
+        for thread in threads:
+            thread.join()
+        return_code = process.wait()
+        span.attributes.update(exit_code=return_code, stdout_bytes=out_bytes)
+
+    if err_tail and return_code != 0:
+        core.log_tools.log_list(log_before_err, core.log_tools.LogLevel.error)
+        core.log_tools.log_stdouterr(b"".join(err_tail), core.log_tools.LogLevel.error)
+        core.log_tools.log_list(log_after_err, core.log_tools.LogLevel.error)
+
+    return return_code
+
+
+def _popen(command: str, **kwargs) -> subprocess.Popen:
+    """Starts a process for a command.
+
+    Commands got from a CommandsCore are run from their argument list,
+    without a shell (see core.CommandsCore.Command.argv), which saves the
+    shell process and the quoting of their values. On POSIX the program path
+    is resolved, so the process is started with posix_spawn. Other commands,
+    and the ones whose program is not found, are run by the shell.
+
+    Args:
+        command: Command to be executed.
+        kwargs: Popen arguments (stdin, stdout, stderr...).
+    """
+
+    argv = getattr(command, "argv", None)
+    program = _which(argv[0]) if argv else None
+    if program:
+        return subprocess.Popen([program, *argv[1:]], close_fds=False, **kwargs)
+    return subprocess.Popen(command.strip(), shell=True, **kwargs)
+
+
+def _which(program: str) -> Union[str, None]:
+    """Gets the path to a program, caching it once it is found (it may be
+    installed later in the run, e.g. WP-CLI).
+
+    Args:
+        program: Name of the program.
+    """
+
+    if program not in _programs:
+        path = shutil.which(program)
+        if path is None:
+            return None
+        _programs[program] = path
+    return _programs[program]
+
+
+def _set_span_result(span: tracing.Span, return_code: int, out: bytes, err: bytes):
+    """Adds the result of a process to its span.
+
+    Args:
+        span: Span of the process.
+        return_code: Process return code.
+        out: stdout output.
+        err: stderr output.
+    """
+
+    span.attributes.update(exit_code=return_code, stdout_bytes=len(out or b""), stderr_bytes=len(err or b""))
+
+
+def _copy_to_pipe(source: BinaryIO, pipe: IO[bytes]):
+    """Writes a file to a process pipe and closes the pipe.
+
+    Args:
+        source: Binary file to be written.
+        pipe: stdin pipe of the process.
+    """
+
+    # If the process exits before reading everything, its return code tells why
+    with contextlib.suppress(BrokenPipeError):
+        with pipe:
+            for chunk in iter(lambda: source.read(tools.constants.pipe_chunk_size), b""):
+                pipe.write(chunk)
+
+
+def _tail_lines(pipe: IO[bytes], tail: deque):
+    """Keeps the last lines read from a pipe.
+
+    Args:
+        pipe: stderr pipe of the process.
+        tail: Bounded deque where the lines are appended.
+    """
+
+    with pipe:
+        tail.extend(iter(pipe.readline, b""))
+
+
+def _enqueue_lines(pipe: IO[bytes], pipe_name: str, lines: queue.Queue):
+    """Puts every line read from a pipe in the queue, followed by None when
+    the pipe is closed.
+
+    Args:
+        pipe: stdout or stderr pipe of the process.
+        pipe_name: Name used to tell the pipes apart in the queue.
+        lines: Queue shared by the readers of the process pipes.
+    """
+
+    with pipe:
+        for line in iter(pipe.readline, b""):
+            lines.put((pipe_name, line))
+    lines.put((pipe_name, None))
+
+
 if __name__ == "__main__":
     help(__name__)
@@ -14,4 +14,6 @@ class Commands(ValueDictsBase):
         "git_init": "git init {path}",
         "git_add": "git add .",
         "git_commit_m": "git commit -m \"{message}\"",
+        "zstd_compress": "zstd -q -f -o \"{path}\"",
+        "zstd_decompress": "zstd -q -d -c \"{path}\"",
     }
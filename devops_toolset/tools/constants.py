@@ -5,3 +5,21 @@ devops_toolset_save_as = "devops-toolset-master.zip"
 devops_toolset_folder = "devops-toolset"
 project_xml_name = "project.xml"
 project_xml_download_resource = "https://raw.githubusercontent.com/aheadlabs/devops-toolset/master/project.xml"
+
+# HTTP client (see tools.http_client)
+http_pool_size = 10
+http_timeout = (10, 60)
+http_retries = 3
+http_backoff_factor = 0.5
+http_retry_status_codes = (429, 500, 502, 503, 504)
+
+# Streaming subprocess output (see tools.cli.call_subprocess)
+stream_queue_max_lines = 1000
+stream_stderr_tail_lines = 1000
+
+# Piping files through subprocesses (see tools.cli.pipe_subprocess)
+pipe_chunk_size = 1024 * 1024
+
+# Execution timeline files (see tools.tracing)
+trace_json_file_name = "trace.json"
+trace_chrome_file_name = "trace.chrome.json"
@@ -1,7 +1,7 @@
 """Utilities and tools for the devops toolset repository"""
 
 import tools.constants as constants
-import requests
+import tools.http_client as http_client
 from zipfile import ZipFile
 from tools.xmlparser import XMLParser
 import logging
@@ -30,7 +30,7 @@ def get_devops_toolset(destination_path: str):
     logging.info(literals.get("wp_devops_toolset_obtaining").format(
         resource=constants.devops_toolset_download_resource)
     )
-    response = requests.get(constants.devops_toolset_download_resource, allow_redirects=True)
+    response = http_client.get(constants.devops_toolset_download_resource, allow_redirects=True)
     devops_toolset_path_file = os.path.join(destination_path, constants.devops_toolset_save_as)
     with open(devops_toolset_path_file, 'ab') as devops_toolset:
         devops_toolset.write(response.content)
@@ -80,7 +80,7 @@ def compare_devops_toolset_version(toolset_path: str) -> bool:
     current_version = xml_parser.get_attribute_value("version")
     logging.debug(literals.get("wp_current_version").format(version=current_version))
     # Get latest version from GitHub
-    response = requests.get(constants.project_xml_download_resource, allow_redirects=True)
+    response = http_client.get(constants.project_xml_download_resource, allow_redirects=True)
     xml_parser.parse_from_content(response.content.decode("utf-8"))
     latest_version = xml_parser.get_attribute_value("version")
     logging.debug(literals.get("wp_latest_version").format(version=latest_version))
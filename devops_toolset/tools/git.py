@@ -7,8 +7,6 @@ import os
 import pathlib
 import re
 
-from clint.textui import prompt
-
 import filesystem.paths
 import core.app
 import filesystem.paths as path_tools
@@ -16,12 +14,14 @@ from core.LiteralsCore import LiteralsCore
 from tools.Literals import Literals as ToolsLiterals
 from filesystem.constants import FileNames, Directions
 from core.CommandsCore import CommandsCore
+from core.lazy_import import lazy_import
 from tools.commands import Commands as ToolsCommands
 import tools.cli
 
 app: core.app.App = core.app.App()
 literals = LiteralsCore([ToolsLiterals])
 commands = CommandsCore([ToolsCommands])
+prompt = lazy_import("clint.textui.prompt")
 platform_specific = app.load_platform_specific("environment")
 
 
@@ -0,0 +1,167 @@
+"""Process-wide HTTP client.
+
+All the HTTP requests of the toolset go through one requests session, so
+connections to the same host are kept alive and reused instead of doing a
+new TCP + TLS handshake per request. Failed connections and 429 / 5xx
+responses to idempotent requests are retried with exponential backoff, and
+the number of requests and the time spent are counted per host:
+
+    response = http_client.get(url, headers=headers)
+    ...
+    http_client.log_statistics()
+"""
+
+import logging
+import threading
+import time
+import tools.constants as constants
+from core.app import App
+from core.lazy_import import lazy_import
+from core.LiteralsCore import LiteralsCore
+from tools.Literals import Literals as ToolsLiterals
+from typing import Dict, NamedTuple, Union
+from urllib.parse import urlparse
+
+app: App = App()
+requests = lazy_import("requests")
+literals = LiteralsCore([ToolsLiterals])
+
+_session: Union["requests.Session", None] = None
+_settings: dict = {
+    "pool_size": constants.http_pool_size,
+    "timeout": constants.http_timeout,
+    "retries": constants.http_retries,
+    "backoff_factor": constants.http_backoff_factor,
+}
+_statistics: Dict[str, "HostStatistics"] = {}
+_lock = threading.Lock()
+
+
+class HostStatistics(NamedTuple):
+    """Requests sent to a host"""
+    requests: int
+    errors: int
+    seconds: float
+
+
+def configure(pool_size: int = None, timeout: Union[float, tuple] = None, retries: int = None,
+              backoff_factor: float = None):
+    """Changes the settings of the HTTP client. The session is created again
+    with the new settings on the next request.
+
+    Args:
+        pool_size: Maximum number of connections kept alive per host.
+        timeout: Seconds to wait for the server, as (connect, read) or as a
+            single value for both. Used if a request does not set its own.
+        retries: Times a failed request is retried.
+        backoff_factor: Base of the exponential wait between retries
+            (backoff_factor * 2 ^ (retry - 1) seconds).
+    """
+
+    global _session
+
+    new_settings = {"pool_size": pool_size, "timeout": timeout, "retries": retries, "backoff_factor": backoff_factor}
+    with _lock:
+        _settings.update({name: value for name, value in new_settings.items() if value is not None})
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def get(url: str, **kwargs) -> "requests.Response":
+    """Sends a GET request. Same as requests.get.
+
+    Args:
+        url: URL of the request.
+        kwargs: Arguments of requests.get (headers, stream, timeout...).
+    """
+    return request("GET", url, **kwargs)
+
+
+def get_session() -> "requests.Session":
+    """Gets the process-wide session, creating it the first time."""
+
+    global _session
+
+    with _lock:
+        if _session is None:
+            # Imported here as requests and urllib3 are slow to import and many runs do not send any request
+            import requests.adapters
+            from urllib3.util.retry import Retry
+
+            retry = Retry(total=_settings["retries"], backoff_factor=_settings["backoff_factor"],
+                          status_forcelist=constants.http_retry_status_codes, raise_on_status=False)
+            adapter = requests.adapters.HTTPAdapter(pool_connections=_settings["pool_size"],
+                                                    pool_maxsize=_settings["pool_size"], max_retries=retry)
+            _session = requests.Session()
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+
+def get_statistics() -> Dict[str, HostStatistics]:
+    """Gets the number of requests and the seconds spent waiting for
+    responses per host."""
+
+    with _lock:
+        return dict(_statistics)
+
+
+def log_statistics():
+    """Logs the number of requests and the seconds spent per host, slowest
+    host first."""
+
+    statistics = get_statistics()
+    for host, host_statistics in sorted(statistics.items(), key=lambda item: item[1].seconds, reverse=True):
+        logging.info(literals.get("http_host_statistics").format(host=host, requests=host_statistics.requests,
+                                                                 errors=host_statistics.errors,
+                                                                 seconds=host_statistics.seconds))
+
+
+def request(method: str, url: str, **kwargs) -> "requests.Response":
+    """Sends a request through the process-wide session. Same as
+    requests.request.
+
+    Args:
+        method: HTTP method.
+        url: URL of the request.
+        kwargs: Arguments of requests.request.
+    """
+
+    kwargs.setdefault("timeout", _settings["timeout"])
+
+    start = time.perf_counter()
+    failed = True
+    try:
+        response = get_session().request(method, url, **kwargs)
+        failed = response.status_code >= 400
+        return response
+    finally:
+        _count(urlparse(url).netloc, time.perf_counter() - start, failed)
+
+
+def reset_statistics():
+    """Clears the counters of all hosts."""
+
+    with _lock:
+        _statistics.clear()
+
+
+def _count(host: str, seconds: float, failed: bool):
+    """Adds a request to the counters of a host.
+
+    Args:
+        host: Host the request was sent to.
+        seconds: Time until the response headers were received (or the
+            request failed).
+        failed: True if the request failed or got an error status.
+    """
+
+    with _lock:
+        host_statistics = _statistics.get(host, HostStatistics(0, 0, 0.0))
+        _statistics[host] = HostStatistics(host_statistics.requests + 1, host_statistics.errors + int(failed),
+                                           host_statistics.seconds + seconds)
+
+
+if __name__ == "__main__":
+    help(__name__)
@@ -0,0 +1,237 @@
+"""Execution timeline of a run.
+
+Spans record how long a step or an external command takes. They nest, so
+the commands of a step are shown under it:
+
+    tracing.enable()
+    with tracing.span("install plugins"):
+        cli.call_subprocess(command)  # adds a command span
+    tracing.write_json("trace.json")
+    tracing.write_chrome_trace("trace.chrome.json")  # open it in Perfetto
+
+Spans are only kept while tracing is enabled.
+"""
+
+import contextlib
+import itertools
+import json
+import os
+import pathlib
+import threading
+import time
+import tools.constants as constants
+from typing import Iterable, Iterator, List, Union
+
+# Text that replaces the secrets in the traced commands
+REDACTED = "***"
+
+_enabled: bool = False
+_spans: List["Span"] = []
+_secrets: set = set()
+_ids = itertools.count(1)
+_lock = threading.Lock()
+_local = threading.local()
+
+
+class Span(object):
+    """Step or command of a run"""
+
+    def __init__(self, name: str, category: str, parent_id: Union[int, None], attributes: dict):
+        """
+        Args:
+            name: Name of the step or command template key.
+            category: "step" or "command".
+            parent_id: Id of the span it is nested in.
+            attributes: Information about the span (command, exit code...).
+        """
+
+        self.id = next(_ids)
+        self.name = name
+        self.category = category
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.thread_id = threading.get_ident()
+        self.start = time.time()
+        self.end = None
+        self._start_counter = time.perf_counter()
+        self.duration = None
+
+    def finish(self):
+        """Sets the end time of the span."""
+        self.duration = time.perf_counter() - self._start_counter
+        self.end = self.start + self.duration
+
+    def to_dict(self) -> dict:
+        """Gets the span as a JSON serializable dict."""
+        return {"id": self.id, "parent_id": self.parent_id, "name": self.name, "category": self.category,
+                "thread_id": self.thread_id, "start": self.start, "end": self.end, "duration": self.duration,
+                "attributes": self.attributes}
+
+
+def add_secrets(secrets: Iterable[str]):
+    """Adds values that must be redacted from the traced commands (e.g.
+    passwords passed as arguments).
+
+    Args:
+        secrets: Secret values.
+    """
+
+    with _lock:
+        _secrets.update(secret for secret in secrets if secret)
+
+
+def command_span(command: str) -> contextlib.AbstractContextManager:
+    """Traces an external command. The command is redacted and its template
+    key is used as name (see core.CommandsCore.Command).
+
+    Args:
+        command: Command to be executed.
+
+    Returns:
+        Context manager that yields the span, to add the exit code and output
+        sizes to its attributes.
+    """
+
+    key = getattr(command, "key", None)
+    if _enabled:
+        command = redact(command, getattr(command, "secrets", ()))
+    return span(key or "command", "command", command=str(command).strip(), key=key)
+
+
+def disable():
+    """Stops keeping spans."""
+
+    global _enabled
+    _enabled = False
+
+
+def enable():
+    """Starts keeping spans, forgetting the ones of a previous run."""
+
+    global _enabled
+    with _lock:
+        _spans.clear()
+        _enabled = True
+
+
+def get_spans() -> List[Span]:
+    """Gets the finished spans, in the order they started."""
+
+    with _lock:
+        return sorted((span_ for span_ in _spans if span_.end is not None), key=lambda span_: span_.start)
+
+
+def redact(text: str, secrets: Iterable[str] = ()) -> str:
+    """Replaces the secrets added with add_secrets and the ones passed in a
+    text.
+
+    Args:
+        text: Text to be redacted.
+        secrets: More secret values.
+    """
+
+    with _lock:
+        all_secrets = _secrets.union(secret for secret in secrets if secret)
+    # Longest first, so a secret that contains another one is fully replaced
+    for secret in sorted(all_secrets, key=len, reverse=True):
+        text = text.replace(secret, REDACTED)
+    return text
+
+
+@contextlib.contextmanager
+def span(name: str, category: str = "step", **attributes) -> Iterator[Span]:
+    """Traces a step of the run. Spans started inside it (in the same thread)
+    are nested in it.
+
+    Args:
+        name: Name of the step.
+        category: "step" or "command".
+        attributes: Information about the step.
+
+    Yields:
+        The span, to add attributes to it.
+    """
+
+    stack = _get_stack()
+    current = Span(name, category, stack[-1].id if stack else None, attributes)
+    if not _enabled:
+        yield current
+        return
+
+    with _lock:
+        _spans.append(current)
+    stack.append(current)
+    try:
+        yield current
+    except BaseException as error:
+        current.attributes["error"] = type(error).__name__
+        raise
+    finally:
+        stack.pop()
+        current.finish()
+
+
+@contextlib.contextmanager
+def trace(path: Union[str, None], secrets: Iterable[str] = ()):
+    """Traces a run, writing its timeline when it ends (even if it fails)
+    as JSON and Chrome trace files in a directory.
+
+    Args:
+        path: Directory where the trace files are written. If None the run
+            is not traced.
+        secrets: Values redacted from the traced commands.
+    """
+
+    if path is None:
+        yield
+        return
+
+    enable()
+    add_secrets(secrets)
+    try:
+        yield
+    finally:
+        disable()
+        pathlib.Path(path).mkdir(parents=True, exist_ok=True)
+        write_json(str(pathlib.Path.joinpath(pathlib.Path(path), constants.trace_json_file_name)))
+        write_chrome_trace(str(pathlib.Path.joinpath(pathlib.Path(path), constants.trace_chrome_file_name)))
+
+
+def write_chrome_trace(path: str):
+    """Writes the spans in Chrome trace event format, that can be opened in
+    https://ui.perfetto.dev or chrome://tracing.
+
+    Args:
+        path: Path to the trace file.
+    """
+
+    spans = get_spans()
+    origin = spans[0].start if spans else 0
+    events = [{"name": span_.name, "cat": span_.category, "ph": "X", "pid": os.getpid(), "tid": span_.thread_id,
+               "ts": round((span_.start - origin) * 1e6), "dur": round(span_.duration * 1e6),
+               "args": span_.attributes} for span_ in spans]
+    with open(path, "w") as trace_file:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, trace_file)
+
+
+def write_json(path: str):
+    """Writes the spans to a JSON file.
+
+    Args:
+        path: Path to the trace file.
+    """
+
+    with open(path, "w") as trace_file:
+        json.dump({"spans": [span_.to_dict() for span_ in get_spans()]}, trace_file, indent=2)
+
+
+def _get_stack() -> List[Span]:
+    """Gets the spans open in the current thread."""
+
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+if __name__ == "__main__":
+    help(__name__)
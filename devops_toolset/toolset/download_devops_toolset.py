@@ -95,11 +95,9 @@ def download_toolset(branch, destination_path, toolset_name):
         """
     destination_path_object = pathlib.Path(destination_path)
     full_destination_path = pathlib.Path.joinpath(destination_path_object, f"{toolset_name}.zip")
-    response = requests.get(f"https://github.com/aheadlabs/devops-toolset/archive/{branch}.zip")
     if not os.path.exists(destination_path):
         os.mkdir(destination_path)
-    with open(full_destination_path, "wb") as zip_file:
-        zip_file.write(response.content)
+    stream_to_file(f"https://github.com/aheadlabs/devops-toolset/archive/{branch}.zip", full_destination_path)
     logger.info(f"devops-toolset downloaded to {full_destination_path}")
     return destination_path_object, full_destination_path
 
@@ -113,6 +111,24 @@ def is_valid_path(path: str) -> bool:
     return True
 
 
+def stream_to_file(url: str, file_path: pathlib.Path):
+    """Downloads a URL in chunks to a .part file and renames it when the
+    download is complete. It does the same as filesystem.paths.download_file,
+    which this script cannot import.
+
+    Args:
+        url: Where to download the file from.
+        file_path: Path to the downloaded file.
+    """
+    partial_path = f"{file_path}.part"
+    with requests.get(url, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        with open(partial_path, "wb") as file:
+            for chunk in response.iter_content(chunk_size=1024 * 1024):
+                file.write(chunk)
+    os.replace(partial_path, file_path)
+
+
 class PathValidator(argparse.Action):
     """Validates a path"""
     def __init__(self, option_strings, dest, **kwargs):
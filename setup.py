@@ -27,6 +27,7 @@ setuptools.setup(
     install_requires=install_requires,
     include_package_data=True,
     package_data={"core": ["*.json"],
+                  "project_types.wordpress": ["wordpress-constants.json", "*.php"],
                   "locales": ["**/LC_MESSAGES/*.mo"]},
     url='https://github.com/aheadlabs/devops-toolset/',
     license='https://github.com/aheadlabs/devops-toolset/blob/master/LICENSE',
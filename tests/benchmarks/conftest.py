@@ -0,0 +1,85 @@
+"""Test configuration file for benchmarks.
+
+Add here whatever you want to pass as a fixture in your benchmarks."""
+
+import logging
+import os
+import pathlib
+import stat
+import sys
+import time
+import pytest
+import tools.cli
+
+FAKE_WP_SCRIPT = '''#!{python}
+"""Fake wp binary that sleeps to simulate the PHP + WordPress bootstrap"""
+import json
+import sys
+import time
+
+time.sleep({boot_seconds})
+
+if len(sys.argv) > 1 and sys.argv[1] == "eval-file":
+    print(json.dumps({{"ready": True}}), flush=True)
+    for line in sys.stdin:
+        request = json.loads(line)
+        print(json.dumps({{"stdout": request["command"] + "\\\\n", "stderr": "", "return_code": 0}}), flush=True)
+else:
+    print(" ".join(sys.argv[1:]))
+'''
+
+
+class FakeWp(object):
+    """Fake wp binary installed in the PATH"""
+    boot_seconds = 0.05
+
+    def __init__(self, bin_path: pathlib.Path, wordpress_path: pathlib.Path):
+        self.bin_path = bin_path
+        self.wordpress_path = wordpress_path.as_posix()
+
+
+class Stopwatch(object):
+    """Measures and logs the wall-clock time of a code block"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.elapsed = time.perf_counter() - self._start
+        logging.warning(f"[benchmark] {self.name}: {self.elapsed:.4f}s")
+
+    def log_speedup(self, baseline: "Stopwatch"):
+        """Logs how many times faster than a baseline the timed code was.
+        Timings depend on the machine load, so benchmarks report them instead
+        of asserting on them"""
+        logging.warning(f"[benchmark] {self.name}: {baseline.elapsed / self.elapsed:.2f}x speedup over {baseline.name}")
+
+
+@pytest.fixture
+def fake_wp(tmp_path, monkeypatch):
+    """Installs a fake wp binary in the PATH"""
+    if sys.platform == "win32":
+        pytest.skip("The fake wp binary needs a POSIX shell")
+
+    bin_path = pathlib.Path.joinpath(tmp_path, "bin")
+    bin_path.mkdir()
+    wp_path = pathlib.Path.joinpath(bin_path, "wp")
+    wp_path.write_text(FAKE_WP_SCRIPT.format(python=sys.executable, boot_seconds=FakeWp.boot_seconds))
+    wp_path.chmod(wp_path.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_path}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setattr(tools.cli, "_programs", {})
+
+    wordpress_path = pathlib.Path.joinpath(tmp_path, "wordpress")
+    wordpress_path.mkdir()
+    return FakeWp(bin_path, wordpress_path)
+
+
+@pytest.fixture
+def stopwatch():
+    """Stopwatch factory to time benchmarked code"""
+    return Stopwatch
@@ -0,0 +1,111 @@
+"""Benchmark for the import time of the entry points"""
+
+import logging
+import pathlib
+import subprocess
+import sys
+import pytest
+
+SOURCE_PATH = pathlib.Path(__file__).parent.parent.parent.joinpath("devops_toolset")
+
+# Imports an entry point in a new interpreter, counting the times logging is configured
+IMPORT_SCRIPT = """
+import time
+import core.log_setup
+
+calls = 0
+configure = core.log_setup.configure
+
+
+def counted_configure(filepath):
+    global calls
+    calls += 1
+    configure(filepath)
+
+
+core.log_setup.configure = counted_configure
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start, calls)
+"""
+
+# Modules with an if __name__ == "__main__" block that runs a script
+ENTRY_POINTS = [
+    "configure",
+    "core.log_setup",
+    "i18n.utils",
+    "project_types.aws.get_aws_resources",
+    "project_types.linux.software_installer",
+    "project_types.wordpress.bootstrap_repository",
+    "project_types.wordpress.generate_wordpress",
+    "project_types.wordpress.parse_theme_metadata",
+    "project_types.wordpress.rollback_database",
+    "toolset.download_devops_toolset",
+]
+
+# Entry points that create the App (download_devops_toolset is standalone)
+APP_ENTRY_POINTS = [
+    "project_types.wordpress.generate_wordpress",
+    "project_types.wordpress.bootstrap_repository",
+    "project_types.wordpress.rollback_database",
+    "project_types.wordpress.parse_theme_metadata",
+    "project_types.linux.software_installer",
+]
+
+# Maximum time to import an entry point, as reported by python -X importtime
+IMPORT_TIME_BUDGET = 0.3
+
+# Modules that are slow to import, so they must be imported lazily
+LAZY_MODULES = ["pkg_resources", "pyfiglet", "requests", "urllib3"]
+
+
+def get_import_times(module: str) -> dict:
+    """Imports a module in a new interpreter with python -X importtime
+
+    Returns:
+        Cumulative seconds spent importing every module, by module name.
+    """
+
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=SOURCE_PATH,
+                            capture_output=True, text=True, check=True)
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:"):
+            self_time, cumulative, name = line[len("import time:"):].split("|")
+            # The first line is the header
+            if cumulative.strip().isdigit():
+                import_times[name.strip()] = int(cumulative) / 1e6
+    return import_times
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("module", ENTRY_POINTS)
+def test_benchmark_import_time_budget(module):
+    """Measures the time to import an entry point in a new process, which
+    is reported against the budget, and checks that it does not import slow
+    modules before they are needed"""
+
+    # Act
+    import_times = get_import_times(module)
+    logging.warning(f"[benchmark] import {module}: {import_times[module]:.4f}s (-X importtime), "
+                    f"budget {IMPORT_TIME_BUDGET}s")
+
+    # Assert
+    if module != "toolset.download_devops_toolset":
+        assert [name for name in LAZY_MODULES if name in import_times] == []
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("module", APP_ENTRY_POINTS)
+def test_benchmark_import_time(module):
+    """Measures the time to import an entry point in a new process, which
+    must set up the App only once"""
+
+    # Act
+    result = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT.format(module=module)], cwd=SOURCE_PATH,
+                            capture_output=True, text=True, check=True)
+    seconds, calls = result.stdout.split()[-2:]
+    logging.warning(f"[benchmark] import {module}: {float(seconds):.4f}s, logging configured {calls} time(s)")
+
+    # Assert
+    assert int(calls) == 1
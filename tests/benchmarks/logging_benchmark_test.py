@@ -0,0 +1,62 @@
+"""Benchmark for the core.log_setup file"""
+
+import contextlib
+import logging
+import pathlib
+import pytest
+import core.log_setup as log_setup
+import core.log_tools as log_tools
+
+LINES = 200000
+
+
+@contextlib.contextmanager
+def file_logger(file_path: pathlib.Path):
+    """Root logger that only writes to a file through a StreamHandler, as the
+    console handlers do when the output is redirected"""
+    log = logging.getLogger()
+    handlers, level = log.handlers, log.level
+    with open(file_path, "w") as output:
+        handler = logging.StreamHandler(output)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)-8s %(module)-15s %(message)s"))
+        log.handlers = [handler]
+        log.setLevel(logging.INFO)
+        try:
+            yield
+        finally:
+            log.handlers, log.level = handlers, level
+
+
+@pytest.mark.benchmark
+def test_benchmark_logging_throughput(tmp_path, stopwatch):
+    """Measures the lines per second of subprocess output logged on the
+    calling thread and in queue mode"""
+
+    # Arrange
+    output = b"\n".join(f"npm http fetch GET 200 https://registry.npmjs.org/package-{index}".encode("utf-8")
+                        for index in range(LINES))
+    output_path = tmp_path.joinpath("output.log")
+
+    # Act
+    with file_logger(output_path):
+        direct = stopwatch("calling thread")
+        with direct:
+            log_tools.log_stdouterr(output, log_tools.LogLevel.info)
+
+        queued = stopwatch("queue mode")
+        producer = stopwatch("queue mode (calling thread)")
+        with queued:
+            log_setup.start_queue_logging()
+            try:
+                with producer:
+                    log_tools.log_stdouterr(output, log_tools.LogLevel.info)
+            finally:
+                log_setup.stop_queue_logging()
+
+    logging.warning(f"[benchmark] {LINES} lines/s: {LINES / direct.elapsed:.0f} calling thread, "
+                    f"{LINES / queued.elapsed:.0f} queue mode, "
+                    f"{LINES / producer.elapsed:.0f} queue mode (calling thread)")
+
+    # Assert
+    with open(output_path, "r") as output_file:
+        assert sum(1 for line in output_file) == 2 * LINES + 3
@@ -0,0 +1,29 @@
+"""Benchmark for running commands with and without a shell (tools.cli)"""
+
+import shutil
+import pytest
+import tools.cli
+from core.CommandsCore import Command
+
+COMMANDS = 200
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(shutil.which("uname") is None, reason="uname is not available")
+def test_benchmark_spawn_latency(stopwatch):
+    """Measures running a command that does nothing through the shell and
+    from its argument list"""
+
+    # Arrange
+    command = Command("uname -s", "uname", argv=("uname", "-s"))
+
+    # Act
+    with stopwatch(f"{COMMANDS} commands, shell") as shell:
+        for _ in range(COMMANDS):
+            tools.cli.call_subprocess_with_result(str(command))
+
+    with stopwatch(f"{COMMANDS} commands, argv") as argv:
+        for _ in range(COMMANDS):
+            tools.cli.call_subprocess_with_result(command)
+
+    argv.log_speedup(shell)
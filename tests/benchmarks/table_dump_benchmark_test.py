@@ -0,0 +1,37 @@
+"""Benchmark for importing table dumps with one and several workers
+(wordpress.database)"""
+
+import os
+import pathlib
+import pytest
+import project_types.wordpress.database as database
+from tests.project_types.wordpress.database_test import install_fake_wp_db
+
+TABLES = 8
+IMPORT_SECONDS = 0.2
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(os.name != "posix", reason="The fake wp binary needs a POSIX shell")
+def test_benchmark_import_tables(tmp_path, monkeypatch, stopwatch):
+    """Measures importing a table dump whose tables take IMPORT_SECONDS each
+    with one worker and with the default number of workers"""
+
+    # Arrange
+    bin_path = pathlib.Path.joinpath(tmp_path, "bin")
+    bin_path.mkdir()
+    install_fake_wp_db(bin_path, {f"wp_table_{index}": 100 for index in range(TABLES)}, monkeypatch)
+    dump_path = str(pathlib.Path.joinpath(tmp_path, "db.tables"))
+    database.export_tables("/pathto/wordpress", dump_path)
+    monkeypatch.setenv("FAKE_WP_IMPORT_SECONDS", str(IMPORT_SECONDS))
+
+    # Act
+    with stopwatch(f"{TABLES} tables, 1 worker") as serial:
+        serial_result = database.import_tables("/pathto/wordpress", dump_path, max_workers=1)
+
+    with stopwatch(f"{TABLES} tables, {database.wp_constants.table_dump_max_workers} workers") as parallel:
+        parallel_result = database.import_tables("/pathto/wordpress", dump_path)
+
+    # Assert
+    assert serial_result and parallel_result
+    parallel.log_speedup(serial)
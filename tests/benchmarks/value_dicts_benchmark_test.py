@@ -0,0 +1,56 @@
+"""Benchmark for the core.ValueDictsBase file"""
+
+import inspect
+import logging
+import tracemalloc
+import pytest
+from core.CommandsCore import CommandsCore
+from core.LiteralsCore import LiteralsCore
+from devops_platforms.azuredevops.Literals import Literals as PlatformLiterals
+from project_types.wordpress.commands import Commands as WordpressCommands
+from project_types.wordpress.Literals import Literals as WordpressLiterals
+
+INSTANCES = 1000
+
+
+def merge_values_per_instance(value_classes: list) -> dict:
+    """Merges the values as they were merged for every instance before the
+    registry, instancing every class and inspecting its members"""
+    values = {}
+    for value_class in value_classes:
+        instance = object.__new__(value_class)
+        for name, dictionary in inspect.getmembers(instance, lambda m: type(m) is dict and len(m) > 0):
+            values.update(dictionary)
+    return values
+
+
+@pytest.mark.benchmark
+def test_benchmark_value_dicts_registry(stopwatch):
+    """Measures creating the literals and commands of a module, as every
+    module does at import time"""
+
+    # Act
+    with stopwatch(f"{INSTANCES} literals + commands, merged per instance") as per_instance:
+        tracemalloc.start()
+        per_instance_values = [(merge_values_per_instance([LiteralsCore, WordpressLiterals, PlatformLiterals]),
+                                merge_values_per_instance([CommandsCore, WordpressCommands]))
+                               for _ in range(INSTANCES)]
+        per_instance_memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+    with stopwatch(f"{INSTANCES} literals + commands, registry") as registry:
+        tracemalloc.start()
+        registry_values = [(LiteralsCore([WordpressLiterals, PlatformLiterals]), CommandsCore([WordpressCommands]))
+                           for _ in range(INSTANCES)]
+        registry_memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+    registry.log_speedup(per_instance)
+    logging.warning(f"[benchmark] {INSTANCES} literals + commands memory: "
+                    f"{per_instance_memory / 2 ** 20:.2f} MiB merged per instance, "
+                    f"{registry_memory / 2 ** 20:.2f} MiB registry")
+
+    # Assert
+    assert registry_values[0][0].all == per_instance_values[0][0]
+    assert registry_values[0][1].all == per_instance_values[0][1]
+    assert registry_memory < per_instance_memory
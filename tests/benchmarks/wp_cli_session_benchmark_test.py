@@ -0,0 +1,28 @@
+"""Benchmark for the wordpress.wp_cli_session file"""
+
+import pytest
+import project_types.wordpress.wp_cli as wp_cli
+import project_types.wordpress.wp_cli_session as wp_cli_session
+
+CALLS = 20
+
+
+@pytest.mark.benchmark
+def test_benchmark_wp_cli_session_vs_process_per_call(fake_wp, stopwatch):
+    """Compares running wp option get in a new process per call with running
+    it in a WP-CLI session"""
+
+    # Act
+    with stopwatch(f"{CALLS} wp option get, one process per call") as process_per_call:
+        values_per_call = [wp_cli.check_if_option_exists(f"option_{i}", fake_wp.wordpress_path) for i in range(CALLS)]
+
+    with stopwatch(f"{CALLS} wp option get, WP-CLI session") as session:
+        with wp_cli_session.session(fake_wp.wordpress_path) as wp_session:
+            values_in_session = [wp_cli.check_if_option_exists(f"option_{i}", fake_wp.wordpress_path)
+                                 for i in range(CALLS)]
+            commands_count = wp_session.commands_count
+
+    # Assert
+    assert commands_count == CALLS
+    assert [exists for exists, _ in values_per_call] == [exists for exists, _ in values_in_session]
+    session.log_speedup(process_per_call)
@@ -0,0 +1,104 @@
+"""Benchmark for the wordpress.wxr file"""
+
+import logging
+import pathlib
+import tracemalloc
+import xml.etree.ElementTree as ElementTree
+import pytest
+import project_types.wordpress.wxr as wxr
+
+WXR_START = """<?xml version="1.0" encoding="UTF-8" ?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/" xmlns:wp="http://wordpress.org/export/1.2/">
+<channel>
+<title>Benchmark</title>
+<wp:wxr_version>1.2</wp:wxr_version>
+"""
+
+WXR_ITEM = """<item>
+<title>Post {index}</title>
+<guid isPermaLink="false">http://example.com/?p={index}</guid>
+<content:encoded><![CDATA[<p>{content}</p>]]></content:encoded>
+<wp:post_date_gmt><![CDATA[2021-01-01 10:00:00]]></wp:post_date_gmt>
+<wp:post_modified_gmt><![CDATA[2021-02-01 10:00:00]]></wp:post_modified_gmt>
+<wp:post_type><![CDATA[post]]></wp:post_type>
+</item>
+"""
+
+# Percentage of the items that changed since the last import
+CHANGED_RATIO = 0.01
+
+
+def create_wxr_file(path: pathlib.Path, items: int) -> str:
+    """Writes a WXR file with the given number of items"""
+    wxr_path = pathlib.Path.joinpath(path, f"post-{items}.xml")
+    content = "Lorem ipsum dolor sit amet. " * 20
+    with open(wxr_path, "w", encoding="utf-8") as wxr_file:
+        wxr_file.write(WXR_START)
+        for index in range(items):
+            wxr_file.write(WXR_ITEM.format(index=index, content=content))
+        wxr_file.write("</channel>\n</rss>\n")
+    return str(wxr_path)
+
+
+def get_existing_posts(items: int) -> list:
+    """Gets the posts of a previous import where some of the items changed"""
+    changed_every = int(1 / CHANGED_RATIO)
+    return [{"ID": index, "guid": f"http://example.com/?p={index}", "post_type": "post",
+             "post_title": f"Post {index}", "post_date_gmt": "2021-01-01 10:00:00",
+             "post_modified_gmt": "2021-01-01 10:00:00" if index % changed_every == 0 else "2021-02-01 10:00:00"}
+            for index in range(items)]
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("items", [1000, 10000, 100000])
+def test_benchmark_wxr_incremental_import_plan(items, tmp_path, stopwatch):
+    """Measures reading a WXR file, comparing it with the database and
+    writing only the changed items to be imported"""
+
+    # Arrange
+    wxr_path = create_wxr_file(tmp_path, items)
+    existing_posts = get_existing_posts(items)
+    filtered_path = str(pathlib.Path.joinpath(tmp_path, "filtered.xml"))
+
+    # Act
+    with stopwatch(f"{items} items, streaming incremental plan"):
+        changes = wxr.get_changes(list(wxr.iter_items(wxr_path)), existing_posts, "post")
+        written = wxr.write_items(wxr_path, {item.guid for item in changes.imported}, filtered_path)
+
+    with stopwatch(f"{items} items, whole document parse"):
+        ElementTree.parse(wxr_path)
+
+    logging.warning(f"[benchmark] {items} items: {written} to be imported instead of {items}")
+
+    # Assert
+    assert written == len(changes.changed) == items * CHANGED_RATIO
+    assert changes.deleted_ids == [str(post["ID"]) for post in existing_posts
+                                   if post["post_modified_gmt"] == "2021-01-01 10:00:00"]
+
+
+@pytest.mark.benchmark
+def test_benchmark_wxr_streaming_peak_memory(tmp_path):
+    """Compares the peak memory of reading the items of a WXR file with
+    iterparse with loading the whole document"""
+
+    # Arrange
+    items = 10000
+    wxr_path = create_wxr_file(tmp_path, items)
+
+    # Act
+    tracemalloc.start()
+    for _ in wxr.iter_items(wxr_path):
+        pass
+    _, streaming_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    ElementTree.parse(wxr_path)
+    _, document_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    logging.warning(f"[benchmark] {items} items peak memory: {streaming_peak / 2 ** 20:.2f} MiB streaming, "
+                    f"{document_peak / 2 ** 20:.2f} MiB whole document")
+
+    # Assert
+    assert streaming_peak * 10 < document_peak
@@ -30,6 +30,7 @@ class FileNames(object):
 class Mocks(object):
     """Class used to declare general purpose testing mocks"""
     requests_get_mock = mock.patch.object(requests, "get").start()
+    http_get_mock = mock.patch("tools.http_client.get").start()
 
 
 @pytest.fixture
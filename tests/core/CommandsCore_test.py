@@ -0,0 +1,146 @@
+"""Unit core for the core.CommandsCore file"""
+
+import sys
+from core.CommandsCore import Argument, Command, CommandsCore
+from core.ValueDictsBase import ValueDictsBase
+from unittest.mock import patch
+
+
+class FooCommands(ValueDictsBase):
+    """Commands for testing"""
+    _commands = {
+        "foo_option_add": "wp option add {name} \"{value}\" --path={path} {debug_info}",
+        "foo_query": "wp db query \"create user '{user}' identified by '{password}'\" --dbpass={admin_password}",
+        "foo_delete": "wp post delete {id_list} --force",
+        "foo_db_create": "wp db create {db_user} {db_pass} --path={path}",
+        "foo_info": "wp --info",
+        "foo_login": "{token} | az devops login",
+        "foo_export": "export {name}={value}",
+    }
+
+# region get()
+
+
+def test_get_given_key_then_returns_command_with_key_and_argv():
+    """Given a key, then returns the command with its template key and its
+    arguments"""
+
+    # Act
+    result = CommandsCore([FooCommands]).get("foo_info")
+
+    # Assert
+    assert result == "wp --info"
+    assert result.key == "foo_info"
+    assert result.argv == ("wp", "--info")
+
+
+def test_get_given_template_that_needs_shell_then_has_no_argv():
+    """Given a template with a pipe or a shell builtin, then the command has
+    no argv, so it is run by the shell"""
+
+    # Arrange
+    commands = CommandsCore([FooCommands])
+
+    # Act
+    login = commands.get("foo_login")
+    export = commands.get("foo_export")
+
+    # Assert
+    assert login.argv is None
+    assert export.argv is None
+
+
+@patch.object(sys, "platform", "win32")
+def test_get_given_windows_then_has_no_argv():
+    """Given Windows, then commands have no argv, so they are run by the shell
+    and paths with backslashes are kept"""
+
+    # Act
+    result = CommandsCore([FooCommands]).get("foo_delete").format(id_list="C:\\agent\\_work")
+
+    # Assert
+    assert result == "wp post delete C:\\agent\\_work --force"
+    assert result.argv is None
+
+# endregion get()
+
+# region Command.format()
+
+
+def test_format_given_quoted_field_then_value_is_one_argument():
+    """Given a value with quotes and shell syntax in a quoted field, then it
+    is passed as a single argument, as it is"""
+
+    # Arrange
+    command = CommandsCore([FooCommands]).get("foo_option_add")
+    value = "It's \"$HOME\" `whoami`"
+
+    # Act
+    result = command.format(name="blogname", value=value, path="/var/www/my site", debug_info="")
+
+    # Assert
+    assert result.argv == ("wp", "option", "add", "blogname", value, "--path=/var/www/my site")
+
+
+def test_format_given_whole_field_then_value_is_split():
+    """Given an unquoted field that is a whole argument, then its value is
+    split as the shell would do"""
+
+    # Arrange
+    command = CommandsCore([FooCommands]).get("foo_delete")
+
+    # Act
+    result = command.format(id_list="1 2 3")
+
+    # Assert
+    assert result.argv == ("wp", "post", "delete", "1", "2", "3", "--force")
+
+
+def test_format_given_argument_in_whole_field_then_passes_it_as_it_is():
+    """Given Argument values in whole fields, then each one is a single
+    argument, without the shell quotes of the command string"""
+
+    # Arrange
+    command = CommandsCore([FooCommands]).get("foo_db_create")
+
+    # Act
+    result = command.format(db_user=Argument("--dbuser=\"foo\"", "--dbuser=foo"),
+                            db_pass=Argument("--dbpass=\"p\"ss word\"", "--dbpass=p\"ss word"), path="/a")
+
+    # Assert
+    assert result == "wp db create --dbuser=\"foo\" --dbpass=\"p\"ss word\" --path=/a"
+    assert result.argv == ("wp", "db", "create", "--dbuser=foo", "--dbpass=p\"ss word", "--path=/a")
+    assert result.secrets == ("--dbpass=\"p\"ss word\"",)
+
+
+def test_format_given_secret_fields_then_keeps_secrets():
+    """Given fields named as secrets, then their values are kept as secrets
+    and the SQL is a single argument"""
+
+    # Arrange
+    command = CommandsCore([FooCommands]).get("foo_query")
+
+    # Act
+    result = command.format(user="foo", password="p@ss word", admin_password="admin")
+
+    # Assert
+    assert result.key == "foo_query"
+    assert result.secrets == ("p@ss word", "admin")
+    assert result.argv == ("wp", "db", "query", "create user 'foo' identified by 'p@ss word'", "--dbpass=admin")
+
+
+def test_format_given_command_without_argv_then_has_no_argv():
+    """Given a command that needs the shell, then the formatted command has
+    no argv either"""
+
+    # Arrange
+    command = Command("echo {value} > file", "foo", argv=None)
+
+    # Act
+    result = command.format(value="bar")
+
+    # Assert
+    assert result == "echo bar > file"
+    assert result.argv is None
+
+# endregion Command.format()
@@ -0,0 +1,93 @@
+"""Unit core for the core.PlatformRegistry file"""
+
+import pathlib
+import types
+import pytest
+from core.PlatformRegistry import PlatformRegistry
+
+
+@pytest.fixture
+def registry(tmp_path):
+    """Registry of two platforms with an environment module each"""
+    for platform in ["platform1", "platform2"]:
+        platform_path = pathlib.Path.joinpath(tmp_path, platform)
+        platform_path.mkdir()
+        pathlib.Path.joinpath(platform_path, "environment.py").write_text(f"PLATFORM = \"{platform}\"\n")
+    yield PlatformRegistry(tmp_path, "platform1")
+
+# region get()
+
+
+def test_get_given_module_then_loads_it_only_once(registry):
+    """Given a module got several times, then it is loaded once and the same
+    module is returned"""
+
+    # Arrange
+    module = registry.get("environment")
+
+    # Act
+    result = registry.get("environment")
+
+    # Assert
+    assert result is module
+    assert result.PLATFORM == "platform1"
+
+
+def test_get_given_platform_then_loads_module_of_that_platform(registry):
+    """Given a platform, then loads the module of that platform"""
+
+    # Act
+    result = registry.get("environment", "platform2")
+
+    # Assert
+    assert result.PLATFORM == "platform2"
+    assert registry.get("environment").PLATFORM == "platform1"
+
+# endregion
+
+# region preload()
+
+
+def test_preload_given_names_then_loads_them_before_get(registry):
+    """Given module names, then they are loaded and returned by get"""
+
+    # Act
+    registry.preload(["environment"])
+    pathlib.Path.joinpath(registry.devops_path, "platform1", "environment.py").unlink()
+
+    # Assert
+    assert registry.get("environment").PLATFORM == "platform1"
+
+# endregion
+
+# region register()
+
+
+def test_register_given_module_then_replaces_loaded_one(registry):
+    """Given a module, then it is returned instead of the loaded one"""
+
+    # Arrange
+    registry.get("environment")
+    stand_in = types.ModuleType("environment")
+
+    # Act
+    registry.register("environment", stand_in)
+
+    # Assert
+    assert registry.get("environment") is stand_in
+
+# endregion
+
+# region use()
+
+
+def test_use_given_platform_then_returns_its_modules(registry):
+    """Given a platform, then its modules are returned by default"""
+
+    # Act
+    registry.use("platform2")
+
+    # Assert
+    assert registry.get("environment").PLATFORM == "platform2"
+
+# endregion
@@ -0,0 +1,48 @@
+"""Unit core for the core.ValueDictsBase file"""
+
+from core.CommandsCore import CommandsCore
+from core.LiteralsCore import LiteralsCore
+from core.ValueDictsBase import ValueDictsBase
+
+
+class FooValues(ValueDictsBase):
+    """Values for testing"""
+    _info = {"foo_info": "Foo {name}"}
+    _errors = {"foo_error": "Foo error"}
+
+
+class BarValues(ValueDictsBase):
+    """Values for testing"""
+    _commands = {"bar_command": "bar --path={path} --name={name} {path}"}
+
+# region ValueDictsBase()
+
+
+def test_value_dicts_base_given_classes_then_merges_their_values():
+    """Given value classes, then all their values can be got"""
+
+    # Act
+    result = LiteralsCore([FooValues, BarValues])
+
+    # Assert
+    assert result.get("foo_info") == "Foo {name}"
+    assert result.get("foo_error") == "Foo error"
+    assert result.get("bar_command") == "bar --path={path} --name={name} {path}"
+    assert result.get("function_params")
+
+
+def test_value_dicts_base_given_same_classes_then_shares_values():
+    """Given the same value classes, then the values are merged once and
+    shared by the instances"""
+
+    # Arrange
+    literals = LiteralsCore([FooValues])
+
+    # Act
+    result = LiteralsCore([FooValues])
+
+    # Assert
+    assert result.all is literals.all
+    assert CommandsCore([FooValues]).all is not literals.all
+
+# endregion
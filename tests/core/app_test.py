@@ -1,11 +1,22 @@
 """Unit core for the core.app file"""
 
+import pytest
 from unittest.mock import patch
 from core.app import App
 
 
+@pytest.fixture(autouse=True)
+def new_app():
+    """Lets every test create the App for the first time, restoring the
+    process-wide App afterwards"""
+    instance, i18n_loaded = App._instance, App._i18n_loaded
+    App._instance, App._i18n_loaded = None, False
+    yield
+    App._instance, App._i18n_loaded = instance, i18n_loaded
+
 # region App()
 
+
 @patch("core.log_setup.configure")
 @patch("i18n.loader.setup")
 def test_app_given_no_parameters_loads_gettext_engine(i18n_loader_setup, log_setup_configure):
@@ -36,4 +47,79 @@ def test_app_given_skip_i18n_parameter_does_not_load_gettext_engine(i18n_loader_
     i18n_loader_setup.assert_not_called()
 
 
+@patch("core.log_setup.configure")
+@patch("i18n.loader.setup")
+def test_app_given_several_calls_then_returns_same_app_configured_once(i18n_loader_setup, log_setup_configure):
+    """Given several calls, then returns the same App and only sets up
+    gettext and logging the first time"""
+
+    # Act
+    app = App()
+    result = App()
+
+    # Assert
+    assert result is app
+    i18n_loader_setup.assert_called_once()
+    log_setup_configure.assert_called_once()
+
+
+@patch("core.log_setup.configure")
+@patch("i18n.loader.setup")
+def test_app_given_skip_i18n_first_when_not_skipped_later_then_loads_gettext_engine(
+        i18n_loader_setup, log_setup_configure):
+    """Given an App created skipping gettext, when it is created again without
+    skipping it, then gettext engine is loaded without configuring logging
+    again"""
+
+    # Act
+    App(True)
+    App()
+
+    # Assert
+    i18n_loader_setup.assert_called_once()
+    log_setup_configure.assert_called_once()
+
+# endregion
+
+# region load_platform_specific()
+
+
+def test_load_platform_specific_given_name_then_returns_same_module_every_time():
+    """Given a platform-specific module loaded several times, then returns
+    the same module"""
+
+    # Arrange
+    module = App(True).load_platform_specific("environment")
+
+    # Act
+    result = App(True).load_platform_specific("environment")
+
+    # Assert
+    assert result is module
+    assert hasattr(result, "create_environment_variables")
+
+# endregion
+
+# region configure()
+
+
+@patch("core.log_setup.configure")
+@patch("i18n.loader.setup")
+def test_configure_given_settings_then_sets_up_everything_again_with_them(i18n_loader_setup, log_setup_configure):
+    """Given new settings, then gettext and logging are set up again with
+    them"""
+
+    # Arrange
+    app = App()
+    settings = App.settings
+
+    # Act
+    with patch.object(App, "_settings"):
+        app.configure(settings=settings)
+
+        # Assert
+        assert App.settings is settings
+        assert i18n_loader_setup.call_count == 2
+        assert log_setup_configure.call_count == 2
+
 # endregion
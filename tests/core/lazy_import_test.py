@@ -0,0 +1,47 @@
+"""Unit core for the core.lazy_import file"""
+
+import sys
+import pytest
+import core.lazy_import as sut
+
+# region lazy_import()
+
+
+def test_lazy_import_given_module_then_executes_it_on_first_use(tmp_path, monkeypatch):
+    """Given a module not imported yet, then it is executed the first time
+    one of its attributes is used"""
+
+    # Arrange
+    tmp_path.joinpath("lazy_foo.py").write_text("import sys\nsys.lazy_foo_executed = True\nVALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "lazy_foo", raising=False)
+    monkeypatch.setattr(sys, "lazy_foo_executed", False, raising=False)
+
+    # Act
+    result = sut.lazy_import("lazy_foo")
+
+    # Assert
+    assert sys.lazy_foo_executed is False
+    assert result.VALUE == 1
+    assert sys.lazy_foo_executed is True
+    assert sys.modules["lazy_foo"] is result
+
+
+def test_lazy_import_given_imported_module_then_returns_it():
+    """Given a module already imported, then returns it"""
+
+    # Act
+    result = sut.lazy_import("json")
+
+    # Assert
+    assert result is sys.modules["json"]
+
+
+def test_lazy_import_given_unknown_module_then_raises_module_not_found_error():
+    """Given a module that does not exist, then raises ModuleNotFoundError"""
+
+    # Act
+    with pytest.raises(ModuleNotFoundError):
+        sut.lazy_import("lazy_foo_does_not_exist")
+
+# endregion
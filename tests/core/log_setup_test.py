@@ -1,7 +1,7 @@
 """Unit core for the log_setup file"""
 
 import logging
-from unittest.mock import patch, mock_open
+from unittest.mock import patch, mock_open, MagicMock
 import core.log_setup as sut
 from tests.core.conftest import CoreTestsFixture as Fixture
 
@@ -184,3 +184,102 @@ def test_add_time_rotated_file_handler_given_filepath_adds_handler_to_the_log():
             # Assert
             add_handler_mock.assert_called_once
 # endregion
+
+# region add_time_rotated_file_handler(compress=True)
+
+
+def test_add_time_rotated_file_handler_given_compress_then_compresses_rotated_files(tmp_path):
+    """Given compress, then rotated files are compressed with gzip"""
+    import gzip
+
+    # Arrange
+    filepath = str(tmp_path.joinpath("foo.log"))
+    log = logging.getLogger()
+    with patch.object(logging, "getLogger") as get_logger_mock:
+        get_logger_mock.return_value = log
+        with patch.object(log, "addHandler") as add_handler_mock:
+            sut.add_time_rotated_file_handler(filepath=filepath, compress=True)
+    handler = add_handler_mock.call_args.args[0]
+    handler.emit(logging.makeLogRecord({"msg": "foo"}))
+
+    # Act
+    with patch("threading.Thread") as thread_mock:
+        handler.doRollover()
+    sut.compress_file(*thread_mock.call_args.kwargs["args"])
+    handler.close()
+
+    # Assert
+    compressed = [path for path in tmp_path.iterdir() if path.name.endswith(".gz")]
+    assert len(compressed) == 1
+    assert gzip.decompress(compressed[0].read_bytes()) == b"foo\n"
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(["foo.log", compressed[0].name])
+
+# endregion
+
+# region add_colored_formatter_to_console_handlers()
+
+
+def test_add_colored_formatter_to_console_handlers_given_redirected_output_then_keeps_formatter():
+    """Given a console handler that does not write to a terminal, then its
+    formatter is not changed"""
+    import io
+
+    # Arrange
+    tty = io.StringIO()
+    tty.isatty = lambda: True
+    tty_handler = logging.StreamHandler(tty)
+    file_handler = logging.StreamHandler(io.StringIO())
+    for handler in [tty_handler, file_handler]:
+        handler.setFormatter(logging.Formatter("%(message)s"))
+    log = logging.getLogger(__name__)
+    log.handlers = [tty_handler, file_handler]
+
+    # Act
+    with patch.object(logging, "getLogger", return_value=log):
+        sut.add_colored_formatter_to_console_handlers()
+
+    # Assert
+    assert isinstance(tty_handler.formatter, sut.ColorFormatter)
+    assert not isinstance(file_handler.formatter, sut.ColorFormatter)
+    log.handlers = []
+
+# endregion
+
+# region start_queue_logging()
+
+
+def test_start_queue_logging_given_records_then_writes_them_in_batches():
+    """Given records logged in queue mode, then they are written to the
+    console in batches and the handlers are restored when stopped"""
+    import io
+
+    # Arrange
+    stream = io.StringIO()
+    stream.write = MagicMock(wraps=stream.write)
+    handler = logging.StreamHandler(stream)
+    log = logging.getLogger()
+    handlers, level = log.handlers, log.level
+    log.handlers = [handler]
+    log.setLevel(logging.INFO)
+
+    # Act
+    try:
+        # The listener starts once all the records are queued, so every batch is full
+        with patch.object(sut.BatchQueueListener, "start"):
+            listener = sut.start_queue_logging(batch_size=10)
+        for index in range(100):
+            logging.info(f"line {index}")
+        listener.start()
+        sut.stop_queue_logging()
+        result = list(log.handlers)
+    finally:
+        log.handlers, log.level = handlers, level
+
+    # Assert
+    assert stream.getvalue().splitlines() == [f"line {index}" for index in range(100)]
+    assert stream.write.call_count == 10
+    assert result == [handler]
+    assert handler.stream is stream
+    assert not listener.streams[0]._buffer
+
+# endregion
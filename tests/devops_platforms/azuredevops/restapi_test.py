@@ -38,7 +38,7 @@ def test_generate_authentication_header_given_name_and_token_then_generate_heade
 
 @patch("devops_platforms.azuredevops.restapi.generate_authentication_header")
 @patch("logging.info")
-@patch("requests.get", side_effect=mocked_requests_get)
+@patch("tools.http_client.get", side_effect=mocked_requests_get)
 def test_call_api_given_command_and_credentials_when_status_code_is_200_then_return_response(request_get_mock,
                                                                                              logging_mock,
                                                                                              generate_mock,
@@ -56,7 +56,7 @@ def test_call_api_given_command_and_credentials_when_status_code_is_200_then_ret
 
 @patch("devops_platforms.azuredevops.restapi.generate_authentication_header")
 @patch("logging.info")
-@patch("requests.get", side_effect=mocked_requests_get_ko)
+@patch("tools.http_client.get", side_effect=mocked_requests_get_ko)
 def test_call_api_given_command_and_credentials_when_status_code_is_not_200_then_raise_value_error(request_get_mock,
                                                                                              logging_mock,
                                                                                              generate_mock,
@@ -181,7 +181,7 @@ def test_get_last_build_id_given_args_when_build_list_is_not_empty_then_return_f
 
 @patch("devops_platforms.azuredevops.restapi.get_build")
 @patch("devops_platforms.azuredevops.restapi.generate_authentication_header")
-@patch("filesystem.paths.download_file")
+@patch("filesystem.artifact_cache.download_file")
 def test_get_artifact_given_args_when_get_build_returns_download_url_then_calls_download_file(download_file_mock,
     auth_header_mock, get_build_mock, platformdata, artifactsdata):
     """ Given arguments, when get_build retrieves a build with download url, then calls filesystem.download_file """
@@ -200,7 +200,8 @@ def test_get_artifact_given_args_when_get_build_returns_download_url_then_calls_
     # Act
     sut.get_artifact(organization, project, build_id, artifact_name, destination, user_name, access_token)
     # Assert
-    download_file_mock.assert_called_once_with("my_url", destination, f"{artifact_name}.zip", headers)
+    download_file_mock.assert_called_once_with("my_url", destination, f"{artifact_name}.zip", headers,
+                                               version=str(build_id))
 
 # endregion get_artifact
 
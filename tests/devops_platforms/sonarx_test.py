@@ -13,7 +13,7 @@ literals = LiteralsCore([DevopsLiterals])
 # region get_quality_gate_status()
 
 
-@patch("requests.get", side_effect=mocked_requests_get)
+@patch("tools.http_client.get", side_effect=mocked_requests_get)
 @patch("devops_platforms.sonarx.logging.info")
 @patch("devops_platforms.sonarx.logging.error")
 @patch("devops_platforms.sonarx.read_sonar_properties_file")
@@ -33,7 +33,7 @@ def test_get_quality_gate_status_given_branch_then_generates_branch_segment(
     sut.generate_branch_segment.assert_called_once()
 
 
-@patch("requests.get", side_effect=mocked_requests_get)
+@patch("tools.http_client.get", side_effect=mocked_requests_get)
 @patch("devops_platforms.sonarx.logging.info")
 @patch("devops_platforms.sonarx.logging.error")
 @patch("devops_platforms.sonarx.read_sonar_properties_file")
@@ -53,7 +53,7 @@ def test_get_quality_gate_status_given_branch_then_reads_sonar_config_file(
     sut.read_sonar_properties_file.assert_called_once_with(sonarxdata.properties_file_path)
 
 
-@patch("requests.get", side_effect=mocked_requests_get)
+@patch("tools.http_client.get", side_effect=mocked_requests_get)
 @patch("devops_platforms.sonarx.logging.error")
 @patch("devops_platforms.sonarx.logging.info")
 @patch("devops_platforms.sonarx.read_sonar_properties_file")
@@ -73,7 +73,7 @@ def test_get_quality_gate_status_given_branch_when_passing_qg_then_logs_info(
     logging_info.assert_called_with(literals.get("sonar_qg_ok"))
 
 
-@patch("requests.get", side_effect=mocked_requests_get)
+@patch("tools.http_client.get", side_effect=mocked_requests_get)
 @patch("devops_platforms.sonarx.logging.error")
 @patch("devops_platforms.sonarx.logging.info")
 @patch("devops_platforms.sonarx.read_sonar_properties_file")
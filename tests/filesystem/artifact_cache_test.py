@@ -0,0 +1,202 @@
+"""Unit core for the artifact_cache file"""
+
+import hashlib
+import os
+import pathlib
+import pytest
+import filesystem.artifact_cache as sut
+from filesystem.constants import ARTIFACT_CACHE_UNVERSIONED_MAX_AGE
+from unittest.mock import patch
+
+URL = "https://example.com/my-plugin.zip"
+
+
+def mocked_download_file(content: bytes):
+    """Mock to replace filesystem.paths.download_file() that writes content"""
+
+    def download_file(url, destination, save_as, headers=None, **kwargs):
+        file_path = pathlib.Path.joinpath(pathlib.Path(destination), save_as)
+        file_path.write_bytes(content)
+        return save_as, file_path
+
+    return download_file
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Artifact cache in a temporary directory"""
+    yield sut.ArtifactCache(str(pathlib.Path.joinpath(tmp_path, "cache")), 1024 ** 2)
+
+
+@pytest.fixture
+def destination(tmp_path):
+    """Temporary destination directory"""
+    path = pathlib.Path.joinpath(tmp_path, "destination")
+    path.mkdir()
+    yield path
+
+# region download_file()
+
+
+@patch("filesystem.paths.download_file")
+def test_download_file_given_cached_url_then_copies_it_without_downloading(download_file_mock, cache, destination):
+    """Given a URL downloaded before, then it is copied from the cache"""
+
+    # Arrange
+    download_file_mock.side_effect = mocked_download_file(b"plugin")
+    cache.download_file(URL, str(destination), version="1.0")
+    os.remove(pathlib.Path.joinpath(destination, "my-plugin.zip"))
+
+    # Act
+    file_name, file_path = cache.download_file(URL, str(destination), version="1.0")
+
+    # Assert
+    assert file_name == "my-plugin.zip"
+    assert file_path.read_bytes() == b"plugin"
+    assert download_file_mock.call_count == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@patch("filesystem.paths.download_file")
+def test_download_file_given_other_version_then_downloads_it(download_file_mock, cache, destination):
+    """Given a cached URL with another version, then the file is downloaded"""
+
+    # Arrange
+    download_file_mock.side_effect = mocked_download_file(b"plugin")
+    cache.download_file(URL, str(destination), version="1.0")
+
+    # Act
+    cache.download_file(URL, str(destination), version="2.0")
+
+    # Assert
+    assert download_file_mock.call_count == 2
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+@pytest.mark.parametrize("corrupt", [False, True])
+@patch("filesystem.paths.download_file")
+def test_download_file_given_checksum_when_cached_file_does_not_match_then_downloads_it_again(
+        download_file_mock, cache, destination, corrupt):
+    """Given a checksum, when the cached file does not match it (it is stale
+    or corrupt), then the file is downloaded again and cached"""
+
+    # Arrange
+    download_file_mock.side_effect = mocked_download_file(b"old plugin")
+    cache.download_file(URL, str(destination), version="1.0")
+    if corrupt:
+        cache.get(URL, "1.0").write_bytes(b"corrupt")
+    download_file_mock.side_effect = mocked_download_file(b"plugin")
+
+    # Act
+    file_name, file_path = cache.download_file(URL, str(destination), version="1.0",
+                                               checksum=hashlib.md5(b"plugin").hexdigest(), checksum_algorithm="md5")
+
+    # Assert
+    assert file_path.read_bytes() == b"plugin"
+    assert cache.get(URL, "1.0").read_bytes() == b"plugin"
+    assert download_file_mock.call_count == 2
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+@patch("filesystem.paths.download_file")
+def test_download_file_given_checksum_when_cached_file_matches_then_copies_it(download_file_mock, cache, destination):
+    """Given a checksum, when the cached file matches it, then it is copied
+    without downloading it"""
+
+    # Arrange
+    download_file_mock.side_effect = mocked_download_file(b"plugin")
+    cache.download_file(URL, str(destination), version="1.0")
+
+    # Act
+    cache.download_file(URL, str(destination), version="1.0", checksum=hashlib.sha256(b"plugin").hexdigest())
+
+    # Assert
+    assert download_file_mock.call_count == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@patch("filesystem.paths.download_file")
+def test_download_file_given_cache_only_when_not_cached_then_raises_file_not_found_error(
+        download_file_mock, cache, destination):
+    """Given cache only mode, when the file is not cached, then raises
+    FileNotFoundError without downloading it"""
+
+    # Arrange
+    cache.cache_only = True
+
+    # Act
+    with pytest.raises(FileNotFoundError):
+        cache.download_file(URL, str(destination))
+
+    # Assert
+    download_file_mock.assert_not_called()
+
+
+@patch("filesystem.paths.download_file")
+def test_download_file_given_max_size_0_then_downloads_without_cache(download_file_mock, tmp_path, destination):
+    """Given a disabled cache, then calls paths.download_file"""
+
+    # Arrange
+    cache = sut.ArtifactCache(str(tmp_path), 0)
+
+    # Act
+    cache.download_file(URL, str(destination), "plugin.zip")
+
+    # Assert
+    download_file_mock.assert_called_once_with(URL, str(destination), "plugin.zip", None, checksum=None,
+                                               checksum_algorithm="sha256")
+
+# endregion
+
+# region get()
+
+
+def test_get_given_unversioned_entry_when_expired_then_returns_none(cache, destination):
+    """Given a file cached without version, when it is older than the
+    maximum age, then it is not served unless in cache only mode"""
+
+    # Arrange
+    file_path = pathlib.Path.joinpath(destination, "wp-cli.phar")
+    file_path.write_bytes(b"phar")
+    cache.put(URL, None, file_path)
+    now = os.path.getmtime(file_path) + ARTIFACT_CACHE_UNVERSIONED_MAX_AGE + 1
+
+    # Act
+    with patch("datetime.datetime") as datetime_mock:
+        datetime_mock.now.return_value.timestamp.return_value = now
+        result = cache.get(URL)
+        cache.cache_only = True
+        result_cache_only = cache.get(URL)
+
+    # Assert
+    assert result is None
+    assert result_cache_only.read_bytes() == b"phar"
+
+# endregion
+
+# region evict()
+
+
+def test_evict_given_cache_over_max_size_then_deletes_least_recently_used(tmp_path, destination):
+    """Given more content than the maximum size, then the least recently used
+    files are deleted"""
+
+    # Arrange
+    cache = sut.ArtifactCache(str(pathlib.Path.joinpath(tmp_path, "cache")), 1000)
+    for index in range(3):
+        file_path = pathlib.Path.joinpath(destination, f"{index}.zip")
+        file_path.write_bytes(bytes([index]) * 100)
+        blob_path = cache.put(f"{URL}/{index}", "1.0", file_path)
+        os.utime(blob_path, (index, index))
+    cache.max_size = 250
+
+    # Act
+    cache.get(f"{URL}/0", "1.0")
+    cache.evict()
+
+    # Assert
+    assert cache.get(f"{URL}/0", "1.0") is not None
+    assert cache.get(f"{URL}/1", "1.0") is None
+    assert cache.get(f"{URL}/2", "1.0") is not None
+
+# endregion
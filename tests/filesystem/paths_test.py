@@ -1,13 +1,136 @@
 """Unit core for the paths file"""
 
 import filesystem.paths as sut
+import hashlib
 import os
 import pathlib
 import pytest
+import requests
 from tests.conftest import FileNames as FileNameFixtures
 from tests.filesystem.conftest import Paths
 from filesystem.constants import Directions, FileNames
-from unittest.mock import patch
+from unittest.mock import patch, MagicMock
+
+# region download_file()
+
+DOWNLOAD_CONTENT = b"0123456789" * 100
+
+
+def mock_download_response(content: bytes, status_code: int = 200, headers: dict = None) -> MagicMock:
+    """Creates a streamed requests response mock"""
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.status_code = status_code
+    response.headers = headers if headers is not None else {"ETag": "\"v1\""}
+    response.iter_content.return_value = [content[i:i + 300] for i in range(0, len(content), 300)]
+    return response
+
+
+@patch("tools.http_client.get")
+def test_download_file_given_url_then_streams_content_to_file(http_get_mock, tmp_path):
+    """Given a URL, then writes the streamed content and leaves no .part file"""
+
+    # Arrange
+    http_get_mock.return_value = mock_download_response(DOWNLOAD_CONTENT)
+    checksum = hashlib.sha256(DOWNLOAD_CONTENT).hexdigest()
+
+    # Act
+    file_name, file_path = sut.download_file("https://example.com/file.zip", str(tmp_path), checksum=checksum)
+
+    # Assert
+    assert file_name == "file.zip"
+    assert file_path.read_bytes() == DOWNLOAD_CONTENT
+    assert os.listdir(tmp_path) == ["file.zip"]
+    http_get_mock.assert_called_once_with("https://example.com/file.zip", headers={}, stream=True,
+                                              timeout=sut.DOWNLOAD_TIMEOUT)
+
+
+@patch("tools.http_client.get")
+def test_download_file_given_partial_file_then_resumes_with_range(http_get_mock, tmp_path):
+    """Given a .part file left by an interrupted download, then requests the
+    rest of the file and checks the whole file"""
+
+    # Arrange
+    pathlib.Path.joinpath(tmp_path, "file.zip.part").write_bytes(DOWNLOAD_CONTENT[:400])
+    pathlib.Path.joinpath(tmp_path, "file.zip.part.validator").write_text("\"v1\"")
+    http_get_mock.return_value = mock_download_response(DOWNLOAD_CONTENT[400:], 206)
+    checksum = hashlib.md5(DOWNLOAD_CONTENT).hexdigest()
+
+    # Act
+    _, file_path = sut.download_file("https://example.com/file.zip", str(tmp_path), headers={"a": "b"},
+                                     checksum=checksum, checksum_algorithm="md5")
+
+    # Assert
+    assert file_path.read_bytes() == DOWNLOAD_CONTENT
+    assert http_get_mock.call_args.kwargs["headers"] == {"a": "b", "Range": "bytes=400-", "If-Range": "\"v1\""}
+    assert os.listdir(tmp_path) == ["file.zip"]
+
+
+@pytest.mark.parametrize("validator, response_status_code, expected_headers", [
+    ("\"v1\"", 200, {"Range": "bytes=400-", "If-Range": "\"v1\""}),
+    (None, 200, {}),
+])
+@patch("tools.http_client.get")
+def test_download_file_given_partial_file_of_other_file_then_downloads_from_start(
+        http_get_mock, tmp_path, validator, response_status_code, expected_headers):
+    """Given a .part file of a file that changed (the server answers 200 to
+    If-Range) or without a saved validator, then the whole file is
+    downloaded again"""
+
+    # Arrange
+    pathlib.Path.joinpath(tmp_path, "file.zip.part").write_bytes(b"x" * 400)
+    if validator:
+        pathlib.Path.joinpath(tmp_path, "file.zip.part.validator").write_text(validator)
+    http_get_mock.return_value = mock_download_response(DOWNLOAD_CONTENT, response_status_code, {"ETag": "\"v2\""})
+
+    # Act
+    _, file_path = sut.download_file("https://example.com/file.zip", str(tmp_path))
+
+    # Assert
+    assert file_path.read_bytes() == DOWNLOAD_CONTENT
+    assert http_get_mock.call_args.kwargs["headers"] == expected_headers
+
+
+@patch("tools.http_client.get")
+def test_download_file_given_interrupted_transfer_then_retries_resuming(http_get_mock, tmp_path):
+    """Given a transfer that fails, then it is retried from the .part file"""
+
+    # Arrange
+    interrupted_response = mock_download_response(DOWNLOAD_CONTENT)
+
+    def interrupted_iter_content(**kwargs):
+        yield DOWNLOAD_CONTENT[:300]
+        raise requests.exceptions.ChunkedEncodingError("Connection broken: IncompleteRead")
+
+    interrupted_response.iter_content.side_effect = interrupted_iter_content
+    http_get_mock.side_effect = [interrupted_response, mock_download_response(DOWNLOAD_CONTENT[300:], 206)]
+
+    # Act
+    _, file_path = sut.download_file("https://example.com/file.zip", str(tmp_path),
+                                     checksum=hashlib.sha256(DOWNLOAD_CONTENT).hexdigest())
+
+    # Assert
+    assert file_path.read_bytes() == DOWNLOAD_CONTENT
+    assert http_get_mock.call_count == 2
+    assert http_get_mock.call_args.kwargs["headers"] == {"Range": "bytes=300-", "If-Range": "\"v1\""}
+
+
+@patch("tools.http_client.get")
+def test_download_file_given_wrong_checksum_then_raises_value_error_and_removes_file(http_get_mock, tmp_path):
+    """Given a checksum that does not match, then raises ValueError and no
+    file is left"""
+
+    # Arrange
+    http_get_mock.return_value = mock_download_response(DOWNLOAD_CONTENT)
+
+    # Act
+    with pytest.raises(ValueError):
+        sut.download_file("https://example.com/file.zip", str(tmp_path), checksum="0" * 64)
+
+    # Assert
+    assert os.listdir(tmp_path) == []
+
+# endregion
 
 # region files_exist()
 
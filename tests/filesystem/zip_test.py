@@ -1,6 +1,11 @@
 """Unit core for the zip file"""
 
 from unittest.mock import patch
+import gzip
+import os
+import shutil
+import pytest
+import filesystem.constants as constants
 import filesystem.zip as sut
 
 
@@ -75,3 +80,67 @@ def test_download_an_unzip_file_given_parameters_when_delete_after_unzip_is_pres
 # region read_text_file_in_zip
 
 # endregion read_text_file_in_zip
+
+# region get_compression
+
+
+@pytest.mark.parametrize("file_path, expected", [
+    ("dump.sql", None),
+    ("dump.sql.gz", constants.Compression.GZIP),
+    ("dump.sql.ZST", constants.Compression.ZSTD),
+])
+def test_get_compression_given_file_path_then_returns_compression_from_extension(file_path, expected):
+    """ Given a file path, then returns its compression format """
+    # Act
+    result = sut.get_compression(file_path)
+    # Assert
+    assert result == expected
+
+# endregion
+
+# region open_compressed
+
+
+@pytest.mark.parametrize("file_name", ["dump.sql", "dump.sql.gz"])
+def test_open_compressed_given_written_data_then_reads_it_back(file_name, tmp_path):
+    """ Given data written to a file, then reads the same data back """
+    # Arrange
+    file_path = str(tmp_path / file_name)
+    data = b"INSERT INTO wp_options VALUES (1);\n" * 1000
+    # Act
+    with sut.open_compressed(file_path, "wb") as file:
+        file.write(data)
+    with sut.open_compressed(file_path, "rb") as file:
+        result = file.read()
+    # Assert
+    assert result == data
+
+
+def test_open_compressed_given_gzip_file_then_writes_gzip_content(tmp_path):
+    """ Given a .gz file, then writes gzip compressed content """
+    # Arrange
+    file_path = str(tmp_path / "dump.sql.gz")
+    # Act
+    with sut.open_compressed(file_path, "wb") as file:
+        file.write(b"SELECT 1;")
+    # Assert
+    with gzip.open(file_path, "rb") as file:
+        assert file.read() == b"SELECT 1;"
+
+
+@pytest.mark.skipif(shutil.which("zstd") is None, reason="zstd is not installed")
+def test_open_compressed_given_zstd_file_then_reads_it_back(tmp_path):
+    """ Given a .zst file, then writes and reads it through the zstd command """
+    # Arrange
+    file_path = str(tmp_path / "dump.sql.zst")
+    data = b"INSERT INTO wp_options VALUES (1);\n" * 1000
+    # Act
+    with sut.open_compressed(file_path, "wb") as file:
+        file.write(data)
+    with sut.open_compressed(file_path, "rb") as file:
+        result = file.read()
+    # Assert
+    assert result == data
+    assert os.path.getsize(file_path) < len(data)
+
+# endregion
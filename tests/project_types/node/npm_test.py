@@ -112,6 +112,7 @@ def test_install_given_folder_then_calls_subprocess_with_npm_install_command(sub
         command,
         log_before_out=[literal_before],
         log_after_out=[literal_after],
-        log_after_err=[literal_error])
+        log_after_err=[literal_error],
+        stream=True)
 
 # endregion
@@ -155,7 +155,7 @@ def test_get_default_content_given_item_when_source_then_return_corresponding_va
         file_mock, item, expected_value, wordpressdata, mocks):
     """Given item when source has value raw, then return value content"""
     # Arrange
-    mocks.requests_get_mock.side_effect = mocked_requests_get
+    mocks.http_get_mock.side_effect = mocked_requests_get
     # Act
     result = BasicStructureStarter.get_default_content(item)
     # Assert
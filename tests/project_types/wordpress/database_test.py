@@ -0,0 +1,403 @@
+"""Unit core for the wordpress.database file"""
+
+import json
+import os
+import pathlib
+import stat
+import subprocess
+import sys
+import pytest
+import project_types.wordpress.database as sut
+import tools.cli as cli
+from filesystem.constants import Compression
+from unittest.mock import patch, ANY
+
+# Stand-in for the mysql client that keeps the databases, users and grants in a JSON file. Statements that would
+# fail on an existing object fail too, so it tells if a script can be run many times
+FAKE_MYSQL_SCRIPT = '''#!{python}
+import json
+import pathlib
+import re
+import sys
+
+state_path = pathlib.Path(__file__).with_suffix(".json")
+state = json.loads(state_path.read_text()) if state_path.exists() else {{"calls": [], "databases": [], "users": {{}},
+                                                                      "grants": []}}
+state["calls"].append(sys.argv[1:])
+for statement in filter(None, (line.strip() for line in sys.stdin)):
+    if match := re.fullmatch(r"CREATE DATABASE( IF NOT EXISTS)? `(.+)`;", statement):
+        if match.group(2) in state["databases"] and not match.group(1):
+            sys.exit("ERROR 1007: database exists")
+        state["databases"] = sorted(set(state["databases"] + [match.group(2)]))
+    elif match := re.fullmatch(r"CREATE USER( IF NOT EXISTS)? ('.+'@'.+') IDENTIFIED BY '(.*)';", statement):
+        if match.group(2) in state["users"] and not match.group(1):
+            sys.exit("ERROR 1396: user exists")
+        state["users"].setdefault(match.group(2), match.group(3))
+    elif match := re.fullmatch(r"GRANT (.+) ON (.+) TO ('.+'@'.+');", statement):
+        if match.group(3) not in state["users"]:
+            sys.exit("ERROR 1133: user does not exist")
+        state["grants"] = sorted(set(state["grants"] + [f"{{match.group(3)}} {{match.group(2)}} {{match.group(1)}}"]))
+    else:
+        sys.exit(f"ERROR 1064: syntax error in {{statement}}")
+state_path.write_text(json.dumps(state))
+'''
+
+
+# Stand-in for wp that exports the tables listed in a JSON file next to it, with a secondary index each, and keeps
+# the SQL of every import in the imports directory. Imports sleep FAKE_WP_IMPORT_SECONDS, as a large table would
+FAKE_WP_DB_SCRIPT = '''#!{python}
+import json
+import os
+import pathlib
+import sys
+import time
+
+tables = json.loads(pathlib.Path(__file__).with_suffix(".json").read_text())
+args = sys.argv[1:]
+if args[:2] == ["db", "tables"]:
+    print(",".join(tables))
+elif args[:3] == ["db", "export", "-"]:
+    table = args[3].split("=", 1)[1]
+    if "--no-data" in args:
+        print(f"CREATE TABLE `{{table}}` (\\n  `id` int NOT NULL,\\n  `name` varchar(64),\\n  PRIMARY KEY (`id`),"
+              f"\\n  KEY `name` (`name`)\\n) ENGINE=InnoDB;")
+    else:
+        print("\\n".join(f"INSERT INTO `{{table}}` VALUES ({{row}},'row {{row}}');" for row in range(tables[table])))
+elif args[:3] == ["db", "import", "-"]:
+    time.sleep(float(os.environ.get("FAKE_WP_IMPORT_SECONDS", "0")))
+    sql = sys.stdin.read()
+    table = sql.split("`", 2)[1]
+    imports_path = pathlib.Path(__file__).parent.joinpath("imports")
+    imports_path.mkdir(exist_ok=True)
+    imports_path.joinpath(f"{{table}}.sql").write_text(sql)
+else:
+    sys.exit(f"Error: unexpected arguments {{args}}")
+'''
+
+
+@pytest.fixture
+def fake_mysql(tmp_path, monkeypatch) -> pathlib.Path:
+    """Puts a mysql stand-in first in the PATH. Returns the path to its state
+    file"""
+    if os.name != "posix":
+        pytest.skip("The fake mysql binary needs a POSIX shell")
+    mysql_path = pathlib.Path.joinpath(tmp_path, "mysql")
+    mysql_path.write_text(FAKE_MYSQL_SCRIPT.format(python=sys.executable))
+    mysql_path.chmod(mysql_path.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setattr(cli, "_programs", {})
+    return mysql_path.with_suffix(".json")
+
+
+def install_fake_wp_db(bin_path: pathlib.Path, tables: dict, monkeypatch) -> pathlib.Path:
+    """Puts a wp stand-in that exports the given tables (name: number of rows)
+    first in the PATH. Returns the directory where it keeps the imports"""
+    wp_path = pathlib.Path.joinpath(bin_path, "wp")
+    wp_path.write_text(FAKE_WP_DB_SCRIPT.format(python=sys.executable))
+    wp_path.chmod(wp_path.stat().st_mode | stat.S_IEXEC)
+    wp_path.with_suffix(".json").write_text(json.dumps(tables))
+    monkeypatch.setenv("PATH", f"{bin_path}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setattr(cli, "_programs", {})
+    return pathlib.Path.joinpath(bin_path, "imports")
+
+
+@pytest.fixture
+def fake_wp_db(tmp_path, monkeypatch) -> pathlib.Path:
+    """Puts a wp stand-in with the wp_options (3 rows) and wp_posts (20 rows)
+    tables first in the PATH. Returns the directory where it keeps the
+    imports"""
+    if os.name != "posix":
+        pytest.skip("The fake wp binary needs a POSIX shell")
+    bin_path = pathlib.Path.joinpath(tmp_path, "bin")
+    bin_path.mkdir()
+    return install_fake_wp_db(bin_path, {"wp_options": 3, "wp_posts": 20}, monkeypatch)
+
+# region export_tables() / import_tables()
+
+
+@pytest.mark.parametrize("compression, data_suffix", [(None, ""), (Compression.GZIP, ".gz")])
+def test_export_tables_then_writes_a_file_set_per_table_and_manifest(fake_wp_db, tmp_path, compression, data_suffix):
+    """Given a database, then every table has its schema, data and indexes
+    files and the manifest lists them"""
+
+    # Arrange
+    dump_path = str(pathlib.Path.joinpath(tmp_path, "db.tables"))
+
+    # Act
+    result = sut.export_tables("/pathto/wordpress", dump_path, compression)
+
+    # Assert
+    manifest = sut.get_manifest(dump_path)
+    entries = {entry["name"]: entry for entry in manifest["tables"]}
+    assert result
+    assert manifest["compression"] == (compression.value if compression else None)
+    assert sorted(entries) == ["wp_options", "wp_posts"]
+    assert entries["wp_posts"]["data"] == f"wp_posts.data.sql{data_suffix}"
+    assert entries["wp_posts"]["size"] > entries["wp_options"]["size"]
+    assert "KEY `name`" not in pathlib.Path(dump_path, "wp_posts.schema.sql").read_text()
+    assert pathlib.Path(dump_path, "wp_posts.indexes.sql").read_text() == \
+           "ALTER TABLE `wp_posts` ADD KEY `name` (`name`);\n"
+    assert not list(pathlib.Path(dump_path).glob("*.part"))
+
+
+@patch.object(cli, "pipe_subprocess", return_value=1)
+@patch("project_types.wordpress.wp_cli.get_database_tables", return_value=["wp_options"])
+def test_export_tables_when_export_fails_then_returns_false_without_manifest(get_tables_mock, pipe_subprocess_mock,
+                                                                             tmp_path):
+    """Given a table that can not be exported, then returns False and the
+    dump has no manifest"""
+
+    # Arrange
+    dump_path = str(pathlib.Path.joinpath(tmp_path, "db.tables"))
+
+    # Act
+    result = sut.export_tables("/pathto/wordpress", dump_path)
+
+    # Assert
+    assert not result
+    assert not pathlib.Path(dump_path, "manifest.json").exists()
+
+
+def test_import_tables_then_imports_schema_data_and_indexes_of_every_table(fake_wp_db, tmp_path):
+    """Given a table dump, then every table is imported in a single process,
+    with its secondary indexes built after its data"""
+
+    # Arrange
+    dump_path = str(pathlib.Path.joinpath(tmp_path, "db.tables"))
+    sut.export_tables("/pathto/wordpress", dump_path, Compression.GZIP)
+
+    # Act
+    result = sut.import_tables("/pathto/wordpress", dump_path)
+
+    # Assert
+    sql = pathlib.Path(fake_wp_db, "wp_posts.sql").read_text()
+    assert result
+    assert sorted(path.name for path in fake_wp_db.iterdir()) == ["wp_options.sql", "wp_posts.sql"]
+    assert sql.index("CREATE TABLE `wp_posts`") < sql.index("INSERT INTO `wp_posts` VALUES (19,") < \
+           sql.index("ALTER TABLE `wp_posts` ADD KEY `name`")
+
+
+def test_import_tables_given_tables_then_imports_only_them(fake_wp_db, tmp_path):
+    """Given some tables, then only those tables are imported"""
+
+    # Arrange
+    dump_path = str(pathlib.Path.joinpath(tmp_path, "db.tables"))
+    sut.export_tables("/pathto/wordpress", dump_path)
+
+    # Act
+    result = sut.import_tables("/pathto/wordpress", dump_path, tables=["wp_options"])
+
+    # Assert
+    assert result
+    assert [path.name for path in fake_wp_db.iterdir()] == ["wp_options.sql"]
+
+
+def test_import_tables_given_tables_not_in_dump_then_raises_value_error(fake_wp_db, tmp_path):
+    """Given tables that are not in the dump, then raises ValueError before
+    importing anything"""
+
+    # Arrange
+    dump_path = str(pathlib.Path.joinpath(tmp_path, "db.tables"))
+    sut.export_tables("/pathto/wordpress", dump_path)
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        sut.import_tables("/pathto/wordpress", dump_path, tables=["wp_options", "wp_foo"])
+    assert not fake_wp_db.exists()
+
+# endregion export_tables() / import_tables()
+
+# region get_provisioning_script()
+
+
+def test_get_provisioning_script_given_database_users_then_creates_them_if_not_exist():
+    """Given databases and users, then the script creates them if they do not
+    exist and grants the privileges"""
+
+    # Arrange
+    database_users = [sut.DatabaseUser("wp_db", "wp_user", "p@ss"),
+                      sut.DatabaseUser("wp_staging", "staging_user", "pass", "%", "select")]
+
+    # Act
+    result = sut.get_provisioning_script(database_users)
+
+    # Assert
+    assert result.splitlines() == [
+        "CREATE DATABASE IF NOT EXISTS `wp_db`;",
+        "CREATE USER IF NOT EXISTS 'wp_user'@'localhost' IDENTIFIED BY 'p@ss';",
+        "GRANT create, alter, select, insert, update, delete ON `wp_db`.* TO 'wp_user'@'localhost';",
+        "GRANT lock tables, process ON *.* TO 'wp_user'@'localhost';",
+        "CREATE DATABASE IF NOT EXISTS `wp_staging`;",
+        "CREATE USER IF NOT EXISTS 'staging_user'@'%' IDENTIFIED BY 'pass';",
+        "GRANT select ON `wp_staging`.* TO 'staging_user'@'%';",
+        "GRANT lock tables, process ON *.* TO 'staging_user'@'%';",
+    ]
+
+
+def test_get_provisioning_script_given_quotes_then_escapes_them():
+    """Given names and passwords with quotes, then they are escaped"""
+
+    # Act
+    result = sut.get_provisioning_script([sut.DatabaseUser("wp`db", "o'user", "it's\\")])
+
+    # Assert
+    assert "CREATE DATABASE IF NOT EXISTS `wp``db`;" in result
+    assert "CREATE USER IF NOT EXISTS 'o''user'@'localhost' IDENTIFIED BY 'it''s\\\\';" in result
+
+
+def test_get_provisioning_script_given_invalid_privileges_then_raises_value_error():
+    """Given privileges that are not a list of privilege names, then raises
+    ValueError"""
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        sut.get_provisioning_script([sut.DatabaseUser("wp_db", "wp_user", "pass", db_privileges="all; drop user x")])
+
+# endregion get_provisioning_script()
+
+# region provision()
+
+
+@patch.object(cli, "pipe_subprocess", return_value=0)
+def test_provision_given_database_users_then_runs_one_mysql_process(pipe_subprocess_mock):
+    """Given databases and users, then the script is sent to a single mysql
+    process"""
+
+    # Arrange
+    database_users = [sut.DatabaseUser("wp_db", "wp_user", "pass"), sut.DatabaseUser("wp_db2", "wp_user2", "pass")]
+
+    # Act
+    result = sut.provision(database_users, "db.example.com:3307", "root", "secret")
+
+    # Assert
+    assert result
+    pipe_subprocess_mock.assert_called_once_with(ANY, stdin=ANY, log_before_process=ANY, log_after_err=ANY)
+    command = pipe_subprocess_mock.call_args.args[0]
+    assert command.argv == ("mysql", "--host=db.example.com", "--port=3307", "--user=root", "--password=secret",
+                            "--batch")
+    assert command.secrets == ("secret",)
+    assert pipe_subprocess_mock.call_args.kwargs["stdin"].read().decode() == sut.get_provisioning_script(
+        database_users)
+
+
+@patch.object(cli, "pipe_subprocess", return_value=1)
+def test_provision_when_script_fails_then_returns_false(pipe_subprocess_mock):
+    """Given a script that fails, then returns False"""
+
+    # Act
+    result = sut.provision([sut.DatabaseUser("wp_db", "wp_user", "pass")], "localhost", "root", "secret")
+
+    # Assert
+    assert not result
+
+
+def test_provision_given_mysql_stand_in_when_run_twice_then_is_idempotent(fake_mysql):
+    """Given a mysql server stand-in, when the provisioning is run twice, then
+    it succeeds both times with a single process and nothing is duplicated"""
+
+    # Arrange
+    database_users = [sut.DatabaseUser("wp_db", "wp_user", "pass"), sut.DatabaseUser("wp_db2", "wp_user2", "pass")]
+
+    # Act
+    results = [sut.provision(database_users, "localhost", "root", "secret") for _ in range(2)]
+
+    # Assert
+    state = json.loads(fake_mysql.read_text())
+    assert results == [True, True]
+    assert len(state["calls"]) == 2
+    assert state["databases"] == ["wp_db", "wp_db2"]
+    assert sorted(state["users"]) == ["'wp_user'@'localhost'", "'wp_user2'@'localhost'"]
+    assert len(state["grants"]) == 4
+
+
+@pytest.mark.skipif("DEVOPS_TOOLSET_TEST_MYSQL_SERVER" not in os.environ,
+                    reason="DEVOPS_TOOLSET_TEST_MYSQL_SERVER (and _ADMIN_USER / _ADMIN_PASSWORD) are not set")
+def test_provision_given_mysql_server_when_run_twice_then_is_idempotent():
+    """Given a local MySQL / MariaDB server, when the provisioning is run
+    twice, then it succeeds both times and the user can connect"""
+
+    # Arrange
+    server = os.environ["DEVOPS_TOOLSET_TEST_MYSQL_SERVER"]
+    admin_user = os.environ.get("DEVOPS_TOOLSET_TEST_MYSQL_ADMIN_USER", "root")
+    admin_password = os.environ.get("DEVOPS_TOOLSET_TEST_MYSQL_ADMIN_PASSWORD", "")
+    database_users = [sut.DatabaseUser("devops_toolset_test", "devops_toolset_test", "p@ss'word", "%")]
+
+    # Act
+    results = [sut.provision(database_users, server, admin_user, admin_password) for _ in range(2)]
+
+    # Assert
+    host, connection = sut.split_server(server)
+    check = subprocess.run(["mysql", f"--host={host}", *filter(None, [connection]), "--user=devops_toolset_test",
+                            "--password=p@ss'word", "--batch", "--execute=select 1", "devops_toolset_test"])
+    assert results == [True, True]
+    assert check.returncode == 0
+
+# endregion provision()
+
+# region split_secondary_indexes()
+
+SCHEMA = """/*!40101 SET character_set_client = utf8 */;
+CREATE TABLE `wp_posts` (
+  `ID` bigint(20) unsigned NOT NULL AUTO_INCREMENT,
+  `post_name` varchar(200) NOT NULL DEFAULT '',
+  `post_content` longtext NOT NULL,
+  PRIMARY KEY (`ID`),
+  KEY `post_name` (`post_name`(191)),
+  UNIQUE KEY `post_id` (`ID`,`post_name`),
+  FULLTEXT KEY `post_content` (`post_content`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+"""
+
+
+def test_split_secondary_indexes_given_indexes_then_moves_them_to_alter_statements():
+    """Given a schema with secondary indexes, then they are removed from the
+    CREATE TABLE statement and added by ALTER TABLE statements, FULLTEXT
+    ones on their own"""
+
+    # Act
+    schema, indexes = sut.split_secondary_indexes(SCHEMA)
+
+    # Assert
+    assert "  PRIMARY KEY (`ID`)\n) ENGINE=InnoDB" in schema
+    assert "KEY `post_name`" not in schema
+    assert indexes.splitlines() == [
+        "ALTER TABLE `wp_posts` ADD KEY `post_name` (`post_name`(191)), ADD UNIQUE KEY `post_id` (`ID`,`post_name`);",
+        "ALTER TABLE `wp_posts` ADD FULLTEXT KEY `post_content` (`post_content`);",
+    ]
+
+
+@pytest.mark.parametrize("schema", [
+    SCHEMA.replace("  FULLTEXT", "  CONSTRAINT `fk` FOREIGN KEY (`ID`) REFERENCES `wp_users` (`ID`),\n  FULLTEXT"),
+    "CREATE TABLE `wp_options` (\n  `option_id` bigint(20) NOT NULL,\n  PRIMARY KEY (`option_id`)\n);\n",
+])
+def test_split_secondary_indexes_given_foreign_keys_or_no_indexes_then_keeps_schema(schema):
+    """Given a schema with foreign keys or without secondary indexes, then
+    it is kept as it is"""
+
+    # Act
+    result = sut.split_secondary_indexes(schema)
+
+    # Assert
+    assert result == (schema, "")
+
+# endregion split_secondary_indexes()
+
+# region split_server()
+
+
+@pytest.mark.parametrize("server, expected", [
+    ("localhost", ("localhost", "")),
+    ("db.example.com:3307", ("db.example.com", "--port=3307")),
+    ("localhost:/var/run/mysqld/mysqld.sock", ("localhost", "--socket=/var/run/mysqld/mysqld.sock")),
+])
+def test_split_server(server, expected):
+    """Given a DB_HOST value, then returns its host and port or socket
+    argument"""
+
+    # Act
+    result = sut.split_server(server)
+
+    # Assert
+    assert result == expected
+
+# endregion split_server()
@@ -124,10 +124,64 @@ def test_main_given_required_files_when_present_and_create_db_then_calls_setup_d
     get_environment_mock.return_value = environment_config
     get_wordpress_path.return_value = wordpressdata.wordpress_path
     create_db = True
+    setup_database_mock.return_value = True
     # Act
     sut.main(root_path, "root", "root", "root", environment, [''], [''], create_db, True, False)
     # Assert
-    setup_database_mock.assert_called_with(environment_config, wordpressdata.wordpress_path, "root", "root")
+    setup_database_mock.assert_called_with(environment_config, "root", "root")
+
+
+@patch("project_types.wordpress.wptools.import_content_from_configuration_file")
+@patch("tools.git.purge_gitkeep")
+@patch("project_types.wordpress.wptools.export_database")
+@patch("project_types.wordpress.generate_wordpress.delete_sample_wp_config_file")
+@patch("project_types.wordpress.generate_wordpress.generate_additional_wpconfig_files")
+@patch("logging.info")
+@patch("core.log_tools.log_indented_list")
+@patch("project_types.wordpress.wp_theme_tools.build_theme")
+@patch("project_types.wordpress.wptools.install_plugins_from_configuration_file")
+@patch("project_types.wordpress.wp_theme_tools.install_themes_from_configuration_file")
+@patch("project_types.wordpress.wptools.setup_database")
+@patch("project_types.wordpress.wptools.install_wordpress_site")
+@patch("project_types.wordpress.wptools.set_wordpress_config_from_configuration_file")
+@patch("project_types.wordpress.wptools.download_wordpress")
+@patch("project_types.wordpress.generate_wordpress.setup_devops_toolset")
+@patch("project_types.wordpress.wptools.start_basic_project_structure")
+@patch("project_types.wordpress.wptools.get_wordpress_path_from_root_path")
+@patch("project_types.wordpress.wptools.get_site_configuration")
+@patch("project_types.wordpress.wptools.get_required_file_paths")
+@patch("project_types.wordpress.wp_theme_tools.get_themes_path_from_root_path")
+@patch("filesystem.paths.files_exist_filtered")
+@patch("project_types.wordpress.wptools.get_constants")
+@patch("project_types.wordpress.wptools.get_environment")
+@patch("project_types.wordpress.wptools.add_wp_options")
+@patch("project_types.wordpress.wptools.create_users")
+@patch("project_types.wordpress.wptools.convert_wp_config_token")
+@patch("filesystem.paths.move_files")
+def test_main_given_create_db_when_setup_database_fails_then_raise_error(
+        move_files_mock, convert_wp_config_token_mock, create_users_mock, add_wp_options_mock, get_environment_mock,
+        constants_mock, files_exist_mock, get_themes_path_mock, get_required_files_mock,  get_site_config_mock,
+        get_wordpress_path, start_basic_structure_mock, setup_devops_toolset_mock, download_wordpress_mock,
+        set_wordpress_config_mock, install_wordpress_site_mock, setup_database_mock, install_theme_mock,
+        install_plugins_mock, build_theme_mock, log_indented_mock, logging_mock, generate_environments_mock,
+        delete_sample_mock, export_database_mock, purge_gitkeep_mock, import_content_mock, wordpressdata):
+    """ Given create_db, when the database cannot be created, then raise error before installing WordPress """
+    # Arrange
+    required_files = []
+    files_exist_mock.return_value = required_files
+    environment = "any"
+    root_path = wordpressdata.root_path
+    environment_config = json.loads(wordpressdata.site_config_content)["environments"][0]
+    get_environment_mock.return_value = environment_config
+    get_wordpress_path.return_value = wordpressdata.wordpress_path
+    create_db = True
+    setup_database_mock.return_value = False
+    # Act
+    with pytest.raises(ValueError) as value_error:
+        sut.main(root_path, "root", "root", "root", environment, [''], [''], create_db, True, False)
+    # Assert
+    assert str(value_error.value) == sut.literals.get("wp_db_setup_err")
+    install_wordpress_site_mock.assert_not_called()
 
 @patch("project_types.wordpress.wptools.import_content_from_configuration_file")
 @patch("tools.git.purge_gitkeep")
@@ -168,7 +222,7 @@ def test_main_given_required_files_when_not_present_and_use_defaults_then_downlo
     files_exist_mock.return_value = required_files
     prompt_yn_mock.return_value = True
     environment = "any"
-    mocks.requests_get_mock.side_effect = mocked_requests_get
+    mocks.http_get_mock.side_effect = mocked_requests_get
     root_path = wordpressdata.root_path
     m = mock_open()
     expected_content = b"sample response in bytes"
@@ -228,6 +282,178 @@ def test_main_given_required_files_when_create_development_theme_then_calls_crea
     # Assert
     create_dev_theme_mock.assert_called_once_with(ANY, root_path, constants)
 
+
+@patch("project_types.wordpress.wptools.import_content_from_configuration_file")
+@patch("project_types.wordpress.wptools.convert_wp_config_token")
+@patch("filesystem.paths.move_files")
+@patch("tools.git.purge_gitkeep")
+@patch("project_types.wordpress.wptools.export_database")
+@patch("project_types.wordpress.generate_wordpress.delete_sample_wp_config_file")
+@patch("project_types.wordpress.generate_wordpress.generate_additional_wpconfig_files")
+@patch("logging.info")
+@patch("core.log_tools.log_indented_list")
+@patch("project_types.wordpress.wp_theme_tools.build_theme")
+@patch("project_types.wordpress.wptools.install_plugins_from_configuration_file")
+@patch("project_types.wordpress.wp_theme_tools.install_themes_from_configuration_file")
+@patch("project_types.wordpress.wptools.install_wordpress_site")
+@patch("project_types.wordpress.wptools.set_wordpress_config_from_configuration_file")
+@patch("project_types.wordpress.wptools.download_wordpress")
+@patch("project_types.wordpress.generate_wordpress.setup_devops_toolset")
+@patch("project_types.wordpress.wptools.start_basic_project_structure")
+@patch("project_types.wordpress.wptools.get_wordpress_path_from_root_path")
+@patch("project_types.wordpress.wptools.get_site_configuration")
+@patch("project_types.wordpress.wptools.get_required_file_paths")
+@patch("project_types.wordpress.wp_theme_tools.get_themes_path_from_root_path")
+@patch("filesystem.paths.files_exist_filtered")
+@patch("project_types.wordpress.wptools.get_constants")
+@patch("project_types.wordpress.wptools.get_environment")
+@patch("project_types.wordpress.wptools.add_wp_options")
+@patch("project_types.wordpress.wptools.create_users")
+def test_main_given_no_bulk_options_then_add_wp_options_is_not_bulk(
+        create_users_mock, add_wp_options_mock, get_environment_mock, constants_mock, files_exist_mock,
+        get_themes_path_mock, get_required_files_mock, get_site_config_mock, get_wordpress_path,
+        start_basic_structure_mock, setup_devops_toolset_mock, download_wordpress_mock, set_wordpress_config_mock,
+        install_wordpress_site_mock, install_theme_mock, install_plugins_mock, build_theme_mock, log_indented_mock,
+        logging_mock, generate_environments_mock, delete_sample_mock, export_database_mock, purge_gitkeep_mock,
+        move_files_mock, convert_wp_config_token_mock, import_content_mock, wordpressdata):
+    """ Given bulk_options is False, then add_wp_options sets every option on its own """
+    # Arrange
+    files_exist_mock.return_value = []
+    root_path = wordpressdata.root_path
+    # Act
+    sut.main(root_path, "root", "root", "root", "any", [''], [''], False, True, False, bulk_options=False)
+    # Assert
+    assert add_wp_options_mock.call_args.kwargs["bulk"] is False
+
+
+@patch("project_types.wordpress.wptools.import_content_from_configuration_file")
+@patch("project_types.wordpress.wptools.convert_wp_config_token")
+@patch("filesystem.paths.move_files")
+@patch("tools.git.purge_gitkeep")
+@patch("project_types.wordpress.wptools.export_database")
+@patch("project_types.wordpress.generate_wordpress.delete_sample_wp_config_file")
+@patch("project_types.wordpress.generate_wordpress.generate_additional_wpconfig_files")
+@patch("logging.info")
+@patch("core.log_tools.log_indented_list")
+@patch("project_types.wordpress.wp_theme_tools.build_theme")
+@patch("project_types.wordpress.wptools.install_plugins_from_configuration_file")
+@patch("project_types.wordpress.wp_theme_tools.install_themes_from_configuration_file")
+@patch("project_types.wordpress.wptools.install_wordpress_site")
+@patch("project_types.wordpress.wptools.set_wordpress_config_from_configuration_file")
+@patch("project_types.wordpress.wptools.download_wordpress")
+@patch("project_types.wordpress.generate_wordpress.setup_devops_toolset")
+@patch("project_types.wordpress.wptools.start_basic_project_structure")
+@patch("project_types.wordpress.wptools.get_wordpress_path_from_root_path")
+@patch("project_types.wordpress.wptools.get_site_configuration")
+@patch("project_types.wordpress.wptools.get_required_file_paths")
+@patch("project_types.wordpress.wp_theme_tools.get_themes_path_from_root_path")
+@patch("filesystem.paths.files_exist_filtered")
+@patch("project_types.wordpress.wptools.get_constants")
+@patch("project_types.wordpress.wptools.get_environment")
+@patch("project_types.wordpress.wptools.add_wp_options")
+@patch("project_types.wordpress.wptools.create_users")
+def test_main_given_no_bulk_users_then_create_users_is_not_bulk(
+        create_users_mock, add_wp_options_mock, get_environment_mock, constants_mock, files_exist_mock,
+        get_themes_path_mock, get_required_files_mock, get_site_config_mock, get_wordpress_path,
+        start_basic_structure_mock, setup_devops_toolset_mock, download_wordpress_mock, set_wordpress_config_mock,
+        install_wordpress_site_mock, install_theme_mock, install_plugins_mock, build_theme_mock, log_indented_mock,
+        logging_mock, generate_environments_mock, delete_sample_mock, export_database_mock, purge_gitkeep_mock,
+        move_files_mock, convert_wp_config_token_mock, import_content_mock, wordpressdata):
+    """ Given bulk_users is False, then create_users creates every user on its own """
+    # Arrange
+    files_exist_mock.return_value = []
+    root_path = wordpressdata.root_path
+    # Act
+    sut.main(root_path, "root", "root", "root", "any", [''], [''], False, True, False, bulk_users=False)
+    # Assert
+    assert create_users_mock.call_args.kwargs["bulk"] is False
+
+
+@patch("project_types.wordpress.wptools.import_content_from_configuration_file")
+@patch("project_types.wordpress.wptools.convert_wp_config_token")
+@patch("filesystem.paths.move_files")
+@patch("tools.git.purge_gitkeep")
+@patch("project_types.wordpress.wptools.export_database")
+@patch("project_types.wordpress.generate_wordpress.delete_sample_wp_config_file")
+@patch("project_types.wordpress.generate_wordpress.generate_additional_wpconfig_files")
+@patch("logging.info")
+@patch("core.log_tools.log_indented_list")
+@patch("project_types.wordpress.wp_theme_tools.build_theme")
+@patch("project_types.wordpress.wptools.install_plugins_from_configuration_file")
+@patch("project_types.wordpress.wp_theme_tools.install_themes_from_configuration_file")
+@patch("project_types.wordpress.wptools.install_wordpress_site")
+@patch("project_types.wordpress.wptools.set_wordpress_config_from_configuration_file")
+@patch("project_types.wordpress.wptools.download_wordpress")
+@patch("project_types.wordpress.generate_wordpress.setup_devops_toolset")
+@patch("project_types.wordpress.wptools.start_basic_project_structure")
+@patch("project_types.wordpress.wptools.get_wordpress_path_from_root_path")
+@patch("project_types.wordpress.wptools.get_site_configuration")
+@patch("project_types.wordpress.wptools.get_required_file_paths")
+@patch("project_types.wordpress.wp_theme_tools.get_themes_path_from_root_path")
+@patch("filesystem.paths.files_exist_filtered")
+@patch("project_types.wordpress.wptools.get_constants")
+@patch("project_types.wordpress.wptools.get_environment")
+@patch("project_types.wordpress.wptools.add_wp_options")
+@patch("project_types.wordpress.wptools.create_users")
+def test_main_given_delete_content_with_sql_then_import_content_deletes_with_sql(
+        create_users_mock, add_wp_options_mock, get_environment_mock, constants_mock, files_exist_mock,
+        get_themes_path_mock, get_required_files_mock, get_site_config_mock, get_wordpress_path,
+        start_basic_structure_mock, setup_devops_toolset_mock, download_wordpress_mock, set_wordpress_config_mock,
+        install_wordpress_site_mock, install_theme_mock, install_plugins_mock, build_theme_mock, log_indented_mock,
+        logging_mock, generate_environments_mock, delete_sample_mock, export_database_mock, purge_gitkeep_mock,
+        move_files_mock, convert_wp_config_token_mock, import_content_mock, wordpressdata):
+    """ Given delete_content_with_sql, then the content is deleted with SQL before importing it """
+    # Arrange
+    files_exist_mock.return_value = []
+    root_path = wordpressdata.root_path
+    # Act
+    sut.main(root_path, "root", "root", "root", "any", [''], [''], False, True, False, delete_content_with_sql=True)
+    # Assert
+    assert import_content_mock.call_args.kwargs["delete_with_sql"] is True
+
+
+@patch("project_types.wordpress.wptools.import_content_from_configuration_file")
+@patch("project_types.wordpress.wptools.convert_wp_config_token")
+@patch("filesystem.paths.move_files")
+@patch("tools.git.purge_gitkeep")
+@patch("project_types.wordpress.wptools.export_database")
+@patch("project_types.wordpress.generate_wordpress.delete_sample_wp_config_file")
+@patch("project_types.wordpress.generate_wordpress.generate_additional_wpconfig_files")
+@patch("logging.info")
+@patch("core.log_tools.log_indented_list")
+@patch("project_types.wordpress.wp_theme_tools.build_theme")
+@patch("project_types.wordpress.wptools.install_plugins_from_configuration_file")
+@patch("project_types.wordpress.wp_theme_tools.install_themes_from_configuration_file")
+@patch("project_types.wordpress.wptools.install_wordpress_site")
+@patch("project_types.wordpress.wptools.set_wordpress_config_from_configuration_file")
+@patch("project_types.wordpress.wptools.download_wordpress")
+@patch("project_types.wordpress.generate_wordpress.setup_devops_toolset")
+@patch("project_types.wordpress.wptools.start_basic_project_structure")
+@patch("project_types.wordpress.wptools.get_wordpress_path_from_root_path")
+@patch("project_types.wordpress.wptools.get_site_configuration")
+@patch("project_types.wordpress.wptools.get_required_file_paths")
+@patch("project_types.wordpress.wp_theme_tools.get_themes_path_from_root_path")
+@patch("filesystem.paths.files_exist_filtered")
+@patch("project_types.wordpress.wptools.get_constants")
+@patch("project_types.wordpress.wptools.get_environment")
+@patch("project_types.wordpress.wptools.add_wp_options")
+@patch("project_types.wordpress.wptools.create_users")
+def test_main_given_no_incremental_import_then_import_content_is_not_incremental(
+        create_users_mock, add_wp_options_mock, get_environment_mock, constants_mock, files_exist_mock,
+        get_themes_path_mock, get_required_files_mock, get_site_config_mock, get_wordpress_path,
+        start_basic_structure_mock, setup_devops_toolset_mock, download_wordpress_mock, set_wordpress_config_mock,
+        install_wordpress_site_mock, install_theme_mock, install_plugins_mock, build_theme_mock, log_indented_mock,
+        logging_mock, generate_environments_mock, delete_sample_mock, export_database_mock, purge_gitkeep_mock,
+        move_files_mock, convert_wp_config_token_mock, import_content_mock, wordpressdata):
+    """ Given incremental_import is False, then all the content is deleted and imported again """
+    # Arrange
+    files_exist_mock.return_value = []
+    root_path = wordpressdata.root_path
+    # Act
+    sut.main(root_path, "root", "root", "root", "any", [''], [''], False, True, False, incremental_import=False)
+    # Assert
+    assert import_content_mock.call_args.kwargs["incremental"] is False
+
 # endregion main
 
 # region delete_sample_wp_config_file
@@ -289,4 +515,24 @@ def test_setup_devops_toolset_given_root_path_then_call_update_devops_toolset(
 # region generate_additional_wpconfig_files
 
 
+@patch("shutil.move")
+@patch("filesystem.paths.is_valid_path")
+@patch("project_types.wordpress.wptools.set_wordpress_config_from_configuration_file")
+def test_generate_additional_wpconfig_files_given_native_then_passes_it_to_set_wordpress_config(
+        set_wordpress_config_mock, is_valid_path_mock, move_mock, wordpressdata):
+    """ Given native, then every additional wp-config.php file is rendered with it """
+    # Arrange
+    site_config = json.loads(wordpressdata.site_config_content)
+    environments = [{"name": "dev"}, {"name": "prod"}, {"name": "staging"}]
+    passwords = {"dev": "dev-password", "prod": "prod-password"}
+    is_valid_path_mock.return_value = True
+    # Act
+    sut.generate_additional_wpconfig_files(site_config, environments, ["dev", "prod"], passwords,
+                                           wordpressdata.wordpress_path, False)
+    # Assert
+    set_wordpress_config_mock.assert_has_calls([
+        call(site_config, {"name": "dev"}, wordpressdata.wordpress_path, "dev-password", native=False),
+        call(site_config, {"name": "prod"}, wordpressdata.wordpress_path, "prod-password", native=False)])
+
+
 # endregion
@@ -0,0 +1,75 @@
+"""Unit core for the wordpress.php_date file"""
+import datetime
+import zoneinfo
+import pytest
+import project_types.wordpress.php_date as sut
+
+DATE = datetime.datetime(2021, 3, 4, 15, 6, 7, 123456, tzinfo=datetime.timezone.utc)
+
+# region compile_format()
+
+
+def test_compile_format_given_format_when_called_twice_then_returns_cached_template():
+    """Given a format, when compiled twice, then the same template is returned"""
+    # Act
+    result1 = sut.compile_format("Y-m-d")
+    result2 = sut.compile_format("Y-m-d")
+    # Assert
+    assert result1 is result2
+    assert result1[1] == "-"
+
+
+# endregion
+
+# region format_date()
+
+
+@pytest.mark.parametrize("date_format, expected", [
+    ("Y.m.d-Hisve", "2021.03.04-150607000UTC"),
+    ("D, d M y", "Thu, 04 Mar 21"),
+    ("l jS \\o\\f F", "Thursday 4th of March"),
+    ("N w z W t L o", "4 4 62 09 31 0 2021"),
+    ("g:i a G h A B", "3:06 pm 15 03 PM 670"),
+    ("u v O P p Z I", "000000 000 +0000 +00:00 Z 0 0"),
+    ("c", "2021-03-04T15:06:07+00:00"),
+    ("r", "Thu, 04 Mar 2021 15:06:07 +0000"),
+    ("U", "1614870367"),
+    ("[Y]", "[2021]"),
+])
+def test_format_date_given_format_then_formats_as_php(date_format, expected):
+    """Given a PHP date format, then formats the date as PHP does"""
+    # Act
+    result = sut.format_date(date_format, DATE)
+    # Assert
+    assert result == expected
+
+
+def test_format_date_given_microseconds_then_u_and_v_are_zeros():
+    """Given a date with microseconds, then u and v are zeros, as in PHP
+    date(), which gets an integer timestamp. Dump file names made with the
+    default [date|Y.m.d-Hisve] token keep their format"""
+    # Act
+    result = sut.format_date("Y.m.d-Hisv u", datetime.datetime(2021, 3, 4, 15, 6, 7, 999999))
+    # Assert
+    assert result == "2021.03.04-150607000 000000"
+
+
+def test_format_date_given_timezone_then_converts_date():
+    """Given a timezone, then the date is converted to it before formatting"""
+    # Arrange
+    timezone = zoneinfo.ZoneInfo("Europe/Madrid")
+    # Act
+    result = sut.format_date("Y-m-d H:i e T P", DATE, timezone)
+    # Assert
+    assert result == "2021-03-04 16:06 Europe/Madrid CET +01:00"
+
+
+def test_format_date_given_no_date_then_formats_now():
+    """Given no date, then the current date is formatted"""
+    # Act
+    result = sut.format_date("Y")
+    # Assert
+    assert result == str(datetime.datetime.now(datetime.timezone.utc).year)
+
+
+# endregion
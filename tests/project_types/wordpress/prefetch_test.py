@@ -0,0 +1,116 @@
+"""Unit core for the wordpress.prefetch file"""
+import pathlib
+import threading
+import pytest
+import project_types.wordpress.prefetch as sut
+from unittest.mock import patch
+
+GLOBAL_CONSTANTS = {"paths": {"content": {"plugins": "content/plugins", "themes": "content/themes"}}}
+
+
+def create_site_configuration() -> dict:
+    """Site configuration with remote and local plugins and themes"""
+    return {"settings": {
+        "plugins": [
+            {"name": "plugin-1", "source_type": "url", "source": "https://example.com/plugin-1.zip"},
+            {"name": "plugin-2", "source_type": "wordpress", "source": "plugin-2"},
+            {"name": "plugin-3", "source_type": "url", "source": "https://example.com/plugin-3.zip"},
+        ],
+        "themes": [
+            {"name": "theme-1", "source_type": "url", "source": "https://example.com/theme-1.zip"},
+            {"name": "theme-2", "source_type": "feed", "source": "theme-2"},
+            {"name": "theme-3", "source_type": "src", "source": "theme-3"},
+        ]}}
+
+
+@pytest.fixture
+def content_paths(tmp_path):
+    """Creates the plugins and themes directories"""
+    for path in GLOBAL_CONSTANTS["paths"]["content"].values():
+        pathlib.Path.joinpath(tmp_path, path).mkdir(parents=True)
+    yield tmp_path
+
+# region get_downloads()
+
+
+def test_get_downloads_given_site_configuration_then_returns_remote_plugins_and_themes(tmp_path):
+    """Given a site configuration, then returns url plugins and url / feed
+    themes with feed information"""
+    # Arrange
+    site_configuration = create_site_configuration()
+    # Act
+    result = sut.get_downloads(site_configuration, GLOBAL_CONSTANTS, str(tmp_path))
+    # Assert
+    assert [download.name for download in result] == ["plugin-1", "plugin-3", "theme-1"]
+    assert result[0].file_path == pathlib.Path.joinpath(tmp_path, "content/plugins", "plugin-1.zip")
+
+# endregion
+
+# region prefetch_artifacts()
+
+
+@patch("project_types.wordpress.wp_theme_tools.download_wordpress_theme")
+@patch("project_types.wordpress.wptools.download_wordpress_plugin")
+def test_prefetch_artifacts_given_remote_artifacts_then_downloads_them_at_the_same_time(
+        download_plugin_mock, download_theme_mock, content_paths):
+    """Given remote plugins and themes, then downloads them concurrently and
+    records their files as prefetched sources, keeping their source types"""
+    # Arrange
+    site_configuration = create_site_configuration()
+    # Every download waits for the others, so it only finishes if they run at the same time
+    barrier = threading.Barrier(3, timeout=5)
+
+    def download_plugin(plugin, file_path):
+        barrier.wait()
+        pathlib.Path(file_path).write_bytes(b"zip")
+
+    def download_theme(theme, themes_path):
+        barrier.wait()
+        pathlib.Path.joinpath(pathlib.Path(themes_path), f"{theme['name']}.zip").write_bytes(b"zip")
+
+    download_plugin_mock.side_effect = download_plugin
+    download_theme_mock.side_effect = download_theme
+    # Act
+    result = sut.prefetch_artifacts(site_configuration, GLOBAL_CONSTANTS, str(content_paths), 3)
+    # Assert
+    assert result == 3
+    plugin = site_configuration["settings"]["plugins"][0]
+    theme = site_configuration["settings"]["themes"][0]
+    assert plugin["source_type"] == "url"
+    assert plugin["prefetched_source"] == str(pathlib.Path.joinpath(content_paths, "content/plugins", "plugin-1.zip"))
+    assert theme["source_type"] == "url"
+    assert theme["prefetched_source"] == str(pathlib.Path.joinpath(content_paths, "content/themes", "theme-1.zip"))
+
+
+@patch("project_types.wordpress.wp_theme_tools.download_wordpress_theme")
+@patch("project_types.wordpress.wptools.download_wordpress_plugin")
+def test_prefetch_artifacts_given_download_error_then_raises_it(
+        download_plugin_mock, download_theme_mock, content_paths):
+    """Given a download that fails, then the error is raised"""
+    # Arrange
+    site_configuration = create_site_configuration()
+    download_plugin_mock.side_effect = ConnectionError("unreachable")
+    # Act
+    with pytest.raises(ConnectionError):
+        sut.prefetch_artifacts(site_configuration, GLOBAL_CONSTANTS, str(content_paths), 1)
+    # Assert
+    assert "prefetched_source" not in site_configuration["settings"]["plugins"][0]
+
+
+@patch("project_types.wordpress.wp_theme_tools.download_wordpress_theme")
+@patch("project_types.wordpress.wptools.download_wordpress_plugin")
+def test_prefetch_artifacts_given_artifact_not_downloaded_then_keeps_its_source(
+        download_plugin_mock, download_theme_mock, content_paths):
+    """Given a download that leaves no file (e.g. a feed without
+    credentials), even if a file from a previous run is in its path, then the
+    artifact is not prefetched"""
+    # Arrange
+    site_configuration = create_site_configuration()
+    pathlib.Path.joinpath(content_paths, "content/themes", "theme-1.zip").write_bytes(b"previous run")
+    # Act
+    result = sut.prefetch_artifacts(site_configuration, GLOBAL_CONSTANTS, str(content_paths))
+    # Assert
+    assert result == 0
+    assert "prefetched_source" not in site_configuration["settings"]["themes"][0]
+
+# endregion
@@ -1,5 +1,6 @@
 """Unit core for the rollback_database file"""
 
+import pytest
 from unittest.mock import patch
 import project_types.wordpress.rollback_database as sut
 
@@ -20,3 +21,30 @@ def test_main(reset_database, import_database):
     # Assert
     reset_database.assert_called()
     import_database.assert_called()
+
+
+@patch("project_types.wordpress.database.import_tables")
+@patch("project_types.wordpress.wp_cli.import_database")
+@patch("project_types.wordpress.wp_cli.reset_database")
+def test_main_given_table_dump_and_tables_then_imports_only_them(reset_database, import_database, import_tables):
+    """Given a table dump and some tables, then only those tables are
+    imported and the database is not reset"""
+
+    # Act
+    sut.main("/pathto/wordpress", "/pathto/db.tables", True, tables=["wp_options"], max_workers=2)
+
+    # Assert
+    reset_database.assert_not_called()
+    import_database.assert_not_called()
+    import_tables.assert_called_once_with("/pathto/wordpress", "/pathto/db.tables", ["wp_options"], 2, False)
+
+
+@patch("project_types.wordpress.wp_cli.reset_database")
+def test_main_given_tables_and_dump_file_then_raises_value_error(reset_database):
+    """Given some tables and a dump that is not a table dump, then raises
+    ValueError before the database is reset"""
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        sut.main("/pathto/wordpress", "/pathto/db.sql.gz", True, tables=["wp_options"])
+    reset_database.assert_not_called()
@@ -0,0 +1,157 @@
+"""Unit core for the wordpress.wp_cli_cache file"""
+
+import pytest
+import project_types.wordpress.wp_cli as wp_cli
+import project_types.wordpress.wp_cli_cache as sut
+import tools.cli as cli
+from core.CommandsCore import CommandsCore
+from project_types.wordpress.commands import Commands as WordpressCommands
+from unittest.mock import patch, MagicMock
+
+commands = CommandsCore([WordpressCommands])
+
+
+def option_get(option_name: str) -> str:
+    """Gets a wp option get command"""
+    return commands.get("wpcli_option_get").format(option_name=option_name, path="/pathto/wordpress", debug_info="")
+
+
+def user_get(user_login: str) -> str:
+    """Gets a wp user get command"""
+    return commands.get("wp_user_get").format(user_login=user_login, path="/pathto/wordpress", debug_info="")
+
+# region QueryCache
+
+
+def test_query_cache_call_given_same_query_then_runs_it_once():
+    """Given the same read-only query twice, then it is run once and the
+    second call is answered from the cache"""
+
+    # Arrange
+    cache = sut.QueryCache()
+    run = MagicMock(return_value="My site\n")
+
+    # Act
+    results = [cache.call(option_get("blogname"), run) for _ in range(2)]
+
+    # Assert
+    assert results == ["My site\n", "My site\n"]
+    run.assert_called_once()
+    assert cache.get_statistics() == (1, 1)
+
+
+def test_query_cache_call_given_query_without_result_then_caches_it():
+    """Given a query without output (e.g. the option does not exist), then
+    its result is cached too"""
+
+    # Arrange
+    cache = sut.QueryCache()
+    run = MagicMock(return_value=None)
+
+    # Act
+    results = [cache.call(option_get("foo"), run) for _ in range(2)]
+
+    # Assert
+    assert results == [None, None]
+    run.assert_called_once()
+
+
+def test_query_cache_call_given_write_then_forgets_queries_of_its_entity():
+    """Given a write, then the queries of the entity it changes are run
+    again and the rest are still cached"""
+
+    # Arrange
+    cache = sut.QueryCache()
+    run = MagicMock(return_value="value")
+    option_add = commands.get("wpcli_option_add").format(option_name="foo", option_value="bar", autoload="",
+                                                         path="/pathto/wordpress", debug_info="")
+    cache.call(option_get("foo"), run)
+    cache.call(user_get("admin"), run)
+
+    # Act
+    cache.call(option_add, run)
+    cache.call(option_get("foo"), run)
+    cache.call(user_get("admin"), run)
+
+    # Assert
+    assert [call.args[0].key for call in run.call_args_list] == \
+           ["wpcli_option_get", "wp_user_get", "wpcli_option_add", "wpcli_option_get"]
+
+
+@pytest.mark.parametrize("command", [
+    commands.get("wpcli_db_reset").format(path="/pathto/wordpress", yes="--yes", debug_info=""),
+    "wp option get foo --path=/pathto/wordpress"
+])
+def test_query_cache_invalidate_given_unknown_command_then_forgets_every_query(command):
+    """Given a command that is not a known query or write, then every query
+    is forgotten"""
+
+    # Arrange
+    cache = sut.QueryCache()
+    run = MagicMock(return_value="value")
+    cache.call(option_get("foo"), run)
+    cache.call(user_get("admin"), run)
+
+    # Act
+    cache.invalidate(command)
+    cache.call(option_get("foo"), run)
+    cache.call(user_get("admin"), run)
+
+    # Assert
+    assert run.call_count == 4
+
+
+def test_query_cache_call_when_expired_then_runs_query_again():
+    """Given a query whose result expired, then it is run again"""
+
+    # Arrange
+    cache = sut.QueryCache(ttl=0)
+    run = MagicMock(return_value="value")
+
+    # Act
+    cache.call(option_get("foo"), run)
+    cache.call(option_get("foo"), run)
+
+    # Assert
+    assert run.call_count == 2
+
+# endregion QueryCache
+
+# region cached_queries()
+
+
+@patch("logging.info")
+@patch.object(cli, "call_subprocess")
+@patch.object(cli, "call_subprocess_with_result")
+def test_cached_queries_given_add_update_option_then_checks_option_once(call_with_result_mock, call_mock,
+                                                                        log_mock):
+    """Given an option added with add_update_option, then the option is
+    checked once and the calls saved are logged"""
+
+    # Arrange
+    call_with_result_mock.return_value = None
+    option = {"name": "foo", "value": "bar", "autoload": False}
+
+    # Act
+    with sut.cached_queries():
+        wp_cli.add_update_option(option, "/pathto/wordpress")
+
+    # Assert
+    call_with_result_mock.assert_called_once()
+    call_mock.assert_called_once()
+    log_mock.assert_called_once_with(sut.literals.get("wp_wpcli_query_cache_statistics").format(hits=1, misses=1))
+    assert sut.get_active_cache() is None
+
+
+@patch.object(cli, "call_subprocess_with_result")
+def test_call_when_no_active_cache_then_runs_command(call_with_result_mock):
+    """Given no active cache, then queries are always run"""
+
+    # Act
+    wp_cli.check_if_option_exists("foo", "/pathto/wordpress")
+    wp_cli.check_if_option_exists("foo", "/pathto/wordpress")
+
+    # Assert
+    assert call_with_result_mock.call_count == 2
+
+# endregion cached_queries()
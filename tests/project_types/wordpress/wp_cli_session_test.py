@@ -0,0 +1,182 @@
+"""Unit core for the wordpress.wp_cli_session file"""
+import io
+import json
+import pytest
+import subprocess
+import project_types.wordpress.wp_cli_session as sut
+from core.CommandsCore import CommandsCore
+from project_types.wordpress.commands import Commands as WordpressCommands
+from unittest.mock import patch, MagicMock, ANY
+
+commands = CommandsCore([WordpressCommands])
+
+
+def create_session_process(responses: list) -> MagicMock:
+    """Creates a mocked session process that answers with the given responses"""
+    process = MagicMock()
+    lines = [json.dumps({"ready": True})] + [json.dumps(response) for response in responses]
+    process.stdout = io.StringIO("\n".join(lines) + "\n")
+    process.stderr = io.StringIO("")
+    process.stdin = io.StringIO()
+    return process
+
+
+# region WpCliSession
+
+
+@patch.object(subprocess, "Popen")
+@pytest.mark.parametrize("command, expected", [
+    ("wp option get blogname --path=/pathto/wordpress", True),
+    ("wp user create user1 user1@example.com --path=\"/pathto/wordpress\" --debug", True),
+    ("wp option get blogname --path=/pathto/other", False),
+    ("wp db export dump.sql --path=/pathto/wordpress", False),
+    ("wp option get blogname", False),
+    ("gulp build --path=/pathto/wordpress", False),
+])
+def test_wp_cli_session_accepts(popen_mock, command, expected, wordpressdata):
+    """Given a command, accepts it only if it is a session command for the same WordPress path"""
+
+    # Arrange
+    popen_mock.return_value = create_session_process([])
+    session = sut.WpCliSession(wordpressdata.wordpress_path)
+
+    # Act
+    result = session.accepts(command)
+
+    # Assert
+    assert result == expected
+
+
+@patch.object(subprocess, "Popen")
+def test_wp_cli_session_run_sends_command_without_global_arguments(popen_mock, wordpressdata):
+    """Given a command, sends it without the wp prefix, --path and --debug"""
+
+    # Arrange
+    process = create_session_process([{"stdout": "My site\n", "stderr": "", "return_code": 0}])
+    process.stdin = MagicMock()
+    popen_mock.return_value = process
+    session = sut.WpCliSession(wordpressdata.wordpress_path)
+
+    # Act
+    result = session.run(f"wp option get blogname --path={wordpressdata.wordpress_path} --debug")
+
+    # Assert
+    process.stdin.write.assert_called_once_with(json.dumps({"command": "option get blogname"}) + "\n")
+    assert result == sut.WpCliResult("My site\n", "", 0)
+
+
+@patch.object(subprocess, "Popen")
+def test_wp_cli_session_when_not_ready_then_raises_connection_error(popen_mock, wordpressdata):
+    """Given a session process that exits before being ready, raises ConnectionError"""
+
+    # Arrange
+    process = create_session_process([])
+    process.stdout = io.StringIO("Error: Error establishing a database connection.\n")
+    popen_mock.return_value = process
+
+    # Act / Assert
+    with pytest.raises(ConnectionError):
+        sut.WpCliSession(wordpressdata.wordpress_path)
+
+# endregion
+
+# region call_subprocess / call_subprocess_with_result
+
+
+@patch("tools.cli.call_subprocess_with_result")
+def test_call_subprocess_with_result_when_no_session_then_calls_cli(call_subprocess_with_result_mock):
+    """Given no active session, runs the command in its own process"""
+
+    # Arrange
+    command = "wp option get blogname --path=/pathto/wordpress"
+
+    # Act
+    sut.call_subprocess_with_result(command)
+
+    # Assert
+    call_subprocess_with_result_mock.assert_called_once_with(command)
+
+
+@patch("tools.cli.call_subprocess_with_result")
+@patch.object(subprocess, "Popen")
+def test_call_subprocess_with_result_when_session_then_runs_in_session(
+        popen_mock, call_subprocess_with_result_mock, wordpressdata):
+    """Given an active session, runs the command in the session and returns its stdout"""
+
+    # Arrange
+    popen_mock.return_value = create_session_process([{"stdout": "My site\n", "stderr": "", "return_code": 0}])
+    command = f"wp option get blogname --path={wordpressdata.wordpress_path}"
+
+    # Act
+    with sut.session(wordpressdata.wordpress_path):
+        result = sut.call_subprocess_with_result(command)
+
+    # Assert
+    call_subprocess_with_result_mock.assert_not_called()
+    assert result == "My site\n"
+    assert sut.get_active_session() is None
+
+
+@patch("core.log_tools.log_stdouterr")
+@patch("tools.cli.call_subprocess")
+@patch.object(subprocess, "Popen")
+def test_call_subprocess_when_session_and_error_then_logs_error(
+        popen_mock, call_subprocess_mock, log_stdouterr_mock, wordpressdata):
+    """Given an active session, when the command fails, logs stderr as error"""
+
+    # Arrange
+    popen_mock.return_value = create_session_process([{"stdout": "", "stderr": "Error: x", "return_code": 1}])
+    command = f"wp option add foo \"bar\" --path={wordpressdata.wordpress_path}"
+
+    # Act
+    with sut.session(wordpressdata.wordpress_path):
+        sut.call_subprocess(command, log_after_err=["error"])
+
+    # Assert
+    call_subprocess_mock.assert_not_called()
+    log_stdouterr_mock.assert_called_once_with(b"Error: x", ANY)
+
+
+@patch("tools.cli.call_subprocess_with_result", return_value="My site\n")
+@patch.object(subprocess, "Popen")
+def test_call_subprocess_with_result_when_session_dies_then_runs_query_in_cli(
+        popen_mock, call_subprocess_with_result_mock, wordpressdata):
+    """Given an active session, when the session process dies while running a read-only query, runs it in its own
+    process"""
+
+    # Arrange
+    popen_mock.return_value = create_session_process([])
+    command = commands.get("wpcli_option_get").format(option_name="blogname", path=wordpressdata.wordpress_path,
+                                                      debug_info="")
+
+    # Act
+    with sut.session(wordpressdata.wordpress_path):
+        result = sut.call_subprocess_with_result(command)
+
+    # Assert
+    call_subprocess_with_result_mock.assert_called_once_with(command)
+    assert result == "My site\n"
+
+
+@patch("logging.error")
+@patch("tools.cli.call_subprocess")
+@patch.object(subprocess, "Popen")
+def test_call_subprocess_when_session_dies_then_does_not_run_write_again(
+        popen_mock, call_subprocess_mock, log_error_mock, wordpressdata):
+    """Given an active session, when the session process dies while running a command that is not read-only, it
+    is not run again and the error is logged"""
+
+    # Arrange
+    popen_mock.return_value = create_session_process([])
+    command = commands.get("wpcli_plugin_install").format(source="foo", activate="", force="",
+                                                          path=wordpressdata.wordpress_path, debug_info="")
+
+    # Act
+    with sut.session(wordpressdata.wordpress_path):
+        sut.call_subprocess(command, log_after_err=["error"])
+
+    # Assert
+    call_subprocess_mock.assert_not_called()
+    log_error_mock.assert_any_call(sut.literals.get("wp_wpcli_session_write_lost_err"))
+
+# endregion
@@ -7,6 +7,9 @@ from core.LiteralsCore import LiteralsCore
 from project_types.wordpress.Literals import Literals as WordpressLiterals
 from project_types.wordpress.commands import Commands as WordpressCommands
 from unittest.mock import patch, ANY
+import gzip
+import json
+import os
 
 app: App = App()
 literals = LiteralsCore([WordpressLiterals])
@@ -473,6 +476,64 @@ def test_convert_wp_parameter_yes(value, expected):
 
 # endregion
 
+# region export_database()
+
+
+@patch("tools.cli.call_subprocess")
+def test_export_database_given_sql_file_then_exports_without_extended_inserts(call_subprocess, wordpressdata):
+    """Given a .sql dump file, exports it with one INSERT per row so it can be versioned"""
+
+    # Act
+    sut.export_database(wordpressdata.wordpress_path, "/pathto/dump.sql", False)
+
+    # Assert
+    call_subprocess.assert_called_once_with(commands.get("wpcli_db_export").format(
+        core_dump_path="/pathto/dump.sql", path=wordpressdata.wordpress_path, extended_insert="false", debug_info=""),
+        log_before_out=ANY, log_after_err=ANY, stream=True)
+
+
+@patch("tools.cli.pipe_subprocess")
+def test_export_database_given_gz_file_then_streams_compressed_dump(pipe_subprocess, tmp_path, wordpressdata):
+    """Given a .sql.gz dump file, compresses the dump while it is exported with extended inserts"""
+
+    # Arrange
+    dump_file_path = str(tmp_path / "dump.sql.gz")
+
+    def write_dump(command, stdout, **kwargs):
+        stdout.write(b"INSERT INTO wp_options VALUES (1),(2);")
+        return 0
+
+    pipe_subprocess.side_effect = write_dump
+
+    # Act
+    sut.export_database(wordpressdata.wordpress_path, dump_file_path, False)
+
+    # Assert
+    pipe_subprocess.assert_called_once_with(commands.get("wpcli_db_export_stdout").format(
+        path=wordpressdata.wordpress_path, extended_insert="true", debug_info=""),
+        stdout=ANY, log_before_process=ANY, log_after_err=ANY)
+    with gzip.open(dump_file_path, "rb") as dump_file:
+        assert dump_file.read() == b"INSERT INTO wp_options VALUES (1),(2);"
+    assert not os.path.exists(f"{dump_file_path}.part")
+
+
+@patch("tools.cli.pipe_subprocess")
+def test_export_database_given_gz_file_when_export_fails_then_leaves_no_file(pipe_subprocess, tmp_path,
+                                                                             wordpressdata):
+    """Given a .sql.gz dump file, when the export fails, removes the partial dump"""
+
+    # Arrange
+    dump_file_path = str(tmp_path / "dump.sql.gz")
+    pipe_subprocess.return_value = 1
+
+    # Act
+    sut.export_database(wordpressdata.wordpress_path, dump_file_path, False)
+
+    # Assert
+    assert os.listdir(tmp_path) == []
+
+# endregion
+
 # region import_database()
 
 
@@ -491,7 +552,32 @@ def test_import_database(call_subprocess, wordpressdata):
     # Assert
     call_subprocess.assert_called_once_with(commands.get("wpcli_db_import").format(
         file=dump_file_path, path=wordpress_path, debug_info=sut.convert_wp_parameter_debug(debug)),
-        log_before_process=ANY, log_after_err=ANY)
+        log_before_process=ANY, log_after_err=ANY, stream=True)
+
+
+@patch("tools.cli.pipe_subprocess")
+def test_import_database_given_gz_file_then_streams_decompressed_dump(pipe_subprocess, tmp_path, wordpressdata):
+    """Given a .sql.gz dump file, decompresses it while it is imported from stdin"""
+
+    # Arrange
+    dump_file_path = str(tmp_path / "dump.sql.gz")
+    with gzip.open(dump_file_path, "wb") as dump_file:
+        dump_file.write(b"SELECT 1;")
+    imported = {}
+
+    def read_dump(command, stdin, **kwargs):
+        imported["dump"] = stdin.read()
+        return 0
+
+    pipe_subprocess.side_effect = read_dump
+
+    # Act
+    sut.import_database(wordpressdata.wordpress_path, dump_file_path, False)
+
+    # Assert
+    pipe_subprocess.assert_called_once_with(commands.get("wpcli_db_import_stdin").format(
+        path=wordpressdata.wordpress_path, debug_info=""), stdin=ANY, log_before_process=ANY, log_after_err=ANY)
+    assert imported["dump"] == b"SELECT 1;"
 
 # endregion
 
@@ -552,47 +638,309 @@ def test_wp_cli_info(call_subprocess):
 
 # endregion
 
-# region create_wordpress_database_user()
+# region export_content_to_wxr()
 
 
 @patch("tools.cli.call_subprocess")
-@pytest.mark.skip(reason="Need to fix this test")
-def test_create_wordpress_database_user(call_subprocess):
-    """Given arguments, when the method is called, then creates a db user"""
+def test_export_content_to_wxr(call_subprocess):
+    """Given arguments, when the method is called, then exports WordPress
+    content"""
 
     # Arrange
     wordpress_path = ""
-    user_name = "user1"
-    user_p = "pass"
-    schema = "db1"
-    host = "localhost"
-    privileges = "create, alter, select, insert, update, delete"
+    destination_path = ""
+    wxr_file_suffix = "suffix"
 
     # Act
-    sut.create_wordpress_database_user(wordpress_path, user_name, user_p, schema, host, privileges)
+    sut.export_content_to_wxr(wordpress_path, destination_path, wxr_file_suffix)
 
     # Assert
     call_subprocess.assert_called()
 
 # endregion
 
-# region create_wordpress_database_user()
+# region get_options()
+
+
+@patch("tools.cli.call_subprocess_with_result")
+def test_get_options_returns_option_values_by_name(call_subprocess_with_result, wordpressdata):
+    """Given a WordPress path, lists the options once and returns their values by name"""
+
+    # Arrange
+    call_subprocess_with_result.return_value = json.dumps([
+        {"option_name": "blogname", "option_value": "My site"},
+        {"option_name": "posts_per_page", "option_value": "10"}])
+
+    # Act
+    result = sut.get_options(wordpressdata.wordpress_path)
+
+    # Assert
+    call_subprocess_with_result.assert_called_once_with(commands.get("wpcli_option_list").format(
+        path=wordpressdata.wordpress_path, debug_info=""))
+    assert result == {"blogname": "My site", "posts_per_page": "10"}
+
+
+@patch("tools.cli.call_subprocess_with_result")
+@pytest.mark.parametrize("output", [None, "Error: not installed"])
+def test_get_options_when_no_json_then_returns_none(call_subprocess_with_result, output, wordpressdata):
+    """Given a WordPress path, when options cannot be listed, returns None"""
+
+    # Arrange
+    call_subprocess_with_result.return_value = output
+
+    # Act
+    result = sut.get_options(wordpressdata.wordpress_path)
+
+    # Assert
+    assert result is None
+
+# endregion
+
+# region update_options()
 
 
 @patch("tools.cli.call_subprocess")
-def test_export_content_to_wxr(call_subprocess):
-    """Given arguments, when the method is called, then exports WordPress
-    content"""
+def test_update_options_writes_changes_file_and_calls_eval_file(call_subprocess, wordpressdata):
+    """Given changes, writes them to a JSON file, runs the bulk script once and deletes the file"""
 
     # Arrange
-    wordpress_path = ""
-    destination_path = ""
-    wxr_file_suffix = "suffix"
+    changes = [{"action": "add", "name": "foo", "value": "bar", "autoload": True}]
+    written = {}
+
+    def read_changes_file(command, **kwargs):
+        changes_file = command.split("\"")[3]
+        with open(changes_file) as file:
+            written["changes"] = json.load(file)
+        written["path"] = changes_file
+
+    call_subprocess.side_effect = read_changes_file
 
     # Act
-    sut.export_content_to_wxr(wordpress_path, destination_path, wxr_file_suffix)
+    sut.update_options(changes, wordpressdata.wordpress_path, False)
 
     # Assert
-    call_subprocess.assert_called()
+    call_subprocess.assert_called_once()
+    assert written["changes"] == changes
+    assert not os.path.exists(written["path"])
+
+# endregion
+
+# region get_user_logins()
+
+
+@patch("tools.cli.call_subprocess_with_result")
+def test_get_user_logins_returns_logins(call_subprocess_with_result, wordpressdata):
+    """Given a WordPress path, lists the users once and returns their logins"""
+
+    # Arrange
+    call_subprocess_with_result.return_value = json.dumps([{"user_login": "admin"}, {"user_login": "editor"}])
+
+    # Act
+    result = sut.get_user_logins(wordpressdata.wordpress_path, False)
+
+    # Assert
+    call_subprocess_with_result.assert_called_once_with(commands.get("wp_user_list").format(
+        path=wordpressdata.wordpress_path, debug_info=""))
+    assert result == {"admin", "editor"}
+
+
+@patch("tools.cli.call_subprocess_with_result")
+def test_get_user_logins_when_no_json_then_returns_none(call_subprocess_with_result, wordpressdata):
+    """Given a WordPress path, when users cannot be listed, returns None"""
+
+    # Arrange
+    call_subprocess_with_result.return_value = "Error: Error establishing a database connection."
+
+    # Act
+    result = sut.get_user_logins(wordpressdata.wordpress_path, False)
+
+    # Assert
+    assert result is None
+
+# endregion
+
+# region create_users()
+
+
+@patch("tools.cli.call_subprocess_with_result")
+def test_create_users_writes_users_file_and_returns_results(call_subprocess_with_result, wordpressdata):
+    """Given users, writes them to a JSON file, runs the bulk script once, deletes the file and returns the results"""
+
+    # Arrange
+    users = [{"user_login": "new", "user_email": "new@example.com"}]
+    results = [{"user_login": "new", "created": True, "error": None}]
+    written = {}
+
+    def read_users_file(command):
+        users_file = command.split("\"")[3]
+        with open(users_file) as file:
+            written["users"] = json.load(file)
+        written["path"] = users_file
+        return json.dumps(results)
+
+    call_subprocess_with_result.side_effect = read_users_file
+
+    # Act
+    result = sut.create_users(users, wordpressdata.wordpress_path, False)
+
+    # Assert
+    call_subprocess_with_result.assert_called_once()
+    assert written["users"] == users
+    assert not os.path.exists(written["path"])
+    assert result == results
+
+# endregion
+
+# region delete_post_type_content()
+
+
+@patch("tools.cli.call_subprocess")
+@patch("tools.cli.call_subprocess_with_result")
+def test_delete_post_type_content_deletes_posts_in_chunks(call_subprocess_with_result, call_subprocess,
+                                                          wordpressdata):
+    """Given a post type, lists and deletes its posts chunk_size at a time"""
+
+    # Arrange
+    call_subprocess_with_result.side_effect = ["1 2", "3"]
+
+    # Act
+    result = sut.delete_post_type_content(wordpressdata.wordpress_path, "page", chunk_size=2)
+
+    # Assert
+    call_subprocess_with_result.assert_called_with(commands.get("wpcli_post_list_ids_chunk").format(
+        post_type="page", chunk_size=2, path=wordpressdata.wordpress_path))
+    assert [args[0][0] for args in call_subprocess.call_args_list] == [
+        commands.get("wpcli_post_delete_post_type").format(
+            id_list=id_list, path=wordpressdata.wordpress_path, debug_info="") for id_list in ["1 2", "3"]]
+    assert result == 3
+
+
+@patch("tools.cli.call_subprocess")
+@patch("tools.cli.call_subprocess_with_result")
+def test_delete_post_type_content_when_posts_are_not_deleted_then_stops(call_subprocess_with_result,
+                                                                        call_subprocess, wordpressdata):
+    """Given a post type, when the same chunk is listed again after deleting it, stops deleting"""
+
+    # Arrange
+    call_subprocess_with_result.return_value = "1 2"
+
+    # Act
+    result = sut.delete_post_type_content(wordpressdata.wordpress_path, "page", chunk_size=2)
+
+    # Assert
+    call_subprocess.assert_called_once()
+    assert result == 2
+
+
+@patch("tools.cli.call_subprocess")
+@patch("tools.cli.call_subprocess_with_result")
+def test_delete_post_type_content_given_use_sql_then_runs_sql_script(call_subprocess_with_result, call_subprocess,
+                                                                     wordpressdata):
+    """Given use_sql, deletes the posts with a single call to the SQL script"""
+
+    # Arrange
+    call_subprocess_with_result.return_value = "1500"
+
+    # Act
+    result = sut.delete_post_type_content(wordpressdata.wordpress_path, "page", use_sql=True)
+
+    # Assert
+    call_subprocess_with_result.assert_called_once_with(commands.get("wpcli_post_delete_post_type_sql").format(
+        script=sut.DELETE_POST_TYPE_SCRIPT_PATH.as_posix(), post_type="page", path=wordpressdata.wordpress_path,
+        debug_info=""))
+    call_subprocess.assert_not_called()
+    assert result == 1500
+
+# endregion
+
+# region delete_posts()
+
+
+@patch("tools.cli.call_subprocess")
+def test_delete_posts_deletes_posts_in_chunks(call_subprocess, wordpressdata):
+    """Given post ids, deletes them chunk_size at a time"""
+
+    # Act
+    sut.delete_posts(["1", "2", "3"], wordpressdata.wordpress_path, chunk_size=2)
+
+    # Assert
+    assert [args[0][0] for args in call_subprocess.call_args_list] == [
+        commands.get("wpcli_post_delete_post_type").format(
+            id_list=id_list, path=wordpressdata.wordpress_path, debug_info="") for id_list in ["1 2", "3"]]
+
+# endregion
+
+# region get_posts_for_wxr_import()
+
+
+@patch("tools.cli.call_subprocess_with_result")
+def test_get_posts_for_wxr_import_lists_post_types_at_once(call_subprocess_with_result, wordpressdata):
+    """Given post types, lists their posts with a single call"""
+
+    # Arrange
+    posts = [{"ID": 1, "guid": "guid-1", "post_type": "page", "post_title": "Home",
+              "post_date_gmt": "2021-01-01 10:00:00", "post_modified_gmt": "2021-01-01 10:00:00"}]
+    call_subprocess_with_result.return_value = json.dumps(posts)
+
+    # Act
+    result = sut.get_posts_for_wxr_import(["attachment", "page"], wordpressdata.wordpress_path)
+
+    # Assert
+    call_subprocess_with_result.assert_called_once_with(commands.get("wpcli_post_list_wxr").format(
+        post_types="attachment,page", path=wordpressdata.wordpress_path, debug_info=""))
+    assert result == posts
+
+# endregion
+
+# region get_database_fingerprint()
+
+
+@patch("tools.cli.call_subprocess_with_result")
+def test_get_database_fingerprint_given_schema_only_then_queries_only_schema(call_subprocess_with_result,
+                                                                            wordpressdata):
+    """Given schema_only, gets the fingerprint from the columns of the tables only"""
+
+    # Arrange
+    call_subprocess_with_result.return_value = "wp_posts\tID\tbigint(20) unsigned\tPRI\n"
+
+    # Act
+    result = sut.get_database_fingerprint(wordpressdata.wordpress_path, True)
+
+    # Assert
+    call_subprocess_with_result.assert_called_once_with(commands.get("wpcli_db_query_schema").format(
+        path=wordpressdata.wordpress_path, debug_info=""))
+    assert len(result) == 64
+
+
+@patch("tools.cli.call_subprocess_with_result")
+def test_get_database_fingerprint_when_data_changes_then_changes(call_subprocess_with_result, wordpressdata):
+    """Given schema_only False, when table checksums change, the fingerprint changes"""
+
+    # Arrange
+    call_subprocess_with_result.side_effect = ["schema", "wp_options,wp_posts", "wp.wp_options\t1\n",
+                                               "schema", "wp_options,wp_posts", "wp.wp_options\t2\n"]
+
+    # Act
+    first = sut.get_database_fingerprint(wordpressdata.wordpress_path, False)
+    second = sut.get_database_fingerprint(wordpressdata.wordpress_path, False)
+
+    # Assert
+    call_subprocess_with_result.assert_any_call(commands.get("wpcli_db_query_checksum").format(
+        tables="wp_options,wp_posts", path=wordpressdata.wordpress_path, debug_info=""))
+    assert first != second
+
+
+@patch("tools.cli.call_subprocess_with_result")
+def test_get_database_fingerprint_when_no_output_then_returns_none(call_subprocess_with_result, wordpressdata):
+    """Given a WordPress path, when the database cannot be queried, returns None"""
+
+    # Arrange
+    call_subprocess_with_result.return_value = None
+
+    # Act
+    result = sut.get_database_fingerprint(wordpressdata.wordpress_path, False)
+
+    # Assert
+    assert result is None
 
 # endregion
@@ -0,0 +1,108 @@
+"""Unit core for the wordpress.wp_config file"""
+import json
+import pathlib
+import pytest
+import project_types.wordpress.wp_config as sut
+
+# region convert_php_value
+
+
+@pytest.mark.parametrize("value, raw, expected", [
+    ("/wp-content", False, "'/wp-content'"),
+    ("it's C:\\path", False, "'it\\'s C:\\\\path'"),
+    (True, True, "true"),
+    (False, True, "false"),
+    (5, True, "5"),
+    (None, True, "null"),
+])
+def test_convert_php_value(value, raw, expected):
+    """Given a value, returns its PHP representation (quoted unless raw)"""
+
+    # Act
+    result = sut.convert_php_value(value, raw)
+
+    # Assert
+    assert result == expected
+
+# endregion
+
+# region convert_php_setting
+
+
+@pytest.mark.parametrize("value_type, expected", [
+    ("constant", "define( 'WP_DEBUG', true );"),
+    ("variable", "$WP_DEBUG = true;"),
+])
+def test_convert_php_setting(value_type, expected):
+    """Given a setting type, returns a constant definition or a variable assignment"""
+
+    # Act
+    result = sut.convert_php_setting("WP_DEBUG", True, value_type, True)
+
+    # Assert
+    assert result == expected
+
+# endregion
+
+# region generate_salts
+
+
+def test_generate_salts_returns_a_random_value_per_key():
+    """Returns a value for each key, of the expected length and alphabet"""
+
+    # Act
+    result = sut.generate_salts()
+
+    # Assert
+    assert list(result.keys()) == sut.SALT_NAMES
+    for value in result.values():
+        assert len(value) == sut.SALT_LENGTH
+        assert set(value) <= set(sut.SALT_CHARACTERS)
+
+# endregion
+
+# region render_configuration_file
+
+
+@pytest.mark.parametrize("aws_cloudfront", [True, False])
+def test_render_configuration_file_renders_database_salts_settings_and_snippet(aws_cloudfront, wordpressdata):
+    """Given an environment configuration, renders every setting in a single file"""
+
+    # Arrange
+    environment_config = json.loads(wordpressdata.site_config_content)["environments"][0]
+    salts = {name: "salt" for name in sut.SALT_NAMES}
+
+    # Act
+    result = sut.render_configuration_file(environment_config, "my-password", aws_cloudfront, salts)
+
+    # Assert
+    assert "define( 'DB_NAME', 'mysite_com' );" in result
+    assert "define( 'DB_PASSWORD', 'my-password' );" in result
+    assert "define( 'NONCE_SALT', 'salt' );" in result
+    assert "$table_prefix = 'wp_';" in result
+    assert "define( 'WP_CONTENT_URL', '/wp-content' );" in result
+    assert "define( 'EMPTY_TRASH_DAYS', 5 );" in result
+    assert "define( 'WP_DEBUG', true );" in result
+    assert ("HTTP_CLOUDFRONT_FORWARDED_PROTO" in result) == aws_cloudfront
+    assert result.index("HTTP_CLOUDFRONT_FORWARDED_PROTO" if aws_cloudfront else "WP_DEBUG") < \
+        result.index("require_once ABSPATH . 'wp-settings.php';")
+
+# endregion
+
+# region write_configuration_file
+
+
+def test_write_configuration_file_writes_wp_config_php(tmp_path, wordpressdata):
+    """Given a WordPress path, writes the wp-config.php file into it"""
+
+    # Arrange
+    environment_config = json.loads(wordpressdata.site_config_content)["environments"][0]
+
+    # Act
+    result = sut.write_configuration_file(environment_config, str(tmp_path), "my-password")
+
+    # Assert
+    assert result == pathlib.Path.joinpath(tmp_path, "wp-config.php")
+    assert result.read_text().startswith("<?php")
+
+# endregion
@@ -113,7 +113,8 @@ def test_build_theme_given_site_config_when_src_themes_then_calls_subprocess_wit
     subprocess_mock.assert_called_once_with(command,
                                             log_before_out=[literal_before],
                                             log_after_out=[literal_after],
-                                            log_after_err=[literal_error])
+                                            log_after_err=[literal_error],
+                                            stream=True)
 
 
 @patch("logging.info")
@@ -330,8 +331,8 @@ def test_download_wordpress_theme_given_theme_config_when_source_type_is_feed_an
     log_warning_mock.assert_called()
 
 
-@patch("filesystem.paths.download_file")
-def test_download_wordpress_theme_given_theme_config_when_source_type_is_url_then_calls_paths_download_file(
+@patch("filesystem.artifact_cache.download_file")
+def test_download_wordpress_theme_given_theme_config_when_source_type_is_url_then_calls_download_file(
         download_file_mock, themesdata):
     """ Given theme config, when source type is url, then downloads content to the destination path"""
     # Arrange
@@ -340,7 +341,8 @@ def test_download_wordpress_theme_given_theme_config_when_source_type_is_url_the
     # Act
     sut.download_wordpress_theme(theme_config, destination_path)
     # Assert
-    download_file_mock.assert_called_once_with(theme_config["source"], destination_path, f"{theme_config['name']}.zip")
+    download_file_mock.assert_called_once_with(theme_config["source"], destination_path, f"{theme_config['name']}.zip",
+                                               version=None, checksum=None)
 
 # endregion
 
@@ -401,6 +403,31 @@ def test_install_theme_given_configuration_file_when_no_parent_theme_then_instal
                                                environment_config["wp_cli_debug"], themesdata.child_name)
 
 
+@patch("project_types.wordpress.wp_theme_tools.download_wordpress_theme")
+@patch("filesystem.zip.read_text_file_in_zip")
+@patch("filesystem.parsers.parse_theme_metadata", return_value={"Version": "1.0"})
+@patch("project_types.wordpress.wp_cli.install_theme")
+def test_install_theme_given_prefetched_url_theme_then_installs_it_without_downloading_and_purges_it(
+        install_theme_mock, parse_theme_metadata, read_text_file_mock, download_wordpress_mock, tmp_path):
+    """ Given a url theme downloaded by prefetch.prefetch_artifacts, then it is not downloaded again and its zip
+    file is deleted once installed """
+    # Arrange
+    constants = {"paths": {"wordpress": "wordpress", "content": {"themes": "content/themes"}}}
+    theme_path = pathlib.Path.joinpath(tmp_path, "content/themes", "theme-1.zip")
+    theme_path.parent.mkdir(parents=True)
+    theme_path.write_bytes(b"zip")
+    site_config = {"settings": {"themes": [{"name": "theme-1", "source_type": "url", "activate": True,
+                                            "source": "https://example.com/theme-1.zip",
+                                            "prefetched_source": str(theme_path)}]}}
+    # Act
+    sut.install_themes_from_configuration_file(site_config, {"wp_cli_debug": False}, constants, str(tmp_path), True)
+    # Assert
+    download_wordpress_mock.assert_not_called()
+    install_theme_mock.assert_called_once_with(str(pathlib.Path.joinpath(tmp_path, "wordpress")), str(theme_path),
+                                               True, False, "theme-1")
+    assert not theme_path.exists()
+
+
 # endregion
 
 # region replace_theme_meta_data_in_package_file()
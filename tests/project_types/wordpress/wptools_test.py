@@ -1,17 +1,21 @@
 """Unit core for the wordpress.tools file"""
+import datetime
 import os
 import re
 import stat
 import pytest
 import json
 import pathlib
+import requests
+import zoneinfo
+import filesystem.artifact_cache as artifact_cache
 import project_types.wordpress.wptools as sut
 from filesystem import paths
 from project_types.wordpress.basic_structure_starter import BasicStructureStarter
 from devops_platforms import constants as devops_platform_constants
 from core.LiteralsCore import LiteralsCore
 from project_types.wordpress.Literals import Literals as WordpressLiterals
-from unittest.mock import patch, mock_open, call
+from unittest.mock import patch, mock_open, call, MagicMock
 from tests.project_types.wordpress.conftest import WordPressData, mocked_requests_get, \
     mocked_requests_get_json_content, PluginsData
 
@@ -36,8 +40,77 @@ def test_add_wp_options_given_options_then_calls_wp_cli_add_update_option(add_up
         calls.append(call(option, wordpress_path, False))
     add_update_option_mock.assert_has_calls(calls)
 
+
+@patch("project_types.wordpress.wp_cli.update_permalink_structure")
+@patch("project_types.wordpress.wp_cli.update_options")
+@patch("project_types.wordpress.wp_cli.add_update_option")
+@patch("project_types.wordpress.wp_cli.get_options")
+def test_add_wp_options_given_bulk_then_applies_changes_in_a_single_call(
+        get_options_mock, add_update_option_mock, update_options_mock, update_permalink_structure_mock,
+        wordpressdata):
+    """ Given options dict and bulk, then reads the options once and applies the changes at once """
+    # Arrange
+    options = json.loads(wordpressdata.site_config_content)["settings"]["options"]
+    wordpress_path = wordpressdata.wordpress_path
+    get_options_mock.return_value = {"permalink_structure": "/%postname%/"}
+
+    # Act
+    sut.add_wp_options(options, wordpress_path, bulk=True)
+
+    # Assert
+    get_options_mock.assert_called_once_with(wordpress_path, False)
+    add_update_option_mock.assert_not_called()
+    update_options_mock.assert_called_once_with(
+        [{"action": "update", "name": "permalink_structure", "value": "/%category%/%postname%/", "autoload": True}],
+        wordpress_path, False)
+    update_permalink_structure_mock.assert_called_once_with("/%category%/%postname%/", wordpress_path, False)
+
+
+@patch("project_types.wordpress.wp_cli.update_options")
+@patch("project_types.wordpress.wp_cli.add_update_option")
+@patch("project_types.wordpress.wp_cli.get_options")
+def test_add_wp_options_given_bulk_when_options_cannot_be_listed_then_adds_one_by_one(
+        get_options_mock, add_update_option_mock, update_options_mock, wordpressdata):
+    """ Given options dict and bulk, when options cannot be listed, then calls add_update_option for every option """
+    # Arrange
+    options = json.loads(wordpressdata.site_config_content)["settings"]["options"]
+    wordpress_path = wordpressdata.wordpress_path
+    get_options_mock.return_value = None
+
+    # Act
+    sut.add_wp_options(options, wordpress_path, bulk=True)
+
+    # Assert
+    update_options_mock.assert_not_called()
+    add_update_option_mock.assert_has_calls([call(option, wordpress_path, False) for option in options])
+
 # endregion add_wp_options
 
+# region get_wp_options_changes
+
+
+def test_get_wp_options_changes_returns_only_added_and_updated_options():
+    """ Given options and existing options, then returns changes only for missing or different options """
+    # Arrange
+    options = [
+        {"name": "blogname", "value": "My site", "autoload": True},
+        {"name": "posts_per_page", "value": 10, "autoload": True},
+        {"name": "new_option", "value": "new", "autoload": False},
+        {"name": "invalid_option", "value": None, "autoload": False},
+    ]
+    existing_options = {"blogname": "My site", "posts_per_page": "5"}
+
+    # Act
+    result = sut.get_wp_options_changes(options, existing_options)
+
+    # Assert
+    assert result == [
+        {"action": "update", "name": "posts_per_page", "value": "10", "autoload": True},
+        {"action": "add", "name": "new_option", "value": "new", "autoload": False},
+    ]
+
+# endregion get_wp_options_changes
+
 
 # region convert_wp_config_token
 
@@ -53,20 +126,35 @@ def test_convert_wp_config_token_given_token_when_no_match_then_return_bare_toke
     assert result == token
 
 
+@patch("project_types.wordpress.php_date.format_date")
 @patch("project_types.wordpress.wp_cli.eval_code")
-def test_convert_wp_config_token_given_token_when_date_match_then_calls_wp_cli_eval_code(
-        eval_code_mock, wordpressdata):
-    """Given token, when match "date|", then parses and calls wp_cli.eval_code with necessary data"""
+def test_convert_wp_config_token_given_token_when_date_match_then_formats_date_natively(
+        eval_code_mock, format_date_mock, wordpressdata):
+    """Given token, when match "date|", then formats the date without calling wp_cli.eval_code"""
     # Arrange
     token = "some-data-[date|Y.m.d-Hisve]"
     date_formatted = "some-formatted-date"
-    eval_code_mock.return_value = date_formatted
+    format_date_mock.return_value = date_formatted
     expected_result = f"some-data-{date_formatted}"
     wordpress_path = wordpressdata.wordpress_path
     # Act
     result = sut.convert_wp_config_token(token, wordpress_path)
     # Assert
     assert result == expected_result
+    format_date_mock.assert_called_once_with("Y.m.d-Hisve", timezone=datetime.timezone.utc)
+    eval_code_mock.assert_not_called()
+
+
+@patch("project_types.wordpress.php_date.format_date")
+def test_convert_wp_config_token_given_site_configuration_then_uses_site_timezone(format_date_mock, wordpressdata):
+    """Given site configuration, when match "date|", then formats the date in the site timezone"""
+    # Arrange
+    site_configuration = {"settings": {"options": [{"name": "timezone_string", "value": "Europe/Madrid"}]}}
+    format_date_mock.return_value = "2021"
+    # Act
+    sut.convert_wp_config_token("[date|Y]", wordpressdata.wordpress_path, site_configuration)
+    # Assert
+    format_date_mock.assert_called_once_with("Y", timezone=zoneinfo.ZoneInfo("Europe/Madrid"))
 
 
 # endregion
@@ -120,6 +208,67 @@ def test_create_configuration_file_then_calls_wp_cli_create_configuration_with_d
         debug=environment_config["wp_cli_debug"])
 
 
+# endregion
+
+# region create_users()
+
+
+@patch("project_types.wordpress.wp_cli.create_users")
+@patch("project_types.wordpress.wp_cli.get_user_logins")
+def test_create_users_given_bulk_then_creates_missing_users_in_a_single_call(
+        get_user_logins_mock, create_users_mock, wordpressdata):
+    """ Given users and bulk, then lists the users once and creates only the missing ones at once """
+    # Arrange
+    users = [{"user_login": "existing", "user_email": "existing@example.com"},
+             {"user_login": "new", "user_email": "new@example.com"},
+             {"user_login": "failed", "user_email": "failed@example.com"}]
+    wordpress_path = wordpressdata.wordpress_path
+    get_user_logins_mock.return_value = {"admin", "existing"}
+    create_users_mock.return_value = [{"user_login": "new", "created": True, "error": None},
+                                      {"user_login": "failed", "created": False, "error": "Invalid email"}]
+    # Act
+    with patch.object(sut, "logging") as logging_mock:
+        sut.create_users(users, wordpress_path, False, bulk=True)
+    # Assert
+    get_user_logins_mock.assert_called_once_with(wordpress_path, False)
+    create_users_mock.assert_called_once_with(users[1:], wordpress_path, False)
+    logging_mock.warning.assert_called_once_with(literals.get("wp_wpcli_user_exists").format(user="existing"))
+    logging_mock.info.assert_any_call(literals.get("wp_wpcli_user_created").format(user="new"))
+    logging_mock.error.assert_called_once_with(literals.get("wp_wpcli_user_creating_err").format(user="failed"))
+
+
+@patch("project_types.wordpress.wp_cli.create_users")
+@patch("project_types.wordpress.wp_cli.get_user_logins")
+def test_create_users_given_bulk_when_all_users_exist_then_does_not_create(
+        get_user_logins_mock, create_users_mock, wordpressdata):
+    """ Given users and bulk, when all users exist, then does not call wp_cli.create_users """
+    # Arrange
+    users = [{"user_login": "existing", "user_email": "existing@example.com"}]
+    get_user_logins_mock.return_value = {"existing"}
+    # Act
+    sut.create_users(users, wordpressdata.wordpress_path, False, bulk=True)
+    # Assert
+    create_users_mock.assert_not_called()
+
+
+@patch("project_types.wordpress.wp_cli.create_user")
+@patch("project_types.wordpress.wp_cli.user_exists")
+@patch("project_types.wordpress.wp_cli.create_users")
+@patch("project_types.wordpress.wp_cli.get_user_logins")
+def test_create_users_given_bulk_when_users_cannot_be_listed_then_creates_one_by_one(
+        get_user_logins_mock, create_users_mock, user_exists_mock, create_user_mock, wordpressdata):
+    """ Given users and bulk, when users cannot be listed, then checks and creates every user on its own """
+    # Arrange
+    users = [{"user_login": "new", "user_email": "new@example.com", "role": "editor"}]
+    get_user_logins_mock.return_value = None
+    user_exists_mock.return_value = False
+    # Act
+    sut.create_users(users, wordpressdata.wordpress_path, False, bulk=True)
+    # Assert
+    create_users_mock.assert_not_called()
+    create_user_mock.assert_called_once()
+
+
 # endregion
 
 # region download_wordpress()
@@ -157,6 +306,24 @@ def test_download_wordpress_given_valid_arguments_calls_subprocess(
     purge_gitkeep.assert_called_once()
 
 
+# endregion
+
+# region download_wordpress_plugin()
+
+
+@patch("filesystem.artifact_cache.download_file")
+def test_download_wordpress_plugin_given_plugin_config_then_calls_paths_download_file(download_file_mock, tmp_path):
+    """Given a plugin configuration, then downloads the plugin source to the destination path"""
+    # Arrange
+    plugin_config = {"source": "https://example.com/my-plugin.zip"}
+    destination_path = str(pathlib.Path.joinpath(tmp_path, "my-plugin.zip"))
+    # Act
+    sut.download_wordpress_plugin(plugin_config, destination_path)
+    # Assert
+    download_file_mock.assert_called_once_with(plugin_config["source"], str(tmp_path), "my-plugin.zip",
+                                               version=None, checksum=None)
+
+
 # endregion
 
 # region export_database()
@@ -233,6 +400,74 @@ def test_get_environment_given_site_config_then_update_url_constants(filter_keys
 
 # endregion get_environment()
 
+# region get_constants()
+
+
+@pytest.fixture
+def constants_cache(tmp_path, mocks):
+    """Artifact cache in a temporary directory and no constants loaded"""
+    sut.get_constants.cache_clear()
+    mocks.http_get_mock.reset_mock(return_value=True, side_effect=True)
+    cache = artifact_cache.ArtifactCache(str(tmp_path), 1024 ** 2)
+    with patch("filesystem.artifact_cache.get_cache", return_value=cache):
+        yield cache
+    sut.get_constants.cache_clear()
+
+
+def test_get_constants_given_several_calls_then_downloads_once_and_caches_them_with_etag(constants_cache, mocks):
+    """Given several calls, then the constants are downloaded once and saved
+    in the cache with their ETag"""
+
+    # Arrange
+    mocks.http_get_mock.return_value = MagicMock(status_code=200, content=b'{"paths": {}}',
+                                                 headers={"ETag": '"v1"'})
+
+    # Act
+    result = sut.get_constants()
+    sut.get_constants()
+
+    # Assert
+    assert result == {"paths": {}}
+    assert mocks.http_get_mock.call_count == 1
+    cached = json.loads(pathlib.Path.joinpath(constants_cache.path, "wordpress-constants.json").read_text())
+    assert cached == {"etag": '"v1"', "constants": {"paths": {}}}
+
+
+def test_get_constants_given_cached_copy_when_not_modified_then_returns_it(constants_cache, mocks):
+    """Given a cached copy, when the resource has the same ETag, then returns
+    the cached copy"""
+
+    # Arrange
+    pathlib.Path.joinpath(constants_cache.path, "wordpress-constants.json").write_text(
+        json.dumps({"etag": '"v1"', "constants": {"cached": True}}))
+    mocks.http_get_mock.return_value = MagicMock(status_code=304)
+
+    # Act
+    result = sut.get_constants()
+
+    # Assert
+    assert result == {"cached": True}
+    assert mocks.http_get_mock.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+
+@patch("logging.warning")
+def test_get_constants_given_offline_when_not_cached_then_returns_bundled_copy(
+        logging_warning_mock, constants_cache, mocks):
+    """Given the resource cannot be reached, when there is no cached copy,
+    then returns the constants shipped with the toolset"""
+
+    # Arrange
+    mocks.http_get_mock.side_effect = requests.ConnectionError("unreachable")
+
+    # Act
+    result = sut.get_constants()
+
+    # Assert
+    assert "paths" in result
+    logging_warning_mock.assert_called_once()
+
+# endregion
+
 # region get_project_structure()
 
 
@@ -241,7 +476,7 @@ def test_get_project_structure_given_resource_reads_and_parses_content(wordpress
 
     # Arrange
     url_resource = wordpressdata.url_resource
-    mocks.requests_get_mock.side_effect = mocked_requests_get_json_content
+    mocks.http_get_mock.side_effect = mocked_requests_get_json_content
 
     # Act
     result = sut.get_project_structure(url_resource)
@@ -290,6 +525,28 @@ def test_get_site_configuration_reads_json(builtins_open, wordpressdata):
     assert result == json.loads(wordpressdata.site_config_content)
 
 
+# endregion
+
+# region get_site_timezone()
+
+
+@pytest.mark.parametrize("options, expected", [
+    ([{"name": "timezone_string", "value": "Europe/Madrid"}], zoneinfo.ZoneInfo("Europe/Madrid")),
+    ([{"name": "timezone_string", "value": ""}, {"name": "gmt_offset", "value": "-5.5"}],
+     datetime.timezone(datetime.timedelta(hours=-5.5))),
+    ([{"name": "timezone_string", "value": "Nowhere/Unknown"}], datetime.timezone.utc),
+    ([], datetime.timezone.utc),
+])
+def test_get_site_timezone_given_options_then_returns_timezone(options, expected):
+    """Given timezone options, then returns the timezone WordPress would use"""
+    # Arrange
+    site_configuration = {"settings": {"options": options}}
+    # Act
+    result = sut.get_site_timezone(site_configuration)
+    # Assert
+    assert result == expected
+
+
 # endregion
 
 # region import_content_from_configuration_file()
@@ -309,8 +566,8 @@ def test_import_content_from_configuration_file_given_args_then_call_delete_post
     site_config["content"] = json.loads(wordpressdata.import_content_skip_author)
     # Act
     sut.import_content_from_configuration_file(site_config, environment_config, root_path, constants)
-    expected_calls = [call(str(wordpress_path), expected_content_imported[0], False),
-                      call(str(wordpress_path), expected_content_imported[1], False)]
+    expected_calls = [call(str(wordpress_path), expected_content_imported[0], False, use_sql=False),
+                      call(str(wordpress_path), expected_content_imported[1], False, use_sql=False)]
 
     # Assert
     delete_content_mock.assert_has_calls(expected_calls)
@@ -382,8 +639,106 @@ def test_import_content_from_configuration_file_given_args_when_empty_content_th
     import_wxr_content.assert_not_called()
 
 
+@patch("project_types.wordpress.wptools.import_wxr_content_incremental")
+@patch("project_types.wordpress.wp_cli.import_wxr_content")
+@patch("project_types.wordpress.wp_cli.delete_post_type_content")
+def test_import_content_from_configuration_file_given_incremental_then_imports_only_changes(
+        delete_content_mock, import_wxr_content, import_wxr_content_incremental, wordpressdata):
+    """ Given incremental, for every content type, imports only the changes instead of deleting all the content """
+    # Arrange
+    site_config = json.loads(wordpressdata.site_config_content)
+    environment_config = site_config["environments"][0]
+    constants = json.loads(wordpressdata.constants_file_content)
+    root_path = wordpressdata.root_path
+    site_config["content"] = json.loads(wordpressdata.import_content_skip_author)
+    import_wxr_content_incremental.return_value = True
+    # Act
+    sut.import_content_from_configuration_file(site_config, environment_config, root_path, constants,
+                                               incremental=True)
+    # Assert
+    assert import_wxr_content_incremental.call_count == 2
+    delete_content_mock.assert_not_called()
+    import_wxr_content.assert_not_called()
+
+
+@patch("project_types.wordpress.wp_cli.delete_post_type_content_chunked")
+@patch("project_types.wordpress.wp_cli.delete_post_type_content_sql")
+@patch("project_types.wordpress.wp_cli.import_wxr_content")
+def test_import_content_from_configuration_file_given_delete_with_sql_then_deletes_content_with_sql(
+        import_wxr_content, delete_content_sql_mock, delete_content_chunked_mock, wordpressdata):
+    """ Given delete_with_sql, for every content type, deletes the content with SQL before importing it """
+    # Arrange
+    site_config = json.loads(wordpressdata.site_config_content)
+    environment_config = site_config["environments"][0]
+    constants = json.loads(wordpressdata.constants_file_content)
+    root_path = wordpressdata.root_path
+    wordpress_path = pathlib.Path.joinpath(pathlib.Path(root_path), constants["paths"]["wordpress"])
+    site_config["content"] = json.loads(wordpressdata.import_content_skip_author)
+    delete_content_sql_mock.return_value = 0
+    # Act
+    sut.import_content_from_configuration_file(site_config, environment_config, root_path, constants,
+                                               delete_with_sql=True)
+    # Assert
+    delete_content_sql_mock.assert_has_calls([call(str(wordpress_path), "page", False),
+                                              call(str(wordpress_path), "nav_menu_item", False)])
+    delete_content_chunked_mock.assert_not_called()
+    assert import_wxr_content.call_count == 2
+
+
 # endregion import_content_from_configuration_file
 
+# region import_wxr_content_incremental()
+
+
+@patch("project_types.wordpress.wp_cli.set_posts_modified")
+@patch("project_types.wordpress.wp_cli.import_wxr_content")
+@patch("project_types.wordpress.wp_cli.delete_posts")
+@patch("project_types.wordpress.wp_cli.get_posts_for_wxr_import")
+@patch("project_types.wordpress.wxr.iter_items")
+def test_import_wxr_content_incremental_deletes_removed_and_imports_new_items(
+        iter_items_mock, get_posts_mock, delete_posts_mock, import_wxr_content_mock, set_posts_modified_mock,
+        tmp_path, wordpressdata):
+    """ Given a WXR file, deletes the posts removed from it and imports only its new items """
+    # Arrange
+    content_path = str(pathlib.Path.joinpath(tmp_path, "page.xml"))
+    pathlib.Path(content_path).write_text("<rss><channel><item><guid>new</guid></item></channel></rss>")
+    new_item = sut.wxr.WxrItem("new", "page", "New", "2021-01-01 10:00:00", "2021-01-01 11:00:00",
+                               "2021-01-01 10:00:00")
+    iter_items_mock.return_value = [new_item]
+    get_posts_mock.return_value = [{"ID": 5, "guid": "removed", "post_type": "page", "post_title": "Removed",
+                                    "post_date_gmt": "", "post_modified_gmt": ""}]
+    wordpress_path = wordpressdata.wordpress_path
+    # Act
+    result = sut.import_wxr_content_incremental(wordpress_path, "page", content_path, "skip", False)
+    # Assert
+    assert result
+    get_posts_mock.assert_called_once_with(["page"], wordpress_path, False)
+    delete_posts_mock.assert_called_once_with(["5"], wordpress_path, False)
+    import_wxr_content_mock.assert_called_once()
+    set_posts_modified_mock.assert_called_once_with(
+        [{"guid": "new", "post_type": "page", "post_title": "New", "post_date_gmt": "2021-01-01 10:00:00",
+          "post_modified": "2021-01-01 11:00:00", "post_modified_gmt": "2021-01-01 10:00:00"}],
+        wordpress_path, False)
+
+
+@patch("project_types.wordpress.wp_cli.import_wxr_content")
+@patch("project_types.wordpress.wp_cli.get_posts_for_wxr_import")
+@patch("project_types.wordpress.wxr.iter_items")
+def test_import_wxr_content_incremental_when_posts_cannot_be_listed_then_returns_false(
+        iter_items_mock, get_posts_mock, import_wxr_content_mock, wordpressdata):
+    """ Given a WXR file, when the posts cannot be listed, returns False without importing anything """
+    # Arrange
+    iter_items_mock.return_value = []
+    get_posts_mock.return_value = None
+    # Act
+    result = sut.import_wxr_content_incremental(wordpressdata.wordpress_path, "page", "page.xml", "skip", False)
+    # Assert
+    assert not result
+    import_wxr_content_mock.assert_not_called()
+
+
+# endregion import_wxr_content_incremental
+
 # region install_plugins_from_configuration_file()
 
 
@@ -442,6 +797,96 @@ def test_install_plugins_given_configuration_file_when_plugins_present_then_inst
         calls.append(plugin_call)
     install_plugin_mock.assert_has_calls(calls)
 
+
+@patch("project_types.wordpress.wp_cli.install_plugin")
+@patch("project_types.wordpress.wptools.download_wordpress_plugin")
+def test_install_plugins_given_prefetched_url_plugin_then_installs_it_without_downloading(
+        download_wordpress_plugin_mock, install_plugin_mock, wordpressdata):
+    """ Given a url plugin downloaded by prefetch.prefetch_artifacts, then it is installed from its zip file without
+    downloading it again"""
+    # Arrange
+    site_config = json.loads(wordpressdata.site_config_content)
+    site_config["settings"]["plugins"] = json.loads(PluginsData.plugins_content_single_url_source)
+    site_config["settings"]["plugins"][0]["prefetched_source"] = "prefetched.zip"
+    environment_config = site_config["environments"][0]
+    constants = json.loads(wordpressdata.constants_file_content)
+    # Act
+    sut.install_plugins_from_configuration_file(site_config, environment_config, constants, wordpressdata.root_path,
+                                                True)
+    # Assert
+    download_wordpress_plugin_mock.assert_not_called()
+    install_plugin_mock.assert_called_once()
+    assert site_config["settings"]["plugins"][0]["source_type"] == "zip"
+
+
+@patch("project_types.wordpress.wp_cli.get_database_fingerprint")
+@patch("project_types.wordpress.wp_cli.install_plugin")
+@patch("project_types.wordpress.wptools.convert_wp_config_token")
+@patch("project_types.wordpress.wptools.export_database")
+def test_install_plugins_given_changes_dumps_then_exports_only_after_plugins_that_changed_the_database(
+        export_mock, convert_token_mock, install_plugin_mock, get_database_fingerprint_mock, wordpressdata):
+    """ Given PluginDumps.CHANGES, then exports a dump only after the plugins that changed the database """
+    # Arrange
+    site_config = json.loads(wordpressdata.site_config_content)
+    site_config["settings"]["plugins"] = json.loads(PluginsData.plugins_content_two_plugins_with_url_and_zip_sources)
+    for plugin in site_config["settings"]["plugins"]:
+        plugin["source_type"] = "wordpress"
+    environment_config = site_config["environments"][0]
+    constants = json.loads(wordpressdata.constants_file_content)
+    convert_token_mock.return_value = "plugins.sql"
+    # Initial state, first plugin changes the database, second one does not
+    get_database_fingerprint_mock.side_effect = ["a", "b", "b"]
+    # Act
+    sut.install_plugins_from_configuration_file(site_config, environment_config, constants, wordpressdata.root_path,
+                                                False, sut.wp_constants.PluginDumps.CHANGES)
+    # Assert
+    assert install_plugin_mock.call_count == 2
+    export_mock.assert_called_once()
+    assert export_mock.call_args[0][0] == environment_config
+
+
+@patch("project_types.wordpress.wp_cli.get_database_fingerprint")
+@patch("project_types.wordpress.wp_cli.install_plugin")
+@patch("project_types.wordpress.wptools.convert_wp_config_token")
+@patch("project_types.wordpress.wptools.export_database")
+def test_install_plugins_given_schema_dumps_when_no_fingerprint_then_exports_after_every_plugin(
+        export_mock, convert_token_mock, install_plugin_mock, get_database_fingerprint_mock, wordpressdata):
+    """ Given PluginDumps.SCHEMA, when database changes cannot be detected, then exports a dump after every plugin """
+    # Arrange
+    site_config = json.loads(wordpressdata.site_config_content)
+    site_config["settings"]["plugins"] = json.loads(PluginsData.plugins_content_two_plugins_with_url_and_zip_sources)
+    for plugin in site_config["settings"]["plugins"]:
+        plugin["source_type"] = "wordpress"
+    environment_config = site_config["environments"][0]
+    constants = json.loads(wordpressdata.constants_file_content)
+    convert_token_mock.return_value = "plugins.sql"
+    get_database_fingerprint_mock.return_value = None
+    # Act
+    sut.install_plugins_from_configuration_file(site_config, environment_config, constants, wordpressdata.root_path,
+                                                False, sut.wp_constants.PluginDumps.SCHEMA)
+    # Assert
+    get_database_fingerprint_mock.assert_called_once()
+    assert export_mock.call_count == 2
+
+# endregion
+
+# region is_plugin_dump_due()
+
+
+@pytest.mark.parametrize("dumps, interval, expected", [
+    (sut.wp_constants.PluginDumps.EACH, 1, [True, True, True, True, True]),
+    (sut.wp_constants.PluginDumps.INTERVAL, 2, [False, True, False, True, True]),
+    (sut.wp_constants.PluginDumps.END, 1, [False, False, False, False, True]),
+    (sut.wp_constants.PluginDumps.CHANGES, 1, [True, True, True, True, True]),
+    (sut.wp_constants.PluginDumps.NONE, 1, [False, False, False, False, False]),
+])
+def test_is_plugin_dump_due_given_dumps_policy_then_returns_if_dump_is_due(dumps, interval, expected):
+    """ Given a dumps policy, then returns after which plugins a dump must be exported """
+    # Act
+    result = [sut.is_plugin_dump_due(dumps, interval, index, 5) for index in range(1, 6)]
+    # Assert
+    assert result == expected
+
 # endregion
 
 # region install_wp_cli()
@@ -463,89 +908,61 @@ def test_install_wp_cli_given_path_when_not_dir_then_raise_value_error(pathlib_m
         assert expected_exception_message == str(exceptionInfo.value)
 
 
-@patch("pathlib.Path")
 @patch("project_types.wordpress.wptools.create_wp_cli_bat_file")
 @patch("project_types.wordpress.wp_cli.wp_cli_info")
+@patch("filesystem.artifact_cache.download_file")
 @patch("logging.info")
 def test_install_wp_cli_given_path_when_is_dir_then_downloads_from_request_resource(
-        log_info_mock, wp_cli_info, create_wp_cli_bat_file, pathlib_mock, wordpressdata, mocks):
+        log_info_mock, download_file_mock, wp_cli_info, create_wp_cli_bat_file, wordpressdata):
     """ Given a file path, when path is a dir, then downloads from download url """
     # Arrange
     install_path = wordpressdata.wp_cli_install_path
-    pathlib_mock.return_value = install_path
-    mocks.requests_get_mock.side_effect = mocked_requests_get
     wp_cli_phar = "wp-cli.phar"
     wp_cli_download_url = f"https://raw.githubusercontent.com/wp-cli/builds/gh-pages/phar/{wp_cli_phar}"
-    with patch(wordpressdata.builtins_open, mock_open()):
-        with patch.object(os, "stat"):
-            with patch.object(os, "chmod"):
-                # Act
-                sut.install_wp_cli(install_path)
-                # Assert
-                calls = [call(wp_cli_download_url)]
-                mocks.requests_get_mock.assert_has_calls(calls, any_order=True)
-
-
-@patch("pathlib.Path")
-@patch("project_types.wordpress.wptools.create_wp_cli_bat_file")
-@patch("project_types.wordpress.wp_cli.wp_cli_info")
-@patch("logging.info")
-def test_install_wp_cli_given_path_when_is_dir_then_writes_response_content(
-        log_info_mock, wp_cli_info, create_wp_cli_bat_file, pathlib_mock, wordpressdata, mocks):
-    """ Given a file path, when path is a dir, then writes response content to
-    file_path """
-    # Arrange
-    install_path = wordpressdata.wp_cli_install_path
-    pathlib_mock.return_value = install_path
-    mocks.requests_get_mock.side_effect = mocked_requests_get
-    expected_content = b"sample response in bytes"
-    m = mock_open()
-    with patch(wordpressdata.builtins_open, m, create=True):
+    with patch.object(pathlib.Path, "is_dir", return_value=True):
         with patch.object(os, "stat"):
             with patch.object(os, "chmod"):
                 # Act
                 sut.install_wp_cli(install_path)
                 # Assert
-                handler = m()
-                handler.write.assert_called_once_with(expected_content)
+                download_file_mock.assert_called_once_with(wp_cli_download_url, install_path, wp_cli_phar)
 
 
+@patch("filesystem.artifact_cache.download_file")
 @patch("project_types.wordpress.wp_cli.wp_cli_info")
-def test_install_wp_cli_given_path_when_is_dir_then_chmods_written_file_path(wp_cli_info, wordpressdata, mocks):
+def test_install_wp_cli_given_path_when_is_dir_then_chmods_written_file_path(
+        wp_cli_info, download_file_mock, wordpressdata):
     """ Given a file path, when path is a dir, then does chmod with S_IEXEC """
     # Arrange
     install_path = wordpressdata.wp_cli_install_path
-    mocks.requests_get_mock.side_effect = mocked_requests_get
 
     with patch.object(pathlib.Path, "is_dir", return_value=True):
-        with patch(wordpressdata.builtins_open, mock_open()):
-            with patch.object(os, "stat") as file_stat_mock:
-                file_stat_mock.return_value = os.stat(install_path)
-                with patch.object(os, "chmod") as chmod_mock:
-                    # Act
-                    sut.install_wp_cli(install_path)
-                    # Assert
-                    chmod_mock.assert_called_once_with(str(wordpressdata.wp_cli_file_path),
-                                                       file_stat_mock.return_value.st_mode | stat.S_IEXEC)
+        with patch.object(os, "stat") as file_stat_mock:
+            file_stat_mock.return_value = os.stat(install_path)
+            with patch.object(os, "chmod") as chmod_mock:
+                # Act
+                sut.install_wp_cli(install_path)
+                # Assert
+                chmod_mock.assert_called_once_with(str(wordpressdata.wp_cli_file_path),
+                                                   file_stat_mock.return_value.st_mode | stat.S_IEXEC)
 
 
+@patch("filesystem.artifact_cache.download_file")
 @patch("project_types.wordpress.wp_cli.wp_cli_info")
 def test_install_wp_cli_given_path_when_is_dir_then_calls_subprocess_wpcli_info_command(
-        wp_cli_info, wordpressdata, mocks):
+        wp_cli_info, download_file_mock, wordpressdata):
     """ Given a file path, when path is a dir, then calls wp_cli_info() from wp_cli module """
     # Arrange
     install_path = wordpressdata.wp_cli_install_path
-    mocks.requests_get_mock.side_effect = mocked_requests_get
 
     with patch.object(pathlib.Path, "is_dir", return_value=True):
-        with patch(wordpressdata.builtins_open, mock_open()):
-            with patch.object(os, "stat") as file_stat_mock:
-                file_stat_mock.return_value = os.stat(install_path)
-                with patch.object(os, "chmod"):
-                    # Act
-                    sut.install_wp_cli(install_path)
-                    # Assert
-                    wp_cli_info.assert_called_once()
+        with patch.object(os, "stat") as file_stat_mock:
+            file_stat_mock.return_value = os.stat(install_path)
+            with patch.object(os, "chmod"):
+                # Act
+                sut.install_wp_cli(install_path)
+                # Assert
+                wp_cli_info.assert_called_once()
 
 
 # endregion
@@ -649,6 +1066,58 @@ def test_install_wordpress_site_then_calls_cli_export_database(
 
 # endregion
 
+# region setup_database()
+
+
+@patch("project_types.wordpress.database.provision", return_value=False)
+def test_setup_database_given_environment_when_provisioning_fails_then_return_false(provision_mock):
+    """Given an environment, when its database cannot be provisioned, then
+    returns False"""
+
+    # Arrange
+    environment_config = {"database": {"host": "localhost", "db_name": "wp", "db_user": "wp_user",
+                                       "db_admin_user": "root"}}
+
+    # Act
+    result = sut.setup_database(environment_config, "pass", "admin")
+
+    # Assert
+    assert not result
+    provision_mock.assert_called_once_with([sut.database.DatabaseUser("wp", "wp_user", "pass", "localhost")],
+                                           "localhost", "root", "admin")
+
+# endregion setup_database()
+
+# region setup_databases()
+
+
+@patch("project_types.wordpress.database.provision", return_value=True)
+def test_setup_databases_given_environments_then_provisions_once_per_server(provision_mock):
+    """Given environments on different database servers, then runs one
+    provisioning script per server"""
+
+    # Arrange
+    def environment(name: str, host: str) -> dict:
+        return {"database": {"host": host, "db_name": f"wp_{name}", "db_user": f"{name}_user",
+                             "db_admin_user": "root"}}
+
+    environments = [(environment("localhost", "localhost"), "pass1"),
+                    (environment("test", "localhost"), "pass2"),
+                    (environment("staging", "db.example.com:3307"), "pass3")]
+
+    # Act
+    result = sut.setup_databases(environments, "admin")
+
+    # Assert
+    assert result
+    assert provision_mock.call_args_list == [
+        call([sut.database.DatabaseUser("wp_localhost", "localhost_user", "pass1", "localhost"),
+              sut.database.DatabaseUser("wp_test", "test_user", "pass2", "localhost")], "localhost", "root", "admin"),
+        call([sut.database.DatabaseUser("wp_staging", "staging_user", "pass3", "db.example.com")],
+             "db.example.com:3307", "root", "admin")]
+
+# endregion setup_databases()
+
 # region start_basic_structure
 
 
@@ -775,6 +1244,32 @@ def test_set_wordpress_config_from_configuration_file_when_aws_cloudfront_is_tru
     # Assert
     add_cloudfront_mock.assert_called_once()
 
+
+@patch("project_types.wordpress.wp_config.write_configuration_file")
+@patch("project_types.wordpress.wptools.create_configuration_file")
+@patch("project_types.wordpress.wp_cli.set_configuration_value")
+def test_set_wordpress_config_from_configuration_file_when_native_then_renders_without_wp_cli(
+        set_configuration_value_mock, create_configuration_file_mock, write_configuration_file_mock, wordpressdata):
+    """Given site_configuration, when native is True, then renders the file
+    without WP-CLI."""
+
+    # Arrange
+    site_config_true_cloudfront = json.loads(wordpressdata.site_config_content_true_aws_cloudfront)
+    site_config = json.loads(wordpressdata.site_config_content)
+    environment_config = site_config["environments"][0]
+    wordpress_path = wordpressdata.wordpress_path
+    database_user_pass = "my-password"
+
+    # Act
+    sut.set_wordpress_config_from_configuration_file(site_config_true_cloudfront, environment_config, wordpress_path,
+                                                     database_user_pass, native=True)
+
+    # Assert
+    create_configuration_file_mock.assert_not_called()
+    set_configuration_value_mock.assert_not_called()
+    write_configuration_file_mock.assert_called_once_with(environment_config, wordpress_path, database_user_pass,
+                                                          True)
+
 # endregion set_wordpress_config_from_configuration_file
 
 # region add_cloudfront_forwarded_proto_to_config
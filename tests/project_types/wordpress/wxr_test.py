@@ -0,0 +1,125 @@
+"""Unit core for the wordpress.wxr file"""
+import pathlib
+import xml.etree.ElementTree as ElementTree
+import project_types.wordpress.wxr as sut
+
+WXR_CONTENT = """<?xml version="1.0" encoding="UTF-8" ?>
+<rss version="2.0" xmlns:excerpt="http://wordpress.org/export/1.2/excerpt/"
+     xmlns:content="http://purl.org/rss/1.0/modules/content/" xmlns:dc="http://purl.org/dc/elements/1.1/"
+     xmlns:wp="http://wordpress.org/export/1.2/">
+<channel>
+    <title>My site</title>
+    <wp:wxr_version>1.2</wp:wxr_version>
+    <wp:author><wp:author_login><![CDATA[admin]]></wp:author_login></wp:author>
+    <item>
+        <title>Home</title>
+        <guid isPermaLink="false">http://example.com/?page_id=1</guid>
+        <content:encoded><![CDATA[<p>Home</p>]]></content:encoded>
+        <wp:post_date_gmt><![CDATA[2021-01-01 10:00:00]]></wp:post_date_gmt>
+        <wp:post_modified><![CDATA[2021-02-01 11:00:00]]></wp:post_modified>
+        <wp:post_modified_gmt><![CDATA[2021-02-01 10:00:00]]></wp:post_modified_gmt>
+        <wp:post_type><![CDATA[page]]></wp:post_type>
+        <wp:postmeta><wp:meta_key><![CDATA[post_type]]></wp:meta_key></wp:postmeta>
+    </item>
+    <item>
+        <title>About</title>
+        <guid isPermaLink="false">http://example.com/?page_id=2</guid>
+        <wp:post_date><![CDATA[2021-01-02 11:00:00]]></wp:post_date>
+        <wp:post_date_gmt><![CDATA[2021-01-02 10:00:00]]></wp:post_date_gmt>
+        <wp:post_type><![CDATA[page]]></wp:post_type>
+    </item>
+</channel>
+</rss>
+"""
+
+
+def create_wxr_file(tmp_path) -> str:
+    """Writes the sample WXR content to a file"""
+    wxr_path = pathlib.Path.joinpath(tmp_path, "page.xml")
+    wxr_path.write_text(WXR_CONTENT, encoding="utf-8")
+    return str(wxr_path)
+
+
+def create_post(post_id: int, guid: str, modified_gmt: str, title: str = "Title",
+                date_gmt: str = "2021-01-01 10:00:00", post_type: str = "page") -> dict:
+    """Creates a post as listed by wp_cli.get_posts_for_wxr_import"""
+    return {"ID": post_id, "guid": guid, "post_type": post_type, "post_title": title, "post_date_gmt": date_gmt,
+            "post_modified_gmt": modified_gmt}
+
+
+# region iter_items
+
+
+def test_iter_items_returns_item_fields(tmp_path):
+    """Given a WXR file, returns the fields of every item, using the publication date if no modification date"""
+
+    # Arrange
+    wxr_path = create_wxr_file(tmp_path)
+
+    # Act
+    result = list(sut.iter_items(wxr_path))
+
+    # Assert
+    assert result == [
+        sut.WxrItem("http://example.com/?page_id=1", "page", "Home", "2021-01-01 10:00:00",
+                    "2021-02-01 11:00:00", "2021-02-01 10:00:00"),
+        sut.WxrItem("http://example.com/?page_id=2", "page", "About", "2021-01-02 10:00:00",
+                    "2021-01-02 11:00:00", "2021-01-02 10:00:00"),
+    ]
+
+# endregion
+
+# region get_changes
+
+
+def test_get_changes_classifies_items_and_posts():
+    """Given items and posts, returns new, changed and unchanged items and the posts to be deleted"""
+
+    # Arrange
+    items = [
+        sut.WxrItem("guid-1", "page", "Unchanged", "2021-01-01 10:00:00", "", "2021-01-01 10:00:00"),
+        sut.WxrItem("guid-2", "page", "Changed", "2021-01-01 10:00:00", "", "2021-03-01 10:00:00"),
+        sut.WxrItem("guid-3", "page", "New", "2021-01-01 10:00:00", "", "2021-01-01 10:00:00"),
+        sut.WxrItem("guid-4", "page", "Attachment", "2021-01-05 10:00:00", "", "2021-01-05 10:00:00"),
+    ]
+    existing_posts = [
+        create_post(1, "guid-1", "2021-01-01 10:00:00"),
+        create_post(2, "guid-2", "2021-01-01 10:00:00"),
+        create_post(4, "http://example.com/renamed.jpg", "2021-01-05 10:00:00", "Attachment", "2021-01-05 10:00:00"),
+        create_post(5, "guid-5", "2021-01-01 10:00:00"),
+        create_post(6, "guid-6", "2021-01-01 10:00:00", post_type="post"),
+    ]
+
+    # Act
+    result = sut.get_changes(items, existing_posts, "page")
+
+    # Assert
+    assert result.new == [items[2]]
+    assert result.changed == [items[1]]
+    assert result.unchanged == [items[0], items[3]]
+    assert result.imported == [items[2], items[1]]
+    assert result.deleted_ids == ["2", "5"]
+
+# endregion
+
+# region write_items
+
+
+def test_write_items_keeps_channel_and_selected_items(tmp_path):
+    """Given GUIDs, writes a WXR file with the channel information and only the items with those GUIDs"""
+
+    # Arrange
+    wxr_path = create_wxr_file(tmp_path)
+    destination_path = str(pathlib.Path.joinpath(tmp_path, "filtered.xml"))
+
+    # Act
+    result = sut.write_items(wxr_path, {"http://example.com/?page_id=2"}, destination_path)
+
+    # Assert
+    assert result == 1
+    assert [item.guid for item in sut.iter_items(destination_path)] == ["http://example.com/?page_id=2"]
+    channel = ElementTree.parse(destination_path).getroot().find("channel")
+    assert channel.find("title").text == "My site"
+    assert channel.find("{http://wordpress.org/export/1.2/}author") is not None
+
+# endregion
@@ -1,9 +1,12 @@
 """Unit core for the tools file"""
 
+import io
 import unittest.mock as mock
 import tools.cli as sut
 import subprocess
+import sys
 import core.log_tools
+from core.CommandsCore import Command
 
 # region call_subprocess(str)
 
@@ -66,3 +69,174 @@ def test_call_subprocess_given_command_srt_when_stderr_has_lines_then_log_error(
         logging_mock.assert_called_once_with(expected_log_message, log_level)
 
 # endregion call_subprocess(str)
+
+# region stream_subprocess(str)
+
+
+@mock.patch.object(subprocess, "Popen")
+def test_call_subprocess_given_stream_then_does_not_buffer_output(subprocess_mock, clidata):
+    """ Given stream=True, then reads the pipes instead of calling communicate"""
+
+    # Arrange
+    foo_command = clidata.sample_command
+    subprocess_mock.return_value.stdout = io.BytesIO(b"line1\nline2\n")
+    subprocess_mock.return_value.stderr = io.BytesIO(b"")
+    subprocess_mock.return_value.wait.return_value = 0
+
+    # Act
+    with mock.patch.object(core.log_tools, "log_stdouterr") as logging_mock:
+        sut.call_subprocess(foo_command, stream=True)
+
+        # Assert
+        subprocess_mock.return_value.communicate.assert_not_called()
+        logging_mock.assert_has_calls([mock.call(b"line1\n", core.log_tools.LogLevel.info),
+                                       mock.call(b"line2\n", core.log_tools.LogLevel.info)])
+
+
+@mock.patch.object(subprocess, "Popen")
+def test_stream_subprocess_given_stdout_then_logs_hooks_around_output(subprocess_mock, clidata):
+    """ Given a process with stdout, then logs before and after out hooks around the lines"""
+
+    # Arrange
+    foo_command = clidata.sample_command
+    subprocess_mock.return_value.stdout = io.BytesIO(clidata.sample_log_message_info)
+    subprocess_mock.return_value.stderr = io.BytesIO(b"")
+    subprocess_mock.return_value.wait.return_value = 0
+    manager = mock.Mock()
+
+    # Act
+    with mock.patch.object(core.log_tools, "log_stdouterr", manager.log_stdouterr), \
+            mock.patch.object(core.log_tools, "log_list", manager.log_list):
+        sut.stream_subprocess(foo_command, log_before_out=["before"], log_after_out=["after"])
+
+    # Assert
+    assert manager.mock_calls == [
+        mock.call.log_list(["before"], core.log_tools.LogLevel.info),
+        mock.call.log_stdouterr(clidata.sample_log_message_info, core.log_tools.LogLevel.info),
+        mock.call.log_list(["after"], core.log_tools.LogLevel.info)]
+
+
+@mock.patch.object(subprocess, "Popen")
+def test_stream_subprocess_given_stderr_when_return_code_is_0_then_not_log_error(subprocess_mock, clidata):
+    """ Given a process with stderr, when it succeeds, then stderr is not logged"""
+
+    # Arrange
+    foo_command = clidata.sample_command
+    subprocess_mock.return_value.stdout = io.BytesIO(b"")
+    subprocess_mock.return_value.stderr = io.BytesIO(clidata.sample_log_message_error)
+    subprocess_mock.return_value.wait.return_value = 0
+
+    # Act
+    with mock.patch.object(core.log_tools, "log_stdouterr") as logging_mock:
+        return_code = sut.stream_subprocess(foo_command)
+
+    # Assert
+    assert return_code == 0
+    logging_mock.assert_not_called()
+
+
+@mock.patch.object(sut.tools.constants, "stream_stderr_tail_lines", 2)
+@mock.patch.object(subprocess, "Popen")
+def test_stream_subprocess_given_stderr_when_return_code_is_not_0_then_log_error_tail(subprocess_mock, clidata):
+    """ Given a process with stderr, when it fails, then logs the last stderr lines as error"""
+
+    # Arrange
+    foo_command = clidata.sample_command
+    subprocess_mock.return_value.stdout = io.BytesIO(b"")
+    subprocess_mock.return_value.stderr = io.BytesIO(b"err1\nerr2\nerr3\n")
+    subprocess_mock.return_value.wait.return_value = 1
+
+    # Act
+    with mock.patch.object(core.log_tools, "log_stdouterr") as logging_mock:
+        return_code = sut.stream_subprocess(foo_command)
+
+    # Assert
+    assert return_code == 1
+    logging_mock.assert_called_once_with(b"err2\nerr3\n", core.log_tools.LogLevel.error)
+
+
+def test_stream_subprocess_given_real_process_then_drains_both_pipes():
+    """ Given a process that writes more than a pipe buffer to both pipes, then it does not deadlock"""
+
+    # Arrange
+    command = f"{sys.executable} -c \"import sys; [print(i) or print(i, file=sys.stderr) for i in range(20000)]\""
+
+    # Act
+    with mock.patch.object(core.log_tools, "log_stdouterr") as logging_mock:
+        return_code = sut.stream_subprocess(command)
+
+    # Assert
+    assert return_code == 0
+    assert logging_mock.call_count == 20000
+
+# endregion stream_subprocess(str)
+
+# region pipe_subprocess(str)
+
+
+def test_pipe_subprocess_given_stdin_and_stdout_then_streams_both():
+    """ Given input and output files, then writes the input to the process and its output to the output file"""
+
+    # Arrange
+    command = f"{sys.executable} -c \"import shutil, sys; shutil.copyfileobj(sys.stdin.buffer, sys.stdout.buffer)\""
+    data = b"INSERT INTO wp_posts VALUES (1);\n" * 100000
+    output = io.BytesIO()
+
+    # Act
+    return_code = sut.pipe_subprocess(command, stdin=io.BytesIO(data), stdout=output)
+
+    # Assert
+    assert return_code == 0
+    assert output.getvalue() == data
+
+
+def test_pipe_subprocess_when_return_code_is_not_0_then_log_error():
+    """ Given a command, when it fails, then logs its stderr as error and returns its return code"""
+
+    # Arrange
+    command = f"{sys.executable} -c \"import sys; print('Error: boom', file=sys.stderr); sys.exit(3)\""
+
+    # Act
+    with mock.patch.object(core.log_tools, "log_stdouterr") as logging_mock:
+        return_code = sut.pipe_subprocess(command, stdout=io.BytesIO())
+
+    # Assert
+    assert return_code == 3
+    logging_mock.assert_called_once_with(mock.ANY, core.log_tools.LogLevel.error)
+    assert logging_mock.call_args[0][0].strip() == b"Error: boom"
+
+# endregion pipe_subprocess(str)
+
+# region _popen(str)
+
+
+def test_popen_given_command_with_argv_then_runs_it_without_shell():
+    """ Given a command with an argument list, then runs it without a shell, passing the values as they are"""
+
+    # Arrange
+    value = "It's \"$HOME\" `whoami` | cat"
+    command = Command(f"{sys.executable} -c \"...\" {value}", "foo",
+                      argv=(sys.executable, "-c", "import sys; print(sys.argv[1])", value))
+
+    # Act
+    with mock.patch.object(sut, "_programs", {}):
+        result = sut.call_subprocess_with_result(command)
+
+    # Assert
+    assert result.strip() == value
+
+
+@mock.patch.object(subprocess, "Popen")
+def test_popen_given_command_with_argv_when_program_not_found_then_uses_shell(popen_mock):
+    """ Given a command with an argument list, when its program is not found, then it is run by the shell"""
+
+    # Arrange
+    command = Command("missing-program --foo", "foo", argv=("missing-program", "--foo"))
+
+    # Act
+    sut._popen(command, stdout=subprocess.PIPE)
+
+    # Assert
+    popen_mock.assert_called_once_with("missing-program --foo", shell=True, stdout=subprocess.PIPE)
+
+# endregion _popen(str)
@@ -23,13 +23,13 @@ def test_get_devops_toolset_calls_get_devops_toolset_resource(
     """ Given destination path, calls the get request of the devops_toolset_download_resource """
     # Arrange
     destination_path = paths.devops_destination_path
-    mocks.requests_get_mock.side_effect = mocked_requests_get
+    mocks.http_get_mock.side_effect = mocked_requests_get
     # Act
     with patch(paths.builtins_open, mock_open()):
         sut.get_devops_toolset(destination_path)
         # Assert
         calls = [call(constants.devops_toolset_download_resource, allow_redirects=True)]
-        mocks.requests_get_mock.assert_has_calls(calls, any_order=True)
+        mocks.http_get_mock.assert_has_calls(calls, any_order=True)
 
 
 @patch("tools.devops_toolset.ZipFile")
@@ -44,7 +44,7 @@ def test_get_devops_toolset_extracts_all_devops_toolset_path_content_into_destin
     # Arrange
     devops_toolset_name = "devops-toolset-master.zip"
     destination_path = paths.devops_destination_path
-    mocks.requests_get_mock.side_effect = mocked_requests_get
+    mocks.http_get_mock.side_effect = mocked_requests_get
     zip_file_path = os.path.join(destination_path, devops_toolset_name)
     # Act
     with patch(paths.builtins_open, mock_open()):
@@ -64,7 +64,7 @@ def test_get_devops_toolset_renames_final_destination_folder(
     """ Given destination path, renames the old_destination_folder to the final_destination_folder """
     # Arrange
     destination_path = paths.devops_destination_path
-    mocks.requests_get_mock.side_effect = mocked_requests_get
+    mocks.http_get_mock.side_effect = mocked_requests_get
     zip_extension = pathlib.Path(constants.devops_toolset_save_as).suffixes[0]
     destination_file_without_zip_extension = constants.devops_toolset_save_as.replace(zip_extension, '')
     old_folder = os.path.join(destination_path, destination_file_without_zip_extension)
@@ -87,7 +87,7 @@ def test_get_devops_toolset_removes_devops_toolset_path_file(
     """ Given destination path, removes the devops_toolset_path """
     # Arrange
     destination_path = paths.devops_destination_path
-    mocks.requests_get_mock.side_effect = mocked_requests_get
+    mocks.http_get_mock.side_effect = mocked_requests_get
     devops_toolset_path_file = os.path.join(destination_path, constants.devops_toolset_save_as)
     # Act
     with patch(paths.builtins_open, mock_open()):
@@ -107,7 +107,7 @@ def test_get_devops_toolset_calls_purge_gitkeep(
     """ Given destination path, calls the tools.git purge gitkeep """
     # Arrange
     destination_path = paths.devops_destination_path
-    mocks.requests_get_mock.side_effect = mocked_requests_get
+    mocks.http_get_mock.side_effect = mocked_requests_get
     # Act
     with patch(paths.builtins_open, mock_open()):
         sut.get_devops_toolset(destination_path)
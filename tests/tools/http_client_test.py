@@ -0,0 +1,103 @@
+"""Unit core for the http_client file"""
+
+import pytest
+import requests
+import tools.constants as constants
+import tools.http_client as sut
+from unittest.mock import patch, MagicMock
+
+
+@pytest.fixture(autouse=True)
+def default_http_client():
+    """Restores the default settings and counters after every test"""
+    yield
+    sut.configure(constants.http_pool_size, constants.http_timeout, constants.http_retries,
+                  constants.http_backoff_factor)
+    sut.reset_statistics()
+
+# region configure()
+
+
+def test_configure_given_settings_then_creates_session_with_them():
+    """Given new settings, then the next session uses them"""
+
+    # Arrange
+    session = sut.get_session()
+
+    # Act
+    sut.configure(pool_size=3, retries=5)
+    result = sut.get_session()
+
+    # Assert
+    adapter = result.get_adapter("https://example.com")
+    assert result is not session
+    assert result is sut.get_session()
+    assert adapter._pool_maxsize == 3
+    assert adapter.max_retries.total == 5
+
+# endregion
+
+# region request()
+
+
+@patch.object(requests.Session, "request")
+def test_request_given_url_then_uses_default_timeout_and_counts_it_by_host(request_mock):
+    """Given a request without timeout, then sends it with the default timeout
+    and adds it to the host counters"""
+
+    # Arrange
+    request_mock.return_value = MagicMock(status_code=200)
+
+    # Act
+    sut.request("GET", "https://example.com/a", headers={"a": "b"})
+    sut.request("GET", "https://example.com/b", timeout=1)
+    sut.request("GET", "https://other.example.com/c")
+
+    # Assert
+    request_mock.assert_any_call("GET", "https://example.com/a", headers={"a": "b"}, timeout=constants.http_timeout)
+    request_mock.assert_any_call("GET", "https://example.com/b", timeout=1)
+    statistics = sut.get_statistics()
+    assert statistics["example.com"].requests == 2
+    assert statistics["example.com"].errors == 0
+    assert statistics["other.example.com"].requests == 1
+
+
+@patch.object(requests.Session, "request")
+def test_request_given_error_then_counts_it_as_failed(request_mock):
+    """Given error responses and connection errors, then they are counted as
+    failed"""
+
+    # Arrange
+    request_mock.side_effect = [MagicMock(status_code=503), requests.ConnectionError("reset")]
+
+    # Act
+    sut.request("GET", "https://example.com/a")
+    with pytest.raises(requests.ConnectionError):
+        sut.request("GET", "https://example.com/a")
+
+    # Assert
+    assert sut.get_statistics()["example.com"].errors == 2
+
+# endregion
+
+# region log_statistics()
+
+
+@patch("logging.info")
+def test_log_statistics_given_requests_then_logs_slowest_host_first(logging_info_mock):
+    """Given requests to several hosts, then logs their counters, slowest
+    host first"""
+
+    # Arrange
+    sut._count("fast.example.com", 0.1, False)
+    sut._count("slow.example.com", 2.0, True)
+
+    # Act
+    sut.log_statistics()
+
+    # Assert
+    messages = [call.args[0] for call in logging_info_mock.call_args_list]
+    assert "slow.example.com" in messages[0]
+    assert "fast.example.com" in messages[1]
+
+# endregion
@@ -0,0 +1,162 @@
+"""Unit core for the tools.tracing file"""
+
+import json
+import pathlib
+import subprocess
+import unittest.mock as mock
+import pytest
+import tools.cli
+import tools.tracing as sut
+from core.CommandsCore import Command
+
+
+@pytest.fixture
+def tracing():
+    """Enables tracing, forgetting the secrets of other tests"""
+    sut.enable()
+    sut._secrets.clear()
+    yield sut
+    sut.disable()
+    sut._secrets.clear()
+
+# region span()
+
+
+def test_span_given_nested_spans_then_sets_parent_id(tracing):
+    """Given a span started inside another one, then it is nested in it"""
+
+    # Act
+    with sut.span("install plugins") as step:
+        with sut.span("install plugin", plugin="foo") as nested:
+            pass
+
+    # Assert
+    spans = sut.get_spans()
+    assert [span.name for span in spans] == ["install plugins", "install plugin"]
+    assert step.parent_id is None
+    assert nested.parent_id == step.id
+    assert nested.attributes == {"plugin": "foo"}
+    assert step.duration >= nested.duration
+
+
+def test_span_when_disabled_then_does_not_keep_spans(tracing):
+    """Given tracing is disabled, then spans are not kept"""
+
+    # Arrange
+    sut.disable()
+
+    # Act
+    with sut.span("install plugins"):
+        pass
+
+    # Assert
+    assert sut.get_spans() == []
+
+
+def test_span_when_error_then_sets_error(tracing):
+    """Given an error in a span, then it is finished with the error name"""
+
+    # Act
+    with pytest.raises(ValueError):
+        with sut.span("install plugins"):
+            raise ValueError()
+
+    # Assert
+    assert sut.get_spans()[0].attributes == {"error": "ValueError"}
+
+# endregion span()
+
+# region command_span()
+
+
+def test_command_span_given_command_then_uses_key_and_redacts_secrets(tracing):
+    """Given a command got from the commands, then its key is used as name
+    and its secret values are redacted"""
+
+    # Arrange
+    command = Command("wp db create --dbpass={db_password} --user={db_user}", "wpcli_db_create")
+    command = command.format(db_password="secret", db_user="root")
+
+    # Act
+    with sut.command_span(command):
+        pass
+
+    # Assert
+    span = sut.get_spans()[0]
+    assert span.name == "wpcli_db_create"
+    assert span.category == "command"
+    assert span.attributes["command"] == "wp db create --dbpass=*** --user=root"
+
+
+def test_command_span_given_added_secrets_then_redacts_them(tracing):
+    """Given secrets added to the tracing, then they are redacted from plain
+    commands"""
+
+    # Arrange
+    sut.add_secrets(["secret", ""])
+
+    # Act
+    with sut.command_span("mysql -psecret"):
+        pass
+
+    # Assert
+    span = sut.get_spans()[0]
+    assert span.name == "command"
+    assert span.attributes["command"] == "mysql -p***"
+
+
+@mock.patch.object(subprocess, "Popen")
+def test_command_span_given_call_subprocess_then_sets_exit_code(popen_mock, tracing):
+    """Given a command called with tools.cli, then its exit code and output
+    sizes are traced"""
+
+    # Arrange
+    popen_mock.return_value.returncode = 1
+    popen_mock.return_value.communicate.return_value = (b"out", b"")
+
+    # Act
+    tools.cli.call_subprocess_with_result("foo")
+
+    # Assert
+    span = sut.get_spans()[0]
+    assert span.attributes["exit_code"] == 1
+    assert span.attributes["stdout_bytes"] == 3
+    assert span.attributes["stderr_bytes"] == 0
+
+# endregion command_span()
+
+# region trace()
+
+
+def test_trace_given_path_then_writes_json_and_chrome_trace(tmp_path):
+    """Given a path, then the spans are written as JSON and Chrome trace
+    files"""
+
+    # Act
+    with sut.trace(str(tmp_path), ["secret"]):
+        with sut.span("install plugins"):
+            with sut.command_span("wp plugin install --key=secret"):
+                pass
+
+    # Assert
+    spans = json.loads(pathlib.Path.joinpath(tmp_path, "trace.json").read_text())["spans"]
+    events = json.loads(pathlib.Path.joinpath(tmp_path, "trace.chrome.json").read_text())["traceEvents"]
+    assert [span["name"] for span in spans] == ["install plugins", "command"]
+    assert spans[1]["parent_id"] == spans[0]["id"]
+    assert spans[1]["attributes"]["command"] == "wp plugin install --key=***"
+    assert [(event["name"], event["ph"]) for event in events] == [("install plugins", "X"), ("command", "X")]
+    assert not sut._enabled
+    sut._secrets.clear()
+
+
+def test_trace_given_no_path_then_does_not_trace():
+    """Given no path, then tracing is not enabled"""
+
+    # Act
+    with sut.trace(None, ["secret"]):
+        enabled = sut._enabled
+
+    # Assert
+    assert not enabled
+
+# endregion trace()
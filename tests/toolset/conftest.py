@@ -46,3 +46,16 @@ class MockResponse:
     def __init__(self, b_content, text_content):
         self.content = b_content
         self.text = text_content
+        self.status_code = 200
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def iter_content(self, chunk_size: int = 1):
+        return [self.content[i:i + chunk_size] for i in range(0, len(self.content), chunk_size)]
+
+    def raise_for_status(self):
+        pass
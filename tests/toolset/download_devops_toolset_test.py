@@ -122,11 +122,12 @@ def test_decompress_toolset_given_paths_should_return_internal_full_path_and_tem
 
 
 @patch("os.mkdir")
+@patch("toolset.download_devops_toolset.stream_to_file")
 @patch("pathlib.Path.joinpath")
 @patch("toolset.download_devops_toolset.logger.info")
 @patch("os.path.exists")
 def test_download_toolset_given_args_when_not_exist_destination_path_then_create_it(path_exists_mock, logging_mock,
-    joinpath_mock, mkdir_mock, pathsdata):
+    joinpath_mock, stream_to_file_mock, mkdir_mock, pathsdata):
     """ Given destination path when it doesn't exist then use os.mkdir to create it """
     # Arrange
     destination_path = pathsdata.destination_path
@@ -141,32 +142,30 @@ def test_download_toolset_given_args_when_not_exist_destination_path_then_create
     mkdir_mock.assert_called_once_with(destination_path)
 
 
-@patch("requests.get", side_effect=mocked_requests_get)
-@patch("pathlib.Path.joinpath")
+@patch("toolset.download_devops_toolset.stream_to_file")
 @patch("toolset.download_devops_toolset.logger.info")
 @patch("os.path.exists")
-def test_download_toolset_given_args_then_write_response_content_to_full_destination_path(path_exists_mock,
-    logging_mock, joinpath_mock, requests_get, pathsdata):
-    """  Given destination path then write the zip content response to full destination path """
+def test_download_toolset_given_args_then_streams_branch_zip_to_full_destination_path(path_exists_mock,
+    logging_mock, stream_to_file_mock, pathsdata):
+    """  Given destination path then streams the branch zip to full destination path """
     # Arrange
     destination_path = pathsdata.destination_path
     branch = pathsdata.branch
     toolset_name = pathsdata.toolset_name
     path_exists_mock.return_value = True
-    m = mock_open()
+    expected_full_destination_path = pathlib.Path.joinpath(pathlib.Path(destination_path), f"{toolset_name}.zip")
     # Act
-    with patch(pathsdata.builtins_open, m, create=True):
-        sut.download_toolset(branch, destination_path, toolset_name)
-        # Assert
-        handler = m()
-        handler.write.assert_called_once_with(b"sample response in bytes")
+    sut.download_toolset(branch, destination_path, toolset_name)
+    # Assert
+    stream_to_file_mock.assert_called_once_with(
+        f"https://github.com/aheadlabs/devops-toolset/archive/{branch}.zip", expected_full_destination_path)
 
 
-@patch("requests.get", side_effect=mocked_requests_get)
+@patch("toolset.download_devops_toolset.stream_to_file")
 @patch("toolset.download_devops_toolset.logger.info")
 @patch("os.path.exists")
 def test_download_toolset_given_args_then_returns_destination_path_and_full_destination_path(path_exists_mock,
-    logging_mock, requests_get, pathsdata):
+    logging_mock, stream_to_file_mock, pathsdata):
     """  Given destination path then returns a tuple with destination_path and full_destination_path """
     # Arrange
     destination_path = pathsdata.destination_path
@@ -285,6 +284,23 @@ def test_main_given_args_then_call_cleanup(
 
 # endregion
 
+# region stream_to_file()
+
+
+@patch("requests.get", side_effect=mocked_requests_get)
+def test_stream_to_file_given_url_then_writes_content_and_removes_partial_file(requests_get, tmp_path):
+    """ Given a URL, then writes the streamed content to the file and no .part file is left """
+    # Arrange
+    file_path = pathlib.Path.joinpath(tmp_path, "devops-toolset.zip")
+    # Act
+    sut.stream_to_file("https://example.com/devops-toolset.zip", file_path)
+    # Assert
+    assert file_path.read_bytes() == b"sample response in bytes"
+    assert list(tmp_path.iterdir()) == [file_path]
+    requests_get.assert_called_once_with("https://example.com/devops-toolset.zip", stream=True, timeout=60)
+
+# endregion
+
 
 def my_joinpath(*args):
     """ Just a side effect function to replace the real os.joinpath() """